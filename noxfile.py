@@ -367,6 +367,19 @@ def gen_api_docs(session):
     session.run("sphinx-apidoc", "--module-first", "-o", "docs/ref/", "src/mcookbook/")
 
 
+@nox.session(name="benchmarks", python="3")
+def benchmarks(session):
+    """
+    Run the benchmarks and compare them against the committed baseline.
+
+    Timings are compared relative to a calibration workload run on the same machine. Pass
+    ``-- --save benchmarks/baseline.json --missing`` to add new benchmarks to the baseline.
+    """
+    session.install("--progress-bar=off", "-e", ".", silent=PIP_INSTALL_SILENT)
+    args = session.posargs or ["--compare", "benchmarks/baseline.json"]
+    session.run("mommas-cookbook", "bench", "run", *args)
+
+
 @nox.session(name="changelog", python="3")
 @nox.parametrize("draft", [False, True])
 def changelog(session, draft):
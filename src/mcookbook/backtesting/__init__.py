@@ -0,0 +1,20 @@
+"""
+Vectorized strategy backtesting.
+"""
+from __future__ import annotations
+
+from .engine import backtest
+from .engine import populate_signals
+from .engine import simulate
+from .engine import summarize
+from .runner import Backtester
+from .runner import BacktestResult
+
+__all__ = [
+    "backtest",
+    "Backtester",
+    "BacktestResult",
+    "populate_signals",
+    "simulate",
+    "summarize",
+]
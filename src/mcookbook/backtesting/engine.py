@@ -0,0 +1,169 @@
+"""
+Vectorized backtesting engine.
+
+Positions, trades, fees and slippage are all derived with whole-column polars expressions, there is
+no per candle Python loop.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import polars as pl
+
+from mcookbook.strategies import Strategy
+
+TRADES_SCHEMA = {
+    "pair": pl.Utf8,
+    "entry_timestamp": pl.Int64,
+    "exit_timestamp": pl.Int64,
+    "entry_price": pl.Float64,
+    "exit_price": pl.Float64,
+    "candles": pl.Int64,
+    "profit_ratio": pl.Float64,
+    "is_open": pl.Boolean,
+}
+
+
+def populate_signals(strategy: Strategy, frame: pl.DataFrame) -> pl.DataFrame:
+    """
+    Return the OHLCV ``frame`` with the strategy indicators and the ``entry`` and ``exit`` columns.
+
+    Indicators whose columns are already in ``frame``, precomputed, are not computed again.
+    """
+    expressions: list[pl.Expr] = []
+    for indicator in dict.fromkeys(strategy.indicators()):
+        if set(indicator.columns).issubset(frame.columns):
+            continue
+        expressions.extend(indicator.expressions())
+    if expressions:
+        frame = frame.with_columns(expressions)
+    return frame.with_columns(
+        entry=strategy.entry_signal().fill_null(False),
+        exit=strategy.exit_signal().fill_null(False),
+    )
+
+
+def simulate(
+    frame: pl.DataFrame, pair: str = "", fee: float = 0.0, slippage: float = 0.0
+) -> pl.DataFrame:
+    """
+    Simulate the trades of a single pair, long only, one position at a time.
+
+    :param frame: The OHLCV candles, sorted by timestamp, with the boolean ``entry`` and ``exit``
+                  signal columns
+    :param fee: The fee ratio paid on entry and on exit
+    :param slippage: The price ratio lost to slippage on entry and on exit
+    :return: A data frame with the :data:`TRADES_SCHEMA` columns
+
+    Signals are evaluated on the candle close and executed on the next candle open. An exit signal
+    takes precedence over an entry signal on the same candle. Trades still open on the last candle
+    are closed at its closing price and flagged with ``is_open``.
+    """
+    if frame.is_empty():
+        return pl.DataFrame(schema=TRADES_SCHEMA)
+    # The desired position after each candle close, forward filled until the next signal
+    target = (
+        pl.when(pl.col("exit"))
+        .then(0)
+        .when(pl.col("entry"))
+        .then(1)
+        .otherwise(None)
+        .forward_fill()
+        .fill_null(0)
+        .cast(pl.Int8)
+    )
+    # The position actually held during each candle, entered and exited on the candle open
+    position = target.shift(1).fill_null(0)
+    change = position.diff().fill_null(position)
+    events = (
+        frame.lazy()
+        .select(
+            "timestamp",
+            "open",
+            index=pl.int_range(0, pl.len()),
+            change=change,
+        )
+        .with_columns(trade=(pl.col("change") == 1).cum_sum())
+        .filter(pl.col("change") != 0)
+    )
+    entries = events.filter(pl.col("change") == 1).select(
+        "trade",
+        entry_timestamp="timestamp",
+        entry_price=pl.col("open") * (1 + slippage),
+        entry_index="index",
+    )
+    exits = events.filter(pl.col("change") == -1).select(
+        "trade",
+        exit_timestamp="timestamp",
+        exit_price=pl.col("open") * (1 - slippage),
+        exit_index="index",
+    )
+    last_timestamp = frame["timestamp"][-1]
+    last_close = frame["close"][-1]
+    last_index = frame.height - 1
+    trades = (
+        entries.join(exits, on="trade", how="left")
+        .with_columns(is_open=pl.col("exit_timestamp").is_null())
+        .select(
+            pair=pl.lit(pair, dtype=pl.Utf8),
+            entry_timestamp="entry_timestamp",
+            exit_timestamp=pl.col("exit_timestamp").fill_null(last_timestamp),
+            entry_price="entry_price",
+            exit_price=pl.col("exit_price").fill_null(last_close * (1 - slippage)),
+            candles=pl.col("exit_index").fill_null(last_index + 1) - pl.col("entry_index"),
+            is_open="is_open",
+        )
+        .with_columns(
+            profit_ratio=pl.col("exit_price") * (1 - fee) / (pl.col("entry_price") * (1 + fee)) - 1,
+        )
+        .sort("entry_timestamp")
+        .collect()
+    )
+    return trades.select(list(TRADES_SCHEMA)).cast(TRADES_SCHEMA)  # type: ignore[arg-type]
+
+
+def backtest(
+    strategy: Strategy, frame: pl.DataFrame, pair: str = "", fee: float = 0.0, slippage: float = 0.0
+) -> pl.DataFrame:
+    """
+    Backtest ``strategy`` over the ``pair`` OHLCV ``frame`` and return the trades.
+    """
+    return simulate(populate_signals(strategy, frame), pair=pair, fee=fee, slippage=slippage)
+
+
+def summarize(trades: pl.DataFrame) -> dict[str, Any]:
+    """
+    Summarize ``trades``, assuming the same stake on every trade.
+
+    The profit and drawdown are expressed as a ratio of the stake, accumulated in exit order.
+    """
+    if trades.is_empty():
+        return {
+            "trades": 0,
+            "wins": 0,
+            "win_rate": 0.0,
+            "profit_mean": 0.0,
+            "profit_total": 0.0,
+            "profit_factor": 0.0,
+            "max_drawdown": 0.0,
+        }
+    profit = pl.col("profit_ratio")
+    equity = profit.cum_sum()
+    summary = (
+        trades.sort("exit_timestamp")
+        .select(
+            trades=pl.len(),
+            wins=(profit > 0).sum(),
+            profit_mean=profit.mean(),
+            profit_total=profit.sum(),
+            gross_profit=profit.filter(profit > 0).sum(),
+            gross_loss=-profit.filter(profit < 0).sum(),
+            max_drawdown=(pl.max_horizontal(equity.cum_max(), 0) - equity).max(),
+        )
+        .row(0, named=True)
+    )
+    gross_profit = summary.pop("gross_profit")
+    gross_loss = summary.pop("gross_loss")
+    summary["win_rate"] = summary["wins"] / summary["trades"]
+    summary["profit_factor"] = gross_profit / gross_loss if gross_loss else float("inf")
+    return summary
@@ -0,0 +1,156 @@
+"""
+Multi-pair backtest runner.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import pathlib
+import time
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.backtesting.engine import backtest
+from mcookbook.backtesting.engine import summarize
+from mcookbook.backtesting.engine import TRADES_SCHEMA
+from mcookbook.data import CandleStore
+from mcookbook.strategies import Strategy
+
+log = logging.getLogger(__name__)
+
+
+class BacktestResult(NamedTuple):
+    """
+    Backtest results.
+    """
+
+    trades: pl.DataFrame
+    pairs: pl.DataFrame
+    summary: dict[str, Any]
+    duration: float
+
+
+def backtest_pairs(
+    store_path: pathlib.Path,
+    exchange: str,
+    timeframe: str,
+    pairs: list[str],
+    strategy: dict[str, Any],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    fee: float = 0.0,
+    slippage: float = 0.0,
+) -> tuple[pl.DataFrame, int]:
+    """
+    Backtest ``strategy`` over each of the ``pairs`` and return all trades and the candles count.
+
+    This is what runs on the worker processes, which is why it loads the candles from the store
+    itself, and takes the strategy configuration instead of its instance.
+    """
+    candle_store = CandleStore(store_path, exchange)
+    resolved_strategy = Strategy.resolved(strategy)
+    trades: list[pl.DataFrame] = []
+    candles = 0
+    for pair in pairs:
+        frame = candle_store.load(pair, timeframe, start=start, end=end)
+        candles += frame.height
+        trades.append(backtest(resolved_strategy, frame, pair=pair, fee=fee, slippage=slippage))
+    if not trades:
+        return pl.DataFrame(schema=TRADES_SCHEMA), candles
+    return pl.concat(trades), candles
+
+
+class Backtester:
+    """
+    Backtest a strategy over many pairs, in parallel.
+
+    Pairs are split into chunks, each backtested on a worker process which loads the candles
+    straight from the store, so only the, much smaller, trades are sent between processes.
+    """
+
+    def __init__(
+        self,
+        store: CandleStore,
+        strategy: Strategy,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        fee: float = 0.0,
+        slippage: float = 0.0,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.store = store
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.start = start
+        self.end = end
+        self.fee = fee
+        self.slippage = slippage
+        self.workers = workers or os.cpu_count() or 1
+
+    def _chunks(self, pairs: list[str]) -> list[list[str]]:
+        # A few chunks per worker keeps them all busy even when some pairs have more candles
+        chunk_count = min(len(pairs), self.workers * 4)
+        return [pairs[idx::chunk_count] for idx in range(chunk_count)]
+
+    def run(self, pairs: list[str]) -> BacktestResult:
+        """
+        Backtest ``pairs`` and return the results.
+        """
+        start = time.perf_counter()
+        kwargs: dict[str, Any] = {
+            "store_path": self.store.path.parent,
+            "exchange": self.store.exchange,
+            "timeframe": self.timeframe,
+            "strategy": self.strategy.dict(),
+            "start": self.start,
+            "end": self.end,
+            "fee": self.fee,
+            "slippage": self.slippage,
+        }
+        # Keeps the trades schema, even without any pairs to backtest
+        results = [pl.DataFrame(schema=TRADES_SCHEMA)]
+        candles = 0
+        if self.workers == 1 or len(pairs) <= 1:
+            trades, candles = backtest_pairs(pairs=pairs, **kwargs)
+            results.append(trades)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(backtest_pairs, pairs=chunk, **kwargs)
+                    for chunk in self._chunks(pairs)
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    trades, chunk_candles = future.result()
+                    results.append(trades)
+                    candles += chunk_candles
+        trades = pl.concat(results).sort("pair", "entry_timestamp")
+        duration = time.perf_counter() - start
+        log.info(
+            "Backtested %d candles of %d pairs in %.2f seconds",
+            candles,
+            len(pairs),
+            duration,
+        )
+        pair_trades = {
+            key[0]: frame for key, frame in trades.partition_by("pair", as_dict=True).items()
+        }
+        no_trades = pl.DataFrame(schema=TRADES_SCHEMA)
+        pair_summaries = [
+            {"pair": pair, **summarize(pair_trades.get(pair, no_trades))} for pair in pairs
+        ]
+        summary = summarize(trades)
+        summary["candles"] = candles
+        return BacktestResult(
+            trades=trades,
+            pairs=pl.DataFrame(pair_summaries),
+            summary=summary,
+            duration=duration,
+        )
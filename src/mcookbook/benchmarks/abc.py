@@ -0,0 +1,47 @@
+"""
+Benchmark base class.
+"""
+from __future__ import annotations
+
+import abc
+
+
+class Benchmark(metaclass=abc.ABCMeta):
+    """
+    Base benchmark.
+
+    Subclasses are collected automatically. Only the time spent on :meth:`Benchmark.run` is
+    measured, :meth:`Benchmark.setup` and :meth:`Benchmark.teardown` are called once, before
+    and after all timing rounds.
+    """
+
+    name: str
+
+    @classmethod
+    def collect(cls) -> list[type[Benchmark]]:
+        """
+        Return all concrete benchmark implementations, sorted by name.
+        """
+        collected: list[type[Benchmark]] = []
+        for subclass in cls.__subclasses__():
+            if not subclass.__abstractmethods__:
+                collected.append(subclass)
+            collected.extend(subclass.collect())
+        return sorted(collected, key=lambda benchmark: benchmark.name)
+
+    def setup(self) -> None:
+        """
+        Prepare the benchmark inputs.
+        """
+
+    @abc.abstractmethod
+    def run(self) -> None:
+        """
+        Run the code being benchmarked, once.
+        """
+        raise NotImplementedError
+
+    def teardown(self) -> None:
+        """
+        Cleanup after the benchmark.
+        """
@@ -0,0 +1,30 @@
+"""
+Backtesting benchmarks.
+"""
+from __future__ import annotations
+
+from mcookbook.backtesting import backtest
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import MarketGenerator
+from mcookbook.strategies import EMACross
+
+
+class BacktestPair(Benchmark):
+    """
+    Backtest the EMA crossover strategy over two years of 5m candles of a single pair.
+    """
+
+    name = "backtesting.backtest_pair"
+
+    def setup(self) -> None:
+        """
+        Generate the candles, and build the strategy.
+        """
+        self.frame = MarketGenerator(seed=1).ohlcv("AAA/USDT", timeframe="5m", candles=210_240)
+        self.strategy = EMACross.construct()
+
+    def run(self) -> None:
+        """
+        Backtest the strategy.
+        """
+        backtest(self.strategy, self.frame, pair="AAA/USDT", fee=0.001)
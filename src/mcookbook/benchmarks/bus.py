@@ -0,0 +1,58 @@
+"""
+Event bus benchmarks.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.bus import BLOCK
+from mcookbook.bus import CANDLES
+from mcookbook.bus import CONFLATE
+from mcookbook.bus import EventBus
+from mcookbook.data import MarketGenerator
+from mcookbook.indicators.abc import Candle
+from mcookbook.replay import CandleEvent
+
+
+class EventBusFanOut(Benchmark):
+    """
+    Publish 50,000 candle events to three subscribers.
+
+    Those are a blocking consumer, a keyed conflating consumer and a never consumed logger.
+    """
+
+    name = "bus.fan_out"
+
+    def setup(self) -> None:
+        """
+        Generate the candle events.
+        """
+        generator = MarketGenerator(seed=1)
+        self.events = [
+            CandleEvent(row[0] + 60_000, pair, "1m", Candle(*row))
+            for pair, frame in generator.iter_ohlcv(generator.symbols(50), candles=1000)
+            for row in frame.rows()
+        ]
+
+    async def _run(self) -> None:
+        bus = EventBus()
+        strategy = bus.subscribe(CANDLES, "strategy", maxsize=256, policy=BLOCK)
+        bus.subscribe(CANDLES, "state", maxsize=64, policy=CONFLATE, key=lambda event: event.pair)
+        bus.subscribe(CANDLES, "logger", maxsize=1024)
+
+        async def _consume() -> None:
+            async for _ in strategy:
+                pass
+
+        consumer = asyncio.create_task(_consume())
+        for event in self.events:
+            await bus.publish(CANDLES, event)
+        bus.close()
+        await consumer
+
+    def run(self) -> None:
+        """
+        Publish the candle events.
+        """
+        asyncio.run(self._run())
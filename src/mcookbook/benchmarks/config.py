@@ -0,0 +1,57 @@
+"""
+Configuration benchmarks.
+"""
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.benchmarks.utils import make_symbols
+from mcookbook.config.live import LiveConfig
+
+
+class ParseFiles(Benchmark):
+    """
+    Load and merge three configuration files.
+    """
+
+    name = "config.parse_files"
+
+    def setup(self) -> None:
+        """
+        Write the configuration files.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        tempdir = pathlib.Path(self.tempdir.name)
+        contents = [
+            {
+                "exchange": {
+                    "name": "binance",
+                    "key": "key",
+                    "secret": "secret",
+                    "pair_allow_list": make_symbols(500),
+                },
+                "pairlists": [{"name": "StaticPairList"}],
+            },
+            {"exchange": {"pair_block_list": make_symbols(100)}},
+            {"logging": {"cli": {"level": "warning"}}, "pairlist_refresh_period": 60},
+        ]
+        self.files: list[pathlib.Path] = []
+        for idx, content in enumerate(contents):
+            path = tempdir / f"config-{idx}.json"
+            path.write_text(json.dumps(content))
+            self.files.append(path)
+
+    def run(self) -> None:
+        """
+        Load and merge the configuration files.
+        """
+        LiveConfig.parse_files(*self.files)
+
+    def teardown(self) -> None:
+        """
+        Remove the configuration files.
+        """
+        self.tempdir.cleanup()
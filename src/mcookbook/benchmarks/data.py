@@ -0,0 +1,280 @@
+"""
+Market data benchmarks.
+"""
+from __future__ import annotations
+
+import pathlib
+import random
+import tempfile
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import CandleArchive
+from mcookbook.data import CandleStore
+from mcookbook.data import CandleWindows
+from mcookbook.data import LiveStateReader
+from mcookbook.data import LiveStateWriter
+from mcookbook.data import MarketGenerator
+from mcookbook.data import resample
+from mcookbook.data import Resampler
+from mcookbook.data import scan_gaps
+from mcookbook.data import TradeAggregator
+from mcookbook.indicators.abc import Candle
+
+
+class SyntheticOHLCV(Benchmark):
+    """
+    Generate 1,000,000 synthetic candles, 1,000 for each of 1,000 symbols.
+    """
+
+    name = "data.synthetic_ohlcv"
+
+    def setup(self) -> None:
+        """
+        Build the generator, and its symbols.
+        """
+        self.generator = MarketGenerator(seed=1, gap_ratio=0.01)
+        self.symbols = self.generator.symbols(1000)
+
+    def run(self) -> None:
+        """
+        Generate the candles.
+        """
+        self.generator.ohlcv(self.symbols, candles=1000)
+
+
+class SyntheticMarkets(Benchmark):
+    """
+    Generate 3,000 synthetic markets and their tickers.
+    """
+
+    name = "data.synthetic_markets"
+
+    def setup(self) -> None:
+        """
+        Build the generator.
+        """
+        self.generator = MarketGenerator(seed=1, inactive_ratio=0.05)
+
+    def run(self) -> None:
+        """
+        Generate the markets, and their tickers.
+        """
+        self.generator.tickers(list(self.generator.markets(3000)))
+
+
+class ResampleCandles(Benchmark):
+    """
+    Resample 525,600 1m candles, a year, to the 5m, 15m, 1h and 4h timeframes.
+    """
+
+    name = "data.resample"
+
+    def setup(self) -> None:
+        """
+        Generate a year of 1m candles.
+        """
+        self.frame = MarketGenerator(seed=1, gap_ratio=0.01).ohlcv(
+            "AAA/USDT", timeframe="1m", candles=525_600
+        )
+
+    def run(self) -> None:
+        """
+        Resample the candles to every timeframe.
+        """
+        for timeframe in ("5m", "15m", "1h", "4h"):
+            resample(self.frame, "1m", timeframe)
+
+
+class ResampleCandlesIncrementally(Benchmark):
+    """
+    Update the 5m, 15m, 1h and 4h candles of 100 pairs with 100 1m candles each.
+    """
+
+    name = "data.resample_incrementally"
+
+    def setup(self) -> None:
+        """
+        Generate the 1m candles, in timestamp order.
+        """
+        generator = MarketGenerator(seed=1)
+        frame = generator.ohlcv(generator.symbols(100), timeframe="1m", candles=100)
+        self.candles = [(row[0], Candle(*row[1:])) for row in frame.sort("timestamp").iter_rows()]
+
+    def run(self) -> None:
+        """
+        Feed the candles to a new resampler.
+        """
+        resampler = Resampler("1m", ["5m", "15m", "1h", "4h"])
+        update = resampler.update
+        for pair, candle in self.candles:
+            update(pair, candle)
+
+
+class AggregateTrades(Benchmark):
+    """
+    Aggregate 100,000 trades of 10 pairs into 1s time bars and 5,000 dollar bars.
+    """
+
+    name = "data.aggregate_trades"
+
+    def setup(self) -> None:
+        """
+        Generate the trades.
+        """
+        rng = random.Random(1)
+        pairs = MarketGenerator(seed=1).symbols(10)
+        price = 100.0
+        timestamp = 0
+        self.trades: list[tuple[str, int, float, float]] = []
+        for idx in range(100_000):
+            timestamp += rng.randint(0, 3)
+            price *= 1 + rng.gauss(0, 0.0001)
+            self.trades.append((pairs[idx % 10], timestamp, price, rng.uniform(0.001, 1)))
+
+    def run(self) -> None:
+        """
+        Aggregate the trades into time, and dollar, bars.
+        """
+        bars: list[object] = []
+        for kind, size in (("time", 1), ("dollar", 5000)):
+            aggregator = TradeAggregator(kind, size)
+            aggregator.subscribe(lambda pair, bar: bars.append(bar))
+            update = aggregator.update
+            for trade in self.trades:
+                update(*trade)
+
+
+class CandleWindowsAppend(Benchmark):
+    """
+    Append 100,000 candles to the 200 candle windows of 100 pairs.
+
+    The frame of all the windows is built every 1,000 candles.
+    """
+
+    name = "data.candle_windows_append"
+
+    def setup(self) -> None:
+        """
+        Generate the candles, in timestamp order.
+        """
+        generator = MarketGenerator(seed=1)
+        pairs = generator.symbols(100)
+        frame = generator.ohlcv(pairs, candles=1000).sort("timestamp", "symbol")
+        self.candles = [
+            (row[0], Candle(*row[1:])) for row in frame.select("symbol", *Candle._fields).rows()
+        ]
+
+    def run(self) -> None:
+        """
+        Append the candles to new windows.
+        """
+        windows = CandleWindows(200)
+        append = windows.append
+        for idx, (pair, candle) in enumerate(self.candles, start=1):
+            append(pair, "1m", candle)
+            if not idx % 1000:
+                windows.frame("1m")
+
+
+class ScanGaps(Benchmark):
+    """
+    Scan 300 pairs of 20,000 stored candles, 1% of them missing, for gaps.
+    """
+
+    name = "data.scan_gaps"
+
+    def setup(self) -> None:
+        """
+        Store the candles, 1% of them missing.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = CandleStore(pathlib.Path(self.tempdir.name), "synthetic")
+        generator = MarketGenerator(seed=1, gap_ratio=0.01)
+        self.pairs = generator.symbols(300)
+        for pair, frame in generator.iter_ohlcv(self.pairs, candles=20_000):
+            self.store.save(pair, "1m", frame)
+
+    def run(self) -> None:
+        """
+        Scan the stored candles for gaps.
+        """
+        scan_gaps(self.store, "1m", self.pairs)
+
+    def teardown(self) -> None:
+        """
+        Remove the stored candles.
+        """
+        self.tempdir.cleanup()
+
+
+class LoadArchivedCandles(Benchmark):
+    """
+    Load 10 pairs of 100,000 archived candles.
+    """
+
+    name = "data.load_archived_candles"
+
+    def setup(self) -> None:
+        """
+        Archive the candles.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.archive = CandleArchive(pathlib.Path(self.tempdir.name), "synthetic")
+        generator = MarketGenerator(seed=1)
+        self.pairs = generator.symbols(10)
+        for pair, frame in generator.iter_ohlcv(self.pairs, candles=100_000):
+            self.archive.save(pair, "1m", frame)
+
+    def run(self) -> None:
+        """
+        Load the archived candles.
+        """
+        for pair in self.pairs:
+            self.archive.load(pair, "1m")
+
+    def teardown(self) -> None:
+        """
+        Remove the archived candles.
+        """
+        self.tempdir.cleanup()
+
+
+class ReadLiveState(Benchmark):
+    """
+    Read the published live state.
+
+    That is the pair list, 1,000 tickers and the 200 candle windows of 1,000 pairs.
+    """
+
+    name = "data.read_live_state"
+
+    def setup(self) -> None:
+        """
+        Publish the live state.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(self.tempdir.name)
+        generator = MarketGenerator(seed=1)
+        pairs = generator.symbols(1000)
+        writer = LiveStateWriter(path)
+        writer.publish_pairlist(pairs)
+        writer.publish_tickers(generator.tickers(pairs))
+        writer.publish_candles(
+            "1m",
+            generator.ohlcv(pairs, candles=200).rename({"symbol": "pair"}),
+        )
+        self.reader = LiveStateReader(path)
+
+    def run(self) -> None:
+        """
+        Read the live state.
+        """
+        self.reader.pairlist()
+        self.reader.tickers()
+        self.reader.candles("1m")
+
+    def teardown(self) -> None:
+        """
+        Remove the published live state.
+        """
+        self.tempdir.cleanup()
@@ -0,0 +1,118 @@
+"""
+Exchange call throughput benchmark under the available event loop backends.
+
+Run it with ``python -m mcookbook.benchmarks.eventloop``.
+
+A local HTTP server answers every request with a canned ticker payload, while hundreds of
+concurrent tasks issue requests through a CCXT exchange instance, exercising the same
+HTTP, JSON decoding and error handling code paths used when talking to a real exchange.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+import ccxt.async_support
+
+from mcookbook.config.event_loop import EventLoopConfig
+from mcookbook.utils import eventloop
+
+TICKER_PAYLOAD = json.dumps(
+    {
+        "symbol": "BTCUSDT",
+        "priceChange": "-94.99999800",
+        "priceChangePercent": "-95.960",
+        "weightedAvgPrice": "0.29628482",
+        "lastPrice": "4.00000200",
+        "lastQty": "200.00000000",
+        "openPrice": "99.00000000",
+        "highPrice": "100.00000000",
+        "lowPrice": "0.10000000",
+        "volume": "8913.30000000",
+        "quoteVolume": "15.30000000",
+        "openTime": 1499783499040,
+        "closeTime": 1499869899040,
+        "firstId": 28385,
+        "lastId": 28460,
+        "count": 76,
+    }
+).encode()
+
+
+async def _handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    response = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: " + str(len(TICKER_PAYLOAD)).encode() + b"\r\n"
+        b"\r\n" + TICKER_PAYLOAD
+    )
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if not request:
+                break
+            writer.write(response)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _benchmark(requests: int, concurrency: int) -> float:
+    server = await asyncio.start_server(_handle_client, host="127.0.0.1", port=0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/fapi/v1/ticker/24hr"
+    api = ccxt.async_support.binance({"enableRateLimit": False})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call() -> Any:
+        async with semaphore:
+            return await api.fetch(url, "GET")
+
+    try:
+        # Warm up the connection pool
+        await asyncio.gather(*[call() for _ in range(concurrency)])
+        start = time.perf_counter()
+        await asyncio.gather(*[call() for _ in range(requests)])
+        duration = time.perf_counter() - start
+    finally:
+        await api.close()
+        server.close()
+        await server.wait_closed()
+    return requests / duration
+
+
+def run(backend: str, requests: int = 5000, concurrency: int = 200) -> float:
+    """
+    Run the benchmark on a fresh event loop of the given ``backend``, returning requests per second.
+    """
+    config = EventLoopConfig(backend=backend)
+    return eventloop.run(_benchmark(requests, concurrency), config)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the benchmark against all available event loop backends.
+    """
+    parser = argparse.ArgumentParser(prog="python -m mcookbook.benchmarks.eventloop")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    backends = ["asyncio"]
+    if eventloop.HAS_UVLOOP:
+        backends.append("uvloop")
+    results: dict[str, float] = {}
+    for backend in backends:
+        results[backend] = run(backend, requests=args.requests, concurrency=args.concurrency)
+        print(f"{backend:>8}: {results[backend]:>10.1f} requests/sec")
+    if "uvloop" in results:
+        print(f"  uvloop speedup: {results['uvloop'] / results['asyncio']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
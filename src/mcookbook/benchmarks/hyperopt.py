@@ -0,0 +1,59 @@
+"""
+Hyperopt benchmarks.
+"""
+from __future__ import annotations
+
+import pathlib
+import tempfile
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.hyperopt import Dataset
+from mcookbook.hyperopt import evaluate
+from mcookbook.strategies import EMACross
+
+
+class EvaluateTrial(Benchmark):
+    """
+    Evaluate a hyperopt trial over 20 pairs of 10,000 candles, with precomputed indicators.
+    """
+
+    name = "hyperopt.evaluate_trial"
+
+    def setup(self) -> None:
+        """
+        Store the candles, and build the dataset.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(self.tempdir.name)
+        store = CandleStore(path / "data", "synthetic")
+        generator = MarketGenerator(seed=2)
+        pairs = generator.symbols(20)
+        for pair, frame in generator.iter_ohlcv(pairs, timeframe="5m", candles=10_000):
+            store.save(pair, "5m", frame)
+        self.strategy = EMACross.construct()
+        self.dataset = Dataset.load_or_build(
+            path / "dataset", store, pairs, "5m", indicators=self.strategy.indicators()
+        )
+
+    def run(self) -> None:
+        """
+        Evaluate a single trial over all the pairs.
+        """
+        evaluate(
+            self.dataset,
+            0,
+            self.strategy.dict(),
+            {},
+            [self.dataset.pairs],
+            [],
+            "profit_total",
+            fee=0.001,
+        )
+
+    def teardown(self) -> None:
+        """
+        Remove the dataset, and the candles.
+        """
+        self.tempdir.cleanup()
@@ -0,0 +1,91 @@
+"""
+Indicator benchmarks.
+"""
+from __future__ import annotations
+
+import polars as pl
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import MarketGenerator
+from mcookbook.indicators import ATR
+from mcookbook.indicators import BollingerBands
+from mcookbook.indicators import Candle
+from mcookbook.indicators import EMA
+from mcookbook.indicators import IndicatorEngine
+from mcookbook.indicators import MACD
+from mcookbook.indicators import RSI
+from mcookbook.indicators import SMA
+from mcookbook.indicators import VWAP
+
+PAIRS = 300
+WINDOW = 500
+
+
+class IndicatorsBenchmark(Benchmark):
+    """
+    Base class for the indicator benchmarks, computing all indicators for 300 pairs.
+    """
+
+    def setup(self) -> None:
+        """
+        Build the indicator engine, and the synthetic candles.
+        """
+        self.engine = IndicatorEngine(
+            [
+                SMA(period=20),
+                EMA(period=20),
+                RSI(),
+                ATR(),
+                BollingerBands(),
+                MACD(),
+                VWAP(anchor="1d"),
+            ]
+        )
+        generator = MarketGenerator(seed=1)
+        self.history: dict[str, pl.DataFrame] = {}
+        self.candles: dict[str, Candle] = {}
+        for pair, frame in generator.iter_ohlcv(generator.symbols(PAIRS), candles=WINDOW + 1):
+            self.history[pair] = frame.head(WINDOW)
+            self.candles[pair] = Candle(*frame.row(WINDOW))
+
+
+class RecomputeWindow(IndicatorsBenchmark):
+    """
+    Recompute the indicators over the whole 500 candles window, for each of the 300 pairs.
+    """
+
+    name = "indicators.recompute_window"
+
+    def run(self) -> None:
+        """
+        Recompute the indicators of every pair.
+        """
+        compute = self.engine.compute
+        for frame in self.history.values():
+            compute(frame)
+
+
+class IncrementalUpdate(IndicatorsBenchmark):
+    """
+    Update the indicators with a new candle, for each of the 300 pairs.
+    """
+
+    name = "indicators.incremental_update"
+
+    def setup(self) -> None:
+        """
+        Load the indicator states of every pair.
+        """
+        super().setup()
+        for pair, frame in self.history.items():
+            self.engine.load(pair, frame)
+
+    def run(self) -> None:
+        """
+        Update the indicators of every pair with the same candle.
+        """
+        engine = self.engine
+        for pair, candle in self.candles.items():
+            engine.update(pair, candle)
+            # Allow the same candle to be processed on every iteration
+            engine._pairs[pair].timestamp = None  # pylint: disable=protected-access
@@ -0,0 +1,75 @@
+"""
+Pair list benchmarks.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.config.live import LiveConfig
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges.abc import Exchange
+
+
+class SyntheticAPI:
+    """
+    Synthetic CCXT exchange API, serving in-memory markets and tickers.
+    """
+
+    def __init__(self, generator: MarketGenerator, count: int) -> None:
+        self.markets: dict[str, dict[str, Any]] = generator.markets(count)
+        self.tickers: dict[str, dict[str, Any]] = generator.tickers(list(self.markets))
+
+    async def load_markets(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the synthetic markets.
+        """
+        return self.markets
+
+    async def fetch_tickers(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the synthetic tickers.
+        """
+        return self.tickers
+
+
+class RefreshPairlist(Benchmark):
+    """
+    Refresh a wildcard pair list against a synthetic exchange with 2,000 markets.
+    """
+
+    name = "pairlist.refresh_pairlist"
+
+    def setup(self) -> None:
+        """
+        Resolve the exchange, and load the synthetic markets.
+        """
+        pair_allow_list = [f"{letter}[A-M].*/USDT" for letter in "ABCDEFGHIJ"]
+        pair_allow_list.extend(f"{letter}[N-Z].*/BUSD" for letter in "ABCDEFGHIJ")
+        config = LiveConfig.parse_obj(
+            {
+                "exchange": {
+                    "name": "binance",
+                    "pair_allow_list": pair_allow_list,
+                    "pair_block_list": [".*/BTC", "AA.*/BUSD"],
+                },
+                "pairlists": [{"name": "StaticPairList"}],
+            }
+        )
+        self.exchange = Exchange.resolved(config)
+        self.exchange.set_api(SyntheticAPI(MarketGenerator(seed=1), 2000))
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.exchange.get_markets())
+
+    def run(self) -> None:
+        """
+        Refresh the pair list.
+        """
+        self.loop.run_until_complete(self.exchange.pairlist_manager.refresh_pairlist())
+
+    def teardown(self) -> None:
+        """
+        Close the event loop.
+        """
+        self.loop.close()
@@ -0,0 +1,81 @@
+"""
+Paper trading benchmarks.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import ccxt
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import MarketGenerator
+from mcookbook.paper import MatchingEngine
+
+
+class MatchingEngineThroughput(Benchmark):
+    """
+    Match 20,000 order book updates, trades, limit orders, market orders and cancellations.
+    """
+
+    name = "paper.matching_engine"
+
+    def setup(self) -> None:
+        """
+        Generate the order book, trade and order events.
+        """
+        generator = MarketGenerator(seed=4)
+        self.markets = generator.markets(20)
+        symbols = list(self.markets)
+        rng = random.Random(4)
+        mids = {symbol: 100.0 for symbol in symbols}
+        self.events: list[tuple[Any, ...]] = []
+        orders = 0
+        for idx in range(20_000):
+            symbol = rng.choice(symbols)
+            mid = mids[symbol] = round(mids[symbol] * (1 + rng.gauss(0, 0.0005)), 2)
+            kind = rng.random()
+            if kind < 0.5:
+                bids = [
+                    [round(mid - 0.01 * (level + 1), 2), rng.uniform(1, 10)] for level in range(10)
+                ]
+                asks = [
+                    [round(mid + 0.01 * (level + 1), 2), rng.uniform(1, 10)] for level in range(10)
+                ]
+                self.events.append(("book", symbol, bids, asks, idx))
+            elif kind < 0.6:
+                self.events.append(("trade", symbol, mid, rng.uniform(0.1, 5), idx))
+            elif kind < 0.85:
+                side = rng.choice(("buy", "sell"))
+                offset = rng.randint(0, 5) * 0.01
+                price = mid - offset if side == "buy" else mid + offset
+                self.events.append(("limit", symbol, side, rng.uniform(0.1, 2), price, idx))
+                orders += 1
+            elif kind < 0.95 and orders:
+                self.events.append(("cancel", rng.randint(1, orders)))
+            else:
+                side = rng.choice(("buy", "sell"))
+                self.events.append(("market", symbol, side, rng.uniform(0.1, 2), None, idx))
+                orders += 1
+        self.balances = {"USDT": 1e12, "BUSD": 1e12, "BTC": 1e12} | {
+            market["base"]: 1e12 for market in self.markets.values()
+        }
+
+    def run(self) -> None:
+        """
+        Process the events with a new matching engine.
+        """
+        engine = MatchingEngine(self.markets, self.balances)
+        for event in self.events:
+            kind = event[0]
+            try:
+                if kind == "book":
+                    engine.on_book(*event[1:])
+                elif kind == "trade":
+                    engine.on_trade(*event[1:])
+                elif kind == "cancel":
+                    engine.cancel(str(event[1]))
+                else:
+                    engine.submit(event[1], kind, *event[2:])
+            except ccxt.BaseError:
+                pass
@@ -0,0 +1,76 @@
+"""
+Replay benchmarks.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges.abc import Exchange
+from mcookbook.indicators.abc import Candle
+from mcookbook.replay import CandleEvent
+from mcookbook.replay import ReplayEngine
+
+
+class ReplayCandles(Benchmark):
+    """
+    Replay 500 candles of 100 pairs through the live pair list, indicators and strategy.
+    """
+
+    name = "replay.replay_candles"
+
+    def setup(self) -> None:
+        """
+        Build the exchange, and the candle events.
+        """
+        generator = MarketGenerator(seed=1)
+        pairs = generator.symbols(100)
+        self.config = BacktestConfig.parse_obj(
+            {
+                "exchange": {
+                    "name": "binance",
+                    "pair_allow_list": pairs,
+                    "dry_run_wallet": {"USDT": 1e9, "BUSD": 1e9, "BTC": 1e9},
+                },
+                "pairlists": [{"name": "StaticPairList"}],
+                "strategy": {"name": "EMACross"},
+            }
+        )
+        self.exchange = Exchange.resolved(self.config)
+        self.exchange.set_markets(generator.markets(100))
+        frame = generator.ohlcv(pairs, timeframe="5m", candles=500).sort("timestamp", "symbol")
+        self.events = [
+            CandleEvent(row[1] + 300_000, row[0], "5m", Candle(*row[1:]))
+            for row in frame.iter_rows()
+        ]
+        self.loop = asyncio.new_event_loop()
+
+    def run(self) -> None:
+        """
+        Replay the candle events.
+        """
+        engine = ReplayEngine(self.exchange, self.config.strategy, "5m")
+        self.loop.run_until_complete(engine.run(self.events))
+
+    def teardown(self) -> None:
+        """
+        Close the event loop.
+        """
+        self.loop.close()
+
+
+class ReplayCandlesPaperTrading(ReplayCandles):
+    """
+    Replay 500 candles of 100 pairs, executing the signals with the paper trading matching engine.
+    """
+
+    name = "replay.replay_candles_paper_trading"
+
+    def run(self) -> None:
+        """
+        Replay the candle events, executing the signals.
+        """
+        engine = ReplayEngine(self.exchange, self.config.strategy, "5m", stake_amount=20.0)
+        self.loop.run_until_complete(engine.run(self.events))
@@ -0,0 +1,40 @@
+"""
+Robustness analysis benchmarks.
+"""
+from __future__ import annotations
+
+import random
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.robustness import monte_carlo
+
+
+class MonteCarloBootstrap(Benchmark):
+    """
+    Resample 1,000 trades 10,000 times, with replacement.
+    """
+
+    name = "robustness.monte_carlo_bootstrap"
+    method = "bootstrap"
+
+    def setup(self) -> None:
+        """
+        Generate the trade profits.
+        """
+        rng = random.Random(0)
+        self.profits = [rng.gauss(0.001, 0.02) for _ in range(1000)]
+
+    def run(self) -> None:
+        """
+        Run the simulations.
+        """
+        monte_carlo(self.profits, simulations=10_000, method=self.method)
+
+
+class MonteCarloShuffle(MonteCarloBootstrap):
+    """
+    Reorder 1,000 trades 10,000 times.
+    """
+
+    name = "robustness.monte_carlo_shuffle"
+    method = "shuffle"
@@ -0,0 +1,258 @@
+"""
+Benchmarks runner.
+
+Results are plain JSON so they can be committed to the repository as baselines and compared against
+later runs.
+
+Every run also times a fixed calibration workload, and each benchmark's minimum time is recorded
+relative to it. Comparisons use those relative timings, so a baseline recorded on one machine can
+gate runs on another, like a CI runner.
+"""
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import gc
+import importlib
+import json
+import pathlib
+import platform
+import statistics
+import time
+from collections.abc import Collection
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+
+from mcookbook import __version__
+from mcookbook.benchmarks.abc import Benchmark
+
+BENCHMARK_MODULES = (
+    "mcookbook.benchmarks.backtesting",
+    "mcookbook.benchmarks.bus",
+    "mcookbook.benchmarks.config",
+    "mcookbook.benchmarks.data",
+    "mcookbook.benchmarks.hyperopt",
+    "mcookbook.benchmarks.indicators",
+    "mcookbook.benchmarks.pairlist",
+    "mcookbook.benchmarks.paper",
+    "mcookbook.benchmarks.replay",
+    "mcookbook.benchmarks.robustness",
+    "mcookbook.benchmarks.utils",
+)
+
+
+class Calibration(Benchmark):
+    """
+    Fixed workload, mixing interpreted code and polars, which benchmark timings are relative to.
+    """
+
+    name = "calibration"
+
+    def setup(self) -> None:
+        """
+        Build the calibration frame.
+        """
+        self.frame = pl.DataFrame({"value": [(index * 7919) % 10007 for index in range(100_000)]})
+
+    def run(self) -> None:
+        """
+        Run the calibration workload.
+        """
+        total = 0
+        for index in range(20_000):
+            total += index % 7
+        self.frame.sort("value").select(pl.col("value").cum_sum())
+
+
+class Regression(NamedTuple):
+    """
+    A benchmark slower than its baseline.
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """
+        The relative change, as a percentage.
+        """
+        return (self.current - self.baseline) / self.baseline * 100
+
+
+def collect(pattern: Optional[str] = None) -> list[type[Benchmark]]:
+    """
+    Import the benchmark modules and return the benchmarks whose name matches ``pattern``.
+    """
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+    benchmarks = [benchmark for benchmark in Benchmark.collect() if benchmark is not Calibration]
+    if pattern is not None:
+        benchmarks = [
+            benchmark for benchmark in benchmarks if fnmatch.fnmatch(benchmark.name, pattern)
+        ]
+    return benchmarks
+
+
+def _autorange(benchmark: Benchmark, min_duration: float) -> int:
+    """
+    Return how many iterations of ``benchmark`` are needed to take at least ``min_duration``.
+    """
+    iterations = 1
+    while True:
+        elapsed = _time(benchmark, iterations)
+        if elapsed >= min_duration:
+            return iterations
+        iterations *= 10 if elapsed < min_duration / 10 else 2
+
+
+def _time(benchmark: Benchmark, iterations: int) -> float:
+    run = benchmark.run
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_benchmark(
+    benchmark_class: type[Benchmark], rounds: int = 5, min_duration: float = 0.2
+) -> dict[str, Any]:
+    """
+    Time ``benchmark_class`` and return its results, in seconds per iteration.
+    """
+    benchmark = benchmark_class()
+    benchmark.setup()
+    try:
+        iterations = _autorange(benchmark, min_duration)
+        timings = [_time(benchmark, iterations) / iterations for _ in range(rounds)]
+    finally:
+        benchmark.teardown()
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "rounds": rounds,
+        "iterations": iterations,
+    }
+
+
+def run(
+    pattern: Optional[str] = None,
+    rounds: int = 5,
+    min_duration: float = 0.2,
+    skip: Collection[str] = (),
+) -> dict[str, Any]:
+    """
+    Run the benchmarks whose name matches ``pattern``, and not in ``skip``, and return the results.
+    """
+    calibration = _calibrate(rounds, min_duration)
+    results: dict[str, Any] = {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "version": __version__,
+        "date": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(timespec="seconds"),
+        "benchmarks": {},
+    }
+    for benchmark in collect(pattern):
+        if benchmark.name in skip:
+            continue
+        results["benchmarks"][benchmark.name] = run_benchmark(
+            benchmark, rounds=rounds, min_duration=min_duration
+        )
+    # Calibrate again, the machine load, or its clock speed, might have changed in the meantime
+    calibration = min(calibration, _calibrate(rounds, min_duration))
+    results["calibration"] = calibration
+    for result in results["benchmarks"].values():
+        result["relative"] = result["min"] / calibration
+    return results
+
+
+def _calibrate(rounds: int, min_duration: float) -> float:
+    # The calibration is shared by all the benchmarks, time more rounds of it to reduce the noise
+    return float(run_benchmark(Calibration, rounds=3 * rounds, min_duration=min_duration)["min"])
+
+
+def save(results: dict[str, Any], path: pathlib.Path) -> None:
+    """
+    Save the benchmark ``results`` to ``path``.
+
+    The results already in ``path``, of the benchmarks which didn't run, are kept.
+    """
+    if path.exists():
+        benchmarks = load(path)["benchmarks"]
+        benchmarks.update(results["benchmarks"])
+        results = dict(results, benchmarks=benchmarks)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load(path: pathlib.Path) -> dict[str, Any]:
+    """
+    Load benchmark results from ``path``.
+    """
+    results: dict[str, Any] = json.loads(path.read_text())
+    return results
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 10.0
+) -> list[Regression]:
+    """
+    Return the benchmarks whose minimum time is over ``threshold`` percent slower than the baseline.
+
+    The minimum is compared, instead of the median, since it's the least affected by noise from
+    other processes running on the same machine. Timings relative to the calibration workload are
+    compared when both results have them.
+    """
+    regressions: list[Regression] = []
+    for name, result in sorted(current["benchmarks"].items()):
+        baseline_result = baseline["benchmarks"].get(name)
+        if baseline_result is None:
+            continue
+        regression = _regression(name, baseline_result, result)
+        if regression.change > threshold:
+            regressions.append(regression)
+    return regressions
+
+
+def format_comparison(baseline: dict[str, Any], current: dict[str, Any]) -> str:
+    """
+    Return a human readable table comparing ``current`` against ``baseline``.
+    """
+    lines = [f"{'Benchmark':<40} {'Baseline':>12} {'Current':>12} {'Change':>9}"]
+    for name, result in sorted(current["benchmarks"].items()):
+        baseline_result = baseline["benchmarks"].get(name)
+        if baseline_result is None:
+            lines.append(f"{name:<40} {'-':>12} {_format_time(result['min']):>12} {'new':>9}")
+            continue
+        change = _regression(name, baseline_result, result).change
+        lines.append(
+            f"{name:<40} {_format_time(baseline_result['min']):>12} "
+            f"{_format_time(result['min']):>12} {change:>+8.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def _regression(name: str, baseline: dict[str, Any], current: dict[str, Any]) -> Regression:
+    key = "relative" if "relative" in baseline and "relative" in current else "min"
+    return Regression(name, baseline[key], current[key])
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
@@ -0,0 +1,209 @@
+"""
+Utilities benchmarks.
+"""
+from __future__ import annotations
+
+import logging
+import pathlib
+import tempfile
+from typing import Any
+
+import polars as pl
+
+from mcookbook.benchmarks.abc import Benchmark
+from mcookbook.data import MarketGenerator
+from mcookbook.utils import expand_pairlist
+from mcookbook.utils import merge_dictionaries
+from mcookbook.utils import sanitize_dictionary
+from mcookbook.utils.cache import DiskCache
+from mcookbook.utils.logs import LogRecord
+from mcookbook.utils.logs import TTLFilter
+
+QUOTES = ("USDT", "BUSD", "BTC", "ETH")
+
+
+def make_symbols(count: int) -> list[str]:
+    """
+    Return ``count`` unique, deterministic, market symbols.
+    """
+    symbols: list[str] = []
+    idx = 0
+    while len(symbols) < count:
+        symbols.append(f"COIN{idx // len(QUOTES)}/{QUOTES[idx % len(QUOTES)]}")
+        idx += 1
+    return symbols
+
+
+def make_config_dict(width: int, depth: int) -> dict[str, Any]:
+    """
+    Return a nested configuration like dictionary, ``width`` keys wide and ``depth`` levels deep.
+    """
+    if depth == 0:
+        return {f"key{idx}": idx for idx in range(width)} | {"secret": "s3cr3t"}
+    return {f"section{idx}": make_config_dict(width, depth - 1) for idx in range(width)}
+
+
+class ExpandPairlist(Benchmark):
+    """
+    Expand 50 wildcards against 2,000 markets.
+    """
+
+    name = "utils.expand_pairlist"
+
+    def setup(self) -> None:
+        """
+        Build the markets and the wildcards.
+        """
+        self.markets = make_symbols(2000)
+        self.wildcards = [f"COIN{idx}[0-9]*/USDT" for idx in range(45)] + [
+            ".*/BTC",
+            ".*/ETH",
+            "COIN1.*/BUSD",
+            "COIN2.*/BUSD",
+            "UNKNOWN/USDT",
+        ]
+
+    def run(self) -> None:
+        """
+        Expand the wildcards.
+        """
+        expand_pairlist(self.wildcards, self.markets)
+
+
+class ExpandPairlistKeepInvalid(ExpandPairlist):
+    """
+    Expand 50 wildcards against 2,000 markets, keeping invalid pairs.
+    """
+
+    name = "utils.expand_pairlist_keep_invalid"
+
+    def run(self) -> None:
+        """
+        Expand the wildcards, keeping invalid pairs.
+        """
+        expand_pairlist(self.wildcards, self.markets, keep_invalid=True)
+
+
+class MergeDictionaries(Benchmark):
+    """
+    Merge large configuration dictionaries.
+    """
+
+    name = "utils.merge_dictionaries"
+
+    def setup(self) -> None:
+        """
+        Build the configuration dictionary.
+        """
+        self.source = make_config_dict(width=12, depth=3)
+
+    def run(self) -> None:
+        """
+        Merge the configuration dictionary twice.
+        """
+        merge_dictionaries({}, self.source, self.source)
+
+
+class SanitizeDictionary(Benchmark):
+    """
+    Sanitize a large configuration dictionary.
+    """
+
+    name = "utils.sanitize_dictionary"
+
+    def setup(self) -> None:
+        """
+        Build the configuration dictionary.
+        """
+        self.source = make_config_dict(width=12, depth=3)
+
+    def run(self) -> None:
+        """
+        Sanitize the configuration dictionary.
+        """
+        sanitize_dictionary(self.source, ("key", "secret", "password", "uid"))
+
+
+class TTLFilterThroughput(Benchmark):
+    """
+    Filter 1,000 log records, half of them throttled by ``once_every_secs``.
+    """
+
+    name = "utils.logs.ttl_filter"
+
+    def setup(self) -> None:
+        """
+        Build the log records, and the filter.
+        """
+        self.filter = TTLFilter()
+        self.records: list[logging.LogRecord] = []
+        for idx in range(1000):
+            record = LogRecord(
+                name="mcookbook.benchmark",
+                level=logging.INFO,
+                pathname=__file__,
+                lineno=idx % 10,
+                msg="Message %s",
+                args=(idx % 10,),
+                exc_info=None,
+            )
+            record.wipe_line = False
+            record.once_every_secs = 60 if idx % 2 else 0
+            self.records.append(record)
+
+    def run(self) -> None:
+        """
+        Filter the log records.
+        """
+        filter_record = self.filter.filter
+        for record in self.records:
+            filter_record(record)
+
+
+def rolling_features(candles: pl.DataFrame, windows: tuple[int, ...]) -> pl.DataFrame:
+    """
+    Return rolling returns and volatility features of ``candles``.
+    """
+    returns = pl.col("close").pct_change().over("symbol")
+    return candles.select(
+        "symbol",
+        "timestamp",
+        *(
+            expr
+            for window in windows
+            for expr in (
+                returns.rolling_mean(window).over("symbol").alias(f"mean_{window}"),
+                returns.rolling_std(window).over("symbol").alias(f"std_{window}"),
+            )
+        ),
+    )
+
+
+class MemoizedFeatures(Benchmark):
+    """
+    Load the cached rolling features of 100 pairs of 10,000 candles, keyed by the candles content.
+    """
+
+    name = "utils.cache.memoized_features"
+
+    def setup(self) -> None:
+        """
+        Generate the candles, and cache their features.
+        """
+        self.tempdir = tempfile.TemporaryDirectory()
+        generator = MarketGenerator(seed=1)
+        self.candles = generator.ohlcv(generator.symbols(100), candles=10_000)
+        self.features = DiskCache(pathlib.Path(self.tempdir.name)).memoize(rolling_features)
+        self.features(self.candles, (10, 50, 200))
+
+    def run(self) -> None:
+        """
+        Load the cached features.
+        """
+        self.features(self.candles, (10, 50, 200))
+
+    def teardown(self) -> None:
+        """
+        Remove the cache.
+        """
+        self.tempdir.cleanup()
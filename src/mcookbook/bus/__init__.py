@@ -0,0 +1,36 @@
+"""
+In-process event bus.
+"""
+from __future__ import annotations
+
+from .bus import BLOCK
+from .bus import CONFLATE
+from .bus import DROP_OLDEST
+from .bus import EventBus
+from .bus import OVERFLOW_POLICIES
+from .bus import Subscription
+from .topics import BOOKS
+from .topics import CANDLES
+from .topics import OrderEvent
+from .topics import ORDERS
+from .topics import PAIRLIST
+from .topics import PairListEvent
+from .topics import TICKERS
+from .topics import Topic
+
+__all__ = [
+    "BLOCK",
+    "BOOKS",
+    "CANDLES",
+    "CONFLATE",
+    "DROP_OLDEST",
+    "EventBus",
+    "ORDERS",
+    "OrderEvent",
+    "OVERFLOW_POLICIES",
+    "PAIRLIST",
+    "PairListEvent",
+    "Subscription",
+    "TICKERS",
+    "Topic",
+]
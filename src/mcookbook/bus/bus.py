@@ -0,0 +1,281 @@
+"""
+In-process publish/subscribe event bus.
+
+Every subscriber gets its own bounded queue, so a slow consumer only ever affects its own
+queue. What happens when that queue is full is the subscriber's overflow policy:
+
+``drop_oldest``
+    The oldest queued event is dropped. For consumers which can skip events, like loggers.
+``conflate``
+    Only the latest event, per ``key`` when given, is kept. For consumers which only care about
+    the current state, like the live state publisher.
+``block``
+    The publisher waits for room in the queue. For consumers which must see every event, like
+    order handling. Those must keep up, since they slow down the publisher.
+
+Events are handed to the non blocking subscribers first, so a full blocking subscriber never
+delays them.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+from collections.abc import Callable
+from collections.abc import Hashable
+from typing import Any
+from typing import Generic
+from typing import Optional
+
+from mcookbook.bus.topics import EventT
+from mcookbook.bus.topics import Topic
+from mcookbook.exceptions import SubscriptionClosed
+from mcookbook.utils.metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+CONFLATE = "conflate"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, CONFLATE, BLOCK)
+
+EVENTS_PUBLISHED = REGISTRY.counter(
+    "mcookbook_bus_events_published_total", "Events published to the bus.", labelnames=("topic",)
+)
+EVENTS_DROPPED = REGISTRY.counter(
+    "mcookbook_bus_events_dropped_total",
+    "Events dropped, or conflated, by full subscriber queues.",
+    labelnames=("topic", "subscriber"),
+)
+
+
+class Subscription(Generic[EventT]):
+    """
+    A subscriber's bounded queue of the events published to a topic.
+
+    Consume the events with :meth:`get`, or by iterating the subscription, until it's closed.
+
+    :param topic: The subscribed topic
+    :param name: The subscriber name, used in logs and metrics
+    :param maxsize: The maximum number of queued events
+    :param policy: The overflow policy, one of :data:`OVERFLOW_POLICIES`
+    :param key: With the ``conflate`` policy, keep the latest event of each key, instead of
+        just the latest event
+    """
+
+    def __init__(
+        self,
+        topic: Topic[EventT],
+        name: str,
+        maxsize: int = 1024,
+        policy: str = DROP_OLDEST,
+        key: Optional[Callable[[EventT], Hashable]] = None,
+    ) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"The overflow policy {policy!r} is not valid. Must be one of {OVERFLOW_POLICIES}"
+            )
+        if maxsize < 1:
+            raise ValueError("The subscription maxsize must be positive")
+        if key is not None and policy != CONFLATE:
+            raise ValueError(f"A key is only used by the {CONFLATE!r} overflow policy")
+        self.topic = topic
+        self.name = name
+        self.maxsize = 1 if policy == CONFLATE and key is None else maxsize
+        self.policy = policy
+        self.key = key
+        self.closed = False
+        self.dropped = 0
+        self._events: collections.deque[EventT] = collections.deque()
+        self._conflated: dict[Hashable, EventT] = {}
+        self._getter: Optional[asyncio.Future[None]] = None
+        self._putters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._dropped = EVENTS_DROPPED.labels(topic.name, name)
+
+    def __repr__(self) -> str:
+        """
+        Return the subscription representation, including its topic and name.
+        """
+        return f"Subscription({self.topic.name!r}, {self.name!r}, policy={self.policy!r})"
+
+    def __len__(self) -> int:
+        """
+        Return the number of queued events.
+        """
+        return len(self._conflated) if self.key is not None else len(self._events)
+
+    def full(self) -> bool:
+        """
+        Return whether the queue is full.
+        """
+        return len(self) >= self.maxsize
+
+    @staticmethod
+    def _wake(waiter: Optional[asyncio.Future[None]]) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        self._dropped.inc()
+
+    def put_nowait(self, event: EventT) -> bool:
+        """
+        Queue ``event``, applying the overflow policy when the queue is full.
+
+        Returns ``False`` when the queue is full, and the policy is ``block``.
+        """
+        if self.closed:
+            return True
+        if self.key is not None:
+            key = self.key(event)
+            if key in self._conflated:
+                self._drop()
+            elif self.full():
+                # Drop the event of the longest queued key
+                del self._conflated[next(iter(self._conflated))]
+                self._drop()
+            self._conflated[key] = event
+        elif not self.full():
+            self._events.append(event)
+        elif self.policy == BLOCK:
+            return False
+        else:
+            self._events.popleft()
+            self._events.append(event)
+            self._drop()
+        self._wake(self._getter)
+        return True
+
+    async def put(self, event: EventT) -> None:
+        """
+        Queue ``event``, waiting for room in the queue with the ``block`` policy.
+        """
+        while not self.put_nowait(event):
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            finally:
+                if putter in self._putters:
+                    self._putters.remove(putter)
+
+    def get_nowait(self) -> Optional[EventT]:
+        """
+        Return the next event, if any.
+        """
+        event: Optional[EventT] = None
+        if self.key is not None:
+            if self._conflated:
+                event = self._conflated.pop(next(iter(self._conflated)))
+        elif self._events:
+            event = self._events.popleft()
+        if event is not None and self._putters:
+            self._wake(self._putters.popleft())
+        return event
+
+    async def get(self) -> EventT:
+        """
+        Wait for, and return, the next event.
+
+        Raises :class:`~mcookbook.exceptions.SubscriptionClosed` once the subscription is closed,
+        and its queue drained.
+        """
+        while True:
+            event = self.get_nowait()
+            if event is not None:
+                return event
+            if self.closed:
+                raise SubscriptionClosed(f"The {self!r} is closed")
+            self._getter = asyncio.get_running_loop().create_future()
+            try:
+                await self._getter
+            finally:
+                self._getter = None
+
+    def close(self) -> None:
+        """
+        Stop queueing events. The already queued events can still be consumed.
+        """
+        self.closed = True
+        self._wake(self._getter)
+        while self._putters:
+            self._wake(self._putters.popleft())
+
+    def __aiter__(self) -> Subscription[EventT]:
+        """
+        Return the subscription, iterating its events until it's closed.
+        """
+        return self
+
+    async def __anext__(self) -> EventT:
+        """
+        Return the next event, stopping the iteration once the subscription is closed.
+        """
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration from None
+
+
+class EventBus:
+    """
+    In-process publish/subscribe event bus, with a bounded queue per subscriber.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, list[Subscription[Any]]] = {}
+
+    def subscribe(
+        self,
+        topic: Topic[EventT],
+        name: str,
+        maxsize: int = 1024,
+        policy: str = DROP_OLDEST,
+        key: Optional[Callable[[EventT], Hashable]] = None,
+    ) -> Subscription[EventT]:
+        """
+        Subscribe to ``topic``. See :class:`Subscription` for the parameters.
+        """
+        subscription = Subscription(topic, name, maxsize=maxsize, policy=policy, key=key)
+        subscriptions = self._subscriptions.setdefault(topic.name, [])
+        # Non blocking subscribers first, so they get the events without waiting
+        subscriptions.append(subscription)
+        subscriptions.sort(key=lambda subscription: subscription.policy == BLOCK)
+        log.debug("Subscribed %r", subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription[Any]) -> None:
+        """
+        Close, and remove, ``subscription``.
+        """
+        subscription.close()
+        subscriptions = self._subscriptions.get(subscription.topic.name, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+    def subscriptions(self, topic: Topic[Any]) -> list[Subscription[Any]]:
+        """
+        Return the subscriptions to ``topic``.
+        """
+        return list(self._subscriptions.get(topic.name, ()))
+
+    async def publish(self, topic: Topic[EventT], event: EventT) -> None:
+        """
+        Publish ``event`` to the ``topic`` subscribers.
+
+        Only waits while a ``block`` subscriber's queue is full.
+        """
+        EVENTS_PUBLISHED.labels(topic.name).inc()
+        for subscription in tuple(self._subscriptions.get(topic.name, ())):
+            if not subscription.put_nowait(event):
+                await subscription.put(event)
+
+    def close(self) -> None:
+        """
+        Close all the subscriptions.
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions.clear()
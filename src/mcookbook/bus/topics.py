@@ -0,0 +1,65 @@
+"""
+Event bus topics, and the events published to them.
+
+The market data events are those recorded, and replayed, by :mod:`mcookbook.replay`.
+"""
+from __future__ import annotations
+
+from typing import Any
+from typing import Generic
+from typing import NamedTuple
+from typing import TypeVar
+
+from mcookbook.replay.events import BookEvent
+from mcookbook.replay.events import CandleEvent
+from mcookbook.replay.events import TickersEvent
+
+EventT = TypeVar("EventT")
+
+
+class PairListEvent(NamedTuple):
+    """
+    The refreshed pair list, and the pairs added to, and removed from, the previous one.
+    """
+
+    timestamp: int
+    pairs: list[str]
+    added: list[str]
+    removed: list[str]
+
+
+class OrderEvent(NamedTuple):
+    """
+    A created, or updated, ccxt shaped order.
+    """
+
+    timestamp: int
+    order: dict[str, Any]
+
+
+class Topic(Generic[EventT]):
+    """
+    A typed event bus topic.
+
+    :param name: The topic name, used in logs and metrics
+    :param event_type: The type of the events published to the topic
+    """
+
+    __slots__ = ("name", "event_type")
+
+    def __init__(self, name: str, event_type: type[EventT]) -> None:
+        self.name = name
+        self.event_type = event_type
+
+    def __repr__(self) -> str:
+        """
+        Return the topic representation, including its name and event type.
+        """
+        return f"Topic({self.name!r}, {self.event_type.__name__})"
+
+
+CANDLES: Topic[CandleEvent] = Topic("candles", CandleEvent)
+TICKERS: Topic[TickersEvent] = Topic("tickers", TickersEvent)
+BOOKS: Topic[BookEvent] = Topic("books", BookEvent)
+PAIRLIST: Topic[PairListEvent] = Topic("pairlist", PairListEvent)
+ORDERS: Topic[OrderEvent] = Topic("orders", OrderEvent)
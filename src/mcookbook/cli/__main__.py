@@ -4,18 +4,31 @@ CLI entry point.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import datetime
 import logging
 import multiprocessing
 import pathlib
 import sys
 import traceback
+from typing import Any
 from typing import cast
 
 from pydantic import ValidationError
 
 from mcookbook import __version__
+from mcookbook.cli import archive
+from mcookbook.cli import backtest
+from mcookbook.cli import bench
+from mcookbook.cli import gaps
+from mcookbook.cli import hyperopt
 from mcookbook.cli import live
 from mcookbook.cli import notebook
+from mcookbook.cli import replay
+from mcookbook.cli import robustness
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.config.data import DataConfig
+from mcookbook.config.event_loop import EVENT_LOOP_BACKENDS
 from mcookbook.config.exchange import ExchangeConfig
 from mcookbook.config.live import LiveConfig
 from mcookbook.config.notebook import NotebookConfig
@@ -24,6 +37,10 @@ from mcookbook.pairlist.static import StaticPairList
 from mcookbook.utils.logs import setup_cli_logging
 from mcookbook.utils.logs import setup_logfile_logging
 from mcookbook.utils.logs import SORTED_LEVEL_NAMES
+from mcookbook.utils.profiling import profile
+from mcookbook.utils.profiling import Profiler
+from mcookbook.utils.profiling import PROFILERS
+from mcookbook.utils.profiling import SamplingProfiler
 
 log = logging.getLogger(__name__)
 
@@ -90,13 +107,111 @@ def main(argv: list[str] | None = None) -> None:
         default=None,
         help="Logs file logging level. Default: info",
     )
+    event_loop_params = parser.add_argument_group(
+        title="Event Loop", description="Runtime event loop configuration"
+    )
+    event_loop_params.add_argument(
+        "--event-loop",
+        choices=EVENT_LOOP_BACKENDS,
+        default=None,
+        help=(
+            "The event loop backend to use. 'auto' uses uvloop when installed, asyncio otherwise. "
+            "Default: auto"
+        ),
+    )
+    event_loop_params.add_argument(
+        "--event-loop-debug",
+        action="store_true",
+        default=None,
+        help="Run the event loop in debug mode, logging callbacks slower than the configured threshold",
+    )
+    event_loop_params.add_argument(
+        "--event-loop-watchdog",
+        action="store_true",
+        default=None,
+        help=(
+            "Watch the event loop and log the stack of any code blocking it for longer than the "
+            "configured threshold"
+        ),
+    )
+    profiling_params = parser.add_argument_group(
+        title="Profiling",
+        description=(
+            "Run the command under a profiler. The results are written on exit or, where supported, "
+            "when the process receives the SIGUSR1 signal"
+        ),
+    )
+    profiling_params.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Profile the command",
+    )
+    profiling_params.add_argument(
+        "--profile-mode",
+        choices=list(PROFILERS),
+        default="sampling",
+        help=(
+            "'sampling' writes collapsed stacks, prefixed with the running asyncio task, ready for "
+            "flame graph tools. 'deterministic' writes cProfile statistics. Default: sampling"
+        ),
+    )
+    profiling_params.add_argument(
+        "--profile-output",
+        type=pathlib.Path,
+        default=None,
+        help="Path to the profiling results file. Default: <basedir>/profiles/<command>-<timestamp>.<ext>",
+    )
+    profiling_params.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="The sampling profiler interval, in seconds. Default: 0.005",
+    )
     subparsers = parser.add_subparsers(title="Commands", dest="subparser")
     live_parser = subparsers.add_parser("live", help="Run Live")
     notebook_parser = subparsers.add_parser("notebook", help="Run a provided jupyter notebook")
+    backtest_parser = subparsers.add_parser(
+        "backtest", help="Backtest a strategy over the stored candles of the pair list"
+    )
+    hyperopt_parser = subparsers.add_parser(
+        "hyperopt", help="Optimize a strategy parameters by backtesting many parameter combinations"
+    )
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help=(
+            "Replay the stored candles, and recorded events, through the live pair list, "
+            "indicators and strategy code paths"
+        ),
+    )
+    robustness_parser = subparsers.add_parser(
+        "robustness",
+        help="Run a walk-forward analysis of a strategy and a Monte Carlo analysis of its trades",
+    )
+    gaps_parser = subparsers.add_parser(
+        "gaps", help="Find, and optionally repair, the missing and duplicated stored candles"
+    )
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help=(
+            "Move the older stored candles to the compressed archive, and downsample the archived "
+            "candles according to the retention rules"
+        ),
+    )
+    bench_parser = subparsers.add_parser(
+        "bench", help="Run the performance benchmarks and compare them against a baseline"
+    )
 
     # Setup each sub-parser
     live.setup_parser(live_parser)
     notebook.setup_parser(notebook_parser)
+    backtest.setup_parser(backtest_parser)
+    hyperopt.setup_parser(hyperopt_parser)
+    robustness.setup_parser(robustness_parser)
+    replay.setup_parser(replay_parser)
+    gaps.setup_parser(gaps_parser)
+    archive.setup_parser(archive_parser)
+    bench.setup_parser(bench_parser)
 
     # Parse the CLI arguments
     args: argparse.Namespace = parser.parse_args(args=argv)
@@ -119,7 +234,7 @@ def main(argv: list[str] | None = None) -> None:
         )
         default_config_contents = default_config.json(
             indent=2,
-            exclude={"logging": ...},
+            exclude={"logging": ..., "event_loop": ..., "sharding": ..., "metrics": ...},
         )
         default_config_file = basedir / "default.json"
         if default_config_file.exists():
@@ -132,6 +247,12 @@ def main(argv: list[str] | None = None) -> None:
             status=0, message=f"Runtime directory structure created at {basedir.resolve()}\n"
         )
 
+    if args.subparser == "bench":
+        # The benchmarks don't need any configuration. They also log a lot, hence the higher
+        # default logging level.
+        setup_cli_logging(log_level=args.log_level or "warning")
+        parser.exit(status=bench.main(args))
+
     if args.basedir is not None:
         args.basedir = args.basedir.resolve()
     else:
@@ -155,12 +276,16 @@ def main(argv: list[str] | None = None) -> None:
             )
         args.config_files.append(default_config_file)
 
-    config: LiveConfig | NotebookConfig
+    config: LiveConfig | NotebookConfig | BacktestConfig | DataConfig
     try:
         if args.subparser == "live":
             config = LiveConfig.parse_files(*args.config_files)
         elif args.subparser == "notebook":
             config = NotebookConfig.parse_files(*args.config_files)
+        elif args.subparser in ("backtest", "hyperopt", "replay", "robustness"):
+            config = BacktestConfig.parse_files(*args.config_files)
+        elif args.subparser in ("gaps", "archive"):
+            config = DataConfig.parse_files(*args.config_files)
         else:
             parser.exit(
                 status=1,
@@ -201,17 +326,51 @@ def main(argv: list[str] | None = None) -> None:
     # Set the configuration private attributes
     config._basedir = args.basedir  # pylint: disable=protected-access
 
+    # CLI event loop overrides
+    if args.event_loop is not None:
+        config.event_loop.backend = args.event_loop
+    if args.event_loop_debug is not None:
+        config.event_loop.debug = args.event_loop_debug
+    if args.event_loop_watchdog is not None:
+        config.event_loop.watchdog.enabled = args.event_loop_watchdog
+
     try:
         if args.subparser == "live":
             live.post_process_argparse_parsed_args(parser, args, cast(LiveConfig, config))
         elif args.subparser == "notebook":
             notebook.post_process_argparse_parsed_args(parser, args, cast(NotebookConfig, config))
+        elif args.subparser == "backtest":
+            backtest.post_process_argparse_parsed_args(parser, args, cast(BacktestConfig, config))
+        elif args.subparser == "hyperopt":
+            hyperopt.post_process_argparse_parsed_args(parser, args, cast(BacktestConfig, config))
+        elif args.subparser == "replay":
+            replay.post_process_argparse_parsed_args(parser, args, cast(BacktestConfig, config))
+        elif args.subparser == "robustness":
+            robustness.post_process_argparse_parsed_args(parser, args, cast(BacktestConfig, config))
+        elif args.subparser == "gaps":
+            gaps.post_process_argparse_parsed_args(parser, args, cast(DataConfig, config))
+        elif args.subparser == "archive":
+            archive.post_process_argparse_parsed_args(parser, args, cast(DataConfig, config))
     except AttributeError:
         # process_argparse_parsed_args was not implemented
         pass
 
+    profiling_ctx: contextlib.AbstractContextManager[Any] = contextlib.nullcontext()
+    if args.profile:
+        profiler: Profiler
+        if args.profile_mode == "sampling":
+            profiler = SamplingProfiler(interval=args.profile_interval)
+        else:
+            profiler = PROFILERS[args.profile_mode]()
+        profile_output: pathlib.Path = args.profile_output or args.basedir.joinpath(
+            "profiles",
+            f"{args.subparser}-{datetime.datetime.now():%Y%m%d%H%M%S}.{profiler.extension}",
+        )
+        profiling_ctx = profile(profiler, profile_output)
+
     try:
-        args.func(config)
+        with profiling_ctx:
+            args.func(config)
     except MCookBookSystemExit as exc:
         parser.exit(status=1, message=f"Error: {exc}")
     except Exception:  # pylint: disable=broad-except
@@ -9,6 +9,12 @@ import logging
 import signal
 import sys
 from typing import Any
+from typing import Optional
+
+from mcookbook.config.data import DataConfig
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges import Exchange
 
 log = logging.getLogger(__name__)
 
@@ -58,3 +64,29 @@ class CLIService(metaclass=abc.ABCMeta):
         """
         Implement this method to run any async tasks on termination.
         """
+
+
+class DataService(CLIService):
+    """
+    CLI service abstract class, for the services working on the stored exchange data.
+    """
+
+    def __init__(self, config: DataConfig) -> None:
+        self.config = config
+        self.exchange = Exchange.resolved(config)
+        synthetic = config.synthetic_markets is not None
+        self.store = CandleStore(
+            config.basedir / "data", "synthetic" if synthetic else config.exchange.name
+        )
+
+    async def _load_markets(self) -> None:
+        markets: Optional[dict[str, Any]] = self.store.load_markets()
+        count = self.config.synthetic_markets
+        if count is not None:
+            if markets is None or len(markets) != count:
+                markets = MarketGenerator().markets(count)
+                self.store.save_markets(markets)
+        elif markets is None:
+            markets = await self.exchange.get_markets()
+            self.store.save_markets(markets)
+        self.exchange.set_markets(markets)
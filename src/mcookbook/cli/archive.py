@@ -0,0 +1,106 @@
+"""
+Candle archive service.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from mcookbook.cli.abc import CLIService
+from mcookbook.config.data import DataConfig
+from mcookbook.data import apply_retention
+from mcookbook.data import archive_candles
+from mcookbook.data import CandleArchive
+from mcookbook.data import CandleStore
+from mcookbook.utils import eventloop
+from mcookbook.utils.clock import get_clock
+
+log = logging.getLogger(__name__)
+
+DAY = 86_400_000
+
+
+class ArchiveService(CLIService):
+    """
+    Move the older stored candles to the compressed archive, and apply the retention rules.
+    """
+
+    def __init__(self, config: DataConfig) -> None:
+        self.config = config
+        self.store = CandleStore(config.basedir / "data", config.exchange.name)
+        self.archive = CandleArchive(
+            config.basedir / "archive",
+            config.exchange.name,
+            compression_level=config.archive.compression_level,
+        )
+
+    def _run(self) -> None:
+        config = self.config.archive
+        now = int(get_clock().time() * 1000)
+        size = self.archive.nbytes
+        moved = archive_candles(self.store, self.archive, now - config.hot_days * DAY)
+        log.info(
+            "Archived %d candles older than %d days, %.1f MiB",
+            moved,
+            config.hot_days,
+            (self.archive.nbytes - size) / 2**20,
+        )
+        if not config.retention:
+            return
+        downsampled = apply_retention(
+            self.archive,
+            [(rule.age_days * DAY, rule.timeframe) for rule in config.retention],
+            now,
+        )
+        log.info(
+            "Downsampled %d archived candles. The archive now takes %.1f MiB",
+            downsampled,
+            self.archive.nbytes / 2**20,
+        )
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._run)
+
+
+async def _main(config: DataConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = ArchiveService(config)
+    await service.run()
+
+
+def main(config: DataConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    parser.add_argument(
+        "--hot-days",
+        type=int,
+        default=None,
+        help="Archive the stored candles older than this number of days. Default: 90",
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: DataConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    if args.hot_days is not None:
+        if args.hot_days < 1:
+            parser.exit(status=1, message="The --hot-days must be positive\n")
+        config.archive.hot_days = args.hot_days
@@ -0,0 +1,236 @@
+"""
+Backtest service.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import logging
+import pathlib
+
+import ccxt
+import polars as pl
+
+from mcookbook.backtesting import Backtester
+from mcookbook.backtesting import BacktestResult
+from mcookbook.cli.abc import DataService
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.data import MarketGenerator
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.strategies import Strategy
+from mcookbook.utils import eventloop
+from mcookbook.utils.clock import get_clock
+
+log = logging.getLogger(__name__)
+
+# The default synthetic data time range, when none is configured
+SYNTHETIC_DEFAULT_DAYS = 30
+
+
+class BacktestService(DataService):
+    """
+    Backtest service implementation.
+    """
+
+    config: BacktestConfig
+
+    def _generate_synthetic_candles(self, pairs: list[str]) -> None:
+        config = self.config
+        end = config.end_ms
+        if end is None:
+            today = get_clock().now().replace(hour=0, minute=0, second=0, microsecond=0)
+            end = int(today.timestamp() * 1000)
+        start = config.start_ms
+        if start is None:
+            start = end - SYNTHETIC_DEFAULT_DAYS * 86_400_000
+        interval = ccxt.Exchange.parse_timeframe(config.timeframe) * 1000
+        candles = (end - start) // interval
+        missing = [pair for pair in pairs if not self.store.has_candles(pair, config.timeframe)]
+        if not missing:
+            return
+        log.info("Generating %d synthetic candles for %d pairs", candles, len(missing))
+        generator = MarketGenerator()
+        for pair in missing:
+            frame = generator.ohlcv(pair, timeframe=config.timeframe, candles=candles, since=start)
+            self.store.save(pair, config.timeframe, frame)
+
+    async def resolve_pairs(self) -> list[str]:
+        """
+        Resolve the pair list and return the pairs with stored candles.
+        """
+        await self._load_markets()
+        await self.exchange.pairlist_manager.refresh_pairlist()
+        pairs = self.exchange.pairlist_manager.pairlist
+        if self.config.synthetic_markets is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._generate_synthetic_candles, pairs
+            )
+        available: list[str] = []
+        for pair in pairs:
+            if self.store.has_candles(pair, self.config.timeframe):
+                available.append(pair)
+            else:
+                log.warning(
+                    "No %s candles stored for %s. Skipping it.", self.config.timeframe, pair
+                )
+        if not available:
+            raise MCookBookSystemExit(
+                f"None of the pairs in the pair list have {self.config.timeframe} candles stored "
+                f"in {self.store.path}"
+            )
+        return available
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        pairs = await self.resolve_pairs()
+        backtester = Backtester(
+            self.store,
+            self.config.strategy,
+            self.config.timeframe,
+            start=self.config.start_ms,
+            end=self.config.end_ms,
+            fee=self.config.fee,
+            slippage=self.config.slippage,
+            workers=self.config.workers,
+        )
+        log.info(
+            "Backtesting %s over %d pairs using %d workers",
+            self.config.strategy,
+            len(pairs),
+            backtester.workers,
+        )
+        result = await asyncio.get_running_loop().run_in_executor(None, backtester.run, pairs)
+        self.report(result)
+        if self.config.export is not None:
+            export(result.trades, self.config.export)
+            log.info("Exported the trades to %s", self.config.export)
+
+    def report(self, result: BacktestResult) -> None:
+        """
+        Log the backtest results.
+        """
+        summary = result.summary
+        with pl.Config(tbl_rows=-1, tbl_hide_dataframe_shape=True, float_precision=4):
+            log.info("Results per pair:\n%s", result.pairs.sort("profit_total", descending=True))
+        log.info(
+            "Total: %d trades, %.2f%% win rate, %.4f profit, %.4f max drawdown, in stake units. "
+            "%d candles backtested in %.2f seconds.",
+            summary["trades"],
+            summary["win_rate"] * 100,
+            summary["profit_total"],
+            summary["max_drawdown"],
+            summary["candles"],
+            result.duration,
+        )
+
+    async def await_closed(self) -> None:
+        """
+        Run shutdown routines.
+        """
+        await self.exchange.api.close()
+        return await super().await_closed()
+
+
+def export(trades: pl.DataFrame, path: pathlib.Path) -> None:
+    """
+    Export the backtest ``trades`` to ``path``, as CSV or, for any other extension, parquet.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".csv":
+        trades.write_csv(path)
+    else:
+        trades.write_parquet(path)
+
+
+async def _main(config: BacktestConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = BacktestService(config)
+    await service.run()
+
+
+def main(config: BacktestConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def _date(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=datetime.timezone.utc)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help=(
+            "The strategy to backtest, either a class name or 'package.module:ClassName'. "
+            "Overrides the configured one, with its default parameters"
+        ),
+    )
+    parser.add_argument("--timeframe", default=None, help="The candles timeframe. Default: 5m")
+    parser.add_argument(
+        "--start", type=_date, default=None, help="Backtest from this UTC date, YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--end", type=_date, default=None, help="Backtest until this UTC date, YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--fee", type=float, default=None, help="The fee ratio paid on each entry and exit"
+    )
+    parser.add_argument(
+        "--slippage",
+        type=float,
+        default=None,
+        help="The price ratio lost to slippage on each entry and exit",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes backtesting pairs in parallel. Default: number of CPUs",
+    )
+    parser.add_argument(
+        "--synthetic-markets",
+        type=int,
+        default=None,
+        metavar="COUNT",
+        help=(
+            "Backtest against COUNT deterministic synthetic markets, and their candles, generated "
+            "under <basedir>/data/synthetic when missing, instead of the stored exchange data"
+        ),
+    )
+    parser.add_argument(
+        "--export",
+        type=pathlib.Path,
+        default=None,
+        help="Export the trades to this file, as CSV for the .csv extension, parquet otherwise",
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: BacktestConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    if args.strategy is not None:
+        config.strategy = Strategy.resolved({"name": args.strategy})
+    for option in ("timeframe", "start", "end", "fee", "slippage", "workers"):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(config, option, value)
+    if args.synthetic_markets is not None:
+        if args.synthetic_markets < 1:
+            parser.exit(status=1, message="The number of synthetic markets must be positive\n")
+        config._synthetic_markets = args.synthetic_markets
+    config._export = args.export
@@ -0,0 +1,115 @@
+"""
+Benchmarks command.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+
+from mcookbook.benchmarks import runner
+
+log = logging.getLogger(__name__)
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    Run the benchmarks, or compare results, returning the process exit code.
+    """
+    if args.bench_action == "compare":
+        baseline = runner.load(args.baseline)
+        current = runner.load(args.current)
+    else:
+        skip: set[str] = set()
+        if args.missing:
+            if args.save is None:
+                log.error("--missing requires --save")
+                return 1
+            if args.save.exists():
+                skip.update(runner.load(args.save)["benchmarks"])
+        benchmarks = [
+            benchmark for benchmark in runner.collect(args.filter) if benchmark.name not in skip
+        ]
+        if not benchmarks and skip:
+            log.warning("All the benchmarks are already in %s", args.save)
+            return 0
+        if not benchmarks:
+            log.error("No benchmarks matching %r", args.filter)
+            return 1
+        log.warning("Running %d benchmarks", len(benchmarks))
+        current = runner.run(
+            args.filter, rounds=args.rounds, min_duration=args.min_duration, skip=skip
+        )
+        if args.save is not None:
+            runner.save(current, args.save)
+            log.info("Saved benchmark results to %s", args.save)
+        if args.compare is None:
+            print(runner.format_comparison({"benchmarks": {}}, current))
+            return 0
+        baseline = runner.load(args.compare)
+
+    print(runner.format_comparison(baseline, current))
+    regressions = runner.compare(baseline, current, threshold=args.threshold)
+    if not regressions:
+        return 0
+    for regression in regressions:
+        log.error(
+            "Benchmark %s regressed %.1f%%, over the %.1f%% threshold",
+            regression.name,
+            regression.change,
+            args.threshold,
+        )
+    return 1
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    actions = parser.add_subparsers(title="Actions", dest="bench_action")
+    run_parser = actions.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument(
+        "-k",
+        "--filter",
+        default=None,
+        help="Only run the benchmarks whose name matches this shell-style pattern",
+    )
+    run_parser.add_argument(
+        "--rounds", type=int, default=5, help="Number of timing rounds. Default: 5"
+    )
+    run_parser.add_argument(
+        "--min-duration",
+        type=float,
+        default=0.2,
+        help="Minimum duration, in seconds, of each timing round. Default: 0.2",
+    )
+    run_parser.add_argument(
+        "--save",
+        type=pathlib.Path,
+        default=None,
+        help="Save the results to this JSON file, keeping the results of the benchmarks not run",
+    )
+    run_parser.add_argument(
+        "--missing",
+        action="store_true",
+        default=False,
+        help="Only run the benchmarks missing from the --save file",
+    )
+    run_parser.add_argument(
+        "--compare",
+        type=pathlib.Path,
+        default=None,
+        help="Compare the results against this JSON baseline",
+    )
+    compare_parser = actions.add_parser("compare", help="Compare two benchmark results files")
+    compare_parser.add_argument("baseline", type=pathlib.Path, help="The baseline JSON file")
+    compare_parser.add_argument("current", type=pathlib.Path, help="The JSON file to compare")
+    for action_parser in (run_parser, compare_parser):
+        action_parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Fail when a benchmark is slower than the baseline by over this percentage. Default: 10",
+        )
+    parser.set_defaults(func=main, bench_action="run", filter=None, rounds=5, min_duration=0.2)
+    parser.set_defaults(save=None, missing=False, compare=None, threshold=10.0)
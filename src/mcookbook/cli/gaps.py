@@ -0,0 +1,145 @@
+"""
+Stored candles gaps service.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+
+import polars as pl
+
+from mcookbook.cli.abc import DataService
+from mcookbook.cli.backtest import _date
+from mcookbook.config.data import DataConfig
+from mcookbook.data import repair_gaps
+from mcookbook.data import scan_gaps
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.utils import eventloop
+
+log = logging.getLogger(__name__)
+
+
+class GapsService(DataService):
+    """
+    Find, and optionally repair, the missing and duplicated stored candles.
+    """
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        config = self.config
+        stored = self.store.stored_timeframes()
+        if config.timeframe not in stored:
+            raise MCookBookSystemExit(
+                f"No {config.timeframe} candles stored in {self.store.path}. Stored timeframes: "
+                f"{', '.join(stored) or 'none'}"
+            )
+        gaps = scan_gaps(self.store, config.timeframe, start=config.start_ms, end=config.end_ms)
+        self.report(gaps)
+        if not config.repair or gaps.is_empty():
+            return
+        await self._load_markets()
+        filled = await repair_gaps(
+            self.store,
+            self.exchange.api,
+            config.timeframe,
+            gaps,
+            limit=config.gaps.fetch_limit,
+            concurrency=config.gaps.concurrency,
+        )
+        log.info("Stored %d missing candles", sum(filled.values()))
+        self.report(
+            scan_gaps(
+                self.store, config.timeframe, list(filled), start=config.start_ms, end=config.end_ms
+            )
+        )
+
+    def report(self, gaps: pl.DataFrame) -> None:
+        """
+        Log the gaps found.
+        """
+        if gaps.is_empty():
+            log.info("No gaps found in the stored %s candles", self.config.timeframe)
+            return
+        summary = (
+            gaps.group_by("pair", "kind")
+            .agg(gaps=pl.len(), candles=pl.col("candles").sum())
+            .sort("pair", "kind")
+        )
+        with pl.Config(tbl_rows=-1, tbl_hide_dataframe_shape=True):
+            log.info("Gaps in the stored %s candles:\n%s", self.config.timeframe, summary)
+
+
+async def _main(config: DataConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = GapsService(config)
+    await service.run()
+
+
+def main(config: DataConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    parser.add_argument("--timeframe", default=None, help="The stored candles timeframe")
+    parser.add_argument(
+        "--start",
+        type=_date,
+        default=None,
+        help="Also report the candles missing from this UTC date, YYYY-MM-DD",
+    )
+    parser.add_argument(
+        "--end",
+        type=_date,
+        default=None,
+        help="Also report the candles missing until this UTC date, YYYY-MM-DD",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        default=False,
+        help="Fetch the missing candles from the exchange, and drop the duplicated ones",
+    )
+    parser.add_argument(
+        "--fetch-limit",
+        type=int,
+        default=None,
+        help="The maximum number of candles the exchange returns per request. Default: 1000",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="The maximum number of repair requests in flight at once. Default: 8",
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: DataConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    for option in ("timeframe", "start", "end"):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(config, option, value)
+    for option in ("fetch_limit", "concurrency"):
+        value = getattr(args, option)
+        if value is not None:
+            if value < 1:
+                parser.exit(
+                    status=1, message=f"The --{option.replace('_', '-')} must be positive\n"
+                )
+            setattr(config.gaps, option, value)
+    config._repair = args.repair
@@ -0,0 +1,204 @@
+"""
+Hyperopt service.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+import polars as pl
+
+from mcookbook.cli import backtest
+from mcookbook.cli.backtest import BacktestService
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.hyperopt import Dataset
+from mcookbook.hyperopt import Hyperopt
+from mcookbook.hyperopt import Study
+from mcookbook.hyperopt.objective import OBJECTIVES
+from mcookbook.hyperopt.runner import required_indicators
+from mcookbook.indicators import Indicator
+from mcookbook.utils import eventloop
+
+log = logging.getLogger(__name__)
+
+
+class HyperoptService(BacktestService):
+    """
+    Hyperopt service implementation.
+    """
+
+    @property
+    def study_name(self) -> str:
+        """
+        The study name, defaults to the strategy name and timeframe.
+        """
+        if self.config.hyperopt.study:
+            return self.config.hyperopt.study
+        return f"{self.config.strategy.name.replace(':', '.')}-{self.config.timeframe}"
+
+    def _run(self, pairs: list[str]) -> Study:
+        config = self.config
+        hyperopt_config = config.hyperopt
+        path = config.basedir / "hyperopt" / self.study_name
+        study = Study.load_or_create(
+            path,
+            {
+                "strategy": config.strategy.dict(),
+                "space": {name: param.dict() for name, param in hyperopt_config.space.items()},
+                "objective": hyperopt_config.objective,
+                "seed": hyperopt_config.seed,
+                "min_trades": hyperopt_config.min_trades,
+                "exchange": self.store.exchange,
+                "pairs": pairs,
+                "timeframe": config.timeframe,
+                "start": config.start,
+                "end": config.end,
+                "fee": config.fee,
+                "slippage": config.slippage,
+            },
+        )
+        indicators: list[Indicator] = []
+        if hyperopt_config.precompute_indicators:
+            indicators = required_indicators(
+                config.strategy,
+                hyperopt_config.space,
+                hyperopt_config.seed,
+                study.pending(hyperopt_config.trials),
+            )
+        dataset = Dataset.load_or_build(
+            path / "dataset",
+            self.store,
+            pairs,
+            config.timeframe,
+            start=config.start_ms,
+            end=config.end_ms,
+            indicators=indicators,
+        )
+        hyperopt = Hyperopt(
+            study,
+            dataset,
+            config.strategy,
+            hyperopt_config.space,
+            objective=hyperopt_config.objective,
+            seed=hyperopt_config.seed,
+            fee=config.fee,
+            slippage=config.slippage,
+            min_trades=hyperopt_config.min_trades,
+            pruning=hyperopt_config.pruning,
+            pruning_warmup_trials=hyperopt_config.pruning_warmup_trials,
+            pruning_steps=hyperopt_config.pruning_steps,
+            workers=config.workers,
+        )
+        return hyperopt.run(hyperopt_config.trials)
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        if not self.config.hyperopt.space:
+            raise MCookBookSystemExit(
+                "The hyperopt search space is empty. Configure it under 'hyperopt.space'."
+            )
+        pairs = await self.resolve_pairs()
+        study = await asyncio.get_running_loop().run_in_executor(None, self._run, pairs)
+        self.report(study)
+
+    def report(self, study: Study) -> None:  # type: ignore[override]
+        """
+        Log the hyperopt results table.
+        """
+        results = study.results()
+        with pl.Config(
+            tbl_rows=-1,
+            tbl_cols=-1,
+            tbl_width_chars=250,
+            tbl_hide_dataframe_shape=True,
+            float_precision=4,
+        ):
+            log.info(
+                "Top %d trials of %s:\n%s",
+                self.config.hyperopt.top,
+                study.path,
+                results.head(self.config.hyperopt.top),
+            )
+        best = study.best()
+        if best is None:
+            log.warning("No trial completed")
+            return
+        counts = dict(results.group_by("state").len().iter_rows())
+        log.info(
+            "Best trial %d, %s=%.4f, with parameters %s. Trials by state: %s",
+            best.number,
+            self.config.hyperopt.objective,
+            best.objective,
+            best.params,
+            ", ".join(f"{state}={count}" for state, count in sorted(counts.items())),
+        )
+
+
+async def _main(config: BacktestConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = HyperoptService(config)
+    await service.run()
+
+
+def main(config: BacktestConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    backtest.setup_parser(parser)
+    parser.add_argument(
+        "--trials", type=int, default=None, help="The number of trials to run. Default: 1000"
+    )
+    parser.add_argument(
+        "--study",
+        default=None,
+        help=(
+            "The study name. Studies are stored, and resumed from, <basedir>/hyperopt/<study>. "
+            "Default: <strategy>-<timeframe>"
+        ),
+    )
+    parser.add_argument(
+        "--objective",
+        choices=sorted(OBJECTIVES),
+        default=None,
+        help="The objective to maximize. Default: profit_total",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="The parameters sampling seed")
+    parser.add_argument(
+        "--no-pruning",
+        action="store_false",
+        dest="pruning",
+        default=None,
+        help="Don't prune trials performing worse than the median trial",
+    )
+    parser.add_argument(
+        "--top", type=int, default=None, help="How many of the best trials to report. Default: 10"
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: BacktestConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    backtest.post_process_argparse_parsed_args(parser, args, config)
+    for option in ("trials", "study", "objective", "seed", "pruning", "top"):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(config.hyperopt, option, value)
+    if config.hyperopt.trials < 1:
+        parser.exit(status=1, message="The number of trials must be positive\n")
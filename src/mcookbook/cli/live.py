@@ -5,10 +5,32 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+from typing import Optional
 
+from mcookbook.bus import CONFLATE
+from mcookbook.bus import EventBus
+from mcookbook.bus import PAIRLIST
+from mcookbook.bus import PairListEvent
+from mcookbook.bus import Subscription
+from mcookbook.bus import TICKERS
+from mcookbook.bus.topics import EventT
 from mcookbook.cli.abc import CLIService
 from mcookbook.config.live import LiveConfig
+from mcookbook.data import LiveStateWriter
+from mcookbook.exceptions import MCookBookSystemExit
 from mcookbook.exchanges import Exchange
+from mcookbook.pairlist import PairListDiff
+from mcookbook.replay import TickersEvent
+from mcookbook.sharding import ShardPool
+from mcookbook.utils import eventloop
+from mcookbook.utils.clock import get_clock
+from mcookbook.utils.metrics import MetricsServer
+from mcookbook.utils.watchdog import EventLoopWatchdog
+
+log = logging.getLogger(__name__)
 
 
 class LiveService(CLIService):
@@ -19,31 +41,172 @@ class LiveService(CLIService):
     def __init__(self, config: LiveConfig) -> None:
         self.config = config
         self.exchange = Exchange.resolved(config)
+        self.metrics_server: Optional[MetricsServer] = None
+        self.watchdog: Optional[EventLoopWatchdog] = None
+        self.bus = EventBus()
+        self.state: Optional[LiveStateWriter] = None
+        self.tasks: list[asyncio.Task[None]] = []
+        if config.publish_state:
+            self.state = LiveStateWriter(config.basedir / "live" / config.exchange.name)
+
+    async def _start_monitoring(self) -> None:
+        if self.config.metrics.enabled:
+            self.metrics_server = MetricsServer(
+                host=self.config.metrics.host, port=self.config.metrics.port
+            )
+            await self.metrics_server.start()
+        watchdog_config = self.config.event_loop.watchdog
+        if watchdog_config.enabled or self.config.metrics.enabled:
+            # The event loop lag is always measured when serving metrics, while blocking code
+            # is only tracked down when the watchdog is enabled.
+            self.watchdog = EventLoopWatchdog(
+                interval=watchdog_config.interval,
+                threshold=watchdog_config.threshold,
+                report_interval=watchdog_config.report_interval,
+                detect_blocking=watchdog_config.enabled,
+            )
+            await self.watchdog.start()
+
+    async def _consume(
+        self, subscription: Subscription[EventT], handler: Callable[[EventT], None]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        async for event in subscription:
+            try:
+                await loop.run_in_executor(None, handler, event)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to handle %s event %s", subscription.name, event)
+
+    def _start_state_publisher(self) -> None:
+        state = self.state
+        if state is None:
+            return
+        # Only the latest state is worth publishing, so a slow disk never holds back the bus
+        pairlist: Subscription[PairListEvent] = self.bus.subscribe(
+            PAIRLIST, "live-state", policy=CONFLATE
+        )
+        tickers: Subscription[TickersEvent] = self.bus.subscribe(
+            TICKERS, "live-state", policy=CONFLATE
+        )
+        self.tasks.append(
+            asyncio.create_task(
+                self._consume(pairlist, lambda event: state.publish_pairlist(event.pairs))
+            )
+        )
+        self.tasks.append(
+            asyncio.create_task(
+                self._consume(tickers, lambda event: state.publish_tickers(event.tickers))
+            )
+        )
+
+    async def _publish_pairlist(self, diff: PairListDiff) -> None:
+        await self.bus.publish(
+            PAIRLIST,
+            PairListEvent(
+                int(get_clock().time() * 1000),
+                self.exchange.pairlist_manager.pairlist,
+                diff.added,
+                diff.removed,
+            ),
+        )
 
     async def work(self) -> None:
         """
         Routines to run the service.
         """
+        await self._start_monitoring()
+        self._start_state_publisher()
         assert self.exchange.api  # Load ccxt api
         await self.exchange.get_markets()
-        await self.exchange.pairlist_manager.refresh_pairlist()
+        diff = await self.exchange.pairlist_manager.refresh_pairlist()
+        await self._publish_pairlist(diff)
         while True:
-            await asyncio.sleep(1)
+            await get_clock().sleep(1)
 
     async def await_closed(self) -> None:
         """
         Run shutdown routines.
         """
+        self.bus.close()
+        if self.tasks:
+            # Let the subscribers drain their queues
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.watchdog is not None:
+            await self.watchdog.stop()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
         if self.exchange:
             await self.exchange.api.close()
         return await super().await_closed()
 
 
+class ShardedLiveService(LiveService):
+    """
+    Sharded live trading service implementation.
+
+    This process owns the exchange connection and the pair list manager, while the per pair
+    evaluation is spread among worker processes, keeping this process' event loop free to
+    handle orders.
+    """
+
+    def __init__(self, config: LiveConfig) -> None:
+        super().__init__(config)
+        self.pool = ShardPool(
+            workers=config.sharding.workers,
+            capacity=config.sharding.capacity,
+            evaluator=config.sharding.evaluator,
+        )
+
+    async def _refresh_pairlist(self) -> None:
+        diff = await self.exchange.pairlist_manager.refresh_pairlist()
+        # Only the workers of the added, or removed, pairs are notified
+        self.pool.assign(self.exchange.pairlist_manager.pairlist)
+        await self._publish_pairlist(diff)
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        await self._start_monitoring()
+        self._start_state_publisher()
+        assert self.exchange.api  # Load ccxt api
+        await self.exchange.get_markets()
+        self.pool.start()
+        await self._refresh_pairlist()
+        clock = get_clock()
+        last_pairlist_refresh = clock.monotonic()
+        while True:
+            if clock.monotonic() - last_pairlist_refresh >= self.config.pairlist_refresh_period:
+                await self._refresh_pairlist()
+                last_pairlist_refresh = clock.monotonic()
+            pairlist = self.exchange.pairlist_manager.pairlist
+            if pairlist:
+                tickers: dict[str, Any] = await self.exchange.api.fetch_tickers(pairlist)
+                self.pool.update(tickers)
+                await self.bus.publish(TICKERS, TickersEvent(int(clock.time() * 1000), tickers))
+            for worker_id, pair, result in self.pool.results():
+                log.info("Worker %s evaluated %s: %s", worker_id, pair, result)
+            if not self.pool.alive():
+                raise MCookBookSystemExit("One of the pair evaluation workers died unexpectedly")
+            await clock.sleep(self.config.sharding.ticker_refresh_period)
+
+    async def await_closed(self) -> None:
+        """
+        Run shutdown routines.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.pool.close)
+        return await super().await_closed()
+
+
 async def _main(config: LiveConfig) -> None:
     """
     Asynchronous main method.
     """
-    service = LiveService(config)
+    service: LiveService
+    if config.sharding.workers:
+        service = ShardedLiveService(config)
+    else:
+        service = LiveService(config)
     await service.run()
 
 
@@ -51,17 +214,32 @@ def main(config: LiveConfig) -> None:
     """
     Synchronous main method.
     """
-    asyncio.run(_main(config))
+    eventloop.run(_main(config), config.event_loop)
 
 
 def setup_parser(parser: argparse.ArgumentParser) -> None:
     """
     Setup the sub-parser.
     """
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Number of worker processes among which the pair list evaluation is sharded. "
+            "Zero runs everything on a single process. Default: 0"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve metrics, in the Prometheus text format, on the provided local port",
+    )
     parser.set_defaults(func=main)
 
 
-def post_process_argparse_parsed_args(  # pylint: disable=unused-argument
+def post_process_argparse_parsed_args(
     parser: argparse.ArgumentParser,
     args: argparse.Namespace,
     config: LiveConfig,
@@ -69,3 +247,10 @@ def post_process_argparse_parsed_args(  # pylint: disable=unused-argument
     """
     Post process the parser arguments after the configuration files have been loaded.
     """
+    if args.workers is not None:
+        if args.workers < 0:
+            parser.exit(status=1, message="The number of workers cannot be negative\n")
+        config.sharding.workers = args.workers
+    if args.metrics_port is not None:
+        config.metrics.enabled = True
+        config.metrics.port = args.metrics_port
@@ -5,16 +5,25 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import itertools
 import json
 import logging
 import os
+import pathlib
 import shlex
 import shutil
+from typing import Any
 from typing import TYPE_CHECKING
 
 from mcookbook import CODE_ROOT_DIR
 from mcookbook.cli.abc import CLIService
 from mcookbook.config.notebook import NotebookConfig
+from mcookbook.data.shared import ENVIRON_KEY
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.utils import eventloop
+from mcookbook.utils.cache import ENVIRON_KEY as CACHE_ENVIRON_KEY
+from mcookbook.utils.notebooks import HAS_PAPERMILL
+from mcookbook.utils.notebooks import NotebookBatch
 
 JUPYTER_LAB_BINARY_PATH = shutil.which("jupyter-lab")
 
@@ -36,10 +45,54 @@ class NotebookService(CLIService):
         tmp_path.mkdir(exist_ok=True)
         self.temp_notebook_path = tmp_path / self.config.notebook.name
 
+    def _environ(self) -> dict[str, str]:
+        return {
+            "MCB_CONFIG_FILES": json.dumps([str(p) for p in self.config.config_files]),
+            # Where the live service publishes its state, see ``mcookbook.data.LiveStateReader``
+            ENVIRON_KEY: str(self.config.basedir / "live" / self.config.exchange.name),
+            # Shared by all notebooks, see ``mcookbook.utils.cache.DiskCache``
+            CACHE_ENVIRON_KEY: str(self.config.basedir / "cache"),
+        }
+
+    async def _run_headless(self) -> None:
+        config = self.config
+        batch = NotebookBatch(
+            config.notebook,
+            config.basedir / "notebooks",
+            environ=self._environ(),
+            workers=config.workers,
+            timeout=config.execution_timeout,
+        )
+        parameter_sets = config.parameter_sets
+        log.info(
+            "Executing %s %d times, using %d workers",
+            config.notebook.name,
+            len(parameter_sets),
+            min(batch.workers, len(parameter_sets)),
+        )
+        directory, runs = await asyncio.get_running_loop().run_in_executor(
+            None, batch.run, parameter_sets
+        )
+        failed = [run for run in runs if run.status != "ok"]
+        log.info(
+            "Executed %d runs, %d failed, in %.2f seconds of notebook time. Saved to %s",
+            len(runs),
+            len(failed),
+            sum(run.duration for run in runs),
+            directory,
+        )
+        if failed:
+            raise MCookBookSystemExit(
+                f"{len(failed)} of the {len(runs)} notebook runs failed. See {directory}\n"
+            )
+
     async def work(self) -> None:
         """
         Routines to run the service.
         """
+        if self.config.headless:
+            await self._run_headless()
+            return
         if TYPE_CHECKING:
             assert JUPYTER_LAB_BINARY_PATH
         if self.temp_notebook_path.exists():
@@ -72,7 +125,7 @@ class NotebookService(CLIService):
         )
         log.info("Running: %s", cmd)
         environ = os.environ.copy()
-        environ["MCB_CONFIG_FILES"] = json.dumps([str(p) for p in self.config.config_files])
+        environ.update(self._environ())
         proc = await asyncio.create_subprocess_shell(cmd, env=environ)
         try:
             await proc.communicate()
@@ -105,7 +158,7 @@ def main(config: NotebookConfig) -> None:
     """
     Synchronous main method.
     """
-    asyncio.run(_main(config))
+    eventloop.run(_main(config), config.event_loop)
 
 
 def setup_parser(parser: argparse.ArgumentParser) -> None:
@@ -119,6 +172,47 @@ def setup_parser(parser: argparse.ArgumentParser) -> None:
         default=False,
         help="Keep the temporary notebooks copied from source",
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        default=False,
+        help=(
+            "Execute the notebook, once per parameter set and pair, in parallel worker processes, "
+            "instead of opening it in JupyterLab. The executed notebooks, and a summary of the "
+            "runs, are saved under <basedir>/notebooks"
+        ),
+    )
+    parser.add_argument(
+        "--parameters",
+        type=pathlib.Path,
+        default=None,
+        help=(
+            "JSON file with the parameter sets of the headless runs, a list of objects, each "
+            "injected into the notebook cell tagged 'parameters'"
+        ),
+    )
+    parser.add_argument(
+        "--pair",
+        action="append",
+        default=[],
+        dest="pairs",
+        help=(
+            "Execute the notebook for this pair, passed as the 'pair' parameter, along with each "
+            "parameter set. Can be passed multiple times"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of headless runs executed in parallel. Default: number of CPUs",
+    )
+    parser.add_argument(
+        "--execution-timeout",
+        type=int,
+        default=None,
+        help="Fail the headless runs with a cell running longer than this number of seconds",
+    )
     parser.set_defaults(func=main)
 
 
@@ -128,7 +222,15 @@ def post_process_argparse_parsed_args(
     """
     Post process the parser arguments after the configuration files have been loaded.
     """
-    if JUPYTER_LAB_BINARY_PATH is None:
+    if args.headless:
+        if not HAS_PAPERMILL:
+            message = (
+                "The papermill library is not installed. Please run the following on your "
+                "cloned repository root:\n"
+                "  python -m pip install -e .[notebook]\n"
+            )
+            parser.exit(status=1, message=message)
+    elif JUPYTER_LAB_BINARY_PATH is None:
         message = (
             "The pappermill library is not installed. Please run the following on your "
             "cloned repository root:\n"
@@ -138,3 +240,32 @@ def post_process_argparse_parsed_args(
     config._notebook = args.NOTEBOOK
     config._config_files = args.config_files
     config.keep_temp_notebook = args.keep_temp_notebook
+    if not config.notebook.exists():
+        parser.exit(status=1, message=f"The {args.NOTEBOOK} notebook does not exist\n")
+    if args.workers is not None:
+        if args.workers < 1:
+            parser.exit(status=1, message="The number of workers must be positive\n")
+        config.workers = args.workers
+    if args.execution_timeout is not None:
+        if args.execution_timeout < 1:
+            parser.exit(status=1, message="The --execution-timeout must be positive\n")
+        config.execution_timeout = args.execution_timeout
+    parameter_sets: list[dict[str, Any]] = [{}]
+    if args.parameters is not None:
+        try:
+            parameter_sets = json.loads(args.parameters.read_text())
+        except (OSError, ValueError) as exc:
+            parser.exit(status=1, message=f"Failed to load {args.parameters}: {exc}\n")
+        if isinstance(parameter_sets, dict):
+            parameter_sets = [parameter_sets]
+        if not parameter_sets or not all(isinstance(item, dict) for item in parameter_sets):
+            parser.exit(
+                status=1, message=f"{args.parameters} must hold a non empty list of objects\n"
+            )
+    if args.pairs:
+        parameter_sets = [
+            {**parameters, "pair": pair}
+            for parameters, pair in itertools.product(parameter_sets, args.pairs)
+        ]
+    config._headless = args.headless
+    config._parameter_sets = parameter_sets
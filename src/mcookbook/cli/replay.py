@@ -0,0 +1,178 @@
+"""
+Replay service.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+from collections.abc import Iterable
+
+from mcookbook.cli import backtest
+from mcookbook.cli.backtest import BacktestService
+from mcookbook.cli.backtest import export
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.replay import candle_events
+from mcookbook.replay import Event
+from mcookbook.replay import merge_events
+from mcookbook.replay import read_events
+from mcookbook.replay import ReplayAPI
+from mcookbook.replay import ReplayEngine
+from mcookbook.replay import ReplayResult
+from mcookbook.utils import eventloop
+
+log = logging.getLogger(__name__)
+
+
+class ReplayService(BacktestService):
+    """
+    Replay service implementation.
+
+    Replays the stored candles, along with any recorded events, through the live pair list,
+    indicators and strategy code paths, without any network access.
+    """
+
+    def __init__(self, config: BacktestConfig) -> None:
+        super().__init__(config)
+        # Serves the markets while resolving the pairs, and the replayed market data afterwards
+        self.api = ReplayAPI()
+        self.exchange.set_api(self.api)
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        config = self.config
+        if config.synthetic_markets is not None:
+            # Generates the missing synthetic candles
+            await self.resolve_pairs()
+        else:
+            await self._load_markets()
+        markets = self.exchange.markets
+        pairs = [pair for pair in self.store.pairs(config.timeframe) if pair in markets]
+        if not pairs:
+            raise MCookBookSystemExit(
+                f"No {config.timeframe} candles stored in {self.store.path} for any market"
+            )
+        sources: list[Iterable[Event]] = [
+            candle_events(self.store, pairs, config.timeframe, config.start_ms, config.end_ms)
+        ]
+        sources.extend(read_events(path) for path in config.events)
+        engine = ReplayEngine(
+            self.exchange,
+            config.strategy,
+            config.timeframe,
+            stake_amount=config.stake_amount,
+            api=self.api,
+        )
+        log.info("Replaying %d pairs through %s", len(pairs), config.strategy)
+        result = await engine.run(merge_events(*sources))
+        self.report(result)
+        if engine.paper is not None:
+            balances = await engine.paper.fetch_balance()
+            log.info(
+                "Paper trading balances: %s",
+                ", ".join(
+                    f"{currency}={total:.8g}"
+                    for currency, total in balances["total"].items()
+                    if total
+                ),
+            )
+        if config.export is not None:
+            export(result.signals, config.export)
+            log.info("Exported the signals to %s", config.export)
+
+    def report(self, result: ReplayResult) -> None:  # type: ignore[override]
+        """
+        Log the replay results.
+        """
+        signals = result.signals
+        log.info(
+            "Replayed %d events, %d candles, in %.2f seconds, %.0f events per second. "
+            "%d entry and %d exit signals.",
+            result.events,
+            result.candles,
+            result.duration,
+            result.events / result.duration if result.duration else 0,
+            signals["entry"].sum(),
+            signals["exit"].sum(),
+        )
+        latencies = result.latencies
+        if latencies.is_empty():
+            return
+        log.info(
+            "Decision latency over %d decisions: p50=%.3fms p99=%.3fms max=%.3fms",
+            latencies.len(),
+            (latencies.quantile(0.5) or 0) * 1000,
+            (latencies.quantile(0.99) or 0) * 1000,
+            (latencies.max() or 0) * 1000,  # type: ignore[operator]
+        )
+        fills = result.fills
+        if not fills.is_empty():
+            log.info(
+                "Executed %d paper trading fills, paying %.8g in fees",
+                fills.height,
+                fills["fee"].sum(),
+            )
+        if result.rejected:
+            log.warning("The paper trading engine rejected %d orders", result.rejected)
+
+
+async def _main(config: BacktestConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = ReplayService(config)
+    await service.run()
+
+
+def main(config: BacktestConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    backtest.setup_parser(parser)
+    parser.add_argument(
+        "--events",
+        type=pathlib.Path,
+        action="append",
+        default=[],
+        help=(
+            "Recorded events file, JSON lines, to replay along with the stored candles, like "
+            "tickers or order book updates. Can be passed multiple times"
+        ),
+    )
+    parser.add_argument(
+        "--stake-amount",
+        type=float,
+        default=None,
+        help=(
+            "Execute the signals with a paper trading matching engine, buying this amount of the "
+            "quote currency on each entry"
+        ),
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: BacktestConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    backtest.post_process_argparse_parsed_args(parser, args, config)
+    if args.stake_amount is not None:
+        if args.stake_amount <= 0:
+            parser.exit(status=1, message="The stake amount must be positive\n")
+        config.stake_amount = args.stake_amount
+    for path in args.events:
+        if not path.exists():
+            parser.exit(status=1, message=f"The events file {path} does not exist\n")
+    config._events = args.events
@@ -0,0 +1,200 @@
+"""
+Robustness analysis service.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+import polars as pl
+
+from mcookbook.cli import hyperopt
+from mcookbook.cli.backtest import export
+from mcookbook.cli.hyperopt import HyperoptService
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.exceptions import MCookBookSystemExit
+from mcookbook.robustness import distribution
+from mcookbook.robustness import monte_carlo
+from mcookbook.robustness import split_windows
+from mcookbook.robustness import WalkForward
+from mcookbook.robustness import WalkForwardResult
+from mcookbook.robustness.montecarlo import MONTE_CARLO_METHODS
+from mcookbook.utils import eventloop
+
+log = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+
+class RobustnessService(HyperoptService):
+    """
+    Robustness analysis service implementation.
+    """
+
+    async def work(self) -> None:
+        """
+        Routines to run the service.
+        """
+        config = self.config
+        if not config.hyperopt.space:
+            raise MCookBookSystemExit(
+                "The hyperopt search space is empty. Configure it under 'hyperopt.space'."
+            )
+        if config.start_ms is None or config.end_ms is None:
+            raise MCookBookSystemExit("The robustness analysis needs both a start and an end date")
+        walk_forward_config = config.robustness.walk_forward
+        windows = split_windows(
+            config.start_ms,
+            config.end_ms,
+            walk_forward_config.train_days * DAY_MS,
+            walk_forward_config.test_days * DAY_MS,
+            anchored=walk_forward_config.anchored,
+        )
+        if not windows:
+            raise MCookBookSystemExit(
+                f"The {config.start:%Y-%m-%d} to {config.end:%Y-%m-%d} range is too short for a "
+                f"{walk_forward_config.train_days} days train and {walk_forward_config.test_days} "
+                "days test window"
+            )
+        pairs = await self.resolve_pairs()
+        walk_forward = WalkForward(
+            config.basedir / "robustness" / self.study_name,
+            self.store,
+            config.strategy,
+            config.timeframe,
+            config.hyperopt,
+            fee=config.fee,
+            slippage=config.slippage,
+            workers=config.workers,
+        )
+        log.info(
+            "Running the walk-forward analysis of %s over %d windows and %d pairs using %d workers",
+            config.strategy,
+            len(windows),
+            len(pairs),
+            walk_forward.workers,
+        )
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, walk_forward.run, windows, pairs
+        )
+        self.report(result)
+        if config.export is not None:
+            export(result.trades, config.export)
+            log.info("Exported the out-of-sample trades to %s", config.export)
+
+    def report(self, result: WalkForwardResult) -> None:  # type: ignore[override]
+        """
+        Log the walk-forward windows, the out-of-sample results and their Monte Carlo distribution.
+        """
+        summary = result.summary
+        monte_carlo_config = self.config.robustness.monte_carlo
+        with pl.Config(
+            tbl_rows=-1,
+            tbl_cols=-1,
+            tbl_width_chars=250,
+            fmt_str_lengths=100,
+            tbl_hide_dataframe_shape=True,
+            float_precision=4,
+        ):
+            log.info("Walk-forward windows:\n%s", result.windows)
+            log.info(
+                "Out-of-sample: %d trades, %.2f%% win rate, %.4f profit, %.4f max drawdown, in "
+                "stake units",
+                summary["trades"],
+                summary["win_rate"] * 100,
+                summary["profit_total"],
+                summary["max_drawdown"],
+            )
+            if result.trades.is_empty():
+                return
+            simulations = monte_carlo(
+                result.trades["profit_ratio"],
+                simulations=monte_carlo_config.simulations,
+                method=monte_carlo_config.method,
+                seed=monte_carlo_config.seed,
+            )
+            log.info(
+                "Out-of-sample profit and drawdown distribution, over %d %s simulations:\n%s",
+                monte_carlo_config.simulations,
+                monte_carlo_config.method,
+                distribution(simulations),
+            )
+
+
+async def _main(config: BacktestConfig) -> None:
+    """
+    Asynchronous main method.
+    """
+    service = RobustnessService(config)
+    await service.run()
+
+
+def main(config: BacktestConfig) -> None:
+    """
+    Synchronous main method.
+    """
+    eventloop.run(_main(config), config.event_loop)
+
+
+def setup_parser(parser: argparse.ArgumentParser) -> None:
+    """
+    Setup the sub-parser.
+    """
+    hyperopt.setup_parser(parser)
+    parser.add_argument(
+        "--train-days",
+        type=int,
+        default=None,
+        help="The days of each walk-forward train window. Default: 90",
+    )
+    parser.add_argument(
+        "--test-days",
+        type=int,
+        default=None,
+        help="The days of each walk-forward test window. Default: 30",
+    )
+    parser.add_argument(
+        "--anchored",
+        action="store_true",
+        default=None,
+        help="Train every window from the start date, instead of rolling the train windows",
+    )
+    parser.add_argument(
+        "--simulations",
+        type=int,
+        default=None,
+        help="The number of Monte Carlo simulations. Default: 1000",
+    )
+    parser.add_argument(
+        "--method",
+        choices=MONTE_CARLO_METHODS,
+        default=None,
+        help=(
+            "The Monte Carlo resampling method. 'bootstrap' draws the trades with replacement, "
+            "'shuffle' only reorders them. Default: bootstrap"
+        ),
+    )
+    parser.set_defaults(func=main)
+
+
+def post_process_argparse_parsed_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, config: BacktestConfig
+) -> None:
+    """
+    Post process the parser arguments after the configuration files have been loaded.
+    """
+    hyperopt.post_process_argparse_parsed_args(parser, args, config)
+    robustness = config.robustness
+    for option in ("train_days", "test_days", "anchored"):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(robustness.walk_forward, option, value)
+    for option in ("simulations", "method"):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(robustness.monte_carlo, option, value)
+    if robustness.walk_forward.train_days < 1 or robustness.walk_forward.test_days < 1:
+        parser.exit(status=1, message="The walk-forward windows must be at least a day long\n")
+    if robustness.monte_carlo.simulations < 1:
+        parser.exit(status=1, message="The number of Monte Carlo simulations must be positive\n")
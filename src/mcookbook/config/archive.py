@@ -0,0 +1,54 @@
+"""
+Candle archive configuration models.
+"""
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+from mcookbook.data.resample import can_resample
+from mcookbook.data.resample import timeframe_interval
+from mcookbook.exceptions import OperationalException
+
+
+class RetentionRule(BaseModel):
+    """
+    Archive retention rule configuration model.
+
+    The archived candles older than ``age_days`` are downsampled to ``timeframe``.
+    """
+
+    age_days: int = Field(ge=1)
+    timeframe: str
+
+    @validator("timeframe")
+    @classmethod
+    def _validate_timeframe(cls, value: str) -> str:
+        try:
+            timeframe_interval(value)
+        except (OperationalException, ValueError) as exc:
+            raise ValueError(f"The retention timeframe {value!r} is not valid") from exc
+        return value
+
+
+class ArchiveConfig(BaseModel):
+    """
+    Candle archive configuration model.
+    """
+
+    hot_days: int = Field(default=90, ge=1)
+    compression_level: int = Field(default=19, ge=1, le=22)
+    retention: list[RetentionRule] = []
+
+    @validator("retention")
+    @classmethod
+    def _validate_retention(cls, value: list[RetentionRule]) -> list[RetentionRule]:
+        value = sorted(value, key=lambda rule: rule.age_days)
+        for previous, rule in zip(value, value[1:]):
+            if not can_resample(previous.timeframe, rule.timeframe):
+                raise ValueError(
+                    f"The {rule.timeframe} retention timeframe, after {rule.age_days} days, can't "
+                    f"be built from the {previous.timeframe} one, after {previous.age_days} days"
+                )
+        return value
@@ -0,0 +1,56 @@
+"""
+Backtest configuration schema.
+"""
+from __future__ import annotations
+
+import pathlib
+from typing import Any
+from typing import Optional
+
+from pydantic import Field
+from pydantic import PrivateAttr
+from pydantic import validator
+
+from mcookbook.config.data import DataConfig
+from mcookbook.config.hyperopt import HyperoptConfig
+from mcookbook.config.robustness import RobustnessConfig
+from mcookbook.strategies import Strategy
+
+
+class BacktestConfig(DataConfig):
+    """
+    Backtest configuration schema.
+    """
+
+    strategy: Strategy
+    fee: float = Field(default=0.001, ge=0, lt=1)
+    slippage: float = Field(default=0.0, ge=0, lt=1)
+    workers: Optional[int] = Field(default=None, ge=1)
+    stake_amount: Optional[float] = Field(default=None, gt=0)
+    hyperopt: HyperoptConfig = HyperoptConfig()
+    robustness: RobustnessConfig = RobustnessConfig()
+
+    # Private attributes
+    _export: Optional[pathlib.Path] = PrivateAttr(default=None)
+    _events: list[pathlib.Path] = PrivateAttr(default_factory=list)
+
+    @validator("strategy", pre=True)
+    @classmethod
+    def _resolve_strategy_implementation(cls, value: dict[str, Any]) -> Strategy:
+        if isinstance(value, Strategy):
+            return value
+        return Strategy.resolved(value)
+
+    @property
+    def export(self) -> Optional[pathlib.Path]:
+        """
+        The path to export the backtest trades to.
+        """
+        return self._export
+
+    @property
+    def events(self) -> list[pathlib.Path]:
+        """
+        The recorded event files to replay along with the stored candles.
+        """
+        return self._events
@@ -15,6 +15,7 @@ from pydantic import Field
 from pydantic import PrivateAttr
 from pydantic import validator
 
+from mcookbook.config.event_loop import EventLoopConfig
 from mcookbook.config.exchange import ExchangeConfig
 from mcookbook.config.logging import LoggingConfig
 from mcookbook.exceptions import MCookBookSystemExit
@@ -43,6 +44,7 @@ class BaseConfig(BaseModel):
 
     # Optional Configs
     logging: LoggingConfig = LoggingConfig()
+    event_loop: EventLoopConfig = EventLoopConfig()
 
     # Private attributes
     _basedir: pathlib.Path = PrivateAttr()
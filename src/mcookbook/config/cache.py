@@ -0,0 +1,22 @@
+"""
+Research computations cache configuration models.
+"""
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class CacheConfig(BaseModel):
+    """
+    Disk backed memoization cache configuration model.
+    """
+
+    max_size_mb: int = Field(default=2048, ge=1)
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        Return the maximum size of the cache, in bytes.
+        """
+        return self.max_size_mb * 2**20
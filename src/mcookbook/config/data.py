@@ -0,0 +1,79 @@
+"""
+Stored data configuration schema.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Optional
+
+import ccxt
+from pydantic import PrivateAttr
+from pydantic import validator
+
+from mcookbook.config.archive import ArchiveConfig
+from mcookbook.config.base import BaseConfig
+from mcookbook.config.gaps import GapsConfig
+
+
+class DataConfig(BaseConfig):
+    """
+    Stored data configuration schema.
+    """
+
+    timeframe: str = "5m"
+    start: Optional[datetime.datetime] = None
+    end: Optional[datetime.datetime] = None
+    gaps: GapsConfig = GapsConfig()
+    archive: ArchiveConfig = ArchiveConfig()
+
+    # Private attributes
+    _synthetic_markets: Optional[int] = PrivateAttr(default=None)
+    _repair: bool = PrivateAttr(default=False)
+
+    @validator("timeframe")
+    @classmethod
+    def _validate_timeframe(cls, value: str) -> str:
+        try:
+            ccxt.Exchange.parse_timeframe(value)
+        except Exception as exc:  # pylint: disable=broad-except
+            raise ValueError(f"The timeframe {value!r} is not valid") from exc
+        return value
+
+    @validator("start", "end")
+    @classmethod
+    def _ensure_timezone(cls, value: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value
+
+    @property
+    def start_ms(self) -> Optional[int]:
+        """
+        The data range start, as a timestamp in milliseconds.
+        """
+        if self.start is None:
+            return None
+        return int(self.start.timestamp() * 1000)
+
+    @property
+    def end_ms(self) -> Optional[int]:
+        """
+        The data range end, as a timestamp in milliseconds.
+        """
+        if self.end is None:
+            return None
+        return int(self.end.timestamp() * 1000)
+
+    @property
+    def synthetic_markets(self) -> Optional[int]:
+        """
+        The number of synthetic markets to use, instead of the stored exchange data.
+        """
+        return self._synthetic_markets
+
+    @property
+    def repair(self) -> bool:
+        """
+        Repair the gaps found in the stored candles.
+        """
+        return self._repair
@@ -0,0 +1,45 @@
+"""
+Event loop configuration models.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+EVENT_LOOP_BACKENDS: tuple[str, ...] = ("auto", "asyncio", "uvloop")
+
+
+class EventLoopWatchdogConfig(BaseModel):
+    """
+    Event loop watchdog configuration model.
+    """
+
+    enabled: bool = False
+    interval: float = Field(default=0.1, gt=0)
+    threshold: float = Field(default=0.25, gt=0)
+    report_interval: float = Field(default=60, gt=0)
+
+
+class EventLoopConfig(BaseModel):
+    """
+    Event loop configuration model.
+    """
+
+    backend: str = "auto"
+    debug: bool = False
+    slow_callback_duration: float = Field(default=0.1, gt=0)
+    default_executor_workers: Optional[int] = Field(default=None, ge=1)
+    watchdog: EventLoopWatchdogConfig = EventLoopWatchdogConfig()
+
+    @validator("backend")
+    @classmethod
+    def _validate_backend(cls, value: str) -> str:
+        value = value.lower()
+        if value not in EVENT_LOOP_BACKENDS:
+            raise ValueError(
+                f"The event loop backend {value!r} is not valid. Choose one of {', '.join(EVENT_LOOP_BACKENDS)}"
+            )
+        return value
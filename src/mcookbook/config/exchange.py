@@ -36,6 +36,8 @@ class ExchangeConfig(BaseModel):
     cctx_config: CCXTConfig = CCXTConfig()
     pair_allow_list: list[str] = Field(default_factory=list)
     pair_block_list: list[str] = Field(default_factory=list)
+    dry_run: bool = False
+    dry_run_wallet: dict[str, float] = Field(default_factory=lambda: {"USDT": 10_000.0})
 
     _cctx = PrivateAttr()
 
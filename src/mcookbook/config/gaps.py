@@ -0,0 +1,16 @@
+"""
+Stored candles gaps configuration models.
+"""
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class GapsConfig(BaseModel):
+    """
+    Stored candles gaps repair configuration model.
+    """
+
+    fetch_limit: int = Field(default=1000, ge=1)
+    concurrency: int = Field(default=8, ge=1)
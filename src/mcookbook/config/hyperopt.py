@@ -0,0 +1,44 @@
+"""
+Hyperopt configuration models.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+from mcookbook.hyperopt.objective import OBJECTIVES
+from mcookbook.hyperopt.space import Parameter
+
+
+class HyperoptConfig(BaseModel):
+    """
+    Hyperopt configuration model.
+
+    The ``space`` maps strategy parameter names to their search ranges, either
+    ``{"low": 5, "high": 50, "step": 1}`` for integers, ``{"low": 0.1, "high": 0.9}`` for floats
+    or ``{"choices": [...]}``.
+    """
+
+    space: dict[str, Parameter] = Field(default_factory=dict)
+    trials: int = Field(default=1000, ge=1)
+    objective: str = "profit_total"
+    seed: int = 0
+    study: Optional[str] = None
+    min_trades: int = Field(default=1, ge=0)
+    pruning: bool = True
+    pruning_warmup_trials: int = Field(default=10, ge=1)
+    pruning_steps: int = Field(default=4, ge=1)
+    precompute_indicators: bool = True
+    top: int = Field(default=10, ge=1)
+
+    @validator("objective")
+    @classmethod
+    def _validate_objective(cls, value: str) -> str:
+        if value not in OBJECTIVES:
+            raise ValueError(
+                f"The objective {value!r} is not valid. Valid objectives: {', '.join(sorted(OBJECTIVES))}"
+            )
+        return value
@@ -4,9 +4,15 @@ Live configuration schema.
 from __future__ import annotations
 
 from mcookbook.config.base import BaseConfig
+from mcookbook.config.metrics import MetricsConfig
+from mcookbook.config.sharding import ShardingConfig
 
 
 class LiveConfig(BaseConfig):
     """
     Live configuration schema.
     """
+
+    publish_state: bool = True
+    sharding: ShardingConfig = ShardingConfig()
+    metrics: MetricsConfig = MetricsConfig()
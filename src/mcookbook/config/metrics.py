@@ -0,0 +1,17 @@
+"""
+Metrics configuration models.
+"""
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class MetricsConfig(BaseModel):
+    """
+    Metrics endpoint configuration model.
+    """
+
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = Field(default=9108, ge=0, le=65535)
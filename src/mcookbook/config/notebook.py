@@ -4,11 +4,15 @@ Notebook configuration schema.
 from __future__ import annotations
 
 import pathlib
+from typing import Any
+from typing import Optional
 
+from pydantic import Field
 from pydantic import PrivateAttr
 
 from mcookbook import CODE_ROOT_DIR
 from mcookbook.config.base import BaseConfig
+from mcookbook.config.cache import CacheConfig
 
 
 class NotebookConfig(BaseConfig):
@@ -17,8 +21,13 @@ class NotebookConfig(BaseConfig):
     """
 
     keep_temp_notebook: bool = False
+    workers: Optional[int] = Field(default=None, ge=1)
+    execution_timeout: Optional[int] = Field(default=None, ge=1)
+    cache: CacheConfig = CacheConfig()
     _notebook: str = PrivateAttr()
     _config_files: list[pathlib.Path] = PrivateAttr()
+    _headless: bool = PrivateAttr(default=False)
+    _parameter_sets: list[dict[str, Any]] = PrivateAttr(default_factory=list)
 
     @property
     def notebook(self) -> pathlib.Path:
@@ -33,3 +42,17 @@ class NotebookConfig(BaseConfig):
         Return the list of the configuration files.
         """
         return list(self._config_files)
+
+    @property
+    def headless(self) -> bool:
+        """
+        Execute the notebook, once per parameter set, instead of opening it in JupyterLab.
+        """
+        return self._headless
+
+    @property
+    def parameter_sets(self) -> list[dict[str, Any]]:
+        """
+        The parameters of each headless run.
+        """
+        return list(self._parameter_sets)
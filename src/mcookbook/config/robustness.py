@@ -0,0 +1,48 @@
+"""
+Robustness analysis configuration models.
+"""
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+from mcookbook.robustness.montecarlo import MONTE_CARLO_METHODS
+
+
+class WalkForwardConfig(BaseModel):
+    """
+    Walk-forward analysis configuration model.
+    """
+
+    train_days: int = Field(default=90, ge=1)
+    test_days: int = Field(default=30, ge=1)
+    anchored: bool = False
+
+
+class MonteCarloConfig(BaseModel):
+    """
+    Monte Carlo resampling configuration model.
+    """
+
+    simulations: int = Field(default=1000, ge=1)
+    method: str = "bootstrap"
+    seed: int = 0
+
+    @validator("method")
+    @classmethod
+    def _validate_method(cls, value: str) -> str:
+        if value not in MONTE_CARLO_METHODS:
+            raise ValueError(
+                f"The method {value!r} is not valid. Valid methods: {', '.join(MONTE_CARLO_METHODS)}"
+            )
+        return value
+
+
+class RobustnessConfig(BaseModel):
+    """
+    Robustness analysis configuration model.
+    """
+
+    walk_forward: WalkForwardConfig = WalkForwardConfig()
+    monte_carlo: MonteCarloConfig = MonteCarloConfig()
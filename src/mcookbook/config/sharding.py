@@ -0,0 +1,33 @@
+"""
+Live pair sharding configuration models.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import validator
+
+
+class ShardingConfig(BaseModel):
+    """
+    Live pair sharding configuration model.
+
+    When ``workers`` is greater than zero, the pairlist is partitioned among that many worker
+    processes, each evaluating its own partition with the configured ``evaluator``.
+    """
+
+    workers: int = Field(default=0, ge=0)
+    evaluator: Optional[str] = None
+    capacity: int = Field(default=1024, ge=1)
+    ticker_refresh_period: float = Field(default=5, gt=0)
+
+    @validator("evaluator")
+    @classmethod
+    def _validate_evaluator(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and ":" not in value:
+            raise ValueError(
+                f"The evaluator {value!r} is not valid. It must be in the form 'package.module:ClassName'"
+            )
+        return value
@@ -0,0 +1,48 @@
+"""
+Market data utilities.
+"""
+from __future__ import annotations
+
+from .archive import apply_retention
+from .archive import archive_candles
+from .archive import CandleArchive
+from .bars import BAR_KINDS
+from .bars import TradeAggregator
+from .gaps import find_gaps
+from .gaps import GAPS_SCHEMA
+from .gaps import repair_gaps
+from .gaps import scan_gaps
+from .resample import resample
+from .resample import Resampler
+from .ring import CandleWindow
+from .ring import CandleWindows
+from .ring import RingBuffer
+from .shared import LiveStateReader
+from .shared import LiveStateWriter
+from .shared import TICKERS_SCHEMA
+from .store import CandleStore
+from .synthetic import MarketGenerator
+from .synthetic import OHLCV_COLUMNS
+
+__all__ = [
+    "apply_retention",
+    "archive_candles",
+    "BAR_KINDS",
+    "CandleArchive",
+    "CandleStore",
+    "CandleWindow",
+    "CandleWindows",
+    "find_gaps",
+    "GAPS_SCHEMA",
+    "LiveStateReader",
+    "LiveStateWriter",
+    "MarketGenerator",
+    "OHLCV_COLUMNS",
+    "repair_gaps",
+    "resample",
+    "Resampler",
+    "RingBuffer",
+    "scan_gaps",
+    "TICKERS_SCHEMA",
+    "TradeAggregator",
+]
@@ -0,0 +1,314 @@
+"""
+Compressed candle archive.
+
+The archive is the cold storage tier of the candles, laid out, like the :class:`CandleStore`, as::
+
+    <basedir>/archive/<exchange>/<timeframe>/<BASE>_<QUOTE>.parquet
+
+Candles are encoded as integers before being written, which compresses several times better
+than the floats:
+
+* timestamps are delta encoded, the constant candle interval then taking next to no space
+* prices are scaled to integers, by their number of decimals, the close delta encoded, the open
+  relative to the previous close, and the high and low relative to the candle body
+* volumes are scaled to integers
+
+The number of decimals is detected from the candles, so the encoding is lossless, and stored in
+the parquet metadata along with the pair.
+
+Retention rules downsample the archived candles older than an age to a coarser timeframe, see
+:func:`apply_retention`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import pathlib
+from collections.abc import Iterable
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.data.resample import align
+from mcookbook.data.resample import can_resample
+from mcookbook.data.resample import resample
+from mcookbook.data.store import CandleStore
+from mcookbook.data.store import OHLCV_SCHEMA
+from mcookbook.data.store import pair_to_filename
+from mcookbook.data.synthetic import OHLCV_COLUMNS
+
+log = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# The parquet metadata key the encoding details are stored under
+_METADATA_KEY = "mcookbook.archive"
+
+# Scaled values are kept below 2**53, where floats still represent every integer
+_MAX_SCALED = 2**53
+
+
+def decimals(frame: pl.DataFrame, columns: Iterable[str], limit: int = 12) -> int:
+    """
+    Return the number of decimals of the values in the ``columns`` of ``frame``.
+
+    Values with more than ``limit`` decimals, or more than floats can represent, are rounded.
+    """
+    columns = list(columns)
+    largest = frame.select(pl.max_horizontal(pl.col(columns).abs().max())).item() or 0
+    if largest:
+        limit = max(0, min(limit, int(math.log10(_MAX_SCALED / largest))))
+    exact = frame.select(
+        pl.max_horizontal(
+            ((pl.col(columns) * 10**digits).round() - pl.col(columns) * 10**digits).abs().max()
+        )
+        .le(1e-6)
+        .alias(str(digits))
+        for digits in range(limit + 1)
+    ).row(0)
+    return next((digits for digits, is_exact in enumerate(exact) if is_exact), limit)
+
+
+def encode(frame: pl.DataFrame, price_decimals: int, volume_decimals: int) -> pl.DataFrame:
+    """
+    Encode sorted OHLCV candles as integers, see the module documentation.
+    """
+
+    def scaled(name: str, digits: int) -> pl.Expr:
+        scale: int = 10**digits
+        return (pl.col(name) * scale).round().cast(pl.Int64)
+
+    open_, high, low, close = (scaled(name, price_decimals) for name in PRICE_COLUMNS)
+    return frame.select(
+        timestamp=pl.col("timestamp").diff().fill_null(pl.col("timestamp").first()),
+        open=open_ - close.shift().fill_null(0),
+        high=high - pl.max_horizontal(open_, close),
+        low=pl.min_horizontal(open_, close) - low,
+        close=close.diff().fill_null(close.first()),
+        volume=scaled("volume", volume_decimals),
+    )
+
+
+def decode(frame: pl.DataFrame, price_decimals: int, volume_decimals: int) -> pl.DataFrame:
+    """
+    Decode candles encoded by :func:`encode`.
+    """
+    price_scale = 10**price_decimals
+    close = pl.col("close").cum_sum()
+    return (
+        frame.lazy()
+        .with_columns(
+            timestamp=pl.col("timestamp").cum_sum(),
+            open=pl.col("open") + close.shift().fill_null(0),
+            close=close,
+        )
+        .select(
+            "timestamp",
+            "open",
+            high=pl.col("high") + pl.max_horizontal("open", "close"),
+            low=pl.min_horizontal("open", "close") - pl.col("low"),
+            close="close",
+            volume="volume",
+        )
+        .select(
+            "timestamp",
+            *(pl.col(name) / price_scale for name in PRICE_COLUMNS),
+            pl.col("volume") / 10**volume_decimals,
+        )
+        .collect()
+    )
+
+
+class CandleArchive:
+    """
+    Compressed, on disk, OHLCV candle archive, for a single exchange.
+    """
+
+    def __init__(self, path: pathlib.Path, exchange: str, compression_level: int = 19) -> None:
+        self.path = path / exchange
+        self.exchange = exchange
+        self.compression_level = compression_level
+
+    def __repr__(self) -> str:
+        """
+        Return the archive representation, including its path.
+        """
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
+
+    def candles_path(self, pair: str, timeframe: str) -> pathlib.Path:
+        """
+        Return the path to the archived ``pair`` candles file.
+        """
+        return self.path / timeframe / f"{pair_to_filename(pair)}.parquet"
+
+    def timeframes(self) -> list[str]:
+        """
+        Return the timeframes with archived candles.
+        """
+        if not self.path.is_dir():
+            return []
+        return sorted(path.name for path in self.path.iterdir() if path.is_dir())
+
+    def base_timeframes(self, pair: str, timeframe: str) -> list[str]:
+        """
+        Return the timeframes of the archived ``pair`` candles ``timeframe`` can be built from.
+
+        Including ``timeframe`` itself, when archived.
+        """
+        timeframes = []
+        for archived in self.timeframes():
+            if archived != timeframe and not can_resample(archived, timeframe):
+                continue
+            if self.candles_path(pair, archived).exists():
+                timeframes.append(archived)
+        return timeframes
+
+    def pairs(self, timeframe: str) -> list[str]:
+        """
+        Return the pairs with archived ``timeframe`` candles.
+        """
+        return sorted(
+            json.loads(pl.read_parquet_metadata(path)[_METADATA_KEY])["pair"]
+            for path in self.path.joinpath(timeframe).glob("*.parquet")
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The disk space used by the archived candles.
+        """
+        return sum(path.stat().st_size for path in self.path.glob("*/*.parquet"))
+
+    def load(
+        self,
+        pair: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pl.DataFrame:
+        """
+        Load the archived ``pair`` candles, sorted by timestamp.
+
+        :param start: Only load candles from this timestamp, in milliseconds, inclusive
+        :param end: Only load candles up to this timestamp, in milliseconds, exclusive
+        """
+        path = self.candles_path(pair, timeframe)
+        if not path.exists():
+            return pl.DataFrame(schema=OHLCV_SCHEMA)
+        details = json.loads(pl.read_parquet_metadata(path)[_METADATA_KEY])
+        frame = decode(pl.read_parquet(path), details["price_decimals"], details["volume_decimals"])
+        if start is not None:
+            frame = frame.filter(pl.col("timestamp") >= start)
+        if end is not None:
+            frame = frame.filter(pl.col("timestamp") < end)
+        return frame
+
+    def save(self, pair: str, timeframe: str, frame: pl.DataFrame) -> pathlib.Path:
+        """
+        Archive the ``pair`` candles, merging them with any already archived.
+
+        When both have a candle with the same timestamp, the one in ``frame`` is kept.
+        """
+        frame = pl.concat(
+            [
+                self.load(pair, timeframe),
+                frame.select(OHLCV_COLUMNS).cast(OHLCV_SCHEMA),  # type: ignore[arg-type]
+            ]
+        )
+        return self._write(
+            pair, timeframe, frame.unique("timestamp", keep="last").sort("timestamp")
+        )
+
+    def truncate(self, pair: str, timeframe: str, before: int) -> None:
+        """
+        Drop the archived ``pair`` candles older than ``before``, in milliseconds.
+        """
+        path = self.candles_path(pair, timeframe)
+        if not path.exists():
+            return
+        frame = self.load(pair, timeframe, start=before)
+        if frame.is_empty():
+            path.unlink()
+        else:
+            self._write(pair, timeframe, frame)
+
+    def _write(self, pair: str, timeframe: str, frame: pl.DataFrame) -> pathlib.Path:
+        price_decimals = decimals(frame, PRICE_COLUMNS)
+        volume_decimals = decimals(frame, ["volume"])
+        details = {
+            "pair": pair,
+            "price_decimals": price_decimals,
+            "volume_decimals": volume_decimals,
+        }
+        path = self.candles_path(pair, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, so that concurrent readers never see a partially written file
+        temp_path = path.with_suffix(".parquet.tmp")
+        encode(frame, price_decimals, volume_decimals).write_parquet(
+            temp_path,
+            compression="zstd",
+            compression_level=self.compression_level,
+            statistics=False,
+            metadata={_METADATA_KEY: json.dumps(details)},
+        )
+        temp_path.replace(path)
+        return path
+
+
+def archive_candles(store: CandleStore, archive: CandleArchive, before: int) -> int:
+    """
+    Move the stored candles older than ``before``, in milliseconds, to the ``archive``.
+
+    Returns the number of candles moved.
+    """
+    moved = 0
+    for timeframe in store.stored_timeframes():
+        for pair in store.pairs(timeframe):
+            path = store.candles_path(pair, timeframe)
+            if not path.exists():
+                # Resampled
+                continue
+            old = pl.scan_parquet(path).filter(pl.col("timestamp") < before).collect()
+            if old.is_empty():
+                continue
+            log.debug("Archiving %d %s %s candles", old.height, pair, timeframe)
+            archive.save(pair, timeframe, old)
+            store.truncate(pair, timeframe, before)
+            moved += old.height
+    return moved
+
+
+def apply_retention(archive: CandleArchive, rules: Iterable[tuple[int, str]], now: int) -> int:
+    """
+    Downsample the archived candles according to the retention ``rules``.
+
+    :param rules: The ``(age, timeframe)`` rules, the candles older than ``age``, in milliseconds,
+                  being downsampled to ``timeframe``
+    :param now: The current time, in milliseconds
+    :return: The number of candles downsampled
+    """
+    downsampled = 0
+    for age, timeframe in sorted(rules):
+        # Only downsample whole candles
+        before = align(now - age, timeframe)
+        for base_timeframe in archive.timeframes():
+            if not can_resample(base_timeframe, timeframe):
+                continue
+            for pair in archive.pairs(base_timeframe):
+                old = archive.load(pair, base_timeframe, end=before)
+                if old.is_empty():
+                    continue
+                log.debug(
+                    "Downsampling %d %s %s candles to %s",
+                    old.height,
+                    pair,
+                    base_timeframe,
+                    timeframe,
+                )
+                archive.save(
+                    pair, timeframe, resample(old, base_timeframe, timeframe, partial=True)
+                )
+                archive.truncate(pair, base_timeframe, before)
+                downsampled += old.height
+    return downsampled
@@ -0,0 +1,200 @@
+"""
+Trade to bar aggregation.
+
+Builds bars out of a stream of raw trades, as returned by ccxt's ``fetch_trades()`` or
+``watch_trades()``, for what the exchanges don't provide as klines:
+
+* ``time`` bars, of any interval, including sub-minute ones
+* ``tick`` bars, every given number of trades
+* ``volume`` bars, every given traded amount, in the base currency
+* ``dollar`` bars, every given traded value, in the quote currency
+
+A bar closes with the trade which reaches its size, trades are not split across bars. Time bars
+close with the first trade past their interval, or when :meth:`TradeAggregator.flush` is called.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+from typing import Optional
+
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators.abc import Candle
+
+BAR_KINDS = ("time", "tick", "volume", "dollar")
+
+BarSubscriber = Callable[[str, Candle], Any]
+
+
+class _BarState:
+    """
+    The bar being built for a single pair.
+
+    Updated in place, so aggregating a trade allocates nothing, only completed bars do.
+    """
+
+    __slots__ = ("timestamp", "end", "open", "high", "low", "close", "volume", "size")
+
+    def __init__(self) -> None:
+        self.timestamp = 0
+        self.end = 0
+        self.open = math.nan
+        self.high = -math.inf
+        self.low = math.inf
+        self.close = math.nan
+        self.volume = 0.0
+        # The accumulated amount, value or trades count, compared against the bar size
+        self.size = 0.0
+
+    def candle(self) -> Candle:
+        return Candle(self.timestamp, self.open, self.high, self.low, self.close, self.volume)
+
+
+def _is_new(trade: dict[str, Any], since: int, seen: set[str]) -> bool:
+    if trade["timestamp"] == since:
+        return trade["id"] not in seen
+    return bool(trade["timestamp"] > since)
+
+
+class TradeAggregator:
+    """
+    Aggregate the trades of many pairs into bars, and emit them to the subscribers.
+
+    :param kind: One of :data:`BAR_KINDS`
+    :param size: The bar size, in seconds for time bars, a number of trades for tick bars, an
+                 amount of the base currency for volume bars, and of the quote currency for dollar
+                 bars
+    """
+
+    def __init__(self, kind: str, size: float) -> None:
+        if kind not in BAR_KINDS:
+            raise OperationalException(
+                f"Unknown bar kind {kind!r}. Choose one of {', '.join(BAR_KINDS)}"
+            )
+        if size <= 0:
+            raise OperationalException("The bar size must be positive")
+        self.kind = kind
+        self.size = size
+        self.interval = int(size * 1000) if kind == "time" else 0
+        self._states: dict[str, _BarState] = {}
+        self._subscribers: list[BarSubscriber] = []
+        # The last fetched trade timestamp, and the IDs of the trades at it, per pair
+        self._fetched: dict[str, tuple[int, set[str]]] = {}
+
+    def subscribe(self, subscriber: BarSubscriber) -> None:
+        """
+        Call ``subscriber(pair, bar)`` with every completed bar.
+        """
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: BarSubscriber) -> None:
+        """
+        Stop calling ``subscriber``.
+        """
+        self._subscribers.remove(subscriber)
+
+    def _emit(self, pair: str, state: _BarState) -> None:
+        bar = state.candle()
+        state.open = math.nan
+        state.high = -math.inf
+        state.low = math.inf
+        state.volume = state.size = 0.0
+        for subscriber in self._subscribers:
+            subscriber(pair, bar)
+
+    def update(self, pair: str, timestamp: int, price: float, amount: float) -> None:
+        """
+        Aggregate a single ``pair`` trade.
+        """
+        try:
+            state = self._states[pair]
+        except KeyError:
+            state = self._states[pair] = _BarState()
+        interval = self.interval
+        if interval:
+            if timestamp >= state.end:
+                if state.open == state.open:
+                    self._emit(pair, state)
+                state.timestamp = timestamp - timestamp % interval
+                state.end = state.timestamp + interval
+        elif state.open != state.open:
+            # NaN, the first trade of the bar
+            state.timestamp = timestamp
+        if state.open != state.open:
+            state.open = state.high = state.low = price
+        elif price > state.high:
+            state.high = price
+        elif price < state.low:
+            state.low = price
+        state.close = price
+        state.volume += amount
+        if interval:
+            return
+        kind = self.kind
+        if kind == "tick":
+            state.size += 1
+        elif kind == "volume":
+            state.size += amount
+        else:
+            state.size += price * amount
+        if state.size >= self.size:
+            self._emit(pair, state)
+
+    def update_trades(self, pair: str, trades: Iterable[dict[str, Any]]) -> None:
+        """
+        Aggregate ccxt shaped ``pair`` trades, ordered by timestamp.
+        """
+        update = self.update
+        for trade in trades:
+            update(pair, trade["timestamp"], trade["price"], trade["amount"])
+
+    async def fetch(self, api: Any, pair: str, limit: Optional[int] = None) -> int:
+        """
+        Fetch, and aggregate, the ``pair`` trades since the last fetch.
+
+        ``api`` is a ccxt exchange client. Returns the number of new trades.
+        """
+        since, seen = self._fetched.get(pair, (None, set()))
+        trades: list[dict[str, Any]] = await api.fetch_trades(pair, since, limit)
+        if since is not None:
+            # The trades at the ``since`` timestamp are fetched again
+            trades = [trade for trade in trades if _is_new(trade, since, seen)]
+        if not trades:
+            return 0
+        self.update_trades(pair, trades)
+        last = trades[-1]["timestamp"]
+        ids = {trade["id"] for trade in trades if trade["timestamp"] == last}
+        if last == since:
+            ids |= seen
+        self._fetched[pair] = (last, ids)
+        return len(trades)
+
+    def flush(self, timestamp: int) -> None:
+        """
+        Emit the time bars which closed by ``timestamp``, in milliseconds.
+
+        The bars are emitted even without any trades past them.
+        """
+        if not self.interval:
+            return
+        for pair, state in self._states.items():
+            if state.open == state.open and state.end <= timestamp:
+                self._emit(pair, state)
+
+    def partial(self, pair: str) -> Optional[Candle]:
+        """
+        Return the ``pair`` bar being built, if any.
+        """
+        state = self._states.get(pair)
+        if state is None or state.open != state.open:
+            return None
+        return state.candle()
+
+    def remove(self, pair: str) -> None:
+        """
+        Forget the ``pair`` bar being built.
+        """
+        self._states.pop(pair, None)
+        self._fetched.pop(pair, None)
@@ -0,0 +1,264 @@
+"""
+Stored candle history gap detection and repair.
+
+Exchange outages and interrupted downloads leave missing, or duplicated, candles in the stored
+history. :func:`scan_gaps` finds them with vectorized timestamp diffs, and :func:`repair_gaps`
+fetches the missing candles back from the exchange, issuing as few ``fetch_ohlcv()`` requests as
+possible.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+from collections.abc import Iterable
+from typing import Any
+from typing import Optional
+
+import ccxt
+import polars as pl
+
+from mcookbook.data.resample import align
+from mcookbook.data.resample import can_resample
+from mcookbook.data.resample import timeframe_interval
+from mcookbook.data.store import CandleStore
+from mcookbook.data.store import OHLCV_SCHEMA
+from mcookbook.utils.clock import get_clock
+
+log = logging.getLogger(__name__)
+
+GAPS_SCHEMA = {
+    "pair": pl.Utf8,
+    "kind": pl.Utf8,
+    "start": pl.Int64,
+    "end": pl.Int64,
+    "candles": pl.Int64,
+}
+
+# The number of pairs whose candles are loaded, and scanned in parallel, at once
+_SCAN_BATCH_SIZE = 32
+
+
+def find_gaps(
+    frame: pl.DataFrame | pl.LazyFrame,
+    timeframe: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> pl.LazyFrame:
+    """
+    Find the missing and duplicated candles of a single pair.
+
+    :param frame: The pair candles, at least their ``timestamp`` column
+    :param start: Also report the candles missing from this timestamp, in milliseconds
+    :param end: Also report the candles missing up to this timestamp, in milliseconds, exclusive
+    :return: A query with the :data:`GAPS_SCHEMA` columns, but ``pair``. ``missing`` gaps span
+             from their first missing candle open time, ``start``, to the next stored candle open
+             time, ``end``. ``duplicate`` gaps span a single candle, stored ``candles`` extra times.
+    """
+    interval = timeframe_interval(timeframe)[0]
+    query = frame.lazy().select("timestamp")
+    sentinels = []
+    if start is not None:
+        start = align(start, timeframe, up=True)
+        query = query.filter(pl.col("timestamp") >= start)
+        # Reports the candles missing at the start, like the ones at the end, as a gap
+        sentinels.append(start - interval)
+    if end is not None:
+        end = align(end, timeframe, up=True)
+        query = query.filter(pl.col("timestamp") < end)
+        sentinels.append(end)
+    if sentinels:
+        query = pl.concat(
+            [query, pl.LazyFrame({"timestamp": sentinels}, schema={"timestamp": pl.Int64})]
+        )
+    steps = query.sort("timestamp").select("timestamp", previous=pl.col("timestamp").shift())
+    missing = steps.filter(pl.col("timestamp") - pl.col("previous") > interval).select(
+        kind=pl.lit("missing"),
+        start=pl.col("previous") + interval,
+        end="timestamp",
+        candles=(pl.col("timestamp") - pl.col("previous")) // interval - 1,
+    )
+    duplicates = (
+        steps.filter(pl.col("timestamp") == pl.col("previous"))
+        .group_by("timestamp")
+        .agg(candles=pl.len().cast(pl.Int64))
+        .select(
+            kind=pl.lit("duplicate"),
+            start="timestamp",
+            end=pl.col("timestamp") + interval,
+            candles="candles",
+        )
+    )
+    return pl.concat([missing, duplicates]).sort("start")
+
+
+def _downsampled_until(store: CandleStore, pair: str, timeframe: str) -> Optional[int]:
+    # The close time of the newest archived candle downsampled from ``timeframe`` ones, if any
+    until: Optional[int] = None
+    for archived in store.archive.timeframes():
+        if not can_resample(timeframe, archived):
+            continue
+        if not store.archive.candles_path(pair, archived).exists():
+            continue
+        frame = store.archive.load(pair, archived)
+        if frame.is_empty():
+            continue
+        # Sorted by timestamp
+        close: int = frame.item(-1, "timestamp") + timeframe_interval(archived)[0]
+        until = close if until is None else max(until, close)
+    return until
+
+
+def scan_gaps(
+    store: CandleStore,
+    timeframe: str,
+    pairs: Optional[Iterable[str]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> pl.DataFrame:
+    """
+    Find the missing and duplicated stored ``timeframe`` candles of ``pairs``.
+
+    Only the stored, and archived, candles are scanned, the resampled timeframes inherit the gaps
+    of the stored ones. The range the archive retention rules downsampled to a coarser timeframe is
+    not missing. When both ``start`` and ``end`` are passed, the pairs without any stored, or
+    archived, candles are reported as missing them all.
+
+    :param pairs: The pairs to scan, by default all of those with stored ``timeframe`` candles
+    :return: A data frame with the :data:`GAPS_SCHEMA` columns, sorted by pair and start
+    """
+    if pairs is None:
+        pairs = [
+            pair
+            for pair in store.pairs(timeframe)
+            if any(
+                path.exists()
+                for path in (
+                    store.candles_path(pair, timeframe),
+                    store.archive.candles_path(pair, timeframe),
+                )
+            )
+        ]
+    queries: list[pl.LazyFrame] = []
+    for pair in pairs:
+        frame = store.scan(pair, timeframe)
+        if frame is None:
+            if start is None or end is None:
+                continue
+            frame = pl.LazyFrame({"timestamp": []}, schema={"timestamp": pl.Int64})
+        pair_start = start
+        downsampled_until = _downsampled_until(store, pair, timeframe)
+        if pair_start is not None and downsampled_until is not None:
+            pair_start = max(pair_start, downsampled_until)
+        queries.append(
+            find_gaps(frame, timeframe, pair_start, end).select(
+                pl.lit(pair).alias("pair"), pl.all()
+            )
+        )
+    frames = [pl.DataFrame(schema=GAPS_SCHEMA)]
+    # Scan the pairs in parallel, without loading the candles of all of them at once
+    for idx in range(0, len(queries), _SCAN_BATCH_SIZE):
+        end_idx = idx + _SCAN_BATCH_SIZE
+        frames.extend(pl.collect_all(queries[idx:end_idx]))
+    return pl.concat(frames).cast(GAPS_SCHEMA).sort("pair", "start")  # type: ignore[arg-type]
+
+
+def plan_requests(gaps: pl.DataFrame, timeframe: str, limit: int) -> list[tuple[str, int, int]]:
+    """
+    Return the fewest ``fetch_ohlcv()`` requests, of up to ``limit`` candles, to fill the gaps.
+
+    Only the ``missing`` gaps are filled.
+
+    :return: The ``(pair, since, until)`` requests, ``until`` being exclusive
+    """
+    interval = timeframe_interval(timeframe)[0]
+    span = limit * interval
+    requests: list[tuple[str, int, int]] = []
+    missing = gaps.filter(pl.col("kind") == "missing").sort("pair", "start")
+    for pair, start, end in missing.select("pair", "start", "end").iter_rows():
+        if requests and requests[-1][0] == pair:
+            # The previous request may already cover this gap, or part of it
+            start = max(start, requests[-1][2])
+        while start < end:
+            requests.append((pair, start, start + span))
+            start += span
+    return requests
+
+
+async def repair_gaps(
+    store: CandleStore,
+    api: Any,
+    timeframe: str,
+    gaps: pl.DataFrame,
+    limit: int = 1000,
+    concurrency: int = 8,
+) -> dict[str, int]:
+    """
+    Fill the ``gaps``, as returned by :func:`scan_gaps`.
+
+    The missing candles are fetched from ``api``, a ccxt exchange client, and the duplicated ones
+    dropped.
+
+    Up to ``concurrency`` requests are in flight at once, ccxt's own rate limiting, when enabled,
+    keeping them within the exchange rate limits. Candles the exchange does not have, like during
+    its own outages, are left missing.
+
+    :param limit: The maximum number of candles the exchange returns per request
+    :return: The number of candles stored, per pair
+    """
+    interval = timeframe_interval(timeframe)[0]
+    semaphore = asyncio.Semaphore(concurrency)
+    requests: dict[str, list[tuple[int, int]]] = {}
+    for pair, since, until in plan_requests(gaps, timeframe, limit):
+        requests.setdefault(pair, []).append((since, until))
+    missing: dict[str, list[tuple[int, int]]] = {}
+    for pair, start, end in (
+        gaps.filter(pl.col("kind") == "missing").sort("start").select("pair", "start", "end")
+    ).iter_rows():
+        missing.setdefault(pair, []).append((start, end))
+    duplicated = set(gaps.filter(pl.col("kind") == "duplicate")["pair"].to_list())
+    log.info(
+        "Repairing the %s candles of %d pairs, with %d requests",
+        timeframe,
+        len(missing.keys() | duplicated),
+        sum(len(pair_requests) for pair_requests in requests.values()),
+    )
+
+    async def fetch(pair: str, since: int) -> list[list[Any]]:
+        async with semaphore:
+            try:
+                candles: list[list[Any]] = await api.fetch_ohlcv(pair, timeframe, since, limit)
+            except ccxt.BaseError as exc:
+                log.warning(
+                    "Failed to fetch the %s %s candles since %d: %s", pair, timeframe, since, exc
+                )
+                return []
+            return candles
+
+    def in_gaps(pair: str, timestamp: int) -> bool:
+        ranges = missing[pair]
+        idx = bisect.bisect_right(ranges, (timestamp, float("inf"))) - 1
+        return idx >= 0 and ranges[idx][0] <= timestamp < ranges[idx][1]
+
+    async def repair(pair: str) -> tuple[str, int]:
+        # Only keep the closed candles
+        now = int(get_clock().time() * 1000)
+        responses = await asyncio.gather(
+            *[fetch(pair, since) for since, _ in requests.get(pair, [])]
+        )
+        rows = [
+            row
+            for candles in responses
+            for row in candles
+            if in_gaps(pair, row[0]) and row[0] + interval <= now
+        ]
+        if not rows and pair not in duplicated:
+            return pair, 0
+        frame = pl.DataFrame(rows, schema=OHLCV_SCHEMA, orient="row", strict=False)
+        # Saving also drops the duplicated candles
+        await asyncio.get_running_loop().run_in_executor(None, store.save, pair, timeframe, frame)
+        return pair, frame.height
+
+    return dict(
+        await asyncio.gather(*[repair(pair) for pair in sorted(missing.keys() | duplicated)])
+    )
@@ -0,0 +1,180 @@
+"""
+OHLCV candle resampling.
+
+Higher timeframe candles are derived from a single, lower, base timeframe, so that only the base
+timeframe has to be fetched from the exchange and stored. Candles are aligned like the exchanges
+align them, to the epoch, except weekly candles which open on Mondays.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import ccxt
+import polars as pl
+
+from mcookbook.data.synthetic import OHLCV_COLUMNS
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators.abc import Candle
+
+# The epoch was on a Thursday, weekly candles open 4 days later, on Mondays
+_WEEK_OFFSET = 4 * 86_400_000
+
+OHLCV_AGGREGATIONS = (
+    pl.col("open").first(),
+    pl.col("high").max(),
+    pl.col("low").min(),
+    pl.col("close").last(),
+    pl.col("volume").sum(),
+)
+
+
+def timeframe_interval(timeframe: str) -> tuple[int, int]:
+    """
+    Return the ``timeframe`` interval and its alignment offset, both in milliseconds.
+
+    :raises OperationalException: For the monthly and yearly timeframes, which don't have a fixed
+                                  interval
+    """
+    if timeframe[-1] in ("M", "y"):
+        raise OperationalException(f"The {timeframe} timeframe does not have a fixed interval")
+    interval = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+    offset = _WEEK_OFFSET % interval if timeframe[-1] == "w" else 0
+    return interval, offset
+
+
+def can_resample(base_timeframe: str, timeframe: str) -> bool:
+    """
+    Return ``True`` if ``timeframe`` candles can be built from ``base_timeframe`` candles.
+    """
+    try:
+        base_interval, base_offset = timeframe_interval(base_timeframe)
+        interval, offset = timeframe_interval(timeframe)
+    except (OperationalException, ValueError):
+        return False
+    if interval <= base_interval or interval % base_interval:
+        return False
+    # The candles must also open at base timeframe candle boundaries
+    return not (offset - base_offset) % base_interval
+
+
+def align(timestamp: int, timeframe: str, up: bool = False) -> int:
+    """
+    Return the open time of the ``timeframe`` candle ``timestamp`` falls in.
+
+    With ``up``, return the open time of the next candle instead, unless ``timestamp`` is already
+    a candle open time.
+    """
+    interval, offset = timeframe_interval(timeframe)
+    aligned = timestamp - (timestamp - offset) % interval
+    if up and aligned != timestamp:
+        aligned += interval
+    return aligned
+
+
+def _check(base_timeframe: str, timeframe: str) -> tuple[int, int, int]:
+    if not can_resample(base_timeframe, timeframe):
+        raise OperationalException(
+            f"{timeframe} candles can't be built from {base_timeframe} candles"
+        )
+    base_interval = timeframe_interval(base_timeframe)[0]
+    interval, offset = timeframe_interval(timeframe)
+    return base_interval, interval, offset
+
+
+def resample(
+    frame: pl.DataFrame | pl.LazyFrame,
+    base_timeframe: str,
+    timeframe: str,
+    partial: bool = False,
+) -> pl.DataFrame:
+    """
+    Build ``timeframe`` candles from the ``base_timeframe`` candles in ``frame``.
+
+    :param frame: The base candles, sorted by timestamp
+    :param partial: Keep the last candle, even if the base candles do not cover all of it yet
+    :return: A data frame with the :data:`OHLCV_COLUMNS` columns, sorted by timestamp
+    """
+    base_interval, interval, offset = _check(base_timeframe, timeframe)
+    query = (
+        frame.lazy()
+        .select(OHLCV_COLUMNS)
+        .set_sorted("timestamp")
+        .group_by_dynamic("timestamp", every=f"{interval}i", offset=f"{offset}i")
+        .agg(*OHLCV_AGGREGATIONS, covered=pl.col("timestamp").last() + base_interval)
+    )
+    if not partial:
+        # Only keep the candles the base candles cover up to their close, gaps aside
+        query = query.filter(pl.col("timestamp") + interval <= pl.col("covered").max())
+    return query.drop("covered").collect()
+
+
+class Resampler:
+    """
+    Incrementally build higher timeframe candles from a stream of base timeframe candles.
+
+    Several timeframes are built at once, for many pairs.
+
+    :param base_timeframe: The timeframe of the candles passed to :meth:`Resampler.update`
+    :param timeframes: The timeframes to build
+    """
+
+    def __init__(self, base_timeframe: str, timeframes: list[str]) -> None:
+        self.base_timeframe = base_timeframe
+        self.timeframes: dict[str, tuple[int, int]] = {}
+        base_interval = 0
+        for timeframe in timeframes:
+            base_interval, interval, offset = _check(base_timeframe, timeframe)
+            self.timeframes[timeframe] = (interval, offset)
+        self.base_interval = base_interval
+        self._partials: dict[tuple[str, str], Candle] = {}
+
+    def update(self, pair: str, candle: Candle) -> list[tuple[str, Candle]]:
+        """
+        Update the ``pair`` partial candles with a closed base ``candle``.
+
+        Returns the ``(timeframe, candle)`` candles the base candle completed. A candle is also
+        completed when the next base candle falls past its close, if the base candles have gaps.
+        """
+        completed: list[tuple[str, Candle]] = []
+        partials = self._partials
+        timestamp = candle.timestamp
+        close_time = timestamp + self.base_interval
+        for timeframe, (interval, offset) in self.timeframes.items():
+            key = (pair, timeframe)
+            start = timestamp - (timestamp - offset) % interval
+            current = partials.get(key)
+            if current is not None and current.timestamp > start:
+                # Out of order
+                continue
+            if current is None or current.timestamp < start:
+                if current is not None:
+                    completed.append((timeframe, current))
+                current = candle._replace(timestamp=start)
+            else:
+                current = Candle(
+                    start,
+                    current.open,
+                    max(current.high, candle.high),
+                    min(current.low, candle.low),
+                    candle.close,
+                    current.volume + candle.volume,
+                )
+            if close_time == start + interval:
+                completed.append((timeframe, current))
+                partials.pop(key, None)
+            else:
+                partials[key] = current
+        return completed
+
+    def partial(self, pair: str, timeframe: str) -> Optional[Candle]:
+        """
+        Return the ``pair`` partial, still open, ``timeframe`` candle, if any.
+        """
+        return self._partials.get((pair, timeframe))
+
+    def remove(self, pair: str) -> None:
+        """
+        Forget the ``pair`` partial candles.
+        """
+        for timeframe in self.timeframes:
+            self._partials.pop((pair, timeframe), None)
@@ -0,0 +1,267 @@
+"""
+Fixed capacity ring buffers, for the live candle windows.
+
+Each column is a preallocated ``array.array``, twice the capacity long, every value written twice,
+at its position and one capacity further. The window, oldest value first, is then always a
+contiguous slice of the array, exposed as a zero-copy ``memoryview``, while appending is still a
+constant time operation which never allocates. Memory stays the same however long a bot runs.
+"""
+from __future__ import annotations
+
+import array
+from collections.abc import Iterable
+from typing import Any
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.data.store import OHLCV_SCHEMA
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators.abc import Candle
+
+_TYPECODES = {pl.Int64: "q", pl.Float64: "d"}
+
+
+class RingBuffer:
+    """
+    A fixed capacity ring buffer of ``int`` or ``float`` values.
+
+    :param capacity: The number of values kept, older values are overwritten
+    :param typecode: The ``array`` typecode, ``d`` for floats or ``q`` for integers
+    """
+
+    __slots__ = ("capacity", "_data", "_memory", "_next", "_size")
+
+    def __init__(self, capacity: int, typecode: str = "d") -> None:
+        if capacity < 1:
+            raise OperationalException("The ring buffer capacity must be positive")
+        self.capacity = capacity
+        self._data: array.array[Any] = array.array(
+            typecode, bytes(2 * capacity * array.array(typecode).itemsize)
+        )
+        # The array is never resized, so it can be exported once
+        self._memory = memoryview(self._data)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of values.
+        """
+        return self._size
+
+    def __repr__(self) -> str:
+        """
+        Return the buffer representation, including its values, oldest first.
+        """
+        return f"{self.__class__.__name__}({self.view().tolist()!r}, capacity={self.capacity})"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the values.
+        """
+        return self._data.buffer_info()[1] * self._data.itemsize
+
+    def append(self, value: float) -> None:
+        """
+        Append ``value``, overwriting the oldest one when full.
+        """
+        position = self._next
+        data = self._data
+        data[position] = data[position + self.capacity] = value
+        self._next = (position + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def replace_last(self, value: float) -> None:
+        """
+        Replace the newest value.
+        """
+        if not self._size:
+            raise IndexError("The ring buffer is empty")
+        position = (self._next - 1) % self.capacity
+        self._data[position] = self._data[position + self.capacity] = value
+
+    def view(self) -> memoryview:
+        """
+        Return a zero-copy view of the values, oldest first.
+
+        The view is only valid until the next append.
+        """
+        start = (self._next - self._size) % self.capacity
+        end = start + self._size
+        return self._memory[start:end]
+
+    def last(self) -> float:
+        """
+        Return the newest value.
+        """
+        if not self._size:
+            raise IndexError("The ring buffer is empty")
+        return self._data[(self._next - 1) % self.capacity]  # type: ignore[no-any-return]
+
+    def clear(self) -> None:
+        """
+        Remove all values.
+        """
+        self._next = self._size = 0
+
+
+class CandleWindow:
+    """
+    The last ``capacity`` candles of a pair and timeframe, one :class:`RingBuffer` per column.
+
+    :param capacity: The number of candles kept
+    :param columns: Extra ``float`` columns kept along the OHLCV ones, like indicator values
+    """
+
+    __slots__ = ("capacity", "columns", "buffers", "_timestamps")
+
+    def __init__(self, capacity: int, columns: Iterable[str] = ()) -> None:
+        self.capacity = capacity
+        self.columns: tuple[str, ...] = (*OHLCV_SCHEMA, *columns)
+        self.buffers: dict[str, RingBuffer] = {
+            name: RingBuffer(capacity, _TYPECODES.get(OHLCV_SCHEMA.get(name, pl.Float64), "d"))
+            for name in self.columns
+        }
+        self._timestamps = self.buffers["timestamp"]
+
+    def __len__(self) -> int:
+        """
+        Return the number of candles.
+        """
+        return len(self._timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the candles.
+        """
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        """
+        The newest candle timestamp, if any.
+        """
+        if not len(self._timestamps):
+            return None
+        return int(self._timestamps.last())
+
+    def append(self, candle: Candle, *values: Optional[float]) -> None:
+        """
+        Append a ``candle``, and the values of the extra columns, ``None`` meaning missing.
+        """
+        for buffer, value in zip(self.buffers.values(), (*candle, *values)):
+            buffer.append(float("nan") if value is None else value)
+
+    def replace_last(self, candle: Candle, *values: Optional[float]) -> None:
+        """
+        Replace the newest candle, like when updating the still open candle.
+        """
+        for buffer, value in zip(self.buffers.values(), (*candle, *values)):
+            buffer.replace_last(float("nan") if value is None else value)
+
+    def column(self, name: str) -> memoryview:
+        """
+        Return a zero-copy view of the ``name`` column values, oldest first.
+        """
+        return self.buffers[name].view()
+
+    def last(self) -> Candle:
+        """
+        Return the newest candle.
+        """
+        timestamp, *values = (self.buffers[name].last() for name in OHLCV_SCHEMA)
+        return Candle(int(timestamp), *values)
+
+    def frame(self) -> pl.DataFrame:
+        """
+        Return the candles as a data frame, oldest first.
+
+        polars can't wrap Python buffers, so each column is copied, once.
+        """
+        return pl.DataFrame(
+            [
+                pl.Series(name, buffer.view(), dtype=OHLCV_SCHEMA.get(name, pl.Float64))
+                for name, buffer in self.buffers.items()
+            ]
+        ).fill_nan(None)
+
+
+class CandleWindows:
+    """
+    A :class:`CandleWindow` per pair and timeframe.
+
+    :param capacity: The number of candles kept per pair and timeframe
+    :param columns: Extra ``float`` columns kept along the OHLCV ones
+    """
+
+    def __init__(self, capacity: int, columns: Iterable[str] = ()) -> None:
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self._windows: dict[tuple[str, str], CandleWindow] = {}
+
+    def __len__(self) -> int:
+        """
+        Return the number of windows.
+        """
+        return len(self._windows)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by all the windows.
+        """
+        return sum(window.nbytes for window in self._windows.values())
+
+    def get(self, pair: str, timeframe: str) -> CandleWindow:
+        """
+        Return the ``pair`` and ``timeframe`` window, creating it if needed.
+        """
+        key = (pair, timeframe)
+        try:
+            return self._windows[key]
+        except KeyError:
+            window = self._windows[key] = CandleWindow(self.capacity, self.columns)
+            return window
+
+    def append(self, pair: str, timeframe: str, candle: Candle, *values: Optional[float]) -> None:
+        """
+        Append a ``pair`` and ``timeframe`` candle.
+        """
+        self.get(pair, timeframe).append(candle, *values)
+
+    def remove(self, pair: str, timeframe: Optional[str] = None) -> None:
+        """
+        Drop the ``pair`` windows, of all timeframes unless a ``timeframe`` is passed.
+        """
+        for key in [key for key in self._windows if key[0] == pair]:
+            if timeframe is None or key[1] == timeframe:
+                del self._windows[key]
+
+    def frame(self, timeframe: str, pairs: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Return the ``timeframe`` windows of ``pairs``, all by default, as a single data frame.
+
+        The frame has a leading ``pair`` column.
+        """
+        keys = (
+            [key for key in self._windows if key[1] == timeframe]
+            if pairs is None
+            else [(pair, timeframe) for pair in pairs if (pair, timeframe) in self._windows]
+        )
+        windows = [self._windows[key] for key in keys]
+        columns: dict[str, Any] = {
+            "pair": pl.Series(
+                "pair",
+                [pair for (pair, _), window in zip(keys, windows) for _ in range(len(window))],
+                dtype=pl.Utf8,
+            )
+        }
+        for name in (*OHLCV_SCHEMA, *self.columns):
+            values = array.array("q" if name == "timestamp" else "d")
+            values.frombytes(b"".join([window.buffers[name].view() for window in windows]))
+            columns[name] = pl.Series(name, values, dtype=OHLCV_SCHEMA.get(name, pl.Float64))
+        return pl.DataFrame(columns).fill_nan(None)
@@ -0,0 +1,182 @@
+"""
+Live state sharing, through Arrow IPC files.
+
+The live state, the pair list, the tickers and the candle windows, is published as uncompressed
+Arrow IPC files, laid out as::
+
+    <basedir>/live/<exchange>/pairlist.arrow
+    <basedir>/live/<exchange>/tickers.arrow
+    <basedir>/live/<exchange>/candles/<timeframe>.arrow
+
+The live service publishes the pair list, and, when sharded, the tickers. It does not keep any
+candle windows, so it never publishes candles, those are left to the processes which do keep
+them, through :meth:`LiveStateWriter.publish_candles`.
+
+Notebooks, or any other process, read them with :class:`LiveStateReader`, without any exchange
+API requests. The files are memory mapped, by ``pyarrow`` when it's installed, or else by polars
+itself, so the numeric columns are read without copying them. String columns, like the pairs and
+the ticker symbols, are still copied when converted to polars. Files are replaced atomically, so
+readers never see a partially written file, and keep using the previous one until they read it
+again.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+from collections.abc import Iterable
+from typing import Any
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.sharding.shm import CCXT_TICKER_KEYS
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    HAS_PYARROW = False
+
+log = logging.getLogger(__name__)
+
+TICKERS_SCHEMA = {
+    "symbol": pl.Utf8,
+    **{key: pl.Int64 if key == "timestamp" else pl.Float64 for key in CCXT_TICKER_KEYS},
+}
+
+ENVIRON_KEY = "MCB_LIVE_STATE_DIR"
+
+
+class LiveStateWriter:
+    """
+    Publish the live state of an exchange.
+
+    Publishing writes to disk, so the live service runs it off the event loop, in an executor.
+
+    :param path: The directory to publish the state to, usually ``<basedir>/live/<exchange>``
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    def _write(self, name: str, frame: pl.DataFrame) -> None:
+        path = self.path / f"{name}.arrow"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, so that readers never see a partially written file. Readers which
+        # memory mapped the previous file keep it until they unmap it.
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        frame.write_ipc(temp_path, compression="uncompressed")
+        temp_path.replace(path)
+
+    def publish_pairlist(self, pairs: Iterable[str]) -> None:
+        """
+        Publish the pair list.
+        """
+        self._write("pairlist", pl.DataFrame({"pair": list(pairs)}, schema={"pair": pl.Utf8}))
+
+    def publish_tickers(self, tickers: dict[str, dict[str, Any]]) -> None:
+        """
+        Publish ccxt ``fetch_tickers()`` tickers.
+        """
+        self._write(
+            "tickers",
+            pl.DataFrame(
+                [
+                    (symbol, *(ticker.get(key) for key in CCXT_TICKER_KEYS))
+                    for symbol, ticker in tickers.items()
+                ],
+                schema=TICKERS_SCHEMA,
+                orient="row",
+                strict=False,
+            ),
+        )
+
+    def publish_candles(self, timeframe: str, frame: pl.DataFrame) -> None:
+        """
+        Publish the candle windows of a timeframe.
+
+        :param frame: The candle windows, like those returned by
+                      :meth:`~mcookbook.data.CandleWindows.frame`
+        """
+        self._write(f"candles/{timeframe}", frame)
+
+
+class LiveStateReader:
+    """
+    Read the live state published by a :class:`LiveStateWriter`.
+
+    :param path: The directory the state is published to
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    @classmethod
+    def from_environ(cls) -> LiveStateReader:
+        """
+        Return a reader of the live state directory passed by the notebook command.
+        """
+        try:
+            return cls(pathlib.Path(os.environ[ENVIRON_KEY]))
+        except KeyError:
+            raise RuntimeError(
+                f"The {ENVIRON_KEY} environment variable is not set. Was the notebook started with "
+                "the notebook command?"
+            ) from None
+
+    def _read(self, name: str) -> Optional[pl.DataFrame]:
+        path = self.path / f"{name}.arrow"
+        if not path.exists():
+            return None
+        if HAS_PYARROW:
+            with pyarrow.memory_map(str(path)) as source:
+                table = pyarrow.ipc.open_file(source).read_all()
+            return pl.from_arrow(table)  # type: ignore[return-value]
+        return pl.read_ipc(path)
+
+    def updated(self, name: str) -> Optional[float]:
+        """
+        Return when ``name`` was last published, as a timestamp in seconds, if ever.
+
+        :param name: One of ``pairlist``, ``tickers`` or ``candles/<timeframe>``
+        """
+        path = self.path / f"{name}.arrow"
+        if not path.exists():
+            return None
+        return path.stat().st_mtime
+
+    def pairlist(self) -> list[str]:
+        """
+        Return the published pair list.
+        """
+        frame = self._read("pairlist")
+        if frame is None:
+            return []
+        return frame["pair"].to_list()
+
+    def tickers(self) -> pl.DataFrame:
+        """
+        Return the published tickers, with the :data:`TICKERS_SCHEMA` columns.
+        """
+        frame = self._read("tickers")
+        if frame is None:
+            return pl.DataFrame(schema=TICKERS_SCHEMA)
+        return frame
+
+    def timeframes(self) -> list[str]:
+        """
+        Return the timeframes with published candle windows.
+        """
+        return sorted(path.stem for path in self.path.joinpath("candles").glob("*.arrow"))
+
+    def candles(self, timeframe: str) -> pl.DataFrame:
+        """
+        Return the published ``timeframe`` candle windows, with a leading ``pair`` column.
+        """
+        frame = self._read(f"candles/{timeframe}")
+        if frame is None:
+            raise FileNotFoundError(f"No {timeframe} candles published in {self.path}")
+        return frame
@@ -0,0 +1,265 @@
+"""
+On disk OHLCV candle store.
+
+Candles are stored as parquet files, one per pair and timeframe, laid out as::
+
+    <basedir>/data/<exchange>/<timeframe>/<BASE>_<QUOTE>.parquet
+
+Along with the exchange markets, in ``<basedir>/data/<exchange>/markets.json``.
+
+Timeframes which are not stored are resampled, when loaded, from the highest stored timeframe they
+can be built from, so storing the ``1m`` candles is enough to load any other timeframe.
+
+The older candles, moved to the :class:`~mcookbook.data.CandleArchive` in ``<basedir>/archive``,
+are loaded from there, and merged with the stored ones, including those downsampled to a coarser
+timeframe by the archive retention rules.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from typing import Any
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.data.resample import align
+from mcookbook.data.resample import can_resample
+from mcookbook.data.resample import resample
+from mcookbook.data.resample import timeframe_interval
+from mcookbook.data.synthetic import OHLCV_COLUMNS
+
+log = logging.getLogger(__name__)
+
+OHLCV_SCHEMA = {
+    "timestamp": pl.Int64,
+    "open": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "close": pl.Float64,
+    "volume": pl.Float64,
+}
+
+
+def pair_to_filename(pair: str) -> str:
+    """
+    Return the file name, without extension, used to store ``pair``.
+    """
+    return pair.replace("/", "_").replace(":", "_")
+
+
+class CandleStore:
+    """
+    On disk OHLCV candle store, for a single exchange.
+    """
+
+    def __init__(self, path: pathlib.Path, exchange: str) -> None:
+        # The archive module builds on this one
+        from mcookbook.data.archive import CandleArchive  # pylint: disable=import-outside-toplevel
+
+        self.path = path / exchange
+        self.exchange = exchange
+        self.archive = CandleArchive(path.parent / "archive", exchange)
+
+    def __repr__(self) -> str:
+        """
+        Return the store representation, including its path.
+        """
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
+
+    def candles_path(self, pair: str, timeframe: str) -> pathlib.Path:
+        """
+        Return the path to the ``pair`` candles file.
+        """
+        return self.path / timeframe / f"{pair_to_filename(pair)}.parquet"
+
+    def stored_timeframes(self) -> list[str]:
+        """
+        Return the timeframes with stored candles.
+        """
+        if not self.path.is_dir():
+            return []
+        return sorted(path.name for path in self.path.iterdir() if path.is_dir())
+
+    def base_timeframe(self, pair: str, timeframe: str) -> Optional[str]:
+        """
+        Return the stored timeframe the ``pair`` candles are resampled from, to load ``timeframe``.
+
+        Returns ``None`` when ``timeframe`` is stored, or can't be built from the stored ones.
+        """
+        if self.candles_path(pair, timeframe).exists():
+            return None
+        candidates = [
+            stored
+            for stored in self.stored_timeframes()
+            if can_resample(stored, timeframe) and self.candles_path(pair, stored).exists()
+        ]
+        if not candidates:
+            return None
+        # The fewer candles to aggregate the better
+        return max(candidates, key=lambda stored: timeframe_interval(stored)[0])
+
+    def source_timeframes(self, pair: str, timeframe: str) -> list[str]:
+        """
+        Return the stored, and archived, timeframes the ``pair`` ``timeframe`` candles are built from.
+
+        That is the stored timeframe, or the one it's resampled from, and the archived timeframes
+        it can be built from, coarsest first.
+        """
+        timeframes = set(self.archive.base_timeframes(pair, timeframe))
+        if self.candles_path(pair, timeframe).exists():
+            timeframes.add(timeframe)
+        else:
+            base_timeframe = self.base_timeframe(pair, timeframe)
+            if base_timeframe is not None:
+                timeframes.add(base_timeframe)
+        return sorted(timeframes, key=lambda stored: timeframe_interval(stored)[0], reverse=True)
+
+    def has_candles(self, pair: str, timeframe: str) -> bool:
+        """
+        Return ``True`` if candles are stored, or archived, for ``pair``, or can be resampled.
+        """
+        if self.candles_path(pair, timeframe).exists():
+            return True
+        return bool(self.source_timeframes(pair, timeframe))
+
+    def scan(self, pair: str, timeframe: str) -> Optional[pl.LazyFrame]:
+        """
+        Return the stored, and archived, ``pair`` ``timeframe`` candles, if any.
+
+        When both have a candle with the same timestamp, the stored one is kept.
+        """
+        path = self.candles_path(pair, timeframe)
+        stored = pl.scan_parquet(path).select(OHLCV_COLUMNS) if path.exists() else None
+        if not self.archive.candles_path(pair, timeframe).exists():
+            return stored
+        archived = self.archive.load(pair, timeframe).lazy()
+        if stored is None:
+            return archived
+        return pl.concat(
+            [stored, archived.join(stored.select("timestamp"), on="timestamp", how="anti")]
+        ).sort("timestamp")
+
+    def load(
+        self,
+        pair: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pl.DataFrame:
+        """
+        Load the ``pair`` candles, sorted by timestamp.
+
+        The stored candles are merged with the archived ones. Candles of a coarser source timeframe
+        are only used outside of the time range of those of a finer one.
+
+        :param start: Only load candles from this timestamp, in milliseconds, inclusive
+        :param end: Only load candles up to this timestamp, in milliseconds, exclusive
+        """
+        # Only load the base candles of the whole resampled candles in range
+        if start is not None:
+            start = align(start, timeframe, up=True)
+        if end is not None:
+            end = align(end, timeframe, up=True)
+        base_timeframe = timeframe
+        merged: Optional[pl.DataFrame | pl.LazyFrame] = None
+        for source_timeframe in self.source_timeframes(pair, timeframe):
+            query = self.scan(pair, source_timeframe)
+            if query is None:
+                continue
+            if start is not None:
+                query = query.filter(pl.col("timestamp") >= start)
+            if end is not None:
+                query = query.filter(pl.col("timestamp") < end)
+            if merged is None:
+                base_timeframe = source_timeframe
+                merged = query
+                continue
+            if not can_resample(source_timeframe, base_timeframe):
+                log.debug(
+                    "Can't merge the %s %s candles with the %s ones",
+                    pair,
+                    source_timeframe,
+                    base_timeframe,
+                )
+                continue
+            merged = merged.lazy().collect()
+            frame = resample(query, source_timeframe, base_timeframe)
+            if not merged.is_empty():
+                first, last = merged["timestamp"][0], merged["timestamp"][-1]
+                frame = frame.filter(~pl.col("timestamp").is_between(first, last))
+            merged = pl.concat([merged, frame]).sort("timestamp")
+        if merged is None:
+            raise FileNotFoundError(f"No {timeframe} candles stored, or archived, for {pair}")
+        if base_timeframe != timeframe:
+            log.debug("Resampling the %s %s candles from %s", pair, timeframe, base_timeframe)
+            return resample(merged, base_timeframe, timeframe)
+        return merged.lazy().select(OHLCV_COLUMNS).collect()
+
+    def save(self, pair: str, timeframe: str, frame: pl.DataFrame) -> pathlib.Path:
+        """
+        Save the ``pair`` candles, merging them with any already stored.
+
+        When both have a candle with the same timestamp, the one in ``frame`` is kept.
+        """
+        path = self.candles_path(pair, timeframe)
+        frame = frame.select(OHLCV_COLUMNS).cast(OHLCV_SCHEMA)  # type: ignore[arg-type]
+        if path.exists():
+            frame = pl.concat([pl.read_parquet(path), frame])
+        frame = frame.unique("timestamp", keep="last").sort("timestamp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, so that concurrent readers never see a partially written file
+        temp_path = path.with_suffix(".parquet.tmp")
+        frame.write_parquet(temp_path, statistics=True)
+        temp_path.replace(path)
+        return path
+
+    def truncate(self, pair: str, timeframe: str, before: int) -> None:
+        """
+        Drop the stored ``pair`` candles older than ``before``, in milliseconds.
+        """
+        path = self.candles_path(pair, timeframe)
+        if not path.exists():
+            return
+        frame = pl.read_parquet(path).filter(pl.col("timestamp") >= before)
+        if frame.is_empty():
+            path.unlink()
+            return
+        temp_path = path.with_suffix(".parquet.tmp")
+        frame.write_parquet(temp_path, statistics=True)
+        temp_path.replace(path)
+
+    def pairs(self, timeframe: str) -> list[str]:
+        """
+        Return the pairs with stored, archived, or resampled, candles for ``timeframe``.
+        """
+        markets = self.load_markets() or {}
+        filenames = {pair_to_filename(pair): pair for pair in markets}
+        stems: set[str] = set()
+        for stored in self.stored_timeframes():
+            if stored == timeframe or can_resample(stored, timeframe):
+                stems.update(path.stem for path in self.path.joinpath(stored).glob("*.parquet"))
+        for archived in self.archive.timeframes():
+            if archived == timeframe or can_resample(archived, timeframe):
+                for pair in self.archive.pairs(archived):
+                    filenames[pair_to_filename(pair)] = pair
+                    stems.add(pair_to_filename(pair))
+        return [filenames.get(stem, stem.replace("_", "/", 1)) for stem in sorted(stems)]
+
+    def load_markets(self) -> Optional[dict[str, Any]]:
+        """
+        Load the stored exchange markets, if any.
+        """
+        path = self.path / "markets.json"
+        if not path.exists():
+            return None
+        markets: dict[str, Any] = json.loads(path.read_text())
+        return markets
+
+    def save_markets(self, markets: dict[str, Any]) -> None:
+        """
+        Store the exchange markets.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.path.joinpath("markets.json").write_text(json.dumps(markets, default=str))
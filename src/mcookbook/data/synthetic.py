@@ -0,0 +1,263 @@
+"""
+Synthetic market data.
+
+Generates ccxt shaped markets and tickers, and OHLCV candles, for thousands of symbols without any
+recorded data. Everything is deterministic for a given seed.
+
+Random numbers are derived by hashing each row index with the seed, instead of drawing from a
+stateful generator, which allows the candles to be generated in a single vectorized polars query.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import string
+from collections.abc import Iterator
+from typing import Any
+
+import ccxt
+import polars as pl
+
+from mcookbook.utils.clock import get_clock
+
+OHLCV_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# 2**-53, maps the top 53 bits of a 64 bit hash to a float in [0, 1)
+_UNIFORM_SCALE = 1.0 / (1 << 53)
+
+
+def uniform(index: pl.Expr, seed: int) -> pl.Expr:
+    """
+    Return an expression mapping each ``index`` value to a uniform float in (0, 1).
+    """
+    return ((index.hash(seed) // 2048).cast(pl.Float64) + 0.5) * _UNIFORM_SCALE
+
+
+def normal(index: pl.Expr, seed: int) -> pl.Expr:
+    """
+    Return an expression mapping each ``index`` value to a standard normal float, using Box-Muller.
+    """
+    radius = (-2.0 * uniform(index, seed).log()).sqrt()
+    return radius * (2.0 * math.pi * uniform(index, seed + 1)).cos()
+
+
+def base_names(count: int) -> list[str]:
+    """
+    Return ``count`` base currency names.
+
+    Names are upper case letter combinations, ``AAA``, ``AAB``, ..., so that wildcards like
+    ``A.*/USDT`` or ``AB[A-M]/BTC`` select predictable subsets of the markets.
+    """
+    names: list[str] = []
+    width = 3
+    while len(names) < count:
+        for letters in itertools.product(string.ascii_uppercase, repeat=width):
+            names.append("".join(letters))
+            if len(names) == count:
+                break
+        width += 1
+    return names
+
+
+class MarketGenerator:
+    """
+    Deterministic synthetic market data generator.
+
+    :param seed: The random seed
+    :param quotes: The quote currencies each base currency is listed against
+    :param volatility: The standard deviation of the per candle log returns
+    :param gap_ratio: The fraction of candles randomly missing from the OHLCV series
+    :param inactive_ratio: The fraction of markets flagged as inactive
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        quotes: tuple[str, ...] = ("USDT", "BUSD", "BTC"),
+        volatility: float = 0.002,
+        gap_ratio: float = 0.0,
+        inactive_ratio: float = 0.0,
+    ) -> None:
+        if not 0 <= gap_ratio < 1:
+            raise ValueError("The gap ratio must be in the [0, 1) interval")
+        if not 0 <= inactive_ratio <= 1:
+            raise ValueError("The inactive ratio must be in the [0, 1] interval")
+        self.seed = seed
+        self.quotes = quotes
+        self.volatility = volatility
+        self.gap_ratio = gap_ratio
+        self.inactive_ratio = inactive_ratio
+
+    def symbols(self, count: int) -> list[str]:
+        """
+        Return ``count`` market symbols, every base currency listed against all quote currencies.
+        """
+        bases = base_names(-(-count // len(self.quotes)))
+        symbols = [f"{base}/{quote}" for base in bases for quote in self.quotes]
+        return symbols[:count]
+
+    def _frame(self, symbols: list[str]) -> pl.DataFrame:
+        """
+        Return the per symbol random properties, which only depend on the seed and the symbol.
+        """
+        key = pl.col("symbol").hash(self.seed)
+        return pl.DataFrame({"symbol": symbols}, schema={"symbol": pl.Utf8}).with_columns(
+            key=key,
+            price=10 ** (uniform(key, self.seed) * 8 - 4),
+            change=normal(key, self.seed + 2) * self.volatility * 20,
+            volume=10 ** (uniform(key, self.seed + 4) * 4 + 2),
+            spread=uniform(key, self.seed + 5) * 0.001,
+            active=uniform(key, self.seed + 6) >= self.inactive_ratio,
+        )
+
+    def markets(self, count: int) -> dict[str, dict[str, Any]]:
+        """
+        Return ``count`` ccxt shaped markets, keyed by symbol.
+        """
+        markets: dict[str, dict[str, Any]] = {}
+        for row in self._frame(self.symbols(count)).iter_rows(named=True):
+            symbol = row["symbol"]
+            base, quote = symbol.split("/")
+            markets[symbol] = {
+                "id": f"{base}{quote}",
+                "symbol": symbol,
+                "base": base,
+                "quote": quote,
+                "baseId": base,
+                "quoteId": quote,
+                "type": "spot",
+                "spot": True,
+                "margin": False,
+                "swap": False,
+                "future": False,
+                "option": False,
+                "contract": False,
+                "active": row["active"],
+                "precision": {"amount": 8, "price": 8},
+                "limits": {
+                    "amount": {"min": 1e-8, "max": None},
+                    "price": {"min": 1e-8, "max": None},
+                    "cost": {"min": 10.0, "max": None},
+                },
+                "info": {},
+            }
+        return markets
+
+    def tickers(
+        self, symbols: list[str], timestamp: int | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Return ccxt shaped tickers for ``symbols``.
+
+        :param timestamp: The tickers timestamp, in milliseconds. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = int(get_clock().time() * 1000)
+        iso_datetime = ccxt.Exchange.iso8601(timestamp)
+        tickers: dict[str, dict[str, Any]] = {}
+        frame = self._frame(symbols).with_columns(
+            last=pl.col("price") * (1 + pl.col("change")),
+        )
+        for row in frame.iter_rows(named=True):
+            price = row["price"]
+            last = row["last"]
+            half_spread = last * row["spread"] / 2
+            tickers[row["symbol"]] = {
+                "symbol": row["symbol"],
+                "timestamp": timestamp,
+                "datetime": iso_datetime,
+                "high": max(price, last) * (1 + abs(row["change"])),
+                "low": min(price, last) * (1 - abs(row["change"])),
+                "bid": last - half_spread,
+                "bidVolume": None,
+                "ask": last + half_spread,
+                "askVolume": None,
+                "vwap": (price + last) / 2,
+                "open": price,
+                "close": last,
+                "last": last,
+                "previousClose": None,
+                "change": last - price,
+                "percentage": row["change"] * 100,
+                "average": (price + last) / 2,
+                "baseVolume": row["volume"],
+                "quoteVolume": row["volume"] * last,
+                "info": {},
+            }
+        return tickers
+
+    def ohlcv(
+        self,
+        symbols: str | list[str],
+        timeframe: str = "1m",
+        candles: int = 500,
+        since: int = 0,
+    ) -> pl.DataFrame:
+        """
+        Generate OHLCV candles.
+
+        :param symbols: A symbol, or a list of symbols
+        :param timeframe: The candles timeframe, in the ccxt notation, ``1m``, ``1h``, ``1d``, etc
+        :param candles: The number of candles, per symbol, before removing any gaps
+        :param since: The timestamp, in milliseconds, of the first candle
+        :return: A data frame with the :data:`OHLCV_COLUMNS` columns, sorted by timestamp. When a
+                 list of symbols is passed, an additional ``symbol`` column comes first and the
+                 rows are sorted by symbol and timestamp. Use ``frame.rows()`` to get the ccxt
+                 ``fetch_ohlcv()`` list of lists.
+        """
+        single = isinstance(symbols, str)
+        symbol_list = [symbols] if isinstance(symbols, str) else symbols
+        interval = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        # Align to the timeframe, like exchanges do
+        since -= since % interval
+        seed = self.seed + 10
+        volatility = self.volatility
+        candle_volume_ratio = interval / 86_400_000
+        # Each candle is keyed by its symbol and position
+        key = pl.col("key") + pl.col("position").cast(pl.UInt64)
+        volume_noise = (normal(key, seed + 6) / 2).exp()
+        frame = (
+            self._frame(symbol_list)
+            .select("symbol", "key", start="price", daily_volume="volume")
+            .join(pl.DataFrame({"position": pl.int_range(0, candles, eager=True)}), how="cross")
+            .select(
+                "symbol",
+                "key",
+                "start",
+                timestamp=since + pl.col("position") * interval,
+                log_return=normal(key, seed) * volatility,
+                wick_high=normal(key, seed + 2).abs() * volatility / 2,
+                wick_low=normal(key, seed + 4).abs() * volatility / 2,
+                volume=pl.col("daily_volume") * candle_volume_ratio * volume_noise,
+                keep=uniform(key, seed + 8) >= self.gap_ratio,
+            )
+            .with_columns(
+                close=pl.col("start") * pl.col("log_return").cum_sum().over("key").exp(),
+            )
+            .with_columns(
+                # Same as the previous close, without another window expression
+                open=pl.col("close").truediv(pl.col("log_return").exp()),
+            )
+            .with_columns(
+                high=pl.max_horizontal("open", "close") * pl.col("wick_high").exp(),
+                low=pl.min_horizontal("open", "close") * (-pl.col("wick_low")).exp(),
+            )
+        )
+        if self.gap_ratio:
+            frame = frame.filter(pl.col("keep"))
+        columns = list(OHLCV_COLUMNS) if single else ["symbol", *OHLCV_COLUMNS]
+        return frame.select(columns)
+
+    def iter_ohlcv(
+        self,
+        symbols: list[str],
+        timeframe: str = "1m",
+        candles: int = 500,
+        since: int = 0,
+    ) -> Iterator[tuple[str, pl.DataFrame]]:
+        """
+        Generate OHLCV candles and yield them per symbol.
+        """
+        frame = self.ohlcv(symbols, timeframe=timeframe, candles=candles, since=since)
+        for (symbol,), symbol_frame in frame.group_by("symbol", maintain_order=True):
+            yield symbol, symbol_frame.drop("symbol")
@@ -20,3 +20,9 @@ class OperationalException(MCookBookBaseException):
     """
     Operational exception.
     """
+
+
+class SubscriptionClosed(MCookBookBaseException):
+    """
+    Exception raised when getting events from a closed event bus subscription.
+    """
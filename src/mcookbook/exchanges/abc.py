@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import logging
 import pprint
+import time
 from typing import Any
 
 import ccxt
@@ -12,13 +13,32 @@ from ccxt.async_support import Exchange as CCXTExchange
 from pydantic import BaseModel
 from pydantic import PrivateAttr
 
+from mcookbook.config.base import BaseConfig
 from mcookbook.config.live import LiveConfig
 from mcookbook.exceptions import OperationalException
 from mcookbook.pairlist.manager import PairListManager
+from mcookbook.paper import PaperTradingAPI
 from mcookbook.utils import merge_dictionaries
+from mcookbook.utils.metrics import REGISTRY
 
 log = logging.getLogger(__name__)
 
+EXCHANGE_REQUESTS = REGISTRY.counter(
+    "mcookbook_exchange_requests_total",
+    "Exchange API requests.",
+    labelnames=("exchange", "endpoint", "status"),
+)
+EXCHANGE_REQUEST_DURATION = REGISTRY.histogram(
+    "mcookbook_exchange_request_duration_seconds",
+    "Exchange API request duration, including any rate limit throttling.",
+    labelnames=("exchange", "endpoint"),
+)
+EXCHANGE_RATELIMIT_HEADROOM = REGISTRY.gauge(
+    "mcookbook_exchange_ratelimit_headroom_ratio",
+    "Fraction of the exchange API rate limit still available.",
+    labelnames=("exchange",),
+)
+
 
 class Exchange(BaseModel):
     """
@@ -40,8 +60,32 @@ class Exchange(BaseModel):
     def _get_ccxt_config(self) -> dict[str, Any] | None:
         return None
 
+    def _instrument_api(self, api: CCXTExchange) -> None:
+        name = self.config.exchange.name
+        request = api.request
+
+        async def instrumented_request(path: str, *args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            status = "error"
+            try:
+                response = await request(path, *args, **kwargs)
+                status = "ok"
+                return response
+            finally:
+                EXCHANGE_REQUEST_DURATION.labels(name, path).observe(time.perf_counter() - start)
+                EXCHANGE_REQUESTS.labels(name, path, status).inc()
+
+        api.request = instrumented_request
+        EXCHANGE_RATELIMIT_HEADROOM.labels(name).set_function(self.get_ratelimit_headroom)
+
+    def get_ratelimit_headroom(self) -> float | None:
+        """
+        Return the fraction of the exchange API rate limit still available, if known.
+        """
+        return None
+
     @classmethod
-    def resolved(cls, config: LiveConfig) -> Exchange:
+    def resolved(cls, config: BaseConfig) -> Exchange:
         """
         Resolve the passed ``name`` and ``market`` to class implementation.
         """
@@ -96,6 +140,12 @@ class Exchange(BaseModel):
                 ) from exc
             except ccxt.BaseError as exc:
                 raise OperationalException(f"Initialization of ccxt failed. Reason: {exc}") from exc
+            self._instrument_api(self._api)
+            if self.config.exchange.dry_run:
+                log.info("Dry run, simulating the orders with a paper trading matching engine")
+                self._api = PaperTradingAPI(  # type: ignore[assignment]
+                    self._api, self.config.exchange.dry_run_wallet
+                )
         return self._api
 
     async def get_markets(self) -> dict[str, Any]:
@@ -107,6 +157,19 @@ class Exchange(BaseModel):
             self._markets = await self.api.load_markets()
         return self._markets
 
+    def set_api(self, api: CCXTExchange) -> None:
+        """
+        Use ``api``, a ccxt exchange compatible client, instead of instantiating a ccxt one.
+        """
+        self._api = api
+
+    def set_markets(self, markets: dict[str, Any]) -> None:
+        """
+        Use previously loaded ``markets``, instead of loading them from the exchange.
+        """
+        self.api.set_markets(markets)
+        self._markets = self.api.markets
+
     @property
     def markets(self) -> dict[str, Any]:
         """
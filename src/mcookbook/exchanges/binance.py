@@ -8,6 +8,9 @@ from typing import Any
 from mcookbook.exchanges.abc import Exchange
 from mcookbook.utils import merge_dictionaries
 
+# The request weight allowed per minute on the futures API
+FUTURES_REQUEST_WEIGHT_LIMIT = 2400
+
 
 class BinanceFutures(Exchange):
     """
@@ -20,3 +23,15 @@ class BinanceFutures(Exchange):
     def _get_ccxt_config(self) -> dict[str, Any]:
         ccxt_config = super()._get_ccxt_config() or {}
         return merge_dictionaries(ccxt_config, {"options": {"defaultType": self._market}})
+
+    def get_ratelimit_headroom(self) -> float | None:
+        """
+        Return the fraction of the exchange API rate limit still available, if known.
+        """
+        headers = self.api.last_response_headers
+        if not headers:
+            return None
+        for key, value in headers.items():
+            if key.lower() == "x-mbx-used-weight-1m":
+                return max(0.0, 1 - int(value) / FUTURES_REQUEST_WEIGHT_LIMIT)
+        return None
@@ -0,0 +1,28 @@
+"""
+Strategy parameters optimization.
+"""
+from __future__ import annotations
+
+from .dataset import Dataset
+from .runner import evaluate
+from .runner import Hyperopt
+from .runner import required_indicators
+from .space import ChoiceParameter
+from .space import FloatParameter
+from .space import IntParameter
+from .space import sample
+from .study import Study
+from .study import Trial
+
+__all__ = [
+    "ChoiceParameter",
+    "Dataset",
+    "evaluate",
+    "FloatParameter",
+    "Hyperopt",
+    "IntParameter",
+    "required_indicators",
+    "sample",
+    "Study",
+    "Trial",
+]
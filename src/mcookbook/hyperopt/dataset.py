@@ -0,0 +1,148 @@
+"""
+Hyperopt datasets.
+
+A dataset holds the candles of every pair, along with any precomputed indicator columns, written
+once as uncompressed Arrow IPC files, one per pair, laid out as::
+
+    <path>/index.json
+    <path>/<BASE>_<QUOTE>.arrow
+
+Workers memory-map the pair files, which the operating system shares between processes through
+its page cache, instead of each one unpickling a copy of the whole dataset. Only the pair being
+evaluated is materialized, so the worker memory stays constant however many pairs there are.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from typing import Any
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.data import CandleStore
+from mcookbook.data.store import pair_to_filename
+from mcookbook.indicators import Indicator
+
+log = logging.getLogger(__name__)
+
+
+class Dataset:
+    """
+    A read only, on disk, hyperopt dataset.
+    """
+
+    def __init__(self, path: pathlib.Path, index: dict[str, Any]) -> None:
+        self.path = path
+        self.index = index
+
+    def __repr__(self) -> str:
+        """
+        Return the dataset representation, including its path.
+        """
+        return f"{self.__class__.__name__}(path={str(self.path)!r})"
+
+    @property
+    def pairs(self) -> list[str]:
+        """
+        The dataset pairs.
+        """
+        pairs: list[str] = self.index["pairs"]
+        return pairs
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        The columns of every pair frame.
+        """
+        columns: list[str] = self.index["columns"]
+        return columns
+
+    @property
+    def candles(self) -> int:
+        """
+        The total number of candles.
+        """
+        candles: int = self.index["candles"]
+        return candles
+
+    def pair_path(self, pair: str) -> pathlib.Path:
+        """
+        Return the path to the ``pair`` file.
+        """
+        return self.path / f"{pair_to_filename(pair)}.arrow"
+
+    def load(self, pair: str) -> pl.DataFrame:
+        """
+        Load the ``pair`` frame from its memory mapped file.
+        """
+        # Read from a path, polars memory maps uncompressed files, and its columns reference the
+        # mapped pages, instead of copying them
+        return pl.read_ipc(self.pair_path(pair))
+
+    @classmethod
+    def open(cls, path: pathlib.Path) -> Dataset:
+        """
+        Open the dataset at ``path``.
+        """
+        index = json.loads((path / "index.json").read_text())
+        return cls(path, index)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: pathlib.Path,
+        store: CandleStore,
+        pairs: list[str],
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        indicators: Optional[list[Indicator]] = None,
+    ) -> Dataset:
+        """
+        Open the dataset at ``path``, building it first if missing or built from other inputs.
+
+        :param indicators: Indicators to precompute, once, instead of on every trial
+        """
+        unique_indicators = list(dict.fromkeys(indicators or ()))
+        key = {
+            "store": str(store.path),
+            "pairs": pairs,
+            "timeframe": timeframe,
+            "start": start,
+            "end": end,
+            "indicators": sorted(str(indicator) for indicator in unique_indicators),
+        }
+        index_path = path / "index.json"
+        if index_path.exists():
+            dataset = cls.open(path)
+            if dataset.index["key"] == key:
+                return dataset
+            log.info("The hyperopt dataset inputs changed. Rebuilding it.")
+        path.mkdir(parents=True, exist_ok=True)
+        index_path.unlink(missing_ok=True)
+        for stale in path.glob("*.arrow"):
+            stale.unlink()
+        expressions: list[pl.Expr] = []
+        for indicator in unique_indicators:
+            expressions.extend(indicator.expressions())
+        candles = 0
+        columns: list[str] = []
+        for pair in pairs:
+            frame = store.load(pair, timeframe, start=start, end=end)
+            if expressions:
+                frame = frame.with_columns(expressions)
+            candles += frame.height
+            columns = frame.columns
+            frame.write_ipc(path / f"{pair_to_filename(pair)}.arrow", compression="uncompressed")
+        index = {"key": key, "pairs": pairs, "columns": columns, "candles": candles}
+        # The index is written last, an interrupted build is never mistaken for a complete one
+        index_path.write_text(json.dumps(index, indent=2))
+        log.info(
+            "Built the hyperopt dataset with %d candles of %d pairs and %d precomputed indicators",
+            candles,
+            len(pairs),
+            len(unique_indicators),
+        )
+        return cls(path, index)
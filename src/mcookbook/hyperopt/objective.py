@@ -0,0 +1,36 @@
+"""
+Hyperopt objectives.
+
+Objectives score a backtest summary, as returned by :func:`mcookbook.backtesting.summarize`.
+Higher is better.
+"""
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+
+
+def _calmar(summary: dict[str, Any]) -> float:
+    profit: float = summary["profit_total"]
+    drawdown: float = summary["max_drawdown"]
+    if drawdown:
+        return profit / drawdown
+    return float("inf") if profit > 0 else profit
+
+
+OBJECTIVES: dict[str, Callable[[dict[str, Any]], float]] = {
+    "profit_total": lambda summary: float(summary["profit_total"]),
+    "profit_mean": lambda summary: float(summary["profit_mean"]),
+    "win_rate": lambda summary: float(summary["win_rate"]),
+    "profit_factor": lambda summary: float(summary["profit_factor"]),
+    "calmar": _calmar,
+}
+
+
+def score(objective: str, summary: dict[str, Any], min_trades: int = 0) -> float:
+    """
+    Return the ``objective`` score of ``summary``, minus infinity when it has under ``min_trades``.
+    """
+    if summary["trades"] < min_trades:
+        return float("-inf")
+    return OBJECTIVES[objective](summary)
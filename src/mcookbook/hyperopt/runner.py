@@ -0,0 +1,250 @@
+"""
+Parallel hyperopt runner.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from typing import Any
+from typing import Optional
+
+import polars as pl
+from pydantic import ValidationError
+
+from mcookbook.backtesting.engine import backtest
+from mcookbook.backtesting.engine import summarize
+from mcookbook.exceptions import OperationalException
+from mcookbook.hyperopt.dataset import Dataset
+from mcookbook.hyperopt.objective import score
+from mcookbook.hyperopt.space import Parameter
+from mcookbook.hyperopt.space import sample
+from mcookbook.hyperopt.study import Study
+from mcookbook.hyperopt.study import Trial
+from mcookbook.indicators import Indicator
+from mcookbook.strategies import Strategy
+
+log = logging.getLogger(__name__)
+
+
+def evaluate(
+    dataset: Dataset,
+    number: int,
+    strategy: dict[str, Any],
+    params: dict[str, Any],
+    steps: list[list[str]],
+    thresholds: list[Optional[float]],
+    objective: str,
+    fee: float = 0.0,
+    slippage: float = 0.0,
+    min_trades: int = 0,
+) -> Trial:
+    """
+    Evaluate a single trial.
+
+    The ``params`` override the ``strategy`` configuration. The pairs are backtested one step at a
+    time and, after each step but the last, the trial is pruned if its objective so far is below
+    that step threshold.
+
+    This is what runs on the worker processes, which is why it takes the strategy configuration
+    instead of its instance.
+    """
+    start = time.perf_counter()
+    try:
+        resolved_strategy = Strategy.resolved({**strategy, **params})
+    except (ValidationError, OperationalException) as exc:
+        return Trial(number=number, params=params, state="failed", error=str(exc))
+    trades: list[pl.DataFrame] = []
+    intermediate: list[float] = []
+    summary: dict[str, Any] = {}
+    last_step = len(steps) - 1
+    for step, pairs in enumerate(steps):
+        for pair in pairs:
+            trades.append(
+                backtest(
+                    resolved_strategy, dataset.load(pair), pair=pair, fee=fee, slippage=slippage
+                )
+            )
+        trades = [pl.concat(trades)]
+        summary = summarize(trades[0])
+        value = score(objective, summary, min_trades if step == last_step else 0)
+        intermediate.append(value)
+        threshold = thresholds[step] if step < len(thresholds) else None
+        if step < last_step and threshold is not None and value < threshold:
+            return Trial(
+                number=number,
+                params=params,
+                state="pruned",
+                intermediate=intermediate,
+                summary=summary,
+                duration=time.perf_counter() - start,
+            )
+    return Trial(
+        number=number,
+        params=params,
+        state="complete",
+        objective=intermediate[-1],
+        intermediate=intermediate,
+        summary=summary,
+        duration=time.perf_counter() - start,
+    )
+
+
+def required_indicators(
+    strategy: Strategy, space: dict[str, Parameter], seed: int, numbers: list[int]
+) -> list[Indicator]:
+    """
+    Return the distinct indicators needed by the ``numbers`` trials, to precompute them once.
+    """
+    config = strategy.dict()
+    indicators: dict[Indicator, None] = {}
+    for number in numbers:
+        try:
+            trial_strategy = Strategy.resolved({**config, **sample(space, seed, number)})
+        except (ValidationError, OperationalException):
+            continue
+        indicators.update(dict.fromkeys(trial_strategy.indicators()))
+    return list(indicators)
+
+
+class Hyperopt:
+    """
+    Optimize a strategy parameters by evaluating many trials in parallel.
+
+    Every trial backtests all the dataset pairs, split into ``pruning_steps`` interleaved steps.
+    Once ``pruning_warmup_trials`` trials completed, a trial scoring below the median of the
+    complete trials at any step is pruned, without backtesting the remaining pairs.
+    """
+
+    def __init__(
+        self,
+        study: Study,
+        dataset: Dataset,
+        strategy: Strategy,
+        space: dict[str, Parameter],
+        objective: str = "profit_total",
+        seed: int = 0,
+        fee: float = 0.0,
+        slippage: float = 0.0,
+        min_trades: int = 0,
+        pruning: bool = True,
+        pruning_warmup_trials: int = 10,
+        pruning_steps: int = 4,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.study = study
+        self.dataset = dataset
+        self.strategy = strategy
+        self.space = space
+        self.objective = objective
+        self.seed = seed
+        self.fee = fee
+        self.slippage = slippage
+        self.min_trades = min_trades
+        self.pruning = pruning
+        self.pruning_warmup_trials = pruning_warmup_trials
+        self.workers = workers or os.cpu_count() or 1
+        pairs = dataset.pairs
+        step_count = max(1, min(len(pairs), pruning_steps))
+        self.steps = [pairs[idx::step_count] for idx in range(step_count)]
+
+    def params(self, number: int) -> dict[str, Any]:
+        """
+        Return the parameters of trial ``number``.
+        """
+        return sample(self.space, self.seed, number)
+
+    def _kwargs(self, number: int) -> dict[str, Any]:
+        thresholds: list[Optional[float]] = []
+        if self.pruning:
+            thresholds = self.study.pruning_thresholds(self.pruning_warmup_trials)
+        return {
+            "dataset": self.dataset,
+            "number": number,
+            "strategy": self.strategy.dict(),
+            "params": self.params(number),
+            "steps": self.steps,
+            "thresholds": thresholds,
+            "objective": self.objective,
+            "fee": self.fee,
+            "slippage": self.slippage,
+            "min_trades": self.min_trades,
+        }
+
+    def _record(self, trial: Trial) -> None:
+        best = self.study.best()
+        self.study.record(trial)
+        if trial.state == "complete" and (
+            best is None or (trial.objective or 0) > (best.objective or 0)
+        ):
+            log.info(
+                "Trial %d is the best so far, %s=%.4f: %s",
+                trial.number,
+                self.objective,
+                trial.objective,
+                trial.params,
+            )
+        else:
+            log.debug("Trial %d %s: %s", trial.number, trial.state, trial.params)
+
+    def run(self, trials: int) -> Study:
+        """
+        Run the first ``trials`` trials which haven't finished yet, and return the study.
+        """
+        pending = self.study.pending(trials)
+        if not pending:
+            return self.study
+        start = time.perf_counter()
+        log.info(
+            "Running %d of %d trials over %d candles of %d pairs, using %d workers",
+            len(pending),
+            trials,
+            self.dataset.candles,
+            len(self.dataset.pairs),
+            self.workers,
+        )
+        if self.workers == 1:
+            for number in pending:
+                self._record(evaluate(**self._kwargs(number)))
+        else:
+            self._run_parallel(pending)
+        log.info("Ran %d trials in %.2f seconds", len(pending), time.perf_counter() - start)
+        return self.study
+
+    def _run_parallel(self, pending: list[int]) -> None:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        # Trials are submitted a few at a time, instead of all upfront, so that they're pruned
+        # against the thresholds of the trials completed meanwhile
+        queue = iter(pending)
+        running: dict[concurrent.futures.Future[Trial], int] = {}
+        try:
+            for number in queue:
+                running[executor.submit(evaluate, **self._kwargs(number))] = number
+                if len(running) == self.workers * 2:
+                    break
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    number = running.pop(future)
+                    try:
+                        trial = future.result()
+                    except Exception:  # pylint: disable=broad-except
+                        trial = Trial(
+                            number=number,
+                            params=self.params(number),
+                            state="failed",
+                            error=traceback.format_exc(),
+                        )
+                    self._record(trial)
+                    for number in queue:
+                        running[executor.submit(evaluate, **self._kwargs(number))] = number
+                        break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,87 @@
+"""
+Hyperopt search space.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any
+from typing import Union
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import root_validator
+from pydantic import StrictInt
+
+
+class IntParameter(BaseModel):
+    """
+    Integer parameter, sampled uniformly from ``low`` to ``high``, inclusive, in ``step`` increments.
+    """
+
+    low: StrictInt
+    high: StrictInt
+    step: int = Field(default=1, ge=1)
+
+    @root_validator(skip_on_failure=True)
+    @classmethod
+    def _validate_bounds(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if values["low"] > values["high"]:
+            raise ValueError("'low' must not be greater than 'high'")
+        return values
+
+    def sample(self, rng: random.Random) -> int:
+        """
+        Return a random value.
+        """
+        return rng.randrange(self.low, self.high + 1, self.step)
+
+
+class FloatParameter(BaseModel):
+    """
+    Float parameter, sampled uniformly from ``low`` to ``high``.
+    """
+
+    low: float
+    high: float
+    decimals: int = Field(default=4, ge=0)
+
+    @root_validator(skip_on_failure=True)
+    @classmethod
+    def _validate_bounds(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if values["low"] > values["high"]:
+            raise ValueError("'low' must not be greater than 'high'")
+        return values
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Return a random value, rounded to ``decimals``.
+        """
+        return round(rng.uniform(self.low, self.high), self.decimals)
+
+
+class ChoiceParameter(BaseModel):
+    """
+    Parameter sampled from a list of ``choices``.
+    """
+
+    choices: list[Any] = Field(..., min_items=1)
+
+    def sample(self, rng: random.Random) -> Any:
+        """
+        Return a random choice.
+        """
+        return rng.choice(self.choices)
+
+
+Parameter = Union[ChoiceParameter, IntParameter, FloatParameter]
+
+
+def sample(space: dict[str, Parameter], seed: int, number: int) -> dict[str, Any]:
+    """
+    Return the parameters of trial ``number``.
+
+    Each trial has its own random generator, seeded by the study seed and the trial number, so the
+    parameters of a trial don't depend on which, or how many, trials ran before it.
+    """
+    rng = random.Random(f"{seed}:{number}")
+    return {name: parameter.sample(rng) for name, parameter in sorted(space.items())}
@@ -0,0 +1,172 @@
+"""
+Resumable hyperopt studies.
+
+A study is stored in its own directory, laid out as::
+
+    <path>/study.json
+    <path>/trials.jsonl
+
+``study.json`` records what is being optimized, and ``trials.jsonl`` gets a line appended as
+each trial finishes, so an interrupted study resumes from the last finished trial.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+import statistics
+from typing import Any
+from typing import Optional
+
+import polars as pl
+from pydantic import BaseModel
+from pydantic import Field
+
+from mcookbook.exceptions import OperationalException
+
+log = logging.getLogger(__name__)
+
+TRIAL_STATES = ("complete", "pruned", "failed")
+
+
+class Trial(BaseModel):
+    """
+    A hyperopt trial result.
+    """
+
+    number: int
+    params: dict[str, Any]
+    state: str
+    objective: Optional[float] = None
+    intermediate: list[float] = Field(default_factory=list)
+    summary: dict[str, Any] = Field(default_factory=dict)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+class Study:
+    """
+    A resumable hyperopt study.
+    """
+
+    def __init__(self, path: pathlib.Path, meta: dict[str, Any]) -> None:
+        self.path = path
+        self.meta = meta
+        self.trials: dict[int, Trial] = {}
+
+    def __repr__(self) -> str:
+        """
+        Return the study representation, including its path and number of trials.
+        """
+        return f"{self.__class__.__name__}(path={str(self.path)!r}, trials={len(self.trials)})"
+
+    @property
+    def trials_path(self) -> pathlib.Path:
+        """
+        The path to the trials file.
+        """
+        return self.path / "trials.jsonl"
+
+    @classmethod
+    def load_or_create(cls, path: pathlib.Path, meta: dict[str, Any]) -> Study:
+        """
+        Load the study at ``path``, creating it if missing.
+
+        :param meta: What the study optimizes. Resuming a study created with different ``meta``
+                     would mix up incomparable trials, and raises an
+                     :class:`~mcookbook.exceptions.OperationalException`.
+        """
+        meta = json.loads(json.dumps(meta, default=str))
+        study = cls(path, meta)
+        meta_path = path / "study.json"
+        if not meta_path.exists():
+            path.mkdir(parents=True, exist_ok=True)
+            meta_path.write_text(json.dumps(meta, indent=2))
+            return study
+        stored_meta = json.loads(meta_path.read_text())
+        if stored_meta != meta:
+            raise OperationalException(
+                f"The study at {path} was created with a different configuration. Use another "
+                "study name, or delete the study directory to start over."
+            )
+        if study.trials_path.exists():
+            with study.trials_path.open() as rfh:
+                for line in rfh:
+                    try:
+                        trial = Trial.parse_raw(line)
+                    except ValueError:
+                        # Most likely the last line, cut short when the study was interrupted
+                        log.warning("Skipping a malformed trial line in %s", study.trials_path)
+                        continue
+                    study.trials[trial.number] = trial
+        return study
+
+    def record(self, trial: Trial) -> None:
+        """
+        Record a finished trial.
+        """
+        self.trials[trial.number] = trial
+        with self.trials_path.open("a") as wfh:
+            wfh.write(trial.json() + "\n")
+
+    def pending(self, count: int) -> list[int]:
+        """
+        Return the numbers, out of the first ``count`` trials, which haven't finished.
+        """
+        return [number for number in range(count) if number not in self.trials]
+
+    def pruning_thresholds(self, warmup: int) -> list[Optional[float]]:
+        """
+        Return the median intermediate objective, at each step, of the complete trials.
+
+        A step has no threshold, ``None``, until at least ``warmup`` complete trials reached it.
+        """
+        steps: list[list[float]] = []
+        for trial in self.trials.values():
+            if trial.state != "complete":
+                continue
+            for step, value in enumerate(trial.intermediate):
+                if step == len(steps):
+                    steps.append([])
+                steps[step].append(value)
+        return [statistics.median(values) if len(values) >= warmup else None for values in steps]
+
+    def best(self) -> Optional[Trial]:
+        """
+        Return the complete trial with the highest objective.
+        """
+        complete = [
+            trial
+            for trial in self.trials.values()
+            if trial.state == "complete" and trial.objective is not None
+        ]
+        if not complete:
+            return None
+        return max(complete, key=lambda trial: (trial.objective, -trial.number))
+
+    def results(self) -> pl.DataFrame:
+        """
+        Return the trials, ranked by objective, the unfinished last.
+        """
+        rows: list[dict[str, Any]] = []
+        for trial in self.trials.values():
+            summary = trial.summary
+            rows.append(
+                {
+                    "number": trial.number,
+                    "state": trial.state,
+                    "objective": trial.objective,
+                    "trades": summary.get("trades"),
+                    "profit_total": summary.get("profit_total"),
+                    "win_rate": summary.get("win_rate"),
+                    "max_drawdown": summary.get("max_drawdown"),
+                    **trial.params,
+                }
+            )
+        if not rows:
+            return pl.DataFrame()
+        return (
+            pl.DataFrame(rows, infer_schema_length=None)
+            .sort(["objective", "number"], descending=[True, False], nulls_last=True)
+            .with_row_index("rank", offset=1)
+        )
@@ -0,0 +1,35 @@
+"""
+Technical indicators.
+
+Every indicator can be computed vectorized, over a polars data frame, or incrementally, in constant
+time per new candle.
+"""
+from __future__ import annotations
+
+from .abc import Candle
+from .abc import Indicator
+from .abc import IndicatorState
+from .cache import IndicatorCache
+from .engine import IndicatorEngine
+from .momentum import RSI
+from .trend import EMA
+from .trend import MACD
+from .trend import SMA
+from .volatility import ATR
+from .volatility import BollingerBands
+from .volume import VWAP
+
+__all__ = [
+    "ATR",
+    "BollingerBands",
+    "Candle",
+    "EMA",
+    "Indicator",
+    "IndicatorCache",
+    "IndicatorEngine",
+    "IndicatorState",
+    "MACD",
+    "RSI",
+    "SMA",
+    "VWAP",
+]
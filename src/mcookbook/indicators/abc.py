@@ -0,0 +1,153 @@
+"""
+Indicator base classes.
+"""
+from __future__ import annotations
+
+import abc
+from typing import Any
+from typing import ClassVar
+from typing import NamedTuple
+
+import polars as pl
+from pydantic import BaseModel
+
+from mcookbook.exceptions import OperationalException
+
+
+class Candle(NamedTuple):
+    """
+    A single OHLCV candle, in the same order as the ccxt ``fetch_ohlcv()`` rows.
+    """
+
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class IndicatorState(metaclass=abc.ABCMeta):
+    """
+    Incremental indicator state, for a single pair.
+
+    Updating the state with a new candle is a constant time operation, regardless of the indicator
+    period.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def update(self, candle: Candle) -> Any:
+        """
+        Update the state with a new closed candle and return the indicator value.
+
+        The value is ``None`` while the indicator is still warming up.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def values(self) -> tuple[float | None, ...]:
+        """
+        Return the latest value of each of the indicator columns.
+        """
+        raise NotImplementedError
+
+
+class Indicator(BaseModel):
+    """
+    Base indicator implementation.
+
+    An indicator defines its parameters and how to compute it, either vectorized, over a polars data
+    frame with the OHLCV history, or incrementally, one candle at a time, through the state returned
+    by :meth:`Indicator.state`. Both produce the same values.
+
+    Indicators are immutable and hashable, so the same instance can be shared by several pairs and
+    used as a cache key.
+    """
+
+    name: ClassVar[str]
+
+    class Config:
+        """
+        Indicator model configuration.
+        """
+
+        frozen = True
+
+    @classmethod
+    def resolved(cls, config: dict[str, Any]) -> Indicator:
+        """
+        Resolve the ``name`` key of ``config`` to its implementation, parsing the remaining keys.
+        """
+        config = dict(config)
+        try:
+            name = config.pop("name")
+        except KeyError:
+            raise ValueError("The 'name' key is missing.") from None
+        for subclass in cls.__subclasses__():
+            if subclass.name == name:
+                return subclass.parse_obj(config)
+        raise OperationalException(f"Cloud not find an {name} indicator implementation.")
+
+    @property
+    @abc.abstractmethod
+    def columns(self) -> tuple[str, ...]:
+        """
+        The names of the columns the indicator produces.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the polars expressions, one per column, computing the indicator over the history.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def state(self) -> IndicatorState:
+        """
+        Return a new, empty, incremental state.
+        """
+        raise NotImplementedError
+
+    def compute(self, frame: pl.DataFrame) -> pl.DataFrame:
+        """
+        Return ``frame``, sorted by timestamp, with the indicator columns added.
+
+        Frames without a ``timestamp`` column are assumed to already be in chronological order.
+        """
+        return chronological(frame).with_columns(self.expressions())
+
+    def __str__(self) -> str:
+        """
+        Return the indicator name, and its parameters.
+        """
+        params = ", ".join(f"{key}={value!r}" for key, value in self.dict().items())
+        return f"{self.name}({params})"
+
+
+def chronological(frame: pl.DataFrame) -> pl.DataFrame:
+    """
+    Return ``frame`` sorted by timestamp, unless it's already sorted, or has no timestamp column.
+    """
+    if "timestamp" in frame.columns and not frame["timestamp"].is_sorted():
+        return frame.sort("timestamp")
+    return frame
+
+
+def warmed_up(expr: pl.Expr, count: int) -> pl.Expr:
+    """
+    Return ``expr`` with the values of the first ``count`` rows replaced by nulls.
+    """
+    if count <= 0:
+        return expr
+    return pl.when(pl.int_range(0, pl.len()) >= count).then(expr)
+
+
+def format_param(value: float) -> str:
+    """
+    Format an indicator parameter for a column name.
+    """
+    return f"{value:g}"
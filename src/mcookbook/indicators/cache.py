@@ -0,0 +1,192 @@
+"""
+Shared indicator cache.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+from cachetools import LRUCache
+
+from mcookbook.indicators.abc import chronological
+from mcookbook.indicators.abc import Indicator
+from mcookbook.utils.metrics import CACHE_REQUESTS
+
+log = logging.getLogger(__name__)
+
+
+class CacheKey(NamedTuple):
+    """
+    Indicator cache key.
+
+    The number of candles is part of the key since indicators like the EMA depend on the whole
+    history, not just on the last candle.
+    """
+
+    pair: str
+    timeframe: str
+    indicator: Indicator
+    timestamp: int
+    candles: int
+
+
+def _estimated_size(frame: pl.DataFrame) -> int:
+    return int(frame.estimated_size())
+
+
+class _LRUCache(LRUCache):  # type: ignore[type-arg]
+    """
+    LRU cache notifying when a key is removed, either evicted or deleted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        getsizeof: Callable[[pl.DataFrame], int],
+        on_delete: Callable[[CacheKey], None],
+    ) -> None:
+        super().__init__(maxsize, getsizeof=getsizeof)
+        self._on_delete = on_delete
+
+    def __delitem__(self, key: CacheKey) -> None:
+        super().__delitem__(key)
+        self._on_delete(key)
+
+
+class IndicatorCache:
+    """
+    Memoize indicator computations, shared by every consumer.
+
+    Results are keyed by pair, timeframe, indicator, including its parameters, and last candle
+    timestamp, so each indicator is computed once per candle no matter how many strategies or pair
+    list filters request it. When a newer candle is seen for a pair and timeframe, the older results
+    are dropped. The least recently used results are evicted when the ``memory_budget``, in bytes,
+    is exceeded.
+    """
+
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024) -> None:
+        self._lock = threading.RLock()
+        self._cache = _LRUCache(memory_budget, getsizeof=_estimated_size, on_delete=self._forget)
+        # Keys currently cached, per (pair, timeframe), to invalidate them without a full scan
+        self._keys: dict[tuple[str, str], dict[CacheKey, None]] = {}
+        self._latest: dict[tuple[str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached results.
+        """
+        return len(self._cache)
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Return whether the result of ``key`` is cached.
+        """
+        return key in self._cache
+
+    @property
+    def memory_budget(self) -> int:
+        """
+        The maximum memory, in bytes, used by the cached results.
+        """
+        return int(self._cache.maxsize)
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        The estimated memory, in bytes, used by the cached results.
+        """
+        return int(self._cache.currsize)
+
+    def _forget(self, key: CacheKey) -> None:
+        keys = self._keys.get((key.pair, key.timeframe))
+        if keys is not None:
+            keys.pop(key, None)
+
+    def get(
+        self, pair: str, timeframe: str, indicator: Indicator, frame: pl.DataFrame
+    ) -> pl.DataFrame:
+        """
+        Return the ``indicator`` columns for the ``pair`` OHLCV ``frame``, computing them if needed.
+
+        The returned frame has the same number of rows as ``frame``, sorted by timestamp, like
+        :meth:`~mcookbook.indicators.Indicator.compute` sorts them.
+        """
+        if frame.is_empty():
+            return indicator.compute(frame).select(indicator.columns)
+        # Key on the newest candle, whatever the row order
+        frame = chronological(frame)
+        timestamp: int = frame["timestamp"][-1]
+        key = CacheKey(pair, timeframe, indicator, timestamp, frame.height)
+        with self._lock:
+            try:
+                result: pl.DataFrame = self._cache[key]
+                self.hits += 1
+                CACHE_REQUESTS.labels("indicators", "hit").inc()
+                return result
+            except KeyError:
+                self.misses += 1
+                CACHE_REQUESTS.labels("indicators", "miss").inc()
+            latest = self._latest.get((pair, timeframe))
+            if latest is None or timestamp > latest:
+                self._latest[(pair, timeframe)] = timestamp
+                if latest is not None:
+                    self.invalidate(pair, timeframe, before=timestamp)
+            result = indicator.compute(frame).select(indicator.columns)
+            try:
+                self._cache[key] = result
+            except ValueError:
+                log.warning(
+                    "The %s result for %s(%s) does not fit the indicator cache memory budget",
+                    indicator,
+                    pair,
+                    timeframe,
+                    once_every_secs=300,  # type: ignore[call-arg]
+                )
+            else:
+                self._keys.setdefault((pair, timeframe), {})[key] = None
+            return result
+
+    def invalidate(
+        self, pair: str, timeframe: Optional[str] = None, before: Optional[int] = None
+    ) -> int:
+        """
+        Drop the cached results for ``pair`` and return how many were dropped.
+
+        :param timeframe: Only drop the results for this timeframe
+        :param before: Only drop the results whose last candle is older than this timestamp
+        """
+        dropped = 0
+        with self._lock:
+            if timeframe is None:
+                index_keys = [index_key for index_key in self._keys if index_key[0] == pair]
+            else:
+                index_keys = [(pair, timeframe)]
+            for index_key in index_keys:
+                keys = self._keys.get(index_key)
+                if keys is None:
+                    continue
+                for key in list(keys):
+                    if before is None or key.timestamp < before:
+                        del self._cache[key]
+                        dropped += 1
+                if not keys:
+                    del self._keys[index_key]
+                if before is None:
+                    self._latest.pop(index_key, None)
+        return dropped
+
+    def clear(self) -> None:
+        """
+        Drop all cached results.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._keys.clear()
+            self._latest.clear()
@@ -0,0 +1,115 @@
+"""
+Indicator engine.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.indicators.abc import Candle
+from mcookbook.indicators.abc import chronological
+from mcookbook.indicators.abc import Indicator
+from mcookbook.indicators.abc import IndicatorState
+
+log = logging.getLogger(__name__)
+
+
+class PairState:
+    """
+    The incremental state of all indicators for a single pair.
+    """
+
+    __slots__ = ("states", "timestamp")
+
+    def __init__(self, states: list[IndicatorState]) -> None:
+        self.states = states
+        self.timestamp: Optional[int] = None
+
+
+class IndicatorEngine:
+    """
+    Compute a set of indicators for many pairs.
+
+    The history of each pair is computed vectorized, by :meth:`IndicatorEngine.load`, after which
+    each new closed candle only updates the incremental indicator states, through
+    :meth:`IndicatorEngine.update`, instead of recomputing the whole window.
+    """
+
+    def __init__(self, indicators: Iterable[Indicator]) -> None:
+        self.indicators: tuple[Indicator, ...] = tuple(dict.fromkeys(indicators))
+        self.columns: tuple[str, ...] = tuple(
+            column for indicator in self.indicators for column in indicator.columns
+        )
+        self._pairs: dict[str, PairState] = {}
+
+    @property
+    def pairs(self) -> list[str]:
+        """
+        The pairs being tracked.
+        """
+        return list(self._pairs)
+
+    def compute(self, frame: pl.DataFrame) -> pl.DataFrame:
+        """
+        Return the OHLCV ``frame``, sorted by timestamp, with all the indicator columns added.
+        """
+        expressions: list[pl.Expr] = []
+        for indicator in self.indicators:
+            expressions.extend(indicator.expressions())
+        return chronological(frame).with_columns(expressions)
+
+    def load(self, pair: str, frame: pl.DataFrame) -> pl.DataFrame:
+        """
+        Start tracking ``pair``, returning its OHLCV history ``frame`` with the indicator columns.
+
+        The history is sorted by timestamp. The incremental states are warmed up with it, replacing
+        any previous state.
+        """
+        frame = chronological(frame)
+        pair_state = PairState([indicator.state() for indicator in self.indicators])
+        states = pair_state.states
+        for row in frame.select(Candle._fields).iter_rows():
+            candle = Candle(*row)
+            for state in states:
+                state.update(candle)
+            pair_state.timestamp = candle.timestamp
+        self._pairs[pair] = pair_state
+        return self.compute(frame)
+
+    def update(self, pair: str, candle: Candle) -> dict[str, Optional[float]]:
+        """
+        Update the ``pair`` indicators with a new closed ``candle`` and return the latest values.
+
+        Candles older than, or as old as, the last one seen are ignored.
+        """
+        try:
+            pair_state = self._pairs[pair]
+        except KeyError:
+            pair_state = self._pairs[pair] = PairState(
+                [indicator.state() for indicator in self.indicators]
+            )
+        if pair_state.timestamp is not None and candle.timestamp <= pair_state.timestamp:
+            log.debug("Ignoring stale %s candle for %s", candle.timestamp, pair)
+        else:
+            pair_state.timestamp = candle.timestamp
+            for state in pair_state.states:
+                state.update(candle)
+        return self.latest(pair)
+
+    def latest(self, pair: str) -> dict[str, Optional[float]]:
+        """
+        Return the latest indicator values for ``pair``.
+        """
+        values: list[Optional[float]] = []
+        for state in self._pairs[pair].states:
+            values.extend(state.values())
+        return dict(zip(self.columns, values))
+
+    def remove(self, pair: str) -> None:
+        """
+        Stop tracking ``pair``.
+        """
+        self._pairs.pop(pair, None)
@@ -0,0 +1,102 @@
+"""
+Momentum indicators.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import polars as pl
+from pydantic import Field
+
+from mcookbook.indicators.abc import Candle
+from mcookbook.indicators.abc import Indicator
+from mcookbook.indicators.abc import IndicatorState
+from mcookbook.indicators.abc import warmed_up
+from mcookbook.indicators.trend import EWM
+
+
+def _rsi(average_gain: float, average_loss: float) -> float:
+    if average_loss == 0:
+        return 50.0 if average_gain == 0 else 100.0
+    return 100 - 100 / (1 + average_gain / average_loss)
+
+
+class RSIState(IndicatorState):
+    """
+    Incremental relative strength index state.
+    """
+
+    __slots__ = ("gains", "losses", "previous_close", "warmup", "value")
+
+    def __init__(self, indicator: RSI) -> None:
+        self.gains = EWM(1 / indicator.period)
+        self.losses = EWM(1 / indicator.period)
+        self.previous_close: Optional[float] = None
+        self.warmup = indicator.period
+        self.value: Optional[float] = None
+
+    def update(self, candle: Candle) -> Optional[float]:
+        """
+        Update the index with the candle close, and return it.
+        """
+        close = candle.close
+        previous_close = self.previous_close
+        self.previous_close = close
+        if previous_close is None:
+            self.warmup -= 1
+            return None
+        change = close - previous_close
+        average_gain = self.gains.update(change if change > 0 else 0.0)
+        average_loss = self.losses.update(-change if change < 0 else 0.0)
+        if self.warmup:
+            self.warmup -= 1
+            return None
+        self.value = _rsi(average_gain, average_loss)
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest index.
+        """
+        return (self.value,)
+
+
+class RSI(Indicator):
+    """
+    Relative strength index.
+
+    Gains and losses are smoothed with Wilder's moving average, seeded with the first price change.
+    The index is ``None`` for the first ``period`` candles.
+    """
+
+    name = "rsi"
+
+    period: int = Field(default=14, ge=1)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The rsi_<period> column.
+        """
+        return (f"rsi_{self.period}",)
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the relative strength index expression.
+        """
+        change = pl.col("close").diff()
+        alpha = 1 / self.period
+        average_gain = change.clip(lower_bound=0).ewm_mean(alpha=alpha, adjust=False)
+        average_loss = (-change).clip(lower_bound=0).ewm_mean(alpha=alpha, adjust=False)
+        rsi = (
+            pl.when(average_loss == 0)
+            .then(pl.when(average_gain == 0).then(50.0).otherwise(100.0))
+            .otherwise(100 - 100 / (1 + average_gain / average_loss))
+        )
+        return [warmed_up(rsi, self.period).alias(self.columns[0])]
+
+    def state(self) -> RSIState:
+        """
+        Return a new, empty, RSI state.
+        """
+        return RSIState(self)
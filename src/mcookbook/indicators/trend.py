@@ -0,0 +1,321 @@
+"""
+Trend indicators.
+"""
+from __future__ import annotations
+
+import collections
+import math
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+from pydantic import Field
+
+from mcookbook.indicators.abc import Candle
+from mcookbook.indicators.abc import Indicator
+from mcookbook.indicators.abc import IndicatorState
+from mcookbook.indicators.abc import warmed_up
+
+
+class EWM:
+    """
+    Exponentially weighted moving average, seeded with the first value.
+    """
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        """
+        Update the average with ``value`` and return it.
+        """
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class RollingWindow:
+    """
+    Fixed size window keeping the running sum, and sum of squares, of its values.
+
+    The running sums accumulate floating point errors as values are added and removed, so they're
+    recomputed from the window values every ``size`` pushes, keeping the updates amortized constant
+    time.
+    """
+
+    __slots__ = ("size", "values", "total", "total_squares", "pushes")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values: collections.deque[float] = collections.deque()
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.pushes = 0
+
+    def push(self, value: float) -> bool:
+        """
+        Push ``value`` into the window, dropping the oldest one, and return whether it is full.
+        """
+        values = self.values
+        values.append(value)
+        self.total += value
+        self.total_squares += value * value
+        if len(values) > self.size:
+            oldest = values.popleft()
+            self.total -= oldest
+            self.total_squares -= oldest * oldest
+        self.pushes += 1
+        if self.pushes >= self.size:
+            self.pushes = 0
+            self.total = math.fsum(values)
+            self.total_squares = math.fsum(item * item for item in values)
+        return len(values) == self.size
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean of the window values.
+        """
+        return self.total / len(self.values)
+
+    @property
+    def std(self) -> float:
+        """
+        The population standard deviation of the window values.
+        """
+        mean = self.mean
+        return float(max(self.total_squares / len(self.values) - mean * mean, 0.0) ** 0.5)
+
+
+class SMAState(IndicatorState):
+    """
+    Incremental simple moving average state.
+    """
+
+    __slots__ = ("source", "window", "value")
+
+    def __init__(self, indicator: SMA) -> None:
+        self.source = Candle._fields.index(indicator.source)
+        self.window = RollingWindow(indicator.period)
+        self.value: Optional[float] = None
+
+    def update(self, candle: Candle) -> Optional[float]:
+        """
+        Update the average with the candle source price, and return it.
+        """
+        if self.window.push(candle[self.source]):
+            self.value = self.window.mean
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest average.
+        """
+        return (self.value,)
+
+
+class SMA(Indicator):
+    """
+    Simple moving average.
+    """
+
+    name = "sma"
+
+    period: int = Field(..., ge=1)
+    source: str = "close"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The sma_<period> column, with the source when it's not the close.
+        """
+        if self.source == "close":
+            return (f"sma_{self.period}",)
+        return (f"sma_{self.source}_{self.period}",)
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the rolling mean expression.
+        """
+        return [pl.col(self.source).rolling_mean(self.period).alias(self.columns[0])]
+
+    def state(self) -> SMAState:
+        """
+        Return a new, empty, SMA state.
+        """
+        return SMAState(self)
+
+
+class EMAState(IndicatorState):
+    """
+    Incremental exponential moving average state.
+    """
+
+    __slots__ = ("source", "ewm", "warmup", "value")
+
+    def __init__(self, indicator: EMA) -> None:
+        self.source = Candle._fields.index(indicator.source)
+        self.ewm = EWM(indicator.alpha)
+        self.warmup = indicator.period - 1
+        self.value: Optional[float] = None
+
+    def update(self, candle: Candle) -> Optional[float]:
+        """
+        Update the average with the candle source price, and return it.
+        """
+        value = self.ewm.update(candle[self.source])
+        if self.warmup:
+            self.warmup -= 1
+        else:
+            self.value = value
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest average.
+        """
+        return (self.value,)
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average.
+
+    The average is seeded with the first value and is ``None`` for the first ``period - 1`` candles.
+    """
+
+    name = "ema"
+
+    period: int = Field(..., ge=1)
+    source: str = "close"
+
+    @property
+    def alpha(self) -> float:
+        """
+        The smoothing factor.
+        """
+        return 2 / (self.period + 1)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The ema_<period> column, with the source when it's not the close.
+        """
+        if self.source == "close":
+            return (f"ema_{self.period}",)
+        return (f"ema_{self.source}_{self.period}",)
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the exponentially weighted mean expression.
+        """
+        ewm = pl.col(self.source).ewm_mean(alpha=self.alpha, adjust=False)
+        return [warmed_up(ewm, self.period - 1).alias(self.columns[0])]
+
+    def state(self) -> EMAState:
+        """
+        Return a new, empty, EMA state.
+        """
+        return EMAState(self)
+
+
+class MACDValue(NamedTuple):
+    """
+    MACD values.
+    """
+
+    macd: float
+    signal: float
+    histogram: float
+
+
+class MACDState(IndicatorState):
+    """
+    Incremental MACD state.
+    """
+
+    __slots__ = ("fast", "slow", "signal", "count", "macd_warmup", "signal_warmup", "value")
+
+    def __init__(self, indicator: MACD) -> None:
+        self.fast = EWM(2 / (indicator.fast + 1))
+        self.slow = EWM(2 / (indicator.slow + 1))
+        self.signal = EWM(2 / (indicator.signal + 1))
+        self.count = 0
+        self.macd_warmup = indicator.slow - 1
+        self.signal_warmup = indicator.slow + indicator.signal - 2
+        self.value: Optional[MACDValue] = None
+
+    def update(self, candle: Candle) -> Optional[MACDValue]:
+        """
+        Update the lines with the candle close, and return them.
+        """
+        close = candle.close
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        if self.count < self.signal_warmup:
+            self.count += 1
+            return None
+        self.value = MACDValue(macd, signal, macd - signal)
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest MACD, signal and histogram values.
+        """
+        if self.value is not None:
+            return tuple(self.value)
+        if self.count > self.macd_warmup and self.fast.value is not None:
+            # Only the signal line is still warming up
+            return (self.fast.value - self.slow.value, None, None)  # type: ignore[operator]
+        return (None, None, None)
+
+
+class MACD(Indicator):
+    """
+    Moving average convergence divergence.
+
+    The MACD line is ``None`` for the first ``slow - 1`` candles, the signal and histogram for the
+    first ``slow + signal - 2`` candles. While warming up, :meth:`MACDState.update` returns ``None``.
+    """
+
+    name = "macd"
+
+    fast: int = Field(default=12, ge=1)
+    slow: int = Field(default=26, ge=1)
+    signal: int = Field(default=9, ge=1)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The MACD, signal and histogram columns.
+        """
+        suffix = f"{self.fast}_{self.slow}_{self.signal}"
+        return (f"macd_{suffix}", f"macd_signal_{suffix}", f"macd_hist_{suffix}")
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the MACD, signal and histogram expressions.
+        """
+        close = pl.col("close")
+        macd = close.ewm_mean(alpha=2 / (self.fast + 1), adjust=False) - close.ewm_mean(
+            alpha=2 / (self.slow + 1), adjust=False
+        )
+        signal = macd.ewm_mean(alpha=2 / (self.signal + 1), adjust=False)
+        signal_warmup = self.slow + self.signal - 2
+        macd_column, signal_column, hist_column = self.columns
+        return [
+            warmed_up(macd, self.slow - 1).alias(macd_column),
+            warmed_up(signal, signal_warmup).alias(signal_column),
+            warmed_up(macd - signal, signal_warmup).alias(hist_column),
+        ]
+
+    def state(self) -> MACDState:
+        """
+        Return a new, empty, MACD state.
+        """
+        return MACDState(self)
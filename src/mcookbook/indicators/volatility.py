@@ -0,0 +1,178 @@
+"""
+Volatility indicators.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+from pydantic import Field
+
+from mcookbook.indicators.abc import Candle
+from mcookbook.indicators.abc import format_param
+from mcookbook.indicators.abc import Indicator
+from mcookbook.indicators.abc import IndicatorState
+from mcookbook.indicators.abc import warmed_up
+from mcookbook.indicators.trend import EWM
+from mcookbook.indicators.trend import RollingWindow
+
+
+class ATRState(IndicatorState):
+    """
+    Incremental average true range state.
+    """
+
+    __slots__ = ("ewm", "previous_close", "warmup", "value")
+
+    def __init__(self, indicator: ATR) -> None:
+        self.ewm = EWM(1 / indicator.period)
+        self.previous_close: Optional[float] = None
+        self.warmup = indicator.period - 1
+        self.value: Optional[float] = None
+
+    def update(self, candle: Candle) -> Optional[float]:
+        """
+        Update the average with the candle true range, and return it.
+        """
+        high = candle.high
+        low = candle.low
+        previous_close = self.previous_close
+        if previous_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        self.previous_close = candle.close
+        value = self.ewm.update(true_range)
+        if self.warmup:
+            self.warmup -= 1
+            return None
+        self.value = value
+        return value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest average.
+        """
+        return (self.value,)
+
+
+class ATR(Indicator):
+    """
+    Average true range.
+
+    True ranges are smoothed with Wilder's moving average, seeded with the first candle range. The
+    average is ``None`` for the first ``period - 1`` candles.
+    """
+
+    name = "atr"
+
+    period: int = Field(default=14, ge=1)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The atr_<period> column.
+        """
+        return (f"atr_{self.period}",)
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the average true range expression.
+        """
+        high = pl.col("high")
+        low = pl.col("low")
+        previous_close = pl.col("close").shift(1)
+        true_range = pl.max_horizontal(
+            high - low, (high - previous_close).abs(), (low - previous_close).abs()
+        )
+        atr = true_range.ewm_mean(alpha=1 / self.period, adjust=False)
+        return [warmed_up(atr, self.period - 1).alias(self.columns[0])]
+
+    def state(self) -> ATRState:
+        """
+        Return a new, empty, ATR state.
+        """
+        return ATRState(self)
+
+
+class Bands(NamedTuple):
+    """
+    Bollinger bands values.
+    """
+
+    middle: float
+    upper: float
+    lower: float
+
+
+class BollingerBandsState(IndicatorState):
+    """
+    Incremental Bollinger bands state.
+    """
+
+    __slots__ = ("window", "deviations", "value")
+
+    def __init__(self, indicator: BollingerBands) -> None:
+        self.window = RollingWindow(indicator.period)
+        self.deviations = indicator.deviations
+        self.value: Optional[Bands] = None
+
+    def update(self, candle: Candle) -> Optional[Bands]:
+        """
+        Update the bands with the candle close, and return them.
+        """
+        window = self.window
+        if not window.push(candle.close):
+            return None
+        middle = window.mean
+        width = window.std * self.deviations
+        self.value = Bands(middle, middle + width, middle - width)
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest middle, upper and lower bands.
+        """
+        if self.value is None:
+            return (None, None, None)
+        return tuple(self.value)
+
+
+class BollingerBands(Indicator):
+    """
+    Bollinger bands, using the population standard deviation of the closing prices.
+    """
+
+    name = "bbands"
+
+    period: int = Field(default=20, ge=1)
+    deviations: float = Field(default=2.0, gt=0)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The middle, upper and lower band columns.
+        """
+        suffix = f"{self.period}_{format_param(self.deviations)}"
+        return (f"bb_middle_{suffix}", f"bb_upper_{suffix}", f"bb_lower_{suffix}")
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the middle, upper and lower band expressions.
+        """
+        close = pl.col("close")
+        middle = close.rolling_mean(self.period)
+        width = close.rolling_std(self.period, ddof=0) * self.deviations
+        middle_column, upper_column, lower_column = self.columns
+        return [
+            middle.alias(middle_column),
+            (middle + width).alias(upper_column),
+            (middle - width).alias(lower_column),
+        ]
+
+    def state(self) -> BollingerBandsState:
+        """
+        Return a new, empty, Bollinger bands state.
+        """
+        return BollingerBandsState(self)
@@ -0,0 +1,99 @@
+"""
+Volume indicators.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import ccxt
+import polars as pl
+
+from mcookbook.indicators.abc import Candle
+from mcookbook.indicators.abc import Indicator
+from mcookbook.indicators.abc import IndicatorState
+
+
+class VWAPState(IndicatorState):
+    """
+    Incremental volume weighted average price state.
+    """
+
+    __slots__ = ("anchor", "period", "price_volume", "volume", "value")
+
+    def __init__(self, indicator: VWAP) -> None:
+        self.anchor = indicator.anchor_ms
+        self.period: Optional[int] = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, candle: Candle) -> Optional[float]:
+        """
+        Update the average with the candle typical price and volume, and return it.
+        """
+        if self.anchor:
+            period = candle.timestamp // self.anchor
+            if period != self.period:
+                self.period = period
+                self.price_volume = 0.0
+                self.volume = 0.0
+        volume = candle.volume
+        self.price_volume += (candle.high + candle.low + candle.close) / 3 * volume
+        self.volume += volume
+        self.value = self.price_volume / self.volume if self.volume else None
+        return self.value
+
+    def values(self) -> tuple[Optional[float], ...]:
+        """
+        Return the latest average.
+        """
+        return (self.value,)
+
+
+class VWAP(Indicator):
+    """
+    Volume weighted average price, of the typical price.
+
+    When ``anchor`` is set, a timeframe like ``1d``, the average restarts at each anchor period.
+    """
+
+    name = "vwap"
+
+    anchor: Optional[str] = None
+
+    @property
+    def anchor_ms(self) -> int:
+        """
+        The anchor period, in milliseconds, or zero when the average is not anchored.
+        """
+        if self.anchor is None:
+            return 0
+        return int(ccxt.Exchange.parse_timeframe(self.anchor) * 1000)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """
+        The vwap column, with the anchor when set.
+        """
+        if self.anchor is None:
+            return ("vwap",)
+        return (f"vwap_{self.anchor}",)
+
+    def expressions(self) -> list[pl.Expr]:
+        """
+        Return the volume weighted average price expression.
+        """
+        volume = pl.col("volume")
+        price_volume = (pl.col("high") + pl.col("low") + pl.col("close")) / 3 * volume
+        if self.anchor is None:
+            vwap = price_volume.cum_sum() / volume.cum_sum()
+        else:
+            period = pl.col("timestamp") // self.anchor_ms
+            vwap = price_volume.cum_sum().over(period) / volume.cum_sum().over(period)
+        return [vwap.fill_nan(None).alias(self.columns[0])]
+
+    def state(self) -> VWAPState:
+        """
+        Return a new, empty, VWAP state.
+        """
+        return VWAPState(self)
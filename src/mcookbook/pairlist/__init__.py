@@ -2,8 +2,12 @@ from __future__ import annotations
 
 from .abc import PairList
 from .static import StaticPairList
+from mcookbook.utils import diff_pairlists
+from mcookbook.utils import PairListDiff
 
 __all__ = [
+    "diff_pairlists",
     "PairList",
+    "PairListDiff",
     "StaticPairList",
 ]
@@ -4,16 +4,21 @@ Pair list manager.
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 from typing import TYPE_CHECKING
 
-from cachetools import cached
 from cachetools import TTLCache
 from ccxt.async_support import Exchange as CCXTExchange
 from pydantic import BaseModel
 from pydantic import PrivateAttr
 
+from mcookbook.utils import clock
+from mcookbook.utils import diff_pairlists
 from mcookbook.utils import expand_pairlist
+from mcookbook.utils import PairListDiff
+from mcookbook.utils.metrics import CACHE_REQUESTS
+from mcookbook.utils.metrics import REGISTRY
 
 if TYPE_CHECKING:
     from mcookbook.config.live import LiveConfig
@@ -22,6 +27,16 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+PAIRLIST_REFRESH_DURATION = REGISTRY.histogram(
+    "mcookbook_pairlist_refresh_duration_seconds", "Time taken to refresh the pair list."
+)
+PAIRLIST_SIZE = REGISTRY.gauge("mcookbook_pairlist_size", "Number of pairs in the pair list.")
+PAIRLIST_CHANGES = REGISTRY.counter(
+    "mcookbook_pairlist_changes_total",
+    "Pairs added to, or removed from, the pair list.",
+    labelnames=("change",),
+)
+
 
 class PairListManager(BaseModel):
     """
@@ -32,6 +47,9 @@ class PairListManager(BaseModel):
     _block_list: list[str] = PrivateAttr(default_factory=list)
     _pairlist_handlers: list[PairList] = PrivateAttr(default_factory=list)
     _tickers_needed: bool = PrivateAttr(default=False)
+    _tickers_cache: TTLCache = PrivateAttr(  # type: ignore[type-arg]
+        default_factory=lambda: TTLCache(maxsize=1, ttl=1800, timer=clock.monotonic)
+    )
     _exchange: Exchange = PrivateAttr()
     config: LiveConfig
 
@@ -51,6 +69,13 @@ class PairListManager(BaseModel):
         """
         return self._exchange.api
 
+    @property
+    def pairlist(self) -> list[str]:
+        """
+        The current pair list.
+        """
+        return list(self._allow_list)
+
     @property
     def expanded_blacklist(self) -> list[str]:
         """
@@ -58,16 +83,27 @@ class PairListManager(BaseModel):
         """
         return expand_pairlist(self._block_list, list(self._exchange.markets))
 
-    @cached(TTLCache(maxsize=1, ttl=1800))
     async def _get_cached_tickers(self) -> dict[str, Any]:
+        tickers: dict[str, Any]
+        try:
+            tickers = self._tickers_cache["tickers"]
+            CACHE_REQUESTS.labels("tickers", "hit").inc()
+            return tickers
+        except KeyError:
+            CACHE_REQUESTS.labels("tickers", "miss").inc()
         log.info("Fetching tickers for exchange %s", self.config.exchange.name)
-        tickers: dict[str, Any] = await self.exchange.get_tickers()
+        tickers = await self.exchange.fetch_tickers()
+        self._tickers_cache["tickers"] = tickers
         return tickers
 
-    async def refresh_pairlist(self) -> None:
+    async def refresh_pairlist(self) -> PairListDiff:
         """
         Run pairlist through all configured Pairlist Handlers.
+
+        Returns the difference with the previous pair list, so that only the pairs which changed
+        need their market data subscriptions, candles and indicators set up, or torn down.
         """
+        start = time.perf_counter()
         # Tickers should be cached to avoid calling the exchange on each call.
         tickers: dict[str, Any] = {}
         if self._tickers_needed:
@@ -85,8 +121,23 @@ class PairListManager(BaseModel):
         # to ensure blacklist is respected.
         pairlist = self.verify_blacklist(pairlist)
 
+        diff = diff_pairlists(self._allow_list, pairlist)
         self._allow_list = pairlist
-        log.info("Loaded pair list: %s", self._allow_list)
+        PAIRLIST_REFRESH_DURATION.observe(time.perf_counter() - start)
+        PAIRLIST_SIZE.set(len(pairlist))
+        PAIRLIST_CHANGES.labels("added").inc(len(diff.added))
+        PAIRLIST_CHANGES.labels("removed").inc(len(diff.removed))
+        if diff.changed:
+            log.info(
+                "Refreshed pair list. Added: %s. Removed: %s. Unchanged: %d pairs",
+                diff.added,
+                diff.removed,
+                len(diff.unchanged),
+            )
+        else:
+            log.info("Refreshed pair list. Unchanged: %d pairs", len(diff.unchanged))
+        log.debug("Loaded pair list: %s", self._allow_list)
+        return diff
 
     def verify_blacklist(self, pairlist: list[str]) -> list[str]:
         """
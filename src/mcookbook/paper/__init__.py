@@ -0,0 +1,20 @@
+"""
+Paper trading.
+"""
+from __future__ import annotations
+
+from .api import PaperTradingAPI
+from .matching import Fill
+from .matching import FILLS_SCHEMA
+from .matching import MarketSpec
+from .matching import MatchingEngine
+from .matching import Order
+
+__all__ = [
+    "Fill",
+    "FILLS_SCHEMA",
+    "MarketSpec",
+    "MatchingEngine",
+    "Order",
+    "PaperTradingAPI",
+]
@@ -0,0 +1,183 @@
+"""
+Paper trading exchange client.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+from typing import Optional
+
+import ccxt
+
+from mcookbook.paper.matching import MatchingEngine
+from mcookbook.paper.matching import Order
+from mcookbook.utils.clock import get_clock
+
+log = logging.getLogger(__name__)
+
+
+class PaperTradingAPI:
+    """
+    A ccxt exchange compatible client simulating the orders, with a :class:`MatchingEngine`.
+
+    Everything else is forwarded to the wrapped client, a real ccxt exchange or a replay one, and
+    the order books and tickers it returns are fed to the matching engine.
+    """
+
+    def __init__(self, api: Any, balances: Optional[dict[str, float]] = None) -> None:
+        self._api = api
+        self.engine = MatchingEngine(
+            getattr(api, "markets", None) or {},
+            balances,
+            precision_mode=getattr(api, "precisionMode", None),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Proxy everything else to the wrapped client.
+        """
+        return getattr(self._api, name)
+
+    def _timestamp(self) -> int:
+        return int(get_clock().time() * 1000)
+
+    def _order(self, order: Order) -> dict[str, Any]:
+        return order.to_ccxt(self.engine.spec(order.symbol).quote)
+
+    def set_markets(self, markets: dict[str, dict[str, Any]], *args: Any) -> None:
+        """
+        Set the markets.
+        """
+        self._api.set_markets(markets, *args)
+        self.engine.set_markets(self._api.markets)
+
+    async def load_markets(self, *args: Any, **kwargs: Any) -> dict[str, dict[str, Any]]:
+        """
+        Load the markets.
+        """
+        markets: dict[str, dict[str, Any]] = await self._api.load_markets(*args, **kwargs)
+        self.engine.set_markets(markets)
+        return markets
+
+    async def fetch_order_book(
+        self, symbol: str, limit: Optional[int] = None, *args: Any
+    ) -> dict[str, Any]:
+        """
+        Fetch the ``symbol`` order book.
+        """
+        book: dict[str, Any] = await self._api.fetch_order_book(symbol, limit, *args)
+        self.engine.on_book(
+            symbol, book["bids"], book["asks"], book.get("timestamp") or self._timestamp()
+        )
+        return book
+
+    async def fetch_tickers(
+        self, symbols: Optional[list[str]] = None, *args: Any
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch the tickers.
+        """
+        tickers: dict[str, dict[str, Any]] = await self._api.fetch_tickers(symbols, *args)
+        for ticker in tickers.values():
+            self.engine.on_ticker(ticker)
+        return tickers
+
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,  # pylint: disable=redefined-builtin
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Create a simulated order.
+        """
+        order = self.engine.submit(symbol, type, side, amount, price, self._timestamp())
+        log.debug("Paper %s %s order %s: %s", type, side, order.id, order.status)
+        return self._order(order)
+
+    async def cancel_order(
+        self,
+        id: str,  # pylint: disable=redefined-builtin
+        symbol: Optional[str] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Cancel a simulated order.
+        """
+        return self._order(self.engine.cancel(id))
+
+    async def fetch_order(
+        self,
+        id: str,  # pylint: disable=redefined-builtin
+        symbol: Optional[str] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch a simulated order.
+        """
+        try:
+            return self._order(self.engine.orders[id])
+        except KeyError:
+            raise ccxt.OrderNotFound(f"There's no order with the ID {id!r}") from None
+
+    async def fetch_open_orders(
+        self, symbol: Optional[str] = None, *args: Any
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch the open simulated orders.
+        """
+        return [self._order(order) for order in self.engine.open_orders(symbol)]
+
+    async def fetch_closed_orders(
+        self, symbol: Optional[str] = None, *args: Any
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch the closed and canceled simulated orders.
+        """
+        return [
+            self._order(order)
+            for order in self.engine.orders.values()
+            if order.status != "open" and (symbol is None or order.symbol == symbol)
+        ]
+
+    async def fetch_my_trades(
+        self, symbol: Optional[str] = None, *args: Any
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch the simulated fills, as ccxt trades.
+        """
+        return [
+            {
+                "id": str(index),
+                "order": fill.order_id,
+                "timestamp": fill.timestamp,
+                "datetime": ccxt.Exchange.iso8601(fill.timestamp),
+                "symbol": fill.symbol,
+                "type": self.engine.orders[fill.order_id].type,
+                "side": fill.side,
+                "takerOrMaker": "taker" if fill.taker else "maker",
+                "price": fill.price,
+                "amount": fill.amount,
+                "cost": fill.price * fill.amount,
+                "fee": {"cost": fill.fee, "currency": self.engine.spec(fill.symbol).quote},
+                "info": {},
+            }
+            for index, fill in enumerate(self.engine.fills, start=1)
+            if symbol is None or fill.symbol == symbol
+        ]
+
+    async def fetch_balance(self, *args: Any) -> dict[str, Any]:
+        """
+        Fetch the simulated balances.
+        """
+        balance: dict[str, Any] = {"free": {}, "used": {}, "total": {}, "info": {}}
+        for currency in sorted(self.engine.free.keys() | self.engine.used.keys()):
+            free, used = self.engine.balance(currency)
+            balance[currency] = {"free": free, "used": used, "total": free + used}
+            balance["free"][currency] = free
+            balance["used"][currency] = used
+            balance["total"][currency] = free + used
+        return balance
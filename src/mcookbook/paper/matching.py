@@ -0,0 +1,598 @@
+"""
+Paper trading order matching.
+
+Simulated orders are matched against whatever market data is fed to the engine, order book
+snapshots, top of book tickers, public trades or closed candles, applying the fees, precision and
+limits of the loaded markets, and keeping track of the simulated balances.
+
+Resting limit orders approximate their queue position. When placed, an order is queued behind the
+volume already resting at its price level. That volume only ever shrinks, when the level volume in
+later order book snapshots is smaller, or when public trades happen at the order price. The order
+only fills once the volume ahead of it is gone, or the market trades through its price.
+"""
+from __future__ import annotations
+
+import decimal
+import itertools
+import math
+from collections.abc import Iterable
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import ccxt
+import polars as pl
+
+from mcookbook.indicators.abc import Candle
+
+# The fee used for the markets which do not define their maker or taker fees
+DEFAULT_FEE = 0.001
+
+FILLS_SCHEMA = {
+    "timestamp": pl.Int64,
+    "order_id": pl.Utf8,
+    "symbol": pl.Utf8,
+    "side": pl.Utf8,
+    "price": pl.Float64,
+    "amount": pl.Float64,
+    "fee": pl.Float64,
+    "taker": pl.Boolean,
+}
+
+Levels = list[list[float]]
+
+
+class Fill(NamedTuple):
+    """
+    An order fill. The ``fee`` is paid in the quote currency.
+    """
+
+    timestamp: int
+    order_id: str
+    symbol: str
+    side: str
+    price: float
+    amount: float
+    fee: float
+    taker: bool
+
+
+class MarketSpec(NamedTuple):
+    """
+    The trading rules of a market, extracted from the ccxt market structure.
+    """
+
+    base: str
+    quote: str
+    amount_step: Optional[float]
+    amount_digits: int
+    price_step: Optional[float]
+    price_digits: int
+    min_amount: float
+    max_amount: float
+    min_price: float
+    max_price: float
+    min_cost: float
+    maker: float
+    taker: float
+
+    @classmethod
+    def from_market(cls, market: dict[str, Any], precision_mode: Optional[int]) -> MarketSpec:
+        """
+        Return the trading rules of the ccxt ``market``.
+
+        When ``precision_mode`` is ``None``, integer precisions are taken as a number of decimal
+        places and float precisions as tick sizes.
+        """
+        precision = market.get("precision") or {}
+        limits = market.get("limits") or {}
+        amount_step, amount_digits = _step(precision.get("amount"), precision_mode)
+        price_step, price_digits = _step(precision.get("price"), precision_mode)
+        amount_limits = limits.get("amount") or {}
+        price_limits = limits.get("price") or {}
+        cost_limits = limits.get("cost") or {}
+        return cls(
+            base=market["base"],
+            quote=market["quote"],
+            amount_step=amount_step,
+            amount_digits=amount_digits,
+            price_step=price_step,
+            price_digits=price_digits,
+            min_amount=amount_limits.get("min") or 0.0,
+            max_amount=amount_limits.get("max") or math.inf,
+            min_price=price_limits.get("min") or 0.0,
+            max_price=price_limits.get("max") or math.inf,
+            min_cost=cost_limits.get("min") or 0.0,
+            maker=_fee(market.get("maker")),
+            taker=_fee(market.get("taker")),
+        )
+
+    def amount_to_precision(self, amount: float) -> float:
+        """
+        Truncate ``amount`` to the market amount precision.
+        """
+        if self.amount_step is None:
+            return amount
+        steps = math.floor(amount / self.amount_step + 1e-9)
+        return round(steps * self.amount_step, self.amount_digits)
+
+    def price_to_precision(self, price: float) -> float:
+        """
+        Round ``price`` to the market price precision.
+        """
+        if self.price_step is None:
+            return price
+        return round(round(price / self.price_step) * self.price_step, self.price_digits)
+
+
+def _step(precision: Optional[float], precision_mode: Optional[int]) -> tuple[Optional[float], int]:
+    """
+    Return the step size, and the number of decimal places needed to represent it.
+    """
+    if precision is None:
+        return None, 0
+    if precision_mode == ccxt.DECIMAL_PLACES or (
+        precision_mode is None and isinstance(precision, int)
+    ):
+        return 10.0**-precision, max(0, int(precision))
+    exponent = decimal.Decimal(str(precision)).normalize().as_tuple().exponent
+    return float(precision), max(0, -int(exponent))
+
+
+def _fee(fee: Optional[float]) -> float:
+    return DEFAULT_FEE if fee is None else float(fee)
+
+
+class Order:
+    """
+    A simulated order.
+    """
+
+    __slots__ = (
+        "id",
+        "symbol",
+        "type",
+        "side",
+        "price",
+        "amount",
+        "filled",
+        "cost",
+        "fee",
+        "status",
+        "timestamp",
+        "last_trade_timestamp",
+        "queue",
+    )
+
+    def __init__(
+        self,
+        order_id: str,
+        symbol: str,
+        order_type: str,
+        side: str,
+        price: Optional[float],
+        amount: float,
+        timestamp: int,
+    ) -> None:
+        self.id = order_id
+        self.symbol = symbol
+        self.type = order_type
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.status = "open"
+        self.timestamp = timestamp
+        self.last_trade_timestamp: Optional[int] = None
+        # The volume queued ahead of the order, at its price level
+        self.queue = 0.0
+
+    @property
+    def remaining(self) -> float:
+        """
+        The amount left to fill.
+        """
+        return self.amount - self.filled
+
+    @property
+    def average(self) -> Optional[float]:
+        """
+        The average fill price.
+        """
+        return self.cost / self.filled if self.filled else None
+
+    def to_ccxt(self, quote: str) -> dict[str, Any]:
+        """
+        Return the order as a ccxt order structure.
+        """
+        return {
+            "id": self.id,
+            "clientOrderId": None,
+            "timestamp": self.timestamp,
+            "datetime": ccxt.Exchange.iso8601(self.timestamp),
+            "lastTradeTimestamp": self.last_trade_timestamp,
+            "symbol": self.symbol,
+            "type": self.type,
+            "timeInForce": "GTC" if self.type == "limit" else "IOC",
+            "side": self.side,
+            "price": self.price if self.price is not None else self.average,
+            "average": self.average,
+            "amount": self.amount,
+            "filled": self.filled,
+            "remaining": self.remaining,
+            "cost": self.cost,
+            "status": self.status,
+            "fee": {"cost": self.fee, "currency": quote},
+            "trades": [],
+            "info": {},
+        }
+
+
+class _Book:
+    __slots__ = ("bids", "asks", "last")
+
+    def __init__(self) -> None:
+        self.bids: Levels = []
+        self.asks: Levels = []
+        self.last: Optional[float] = None
+
+
+def _level_volume(levels: Levels, price: float) -> float:
+    for level_price, volume in levels:
+        if level_price == price:
+            return volume
+    return 0.0
+
+
+class MatchingEngine:
+    """
+    Paper trading matching engine.
+
+    :param markets: The ccxt markets, keyed by symbol
+    :param balances: The starting balances, keyed by currency
+    :param precision_mode: The ccxt precision mode of the markets. See
+                           :meth:`MarketSpec.from_market`.
+    """
+
+    def __init__(
+        self,
+        markets: dict[str, dict[str, Any]],
+        balances: Optional[dict[str, float]] = None,
+        precision_mode: Optional[int] = None,
+    ) -> None:
+        self.markets = markets
+        self.precision_mode = precision_mode
+        self.free: dict[str, float] = dict(balances or {})
+        self.used: dict[str, float] = {}
+        self.orders: dict[str, Order] = {}
+        self.fills: list[Fill] = []
+        self._specs: dict[str, MarketSpec] = {}
+        self._books: dict[str, _Book] = {}
+        self._resting: dict[str, list[Order]] = {}
+        self._ids = itertools.count(1)
+
+    def spec(self, symbol: str) -> MarketSpec:
+        """
+        Return the ``symbol`` market trading rules.
+        """
+        try:
+            return self._specs[symbol]
+        except KeyError:
+            pass
+        try:
+            market = self.markets[symbol]
+        except KeyError:
+            raise ccxt.BadSymbol(f"Unknown market symbol {symbol!r}") from None
+        spec = self._specs[symbol] = MarketSpec.from_market(market, self.precision_mode)
+        return spec
+
+    def set_markets(self, markets: dict[str, dict[str, Any]]) -> None:
+        """
+        Replace the markets.
+        """
+        self.markets = markets
+        self._specs.clear()
+
+    def _book(self, symbol: str) -> _Book:
+        try:
+            return self._books[symbol]
+        except KeyError:
+            book = self._books[symbol] = _Book()
+            return book
+
+    def balance(self, currency: str) -> tuple[float, float]:
+        """
+        Return the ``currency`` free and used balances.
+        """
+        return self.free.get(currency, 0.0), self.used.get(currency, 0.0)
+
+    def _move(self, currency: str, free: float, used: float = 0.0) -> None:
+        self.free[currency] = self.free.get(currency, 0.0) + free
+        if used:
+            self.used[currency] = self.used.get(currency, 0.0) + used
+
+    # ----- Market data ---------------------------------------------------------------------------
+
+    def on_book(self, symbol: str, bids: Levels, asks: Levels, timestamp: int) -> None:
+        """
+        Update the ``symbol`` order book, ccxt style, bids descending and asks ascending.
+        """
+        book = self._book(symbol)
+        book.bids = bids
+        book.asks = asks
+        resting = self._resting.get(symbol)
+        if not resting:
+            return
+        best_bid = bids[0][0] if bids else None
+        best_ask = asks[0][0] if asks else None
+        for order in list(resting):
+            price: float = order.price  # type: ignore[assignment]
+            if order.side == "buy":
+                if best_ask is not None and best_ask <= price:
+                    # The real book never crosses, the whole price level was consumed
+                    self._fill(order, price, order.remaining, False, timestamp)
+                    continue
+                if order.queue:
+                    order.queue = min(order.queue, _level_volume(bids, price))
+            else:
+                if best_bid is not None and best_bid >= price:
+                    self._fill(order, price, order.remaining, False, timestamp)
+                    continue
+                if order.queue:
+                    order.queue = min(order.queue, _level_volume(asks, price))
+
+    def on_ticker(self, ticker: dict[str, Any]) -> None:
+        """
+        Update the ``ticker`` symbol top of book.
+
+        A top of book without volumes is taken as infinitely deep.
+        """
+        bid = ticker.get("bid")
+        ask = ticker.get("ask")
+        last = ticker.get("last")
+        if last is not None:
+            self._book(ticker["symbol"]).last = last
+        if bid is None or ask is None:
+            return
+        self.on_book(
+            ticker["symbol"],
+            [[bid, ticker.get("bidVolume") or math.inf]],
+            [[ask, ticker.get("askVolume") or math.inf]],
+            ticker.get("timestamp") or 0,
+        )
+
+    def on_trade(self, symbol: str, price: float, amount: float, timestamp: int) -> None:
+        """
+        Process a public trade of ``amount`` at ``price``.
+        """
+        self._book(symbol).last = price
+        resting = self._resting.get(symbol)
+        if not resting:
+            return
+        for order in list(resting):
+            order_price: float = order.price  # type: ignore[assignment]
+            if order.side == "buy":
+                if price > order_price:
+                    continue
+            elif price < order_price:
+                continue
+            if price != order_price:
+                # Traded through the order price
+                self._fill(order, order_price, order.remaining, False, timestamp)
+                continue
+            available = amount - order.queue
+            order.queue = max(0.0, order.queue - amount)
+            if available > 0:
+                self._fill(order, order_price, min(order.remaining, available), False, timestamp)
+
+    def on_candle(self, symbol: str, candle: Candle) -> None:
+        """
+        Process a closed candle, filling the resting orders the market traded through.
+        """
+        self._book(symbol).last = candle.close
+        resting = self._resting.get(symbol)
+        if not resting:
+            return
+        for order in list(resting):
+            price: float = order.price  # type: ignore[assignment]
+            if (order.side == "buy" and candle.low < price) or (
+                order.side == "sell" and candle.high > price
+            ):
+                self._fill(order, price, order.remaining, False, candle.timestamp)
+
+    # ----- Orders --------------------------------------------------------------------------------
+
+    def submit(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        timestamp: int = 0,
+    ) -> Order:
+        """
+        Submit a new order and match it against the current market data.
+
+        :raises ccxt.InvalidOrder: When the order breaks the market precision or limits
+        :raises ccxt.InsufficientFunds: When the balance can't pay for the order
+        :raises ccxt.OrderNotFillable: When there's no market data to fill a market order
+        """
+        spec = self.spec(symbol)
+        if side not in ("buy", "sell"):
+            raise ccxt.InvalidOrder(f"Invalid order side {side!r}")
+        amount = spec.amount_to_precision(amount)
+        if not spec.min_amount <= amount <= spec.max_amount or amount <= 0:
+            raise ccxt.InvalidOrder(
+                f"{symbol} order amount {amount} is outside the "
+                f"[{spec.min_amount}, {spec.max_amount}] limits"
+            )
+        book = self._book(symbol)
+        if order_type == "market":
+            return self._submit_market(spec, book, symbol, side, amount, timestamp)
+        if order_type != "limit":
+            raise ccxt.InvalidOrder(f"Unsupported order type {order_type!r}")
+        if price is None:
+            raise ccxt.InvalidOrder("Limit orders require a price")
+        price = spec.price_to_precision(price)
+        if not spec.min_price <= price <= spec.max_price or price <= 0:
+            raise ccxt.InvalidOrder(
+                f"{symbol} order price {price} is outside the "
+                f"[{spec.min_price}, {spec.max_price}] limits"
+            )
+        if amount * price < spec.min_cost:
+            raise ccxt.InvalidOrder(
+                f"{symbol} order cost {amount * price} is below the {spec.min_cost} minimum"
+            )
+        # Reserve the funds, assuming the worst case fee
+        if side == "buy":
+            currency, reserve = spec.quote, amount * price * (1 + spec.taker)
+        else:
+            currency, reserve = spec.base, amount
+        if self.free.get(currency, 0.0) < reserve:
+            raise ccxt.InsufficientFunds(
+                f"Not enough {currency} to {side} {amount} {symbol} at {price}"
+            )
+        self._move(currency, -reserve, reserve)
+        order = Order(str(next(self._ids)), symbol, "limit", side, price, amount, timestamp)
+        self.orders[order.id] = order
+        # Take the liquidity the order crosses
+        levels = book.asks if side == "buy" else book.bids
+        taken, book_levels = self._sweep(levels, order.amount, price, side)
+        if taken:
+            if side == "buy":
+                book.asks = book_levels
+            else:
+                book.bids = book_levels
+        for fill_price, fill_amount in taken:
+            self._fill(order, fill_price, fill_amount, True, timestamp)
+        if order.status == "open":
+            order.queue = _level_volume(book.bids if side == "buy" else book.asks, price)
+            self._resting.setdefault(symbol, []).append(order)
+        return order
+
+    def _submit_market(
+        self, spec: MarketSpec, book: _Book, symbol: str, side: str, amount: float, timestamp: int
+    ) -> Order:
+        levels = book.asks if side == "buy" else book.bids
+        taken, book_levels = self._sweep(levels, amount, None, side)
+        remaining = amount - sum(fill_amount for _, fill_amount in taken)
+        if remaining > 0:
+            # Beyond the known depth, fill at the worst known price
+            if levels:
+                worst = levels[-1][0]
+            elif book.last is not None:
+                worst = book.last
+            else:
+                raise ccxt.OrderNotFillable(f"There's no {symbol} market data to fill the order")
+            taken.append((worst, remaining))
+        cost = sum(fill_price * fill_amount for fill_price, fill_amount in taken)
+        if cost < spec.min_cost:
+            raise ccxt.InvalidOrder(
+                f"{symbol} order cost {cost} is below the {spec.min_cost} minimum"
+            )
+        if side == "buy":
+            currency, needed = spec.quote, cost * (1 + spec.taker)
+        else:
+            currency, needed = spec.base, amount
+        if self.free.get(currency, 0.0) < needed:
+            raise ccxt.InsufficientFunds(f"Not enough {currency} to {side} {amount} {symbol}")
+        if side == "buy":
+            book.asks = book_levels
+        else:
+            book.bids = book_levels
+        order = Order(str(next(self._ids)), symbol, "market", side, None, amount, timestamp)
+        self.orders[order.id] = order
+        for fill_price, fill_amount in taken:
+            self._fill(order, fill_price, fill_amount, True, timestamp)
+        return order
+
+    @staticmethod
+    def _sweep(
+        levels: Levels, amount: float, limit: Optional[float], side: str
+    ) -> tuple[list[tuple[float, float]], Levels]:
+        """
+        Take up to ``amount`` from ``levels``, up to the ``limit`` price.
+
+        Returns the taken ``(price, amount)`` pairs and the levels left.
+        """
+        taken: list[tuple[float, float]] = []
+        for index, (price, volume) in enumerate(levels):
+            if limit is not None and (price > limit if side == "buy" else price < limit):
+                return taken, levels[index:]
+            if volume >= amount:
+                taken.append((price, amount))
+                rest = index + 1
+                if volume == amount:
+                    return taken, levels[rest:]
+                return taken, [[price, volume - amount]] + levels[rest:]
+            taken.append((price, volume))
+            amount -= volume
+        return taken, []
+
+    def _fill(self, order: Order, price: float, amount: float, taker: bool, timestamp: int) -> None:
+        spec = self._specs[order.symbol]
+        cost = price * amount
+        fee = cost * (spec.taker if taker else spec.maker)
+        if order.side == "buy":
+            if order.type == "limit":
+                reserved = amount * order.price * (1 + spec.taker)  # type: ignore[operator]
+                self._move(spec.quote, reserved, -reserved)
+            self._move(spec.quote, -cost - fee)
+            self._move(spec.base, amount)
+        else:
+            if order.type == "limit":
+                self._move(spec.base, amount, -amount)
+            self._move(spec.base, -amount)
+            self._move(spec.quote, cost - fee)
+        order.filled += amount
+        order.cost += cost
+        order.fee += fee
+        order.last_trade_timestamp = timestamp
+        self.fills.append(
+            Fill(timestamp, order.id, order.symbol, order.side, price, amount, fee, taker)
+        )
+        if order.remaining <= order.amount * 1e-9:
+            order.status = "closed"
+            self._unrest(order)
+
+    def _unrest(self, order: Order) -> None:
+        resting = self._resting.get(order.symbol)
+        if resting and order in resting:
+            resting.remove(order)
+
+    def cancel(self, order_id: str) -> Order:
+        """
+        Cancel an open order.
+
+        :raises ccxt.OrderNotFound: When there's no such open order
+        """
+        order = self.orders.get(order_id)
+        if order is None or order.status != "open":
+            raise ccxt.OrderNotFound(f"There's no open order with the ID {order_id!r}")
+        spec = self._specs[order.symbol]
+        remaining = order.remaining
+        if order.side == "buy":
+            reserved = remaining * order.price * (1 + spec.taker)  # type: ignore[operator]
+            self._move(spec.quote, reserved, -reserved)
+        else:
+            self._move(spec.base, remaining, -remaining)
+        order.status = "canceled"
+        self._unrest(order)
+        return order
+
+    def open_orders(self, symbol: Optional[str] = None) -> Iterable[Order]:
+        """
+        Return the open orders, optionally only the ``symbol`` ones.
+        """
+        if symbol is not None:
+            return list(self._resting.get(symbol, ()))
+        return [order for orders in self._resting.values() for order in orders]
+
+    def fills_frame(self) -> pl.DataFrame:
+        """
+        Return the fills as a data frame.
+        """
+        return pl.DataFrame(self.fills, schema=FILLS_SCHEMA, orient="row")
@@ -0,0 +1,30 @@
+"""
+Market event replay.
+"""
+from __future__ import annotations
+
+from .engine import ReplayAPI
+from .engine import ReplayEngine
+from .engine import ReplayResult
+from .events import BookEvent
+from .events import candle_events
+from .events import CandleEvent
+from .events import Event
+from .events import merge_events
+from .events import read_events
+from .events import TickersEvent
+from .events import write_events
+
+__all__ = [
+    "BookEvent",
+    "candle_events",
+    "CandleEvent",
+    "Event",
+    "merge_events",
+    "read_events",
+    "ReplayAPI",
+    "ReplayEngine",
+    "ReplayResult",
+    "TickersEvent",
+    "write_events",
+]
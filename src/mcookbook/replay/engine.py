@@ -0,0 +1,288 @@
+"""
+Deterministic market event replay.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import ccxt
+import polars as pl
+
+from mcookbook.data.resample import can_resample
+from mcookbook.data.resample import Resampler
+from mcookbook.exchanges import Exchange
+from mcookbook.indicators.abc import Candle
+from mcookbook.paper import FILLS_SCHEMA
+from mcookbook.paper import PaperTradingAPI
+from mcookbook.replay.events import BookEvent
+from mcookbook.replay.events import CandleEvent
+from mcookbook.replay.events import Event
+from mcookbook.replay.events import TickersEvent
+from mcookbook.strategies import Signal
+from mcookbook.strategies import SignalEvaluator
+from mcookbook.strategies import Strategy
+from mcookbook.utils.clock import set_clock
+from mcookbook.utils.clock import VirtualClock
+from mcookbook.utils.metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+DECISION_LATENCY = REGISTRY.histogram(
+    "mcookbook_decision_latency_seconds",
+    "Time taken to evaluate the strategy signals of the candles closed at the same time.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+SIGNALS_SCHEMA = {
+    "timestamp": pl.Int64,
+    "pair": pl.Utf8,
+    "entry": pl.Boolean,
+    "exit": pl.Boolean,
+}
+
+
+class ReplayAPI:
+    """
+    A ccxt exchange compatible client, serving the replayed market data instead of requesting it.
+    """
+
+    def __init__(self, markets: Optional[dict[str, dict[str, Any]]] = None) -> None:
+        self.markets: dict[str, dict[str, Any]] = markets or {}
+        self.tickers: dict[str, dict[str, Any]] = {}
+        self.order_books: dict[str, dict[str, Any]] = {}
+        self.last_response_headers: dict[str, str] = {}
+
+    def set_markets(self, markets: dict[str, dict[str, Any]]) -> None:
+        """
+        Set the markets.
+        """
+        self.markets = markets
+
+    async def load_markets(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the markets.
+        """
+        return self.markets
+
+    async def fetch_tickers(self, symbols: Optional[list[str]] = None) -> dict[str, dict[str, Any]]:
+        """
+        Return the latest replayed tickers.
+        """
+        if symbols is None:
+            return dict(self.tickers)
+        return {symbol: self.tickers[symbol] for symbol in symbols if symbol in self.tickers}
+
+    async def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> dict[str, Any]:
+        """
+        Return the latest replayed ``symbol`` order book.
+        """
+        book = self.order_books[symbol]
+        if limit is None:
+            return book
+        return book | {"bids": book["bids"][:limit], "asks": book["asks"][:limit]}
+
+    async def close(self) -> None:
+        """
+        Nothing to close.
+        """
+
+
+class ReplayResult(NamedTuple):
+    """
+    Replay results.
+
+    ``signals`` only holds the candles with an entry or exit signal, of the pairs in the pair list
+    at the time. ``latencies`` holds, in seconds, how long each decision took, that is, evaluating
+    the signals of all the candles closed at the same time. ``fills`` holds the paper trading
+    fills, when the signals are executed, and ``rejected`` the number of orders the paper trading
+    engine rejected.
+    """
+
+    signals: pl.DataFrame
+    events: int
+    candles: int
+    latencies: pl.Series
+    duration: float
+    fills: pl.DataFrame
+    rejected: int
+
+
+class ReplayEngine:
+    """
+    Replay market events through the live pair list, indicators and strategy code paths.
+
+    Candles of a lower timeframe than ``timeframe`` are resampled as they're replayed.
+
+    The events drive a :class:`~mcookbook.utils.clock.VirtualClock`, installed as the current
+    clock while replaying, so the pair list refreshes, and every cache, happen in event time. No
+    time is spent waiting, the replay runs as fast as the events are processed.
+
+    When a ``stake_amount``, in the quote currency, is passed, the signals are also executed with
+    market orders, against a :class:`~mcookbook.paper.PaperTradingAPI` fed with the replayed
+    candles, tickers and order books, starting with the configured dry run wallet.
+
+    The replayed market data is served by ``api``, or by a new :class:`ReplayAPI`, holding the
+    exchange markets, when not passed.
+    """
+
+    def __init__(
+        self,
+        exchange: Exchange,
+        strategy: Strategy,
+        timeframe: str,
+        stake_amount: Optional[float] = None,
+        api: Optional[ReplayAPI] = None,
+    ) -> None:
+        self.exchange = exchange
+        self.api = api if api is not None else ReplayAPI(exchange.markets)
+        self.paper: Optional[PaperTradingAPI] = None
+        if stake_amount is None:
+            self.exchange.set_api(self.api)
+        else:
+            self.paper = PaperTradingAPI(self.api, exchange.config.exchange.dry_run_wallet)
+            self.exchange.set_api(self.paper)
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.stake_amount = stake_amount
+        self.evaluator = SignalEvaluator(strategy)
+        self.rejected = 0
+
+    async def run(self, events: Iterable[Event]) -> ReplayResult:
+        """
+        Replay ``events``, ordered by timestamp, and return the results.
+        """
+        start = time.perf_counter()
+        clock = VirtualClock()
+        previous_clock = set_clock(clock)
+        refresh_period = self.exchange.config.pairlist_refresh_period
+        last_refresh: Optional[float] = None
+        # Kept up to date with the differences returned by each pair list refresh
+        pairlist = set(self.exchange.pairlist_manager.pairlist)
+        batch: list[tuple[str, Candle]] = []
+        batch_timestamp: Optional[int] = None
+        signals: list[tuple[int, str, bool, bool]] = []
+        latencies: list[float] = []
+        positions: dict[str, float] = {}
+        resamplers: dict[str, Optional[Resampler]] = {}
+        matching = self.paper.engine if self.paper is not None else None
+        count = candles = 0
+        self.rejected = 0
+        try:
+            for event in events:
+                if batch and event.timestamp != batch_timestamp:
+                    self._decide(batch, pairlist, signals, latencies, positions)
+                    candles += len(batch)
+                    batch = []
+                if count == 0:
+                    clock.start = event.timestamp / 1000
+                else:
+                    clock.advance_to(event.timestamp / 1000)
+                count += 1
+                if isinstance(event, CandleEvent):
+                    if event.timeframe == self.timeframe:
+                        batch.append((event.pair, event.candle))
+                        batch_timestamp = event.timestamp
+                    else:
+                        if event.timeframe not in resamplers:
+                            resamplers[event.timeframe] = (
+                                Resampler(event.timeframe, [self.timeframe])
+                                if can_resample(event.timeframe, self.timeframe)
+                                else None
+                            )
+                        resampler = resamplers[event.timeframe]
+                        if resampler is not None:
+                            for _, candle in resampler.update(event.pair, event.candle):
+                                batch.append((event.pair, candle))
+                                batch_timestamp = event.timestamp
+                    if matching is not None:
+                        matching.on_candle(event.pair, event.candle)
+                elif isinstance(event, TickersEvent):
+                    self.api.tickers.update(event.tickers)
+                    if matching is not None:
+                        for ticker in event.tickers.values():
+                            matching.on_ticker(ticker)
+                elif isinstance(event, BookEvent):
+                    if matching is not None:
+                        matching.on_book(event.pair, event.bids, event.asks, event.timestamp)
+                    self.api.order_books[event.pair] = {
+                        "symbol": event.pair,
+                        "bids": event.bids,
+                        "asks": event.asks,
+                        "timestamp": event.timestamp,
+                        "datetime": datetime.datetime.fromtimestamp(
+                            event.timestamp / 1000, tz=datetime.timezone.utc
+                        ).isoformat(),
+                        "nonce": None,
+                    }
+                if last_refresh is None or clock.monotonic() - last_refresh >= refresh_period:
+                    diff = await self.exchange.pairlist_manager.refresh_pairlist()
+                    pairlist.difference_update(diff.removed)
+                    pairlist.update(diff.added)
+                    last_refresh = clock.monotonic()
+            if batch:
+                self._decide(batch, pairlist, signals, latencies, positions)
+                candles += len(batch)
+        finally:
+            set_clock(previous_clock)
+        duration = time.perf_counter() - start
+        log.info("Replayed %d events in %.2f seconds", count, duration)
+        return ReplayResult(
+            signals=pl.DataFrame(signals, schema=SIGNALS_SCHEMA, orient="row"),
+            events=count,
+            candles=candles,
+            latencies=pl.Series("latency", latencies, dtype=pl.Float64),
+            duration=duration,
+            fills=(
+                matching.fills_frame()
+                if matching is not None
+                else pl.DataFrame(schema=FILLS_SCHEMA)
+            ),
+            rejected=self.rejected,
+        )
+
+    def _decide(
+        self,
+        batch: list[tuple[str, Candle]],
+        pairlist: set[str],
+        signals: list[tuple[int, str, bool, bool]],
+        latencies: list[float],
+        positions: dict[str, float],
+    ) -> None:
+        start = time.perf_counter()
+        decided: list[Signal] = []
+        # Indicators are kept up to date for every pair, so they're warmed up by the time a pair
+        # enters the pair list, but only the pair list signals are acted upon
+        for signal in self.evaluator.update_many(batch):
+            if (signal.entry or signal.exit) and signal.pair in pairlist:
+                decided.append(signal)
+        latency = time.perf_counter() - start
+        DECISION_LATENCY.observe(latency)
+        latencies.append(latency)
+        signals.extend(decided)
+        if self.paper is not None and decided:
+            self._execute(decided, dict(batch), positions)
+
+    def _execute(
+        self, decided: list[Signal], candles: dict[str, Candle], positions: dict[str, float]
+    ) -> None:
+        matching = self.paper.engine  # type: ignore[union-attr]
+        for signal in decided:
+            pair = signal.pair
+            try:
+                if signal.exit and pair in positions:
+                    matching.submit(
+                        pair, "market", "sell", positions.pop(pair), None, signal.timestamp
+                    )
+                elif signal.entry and not signal.exit and pair not in positions:
+                    amount = self.stake_amount / candles[pair].close  # type: ignore[operator]
+                    order = matching.submit(pair, "market", "buy", amount, None, signal.timestamp)
+                    positions[pair] = order.filled
+            except ccxt.BaseError as exc:
+                self.rejected += 1
+                log.warning("Could not execute the %s signal: %s", pair, exc)
@@ -0,0 +1,136 @@
+"""
+Recorded market events.
+
+Events are replayed in timestamp order, the time they became known. For candles that's when they
+close, not their open timestamp.
+
+Recordings are JSON lines files, one event per line, tagged by its ``type``::
+
+    {"type": "candle", "timestamp": 300000, "pair": "BTC/USDT", "timeframe": "5m", "candle": [...]}
+    {"type": "tickers", "timestamp": 300000, "tickers": {"BTC/USDT": {...}}}
+    {"type": "book", "timestamp": 300000, "pair": "BTC/USDT", "bids": [...], "asks": [...]}
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import operator
+import pathlib
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+import ccxt
+import polars as pl
+
+from mcookbook.data import CandleStore
+from mcookbook.indicators.abc import Candle
+
+
+class CandleEvent(NamedTuple):
+    """
+    A closed candle.
+    """
+
+    timestamp: int
+    pair: str
+    timeframe: str
+    candle: Candle
+
+
+class TickersEvent(NamedTuple):
+    """
+    Updated ccxt shaped tickers, keyed by pair.
+    """
+
+    timestamp: int
+    tickers: dict[str, dict[str, Any]]
+
+
+class BookEvent(NamedTuple):
+    """
+    An order book snapshot, as ``[price, amount]`` bids and asks, best first.
+    """
+
+    timestamp: int
+    pair: str
+    bids: list[list[float]]
+    asks: list[list[float]]
+
+
+Event = Union[CandleEvent, TickersEvent, BookEvent]
+
+_EVENT_TYPES: dict[str, type[Event]] = {
+    "candle": CandleEvent,
+    "tickers": TickersEvent,
+    "book": BookEvent,
+}
+_EVENT_NAMES = {event_type: name for name, event_type in _EVENT_TYPES.items()}
+
+
+def _frame_candle_events(
+    frame: pl.DataFrame, pair: str, timeframe: str, interval: int
+) -> Iterator[CandleEvent]:
+    for row in frame.iter_rows():
+        candle = Candle(*row)
+        yield CandleEvent(candle.timestamp + interval, pair, timeframe, candle)
+
+
+def candle_events(
+    store: CandleStore,
+    pairs: list[str],
+    timeframe: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> Iterator[CandleEvent]:
+    """
+    Yield the stored candles of ``pairs``, as events ordered by their close time.
+    """
+    interval = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+    sources = [
+        _frame_candle_events(
+            store.load(pair, timeframe, start=start, end=end).select(Candle._fields),
+            pair,
+            timeframe,
+            interval,
+        )
+        for pair in pairs
+    ]
+    return heapq.merge(*sources, key=operator.attrgetter("timestamp"))
+
+
+def merge_events(*sources: Iterable[Event]) -> Iterator[Event]:
+    """
+    Merge timestamp ordered event ``sources`` into a single ordered stream.
+
+    Events with the same timestamp keep the order of the sources they come from.
+    """
+    return heapq.merge(*sources, key=operator.attrgetter("timestamp"))
+
+
+def write_events(path: pathlib.Path, events: Iterable[Event]) -> int:
+    """
+    Record ``events`` to ``path`` and return how many were written.
+    """
+    count = 0
+    with path.open("w") as wfh:
+        for event in events:
+            wfh.write(json.dumps({"type": _EVENT_NAMES[type(event)], **event._asdict()}) + "\n")
+            count += 1
+    return count
+
+
+def read_events(path: pathlib.Path) -> Iterator[Event]:
+    """
+    Yield the events recorded in ``path``, in the recorded order.
+    """
+    with path.open() as rfh:
+        for line in rfh:
+            data = json.loads(line)
+            event_type = _EVENT_TYPES[data.pop("type")]
+            if event_type is CandleEvent:
+                data["candle"] = Candle(*data["candle"])
+            yield event_type(**data)
@@ -0,0 +1,22 @@
+"""
+Strategy robustness analysis.
+"""
+from __future__ import annotations
+
+from .montecarlo import distribution
+from .montecarlo import monte_carlo
+from .walkforward import split_windows
+from .walkforward import WalkForward
+from .walkforward import WalkForwardResult
+from .walkforward import Window
+from .walkforward import WindowResult
+
+__all__ = [
+    "distribution",
+    "monte_carlo",
+    "split_windows",
+    "WalkForward",
+    "WalkForwardResult",
+    "Window",
+    "WindowResult",
+]
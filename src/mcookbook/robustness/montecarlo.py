@@ -0,0 +1,97 @@
+"""
+Monte Carlo resampling of trade sequences.
+
+Thousands of resampled sequences are computed at once, in batches of whole-column operations,
+instead of looping over the simulations and their trades. Random numbers are derived by hashing
+the row index, as in :mod:`mcookbook.data.synthetic`.
+"""
+from __future__ import annotations
+
+from typing import Union
+
+import polars as pl
+
+from mcookbook.data.synthetic import uniform
+
+MONTE_CARLO_METHODS = ("bootstrap", "shuffle")
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def monte_carlo(
+    profits: Union[pl.Series, list[float]],
+    simulations: int = 1000,
+    method: str = "bootstrap",
+    seed: int = 0,
+    batch_rows: int = 5_000_000,
+) -> pl.DataFrame:
+    """
+    Resample a trade sequence and return the outcome of each simulation.
+
+    :param profits: The profit ratio of each trade, in exit order
+    :param simulations: The number of resampled sequences
+    :param method: ``bootstrap`` draws the trades with replacement, varying the total profit as well
+                   as the drawdown. ``shuffle`` only reorders the trades, so the total profit is
+                   always the same, but the path to it, and the drawdown, are not.
+    :param seed: The random seed
+    :param batch_rows: The maximum number of simulated trades held in memory at once
+    :return: A data frame with the ``simulation``, ``profit_total`` and ``max_drawdown`` columns,
+             expressed, like :func:`mcookbook.backtesting.summarize` does, as ratios of the stake
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(
+            f"The method {method!r} is not valid. Valid methods: {', '.join(MONTE_CARLO_METHODS)}"
+        )
+    profits = pl.Series("profit", profits, dtype=pl.Float64)
+    schema = {"simulation": pl.Int64, "profit_total": pl.Float64, "max_drawdown": pl.Float64}
+    count = profits.len()
+    if count == 0 or simulations < 1:
+        return pl.DataFrame(schema=schema)
+    batch_size = max(1, batch_rows // count)
+    equity = pl.element().cum_sum()
+    drawdown = (pl.max_horizontal(equity.cum_max(), 0) - equity).max()
+    results: list[pl.DataFrame] = []
+    for first in range(0, simulations, batch_size):
+        last = min(first + batch_size, simulations)
+        random = pl.select(uniform(pl.int_range(first * count, last * count), seed)).to_series()
+        if method == "bootstrap":
+            positions = (random * count).cast(pl.Int64)
+        else:
+            # Arg-sorting random keys yields a random permutation
+            positions = (
+                random.reshape((last - first, count))
+                .arr.to_list()
+                .list.eval(pl.element().arg_sort())
+                .explode()
+            )
+        # One row per simulation, holding its trades, lets the cumulative operations run per
+        # simulation without a group by
+        sequences = profits.gather(positions).reshape((last - first, count))
+        results.append(
+            pl.select(
+                simulation=pl.int_range(first, last, dtype=pl.Int64),
+                profit_total=sequences.arr.sum(),
+                max_drawdown=sequences.arr.to_list().list.eval(drawdown).list.first(),
+            )
+        )
+    return pl.concat(results)
+
+
+def distribution(
+    simulations: pl.DataFrame, quantiles: tuple[float, ...] = DEFAULT_QUANTILES
+) -> pl.DataFrame:
+    """
+    Return the ``quantiles`` of the Monte Carlo ``simulations`` total profit and drawdown.
+    """
+    return pl.DataFrame(
+        {
+            "quantile": list(quantiles),
+            "profit_total": [
+                simulations["profit_total"].quantile(quantile) for quantile in quantiles
+            ],
+            "max_drawdown": [
+                simulations["max_drawdown"].quantile(quantile) for quantile in quantiles
+            ],
+        },
+        schema={"quantile": pl.Float64, "profit_total": pl.Float64, "max_drawdown": pl.Float64},
+    )
@@ -0,0 +1,292 @@
+"""
+Walk-forward analysis.
+
+History is split into rolling train and test windows. The strategy parameters are optimized over
+each train window and then backtested, out-of-sample, over the test window which follows it. The
+windows are independent, and run in parallel.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import pathlib
+import time
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.backtesting import Backtester
+from mcookbook.backtesting import summarize
+from mcookbook.backtesting.engine import TRADES_SCHEMA
+from mcookbook.config.hyperopt import HyperoptConfig
+from mcookbook.data import CandleStore
+from mcookbook.hyperopt import Dataset
+from mcookbook.hyperopt import Hyperopt
+from mcookbook.hyperopt import required_indicators
+from mcookbook.hyperopt import Study
+from mcookbook.hyperopt.objective import score
+from mcookbook.strategies import Strategy
+
+log = logging.getLogger(__name__)
+
+
+class Window(NamedTuple):
+    """
+    A walk-forward window, timestamps in milliseconds, start inclusive and end exclusive.
+    """
+
+    number: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+class WindowResult(NamedTuple):
+    """
+    A walk-forward window result.
+
+    ``params`` and the objectives are ``None`` when no optimization trial completed.
+    """
+
+    window: Window
+    params: Optional[dict[str, Any]]
+    train_objective: Optional[float]
+    test_objective: Optional[float]
+    test_summary: dict[str, Any]
+    trades: pl.DataFrame
+
+
+class WalkForwardResult(NamedTuple):
+    """
+    Walk-forward analysis results.
+    """
+
+    windows: pl.DataFrame
+    trades: pl.DataFrame
+    summary: dict[str, Any]
+    duration: float
+
+
+def split_windows(
+    start: int, end: int, train: int, test: int, anchored: bool = False
+) -> list[Window]:
+    """
+    Split the ``start`` to ``end`` time range into walk-forward windows.
+
+    Each window trains over ``train`` milliseconds and tests over the following ``test``
+    milliseconds, the next window moving forward by ``test``. Anchored windows all train from
+    ``start``, growing instead of rolling.
+    """
+    windows: list[Window] = []
+    test_start = start + train
+    while test_start + test <= end:
+        windows.append(
+            Window(
+                number=len(windows),
+                train_start=start if anchored else test_start - train,
+                train_end=test_start,
+                test_start=test_start,
+                test_end=test_start + test,
+            )
+        )
+        test_start += test
+    return windows
+
+
+def run_window(
+    window: Window,
+    path: pathlib.Path,
+    store_path: pathlib.Path,
+    exchange: str,
+    pairs: list[str],
+    timeframe: str,
+    strategy: dict[str, Any],
+    hyperopt: HyperoptConfig,
+    fee: float = 0.0,
+    slippage: float = 0.0,
+) -> WindowResult:
+    """
+    Optimize ``strategy`` over the ``window`` train range, and backtest it over the test range.
+
+    The best trial parameters are the ones backtested. The optimization study and dataset are
+    stored under ``path``, so an interrupted analysis resumes where it left off. This is what runs
+    on the worker processes.
+    """
+    store = CandleStore(store_path, exchange)
+    base_strategy = Strategy.resolved(strategy)
+    study = Study.load_or_create(
+        path / "study",
+        {
+            "window": window._asdict(),
+            "strategy": strategy,
+            "space": {name: param.dict() for name, param in hyperopt.space.items()},
+            "objective": hyperopt.objective,
+            "seed": hyperopt.seed,
+            "min_trades": hyperopt.min_trades,
+            "pairs": pairs,
+            "timeframe": timeframe,
+            "fee": fee,
+            "slippage": slippage,
+        },
+    )
+    indicators = []
+    if hyperopt.precompute_indicators:
+        indicators = required_indicators(
+            base_strategy, hyperopt.space, hyperopt.seed, study.pending(hyperopt.trials)
+        )
+    dataset = Dataset.load_or_build(
+        path / "dataset",
+        store,
+        pairs,
+        timeframe,
+        start=window.train_start,
+        end=window.train_end,
+        indicators=indicators,
+    )
+    Hyperopt(
+        study,
+        dataset,
+        base_strategy,
+        hyperopt.space,
+        objective=hyperopt.objective,
+        seed=hyperopt.seed,
+        fee=fee,
+        slippage=slippage,
+        min_trades=hyperopt.min_trades,
+        pruning=hyperopt.pruning,
+        pruning_warmup_trials=hyperopt.pruning_warmup_trials,
+        pruning_steps=hyperopt.pruning_steps,
+        workers=1,
+    ).run(hyperopt.trials)
+    best = study.best()
+    if best is None:
+        no_trades = pl.DataFrame(schema=TRADES_SCHEMA)
+        return WindowResult(window, None, None, None, summarize(no_trades), no_trades)
+    result = Backtester(
+        store,
+        Strategy.resolved({**strategy, **best.params}),
+        timeframe,
+        start=window.test_start,
+        end=window.test_end,
+        fee=fee,
+        slippage=slippage,
+        workers=1,
+    ).run(pairs)
+    return WindowResult(
+        window=window,
+        params=best.params,
+        train_objective=best.objective,
+        test_objective=score(hyperopt.objective, result.summary),
+        test_summary=result.summary,
+        trades=result.trades,
+    )
+
+
+class WalkForward:
+    """
+    Run a walk-forward analysis of a strategy, optimizing and testing the windows in parallel.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        store: CandleStore,
+        strategy: Strategy,
+        timeframe: str,
+        hyperopt: HyperoptConfig,
+        fee: float = 0.0,
+        slippage: float = 0.0,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.store = store
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.hyperopt = hyperopt
+        self.fee = fee
+        self.slippage = slippage
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, windows: list[Window], pairs: list[str]) -> WalkForwardResult:
+        """
+        Run the walk-forward analysis of ``pairs`` over ``windows`` and return the results.
+        """
+        start = time.perf_counter()
+        kwargs: dict[str, Any] = {
+            "store_path": self.store.path.parent,
+            "exchange": self.store.exchange,
+            "pairs": pairs,
+            "timeframe": self.timeframe,
+            "strategy": self.strategy.dict(),
+            "hyperopt": self.hyperopt,
+            "fee": self.fee,
+            "slippage": self.slippage,
+        }
+        results: list[WindowResult] = []
+        if self.workers == 1 or len(windows) == 1:
+            for window in windows:
+                results.append(run_window(window, self.path / f"window-{window.number}", **kwargs))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        run_window, window, self.path / f"window-{window.number}", **kwargs
+                    )
+                    for window in windows
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    results.append(future.result())
+        results.sort(key=lambda result: result.window.number)
+        duration = time.perf_counter() - start
+        log.info(
+            "Ran the walk-forward analysis of %d windows in %.2f seconds", len(windows), duration
+        )
+        trades = pl.concat(
+            [pl.DataFrame(schema=TRADES_SCHEMA)] + [result.trades for result in results]
+        ).sort("exit_timestamp", "pair")
+        return WalkForwardResult(
+            windows=self._windows_frame(results),
+            trades=trades,
+            summary=summarize(trades),
+            duration=duration,
+        )
+
+    @staticmethod
+    def _windows_frame(results: list[WindowResult]) -> pl.DataFrame:
+        timestamp = pl.Datetime("ms", "UTC")
+        return pl.DataFrame(
+            [
+                {
+                    "window": result.window.number,
+                    "train_start": result.window.train_start,
+                    "test_start": result.window.test_start,
+                    "test_end": result.window.test_end,
+                    "train_objective": result.train_objective,
+                    "test_objective": result.test_objective,
+                    "test_trades": result.test_summary["trades"],
+                    "test_profit_total": result.test_summary["profit_total"],
+                    "test_max_drawdown": result.test_summary["max_drawdown"],
+                    "params": str(result.params) if result.params is not None else None,
+                }
+                for result in results
+            ],
+            schema={
+                "window": pl.Int64,
+                "train_start": pl.Int64,
+                "test_start": pl.Int64,
+                "test_end": pl.Int64,
+                "train_objective": pl.Float64,
+                "test_objective": pl.Float64,
+                "test_trades": pl.Int64,
+                "test_profit_total": pl.Float64,
+                "test_max_drawdown": pl.Float64,
+                "params": pl.Utf8,
+            },
+        ).with_columns(pl.col("train_start", "test_start", "test_end").cast(timestamp))
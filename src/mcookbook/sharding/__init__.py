@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from .evaluator import PairEvaluator
+from .pool import partition_pairs
+from .pool import ShardPool
+from .shm import SharedTickerTable
+from .shm import TickerRow
+
+__all__ = [
+    "PairEvaluator",
+    "partition_pairs",
+    "ShardPool",
+    "SharedTickerTable",
+    "TickerRow",
+]
@@ -0,0 +1,56 @@
+"""
+Per pair evaluators, run on the sharded live worker processes.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from mcookbook.exceptions import OperationalException
+from mcookbook.sharding.shm import TickerRow
+
+
+class PairEvaluator:
+    """
+    Base pair evaluator.
+
+    Subclasses implement :meth:`PairEvaluator.evaluate`, which gets called for each pair in the
+    worker's partition every time fresh market data is available. Any value other than ``None``
+    returned is sent back to the coordinator process.
+    """
+
+    def __init__(self, worker_id: int) -> None:
+        self.worker_id = worker_id
+
+    @classmethod
+    def resolved(cls, path: str | None, worker_id: int) -> PairEvaluator:
+        """
+        Resolve the passed ``path``, in the form ``package.module:ClassName``, to class implementation.
+        """
+        if path is None:
+            return cls(worker_id)
+        module_name, _, class_name = path.partition(":")
+        try:
+            evaluator_cls = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as exc:
+            raise OperationalException(f"Cloud not load the {path} pair evaluator: {exc}") from exc
+        if not issubclass(evaluator_cls, PairEvaluator):
+            raise OperationalException(f"{path} is not a PairEvaluator subclass")
+        evaluator: PairEvaluator = evaluator_cls(worker_id)
+        return evaluator
+
+    def setup(self, pairs: list[str]) -> None:
+        """
+        Setup any state needed for the ``pairs`` just assigned to this worker.
+        """
+
+    def teardown(self, pairs: list[str]) -> None:
+        """
+        Teardown any state kept for the ``pairs`` no longer assigned to this worker.
+        """
+
+    def evaluate(self, pair: str, ticker: TickerRow) -> Any:  # pylint: disable=unused-argument
+        """
+        Evaluate ``pair`` given its latest ``ticker``.
+        """
+        return None
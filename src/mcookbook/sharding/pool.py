@@ -0,0 +1,168 @@
+"""
+Sharded live worker processes pool.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import zlib
+from logging import handlers
+from multiprocessing.context import SpawnProcess
+from typing import Any
+
+from mcookbook.exceptions import OperationalException
+from mcookbook.sharding import worker
+from mcookbook.sharding.shm import SharedTickerTable
+from mcookbook.utils import diff_pairlists
+
+log = logging.getLogger(__name__)
+
+
+def partition_of(pair: str, partitions: int) -> int:
+    """
+    Return the partition of ``pair``, out of ``partitions``.
+    """
+    return zlib.crc32(pair.encode()) % partitions
+
+
+def partition_pairs(pairs: list[str], partitions: int) -> list[list[str]]:
+    """
+    Partition ``pairs`` into ``partitions`` lists.
+
+    The partition of each pair only depends on the pair itself, so pairs don't migrate
+    between workers when the pairlist changes.
+    """
+    result: list[list[str]] = [[] for _ in range(partitions)]
+    for pair in pairs:
+        result[partition_of(pair, partitions)].append(pair)
+    return result
+
+
+class ShardPool:
+    """
+    Pool of worker processes, each evaluating a partition of the pairlist.
+    """
+
+    def __init__(self, workers: int, capacity: int, evaluator: str | None = None) -> None:
+        self.workers = workers
+        self.capacity = capacity
+        self.evaluator = evaluator
+        self.table = SharedTickerTable.create(capacity)
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: list[SpawnProcess] = []
+        self._controls: list[Any] = []
+        self._results: Any = self._context.Queue()
+        self._log_queue: Any = self._context.Queue()
+        self._log_listener = handlers.QueueListener(
+            self._log_queue, *logging.root.handlers, respect_handler_level=True
+        )
+        self._slots: dict[str, int] = {}
+        self._free_slots: list[int] = list(reversed(range(capacity)))
+
+    def start(self) -> None:
+        """
+        Start the worker processes.
+        """
+        self._log_listener.start()
+        log_level = min((handler.level for handler in logging.root.handlers), default=logging.INFO)
+        for worker_id in range(self.workers):
+            control = self._context.Queue()
+            process = self._context.Process(
+                target=worker.main,
+                name=f"mcookbook-worker-{worker_id}",
+                args=(
+                    worker_id,
+                    self.table.name,
+                    self.capacity,
+                    self.evaluator,
+                    control,
+                    self._results,
+                    self._log_queue,
+                    log_level,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._controls.append(control)
+            self._processes.append(process)
+        log.info("Started %s pair evaluation workers", self.workers)
+        # The pairs assigned before the workers were started
+        partitions = partition_pairs(list(self._slots), self.workers)
+        for worker_id, partition in enumerate(partitions):
+            if partition:
+                self._controls[worker_id].put(
+                    (worker.ASSIGN, {pair: self._slots[pair] for pair in partition})
+                )
+
+    def assign(self, pairs: list[str]) -> None:
+        """
+        Assign ``pairs`` to the workers, allocating a shared memory slot for each new pair.
+
+        Only the workers whose partition changed are notified, and those only set up, or tear
+        down, the pairs added to, or removed from, their partition.
+        """
+        diff = diff_pairlists(list(self._slots), pairs)
+        for pair in diff.removed:
+            slot = self._slots.pop(pair)
+            self.table.clear(slot)
+            self._free_slots.append(slot)
+        for pair in diff.added:
+            try:
+                self._slots[pair] = self._free_slots.pop()
+            except IndexError:
+                raise OperationalException(
+                    f"The shared memory table capacity of {self.capacity} pairs was exceeded"
+                ) from None
+        if not self._controls or not diff.changed:
+            return
+        changed = {partition_of(pair, self.workers) for pair in (*diff.added, *diff.removed)}
+        partitions = partition_pairs(pairs, self.workers)
+        for worker_id in sorted(changed):
+            self._controls[worker_id].put(
+                (worker.ASSIGN, {pair: self._slots[pair] for pair in partitions[worker_id]})
+            )
+
+    def update(self, tickers: dict[str, dict[str, Any]]) -> None:
+        """
+        Write the ``tickers`` of the assigned pairs to shared memory and notify the workers.
+        """
+        for pair, slot in self._slots.items():
+            ticker = tickers.get(pair)
+            if ticker is not None:
+                self.table.write(slot, ticker)
+        for control in self._controls:
+            control.put((worker.TICK, None))
+
+    def results(self) -> list[tuple[int, str, Any]]:
+        """
+        Return all results sent back by the workers since the last call.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def alive(self) -> bool:
+        """
+        Return ``True`` if all worker processes are running.
+        """
+        return all(process.is_alive() for process in self._processes)
+
+    def close(self, timeout: float = 5) -> None:
+        """
+        Stop the worker processes and release the shared memory.
+        """
+        for control in self._controls:
+            control.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                log.warning("Worker %s did not terminate in time. Killing it.", process.name)
+                process.kill()
+                process.join()
+        if self._processes:
+            self._log_listener.stop()
+        self.table.close()
@@ -0,0 +1,149 @@
+"""
+Shared memory market data tables.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import NamedTuple
+
+
+class TickerRow(NamedTuple):
+    """
+    A single ticker, as stored in the shared memory table.
+    """
+
+    timestamp: float
+    bid: float
+    ask: float
+    last: float
+    high: float
+    low: float
+    base_volume: float
+    quote_volume: float
+
+
+TICKER_FIELDS = len(TickerRow._fields)
+
+# Maps the ``TickerRow`` fields to the ccxt ticker dictionary keys
+CCXT_TICKER_KEYS = (
+    "timestamp",
+    "bid",
+    "ask",
+    "last",
+    "high",
+    "low",
+    "baseVolume",
+    "quoteVolume",
+)
+
+
+class SharedTickerTable:
+    """
+    Fixed capacity ticker table backed by shared memory.
+
+    The coordinator process writes rows, the worker processes read them without any pickling
+    involved. Each row is protected by a sequence counter (a seqlock), which is odd while the
+    row is being written, allowing readers to detect, and retry, torn reads.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.capacity = capacity
+        seq_size = capacity * 8
+        buf = shm.buf
+        if buf is None:  # pragma: no cover
+            raise RuntimeError("The shared memory segment is not mapped")
+        self._seq = buf[:seq_size].cast("q")
+        data_end = seq_size + capacity * TICKER_FIELDS * 8
+        self._data = buf[seq_size:data_end].cast("d")
+
+    @classmethod
+    def create(cls, capacity: int) -> SharedTickerTable:
+        """
+        Create a new shared memory table able to hold ``capacity`` rows.
+        """
+        size = capacity * 8 + capacity * TICKER_FIELDS * 8
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        table = cls(shm, capacity, owner=True)
+        for idx in range(capacity):
+            table._seq[idx] = 0
+            table._write_nan(idx)
+        return table
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> SharedTickerTable:
+        """
+        Attach to an existing shared memory table, created by another process.
+        """
+        if sys.version_info >= (3, 13):  # pragma: no cover
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the creating process should ever unlink the shared memory segment
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return cls(shm, capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        """
+        The shared memory segment name, to pass to :meth:`SharedTickerTable.attach`.
+        """
+        return self._shm.name
+
+    def _write_nan(self, idx: int) -> None:
+        offset = idx * TICKER_FIELDS
+        for field in range(TICKER_FIELDS):
+            self._data[offset + field] = math.nan
+
+    def write(self, idx: int, ticker: dict[str, Any]) -> None:
+        """
+        Write a ccxt ``ticker`` dictionary to the row at ``idx``.
+        """
+        offset = idx * TICKER_FIELDS
+        seq = self._seq[idx]
+        self._seq[idx] = seq + 1
+        for field, key in enumerate(CCXT_TICKER_KEYS):
+            value = ticker.get(key)
+            self._data[offset + field] = math.nan if value is None else float(value)
+        self._seq[idx] = seq + 2
+
+    def clear(self, idx: int) -> None:
+        """
+        Clear the row at ``idx``.
+        """
+        seq = self._seq[idx]
+        self._seq[idx] = seq + 1
+        self._write_nan(idx)
+        self._seq[idx] = seq + 2
+
+    def read(self, idx: int) -> TickerRow:
+        """
+        Read the row at ``idx``.
+        """
+        offset = idx * TICKER_FIELDS
+        end = offset + TICKER_FIELDS
+        while True:
+            seq = self._seq[idx]
+            if seq % 2:
+                # Row is being written
+                continue
+            row = TickerRow._make(self._data[offset:end])
+            if self._seq[idx] == seq:
+                return row
+
+    def close(self) -> None:
+        """
+        Release this process' mapping of the shared memory segment.
+
+        The segment is unlinked when closed by the process which created it.
+        """
+        self._seq.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,97 @@
+"""
+Sharded live worker process.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import signal
+from logging import handlers
+from typing import Any
+
+from mcookbook.sharding.evaluator import PairEvaluator
+from mcookbook.sharding.shm import SharedTickerTable
+from mcookbook.utils.logs import reset_logging_handlers
+
+log = logging.getLogger(__name__)
+
+# Control message kinds
+ASSIGN = "assign"
+TICK = "tick"
+
+
+def _setup_logging(log_queue: Any, log_level: int) -> None:
+    reset_logging_handlers()
+    handler = handlers.QueueHandler(log_queue)
+    handler.setLevel(log_level)
+    logging.root.addHandler(handler)
+
+
+def _next_messages(control: Any) -> list[tuple[str, Any] | None]:
+    """
+    Block for the next control message and return it, along with any others already queued.
+    """
+    messages = [control.get()]
+    while True:
+        try:
+            messages.append(control.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def main(
+    worker_id: int,
+    shm_name: str,
+    capacity: int,
+    evaluator_path: str | None,
+    control: Any,
+    results: Any,
+    log_queue: Any,
+    log_level: int,
+) -> None:
+    """
+    Worker process entry point.
+
+    Receives pair assignments and market data notifications through the ``control`` queue,
+    reads the market data from the shared memory table and evaluates each assigned pair.
+    """
+    # The coordinator process takes care of an orderly shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _setup_logging(log_queue, log_level)
+    table = SharedTickerTable.attach(shm_name, capacity)
+    evaluator = PairEvaluator.resolved(evaluator_path, worker_id)
+    assigned: dict[str, int] = {}
+    log.debug("Worker %s started", worker_id)
+    try:
+        while True:
+            tick = False
+            for message in _next_messages(control):
+                if message is None:
+                    return
+                kind, payload = message
+                if kind == ASSIGN:
+                    added = [pair for pair in payload if pair not in assigned]
+                    removed = [pair for pair in assigned if pair not in payload]
+                    if removed:
+                        evaluator.teardown(removed)
+                    if added:
+                        evaluator.setup(added)
+                    assigned = payload
+                    log.debug("Worker %s assigned %s pairs", worker_id, len(assigned))
+                elif kind == TICK:
+                    # Pending ticks are coalesced, the shared memory table always
+                    # holds the latest market data.
+                    tick = True
+            if not tick:
+                continue
+            for pair, slot in assigned.items():
+                try:
+                    result = evaluator.evaluate(pair, table.read(slot))
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Worker %s failed to evaluate %s", worker_id, pair)
+                    continue
+                if result is not None:
+                    results.put((worker_id, pair, result))
+    finally:
+        table.close()
+        log.debug("Worker %s terminated", worker_id)
@@ -0,0 +1,16 @@
+"""
+Trading strategies.
+"""
+from __future__ import annotations
+
+from .abc import Strategy
+from .ema_cross import EMACross
+from .live import Signal
+from .live import SignalEvaluator
+
+__all__ = [
+    "EMACross",
+    "Signal",
+    "SignalEvaluator",
+    "Strategy",
+]
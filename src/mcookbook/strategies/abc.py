@@ -0,0 +1,95 @@
+"""
+Strategy base class.
+"""
+from __future__ import annotations
+
+import abc
+import importlib
+from typing import Any
+from typing import ClassVar
+
+import polars as pl
+from pydantic import BaseModel
+
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators import Indicator
+
+
+class Strategy(BaseModel):
+    """
+    Base strategy implementation.
+
+    Strategies declare the indicators they need and their entry and exit signals as polars
+    expressions, evaluated over whole columns at once. Signals are evaluated on each candle close
+    and acted upon on the next candle open.
+
+    The strategy fields are its parameters, which is what gets optimized when running hyperopt.
+    """
+
+    # The number of most recent candles, with their indicator values, the signals look at when
+    # evaluated live, one candle at a time. Two is enough for crossovers, using ``shift(1)``.
+    lookback: ClassVar[int] = 2
+
+    name: str
+
+    class Config:
+        """
+        Strategy model configuration.
+        """
+
+        frozen = True
+
+    @classmethod
+    def construct(cls, _fields_set: set[str] | None = None, **values: Any) -> Strategy:
+        """
+        Construct a new class instance.
+        """
+        if "name" not in values:
+            values["name"] = cls.__name__
+        return super().construct(_fields_set=_fields_set, **values)
+
+    @classmethod
+    def resolved(cls, config: dict[str, Any]) -> Strategy:
+        """
+        Resolve the passed ``name`` to class implementation.
+
+        The name is either the class name of a strategy shipped with mcookbook, or the path to any
+        other strategy, in the form ``package.module:ClassName``.
+        """
+        if "name" not in config:
+            raise ValueError("The 'name' key is missing.")
+        name = config["name"]
+        if ":" in name:
+            module_name, _, class_name = name.partition(":")
+            try:
+                strategy_cls = getattr(importlib.import_module(module_name), class_name)
+            except (ImportError, AttributeError) as exc:
+                raise OperationalException(f"Cloud not load the {name} strategy: {exc}") from exc
+            if not isinstance(strategy_cls, type) or not issubclass(strategy_cls, Strategy):
+                raise OperationalException(f"{name} is not a Strategy subclass")
+            strategy: Strategy = strategy_cls.parse_obj(config)
+            return strategy
+        for subclass in cls.__subclasses__():
+            if subclass.__name__ == name:
+                return subclass.parse_obj(config)
+        raise OperationalException(f"Cloud not find an {name} strategy implementation.")
+
+    def indicators(self) -> list[Indicator]:
+        """
+        Return the indicators the strategy signals depend on.
+        """
+        return []
+
+    @abc.abstractmethod
+    def entry_signal(self) -> pl.Expr:
+        """
+        Return a boolean expression, true on the candles where a long position should be entered.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exit_signal(self) -> pl.Expr:
+        """
+        Return a boolean expression, true on the candles where an open position should be exited.
+        """
+        raise NotImplementedError
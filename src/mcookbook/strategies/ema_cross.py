@@ -0,0 +1,50 @@
+"""
+EMA crossover strategy.
+"""
+from __future__ import annotations
+
+import polars as pl
+from pydantic import Field
+
+from mcookbook.indicators import EMA
+from mcookbook.indicators import Indicator
+from mcookbook.indicators import RSI
+from mcookbook.strategies.abc import Strategy
+
+
+class EMACross(Strategy):
+    """
+    EMA crossover strategy.
+
+    Enter when the fast EMA crosses above the slow EMA, unless overbought, and exit when it crosses
+    back below.
+    """
+
+    fast: int = Field(default=12, ge=1)
+    slow: int = Field(default=26, ge=2)
+    rsi_period: int = Field(default=14, ge=1)
+    rsi_max: float = Field(default=70, gt=0, le=100)
+
+    def indicators(self) -> list[Indicator]:
+        """
+        Return the fast and slow EMAs, and the RSI.
+        """
+        return [EMA(period=self.fast), EMA(period=self.slow), RSI(period=self.rsi_period)]
+
+    def _spread(self) -> pl.Expr:
+        return pl.col(f"ema_{self.fast}") - pl.col(f"ema_{self.slow}")
+
+    def entry_signal(self) -> pl.Expr:
+        """
+        Return whether the fast EMA crossed above the slow EMA, and the RSI is below ``rsi_max``.
+        """
+        spread = self._spread()
+        crossed_above = (spread > 0) & (spread.shift(1) <= 0)
+        return crossed_above & (pl.col(f"rsi_{self.rsi_period}") < self.rsi_max)
+
+    def exit_signal(self) -> pl.Expr:
+        """
+        Return whether the fast EMA crossed below the slow EMA.
+        """
+        spread = self._spread()
+        return (spread < 0) & (spread.shift(1) >= 0)
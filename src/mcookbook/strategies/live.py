@@ -0,0 +1,93 @@
+"""
+Live strategy signal evaluation.
+"""
+from __future__ import annotations
+
+import collections
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import polars as pl
+
+from mcookbook.data.store import OHLCV_SCHEMA
+from mcookbook.indicators import IndicatorEngine
+from mcookbook.indicators.abc import Candle
+from mcookbook.strategies.abc import Strategy
+
+
+class Signal(NamedTuple):
+    """
+    The strategy signals on a closed candle.
+    """
+
+    timestamp: int
+    pair: str
+    entry: bool
+    exit: bool
+
+
+class SignalEvaluator:
+    """
+    Evaluate a strategy signals one closed candle at a time.
+
+    The indicators are updated incrementally, and the signal expressions, the same ones used when
+    backtesting, are evaluated over just the last :attr:`Strategy.lookback` candles, so each
+    candle costs the same however long the history is.
+    """
+
+    def __init__(self, strategy: Strategy) -> None:
+        self.strategy = strategy
+        self.engine = IndicatorEngine(strategy.indicators())
+        self.schema: dict[str, Any] = (
+            {"pair": pl.Utf8} | OHLCV_SCHEMA | dict.fromkeys(self.engine.columns, pl.Float64)
+        )
+        self._expressions = [
+            pl.col("timestamp").last(),
+            strategy.entry_signal().fill_null(False).last().alias("entry"),
+            strategy.exit_signal().fill_null(False).last().alias("exit"),
+        ]
+        self._rows: dict[str, collections.deque[tuple[Any, ...]]] = {}
+
+    def update(self, pair: str, candle: Candle) -> Optional[Signal]:
+        """
+        Update ``pair`` with a new closed ``candle`` and return the signals on it.
+
+        Returns ``None`` for stale candles, older than, or as old as, the last one seen.
+        """
+        signals = self.update_many([(pair, candle)])
+        return signals[0] if signals else None
+
+    def update_many(self, candles: list[tuple[str, Candle]]) -> list[Signal]:
+        """
+        Update many pairs, each with a new closed candle, and return their signals.
+
+        The signals of all pairs are evaluated at once, which is much cheaper than one pair at a
+        time. Stale candles are skipped.
+        """
+        rows: list[tuple[Any, ...]] = []
+        for pair, candle in candles:
+            pair_rows = self._rows.get(pair)
+            if pair_rows is None:
+                pair_rows = self._rows[pair] = collections.deque(maxlen=self.strategy.lookback)
+            elif candle.timestamp <= pair_rows[-1][1]:
+                continue
+            values = self.engine.update(pair, candle)
+            pair_rows.append((pair, *candle, *values.values()))
+            rows.extend(pair_rows)
+        if not rows:
+            return []
+        frame = pl.DataFrame(rows, schema=self.schema, orient="row")
+        return [
+            Signal(timestamp, pair, entry, exit_)
+            for pair, timestamp, entry, exit_ in frame.group_by("pair", maintain_order=True)
+            .agg(self._expressions)
+            .iter_rows()
+        ]
+
+    def remove(self, pair: str) -> None:
+        """
+        Stop tracking ``pair``.
+        """
+        self._rows.pop(pair, None)
+        self.engine.remove(pair)
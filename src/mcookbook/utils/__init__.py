@@ -3,6 +3,7 @@ from __future__ import annotations
 import copy
 import re
 from typing import Any
+from typing import NamedTuple
 
 
 def merge_dictionaries(
@@ -73,3 +74,36 @@ def expand_pairlist(
             except re.error as err:
                 raise ValueError(f"Wildcard error in {pair_wc}, {err}") from err
     return result
+
+
+class PairListDiff(NamedTuple):
+    """
+    The pairs added to, removed from, and kept in, a refreshed pair list.
+    """
+
+    added: list[str]
+    removed: list[str]
+    unchanged: list[str]
+
+    @property
+    def changed(self) -> bool:
+        """
+        Return whether pairs were added or removed.
+        """
+        return bool(self.added or self.removed)
+
+
+def diff_pairlists(previous: list[str], current: list[str]) -> PairListDiff:
+    """
+    Return the difference between the ``previous`` and ``current`` pair lists.
+
+    The added and unchanged pairs are in the ``current`` order, the removed ones in the
+    ``previous`` order. Pairs just reordered are unchanged.
+    """
+    previous_pairs = set(previous)
+    current_pairs = set(current)
+    return PairListDiff(
+        added=[pair for pair in current if pair not in previous_pairs],
+        removed=[pair for pair in previous if pair not in current_pairs],
+        unchanged=[pair for pair in current if pair in previous_pairs],
+    )
@@ -0,0 +1,266 @@
+"""
+Disk backed memoization of expensive research computations.
+
+Results are keyed by the function identity, its module, qualified name and code, by its
+arguments, and by the content of the polars frames passed to it, and stored under the cache
+directory, usually ``<basedir>/cache``, laid out as::
+
+    <path>/<module>.<qualname>/<key>.parquet     polars data frames
+    <path>/<module>.<qualname>/<key>.series      polars series, as a single column parquet file
+    <path>/<module>.<qualname>/<key>.pickle      anything else
+
+The cache is bounded in size, evicting the least recently used results first. Several processes,
+like notebook kernels or headless notebook runs, can share the same cache directory. Results are
+written atomically, and a result evicted, or replaced, by another process is just a cache miss.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import functools
+import hashlib
+import inspect
+import io
+import logging
+import os
+import pathlib
+import pickle
+import types
+from collections.abc import Callable
+from typing import Any
+from typing import Optional
+from typing import TypeVar
+
+import polars as pl
+
+log = logging.getLogger(__name__)
+
+ENVIRON_KEY = "MCB_CACHE_DIR"
+
+SUFFIXES = (".parquet", ".series", ".pickle")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def frame_digest(frame: pl.DataFrame | pl.Series) -> str:
+    """
+    Return a digest of the content of ``frame``, its schema and the values of its rows.
+    """
+    if isinstance(frame, pl.Series):
+        frame = frame.to_frame()
+    digest = hashlib.sha256(repr(list(frame.schema.items())).encode())
+    if frame.height and frame.width:
+        # The row hashes are computed in parallel, so only 8 bytes per row are digested
+        buffer = io.BytesIO()
+        frame.hash_rows(seed=0).to_frame().write_ipc(buffer, compression="uncompressed")
+        digest.update(buffer.getvalue())
+    return digest.hexdigest()
+
+
+def _code_token(code: types.CodeType) -> str:
+    # The repr of nested code objects includes their memory address, recurse instead
+    consts = [
+        _code_token(const) if isinstance(const, types.CodeType) else repr(const)
+        for const in code.co_consts
+    ]
+    return hashlib.sha256(code.co_code + repr((consts, code.co_names)).encode()).hexdigest()
+
+
+def _token(value: Any) -> str:
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (pl.DataFrame, pl.Series)):
+        return f"{type(value).__name__}({frame_digest(value)})"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_token(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort()
+        return f"{type(value).__name__}({', '.join(items)})"
+    if isinstance(value, dict):
+        items = sorted(f"{_token(key)}: {_token(item)}" for key, item in value.items())
+        return f"dict({', '.join(items)})"
+    if isinstance(
+        value, (pathlib.PurePath, datetime.date, datetime.time, datetime.timedelta, pl.DataType)
+    ):
+        return repr(value)
+    raise TypeError(
+        f"Can't build a cache key from a {type(value).__name__} argument. Supported arguments "
+        "are polars data frames and series, primitive values and containers of those."
+    )
+
+
+class DiskCache:
+    """
+    Disk backed, size bounded, memoization cache.
+
+    :param path: The cache directory, usually ``<basedir>/cache``
+    :param max_bytes: Evict the least recently used results once the cache grows past this size
+    """
+
+    def __init__(self, path: pathlib.Path, max_bytes: int = 2 * 2**30) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_environ(cls, max_bytes: int = 2 * 2**30) -> DiskCache:
+        """
+        Return a cache in the directory passed by the notebook command.
+        """
+        try:
+            return cls(pathlib.Path(os.environ[ENVIRON_KEY]), max_bytes=max_bytes)
+        except KeyError:
+            raise RuntimeError(
+                f"The {ENVIRON_KEY} environment variable is not set. Was the notebook started with "
+                "the notebook command?"
+            ) from None
+
+    def key(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """
+        Return the cache key of calling ``func`` with ``args`` and ``kwargs``.
+        """
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        code = getattr(func, "__code__", None)
+        digest = hashlib.sha256(
+            repr(
+                (
+                    pl.__version__,
+                    _code_token(code) if code is not None else None,
+                    [(name, _token(value)) for name, value in bound.arguments.items()],
+                )
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def _paths(self, name: str, key: str) -> list[pathlib.Path]:
+        directory = self.path / name
+        return [directory / f"{key}{suffix}" for suffix in SUFFIXES]
+
+    def get(self, name: str, key: str) -> tuple[bool, Any]:
+        """
+        Return whether the ``name`` cache holds ``key``, and its result.
+        """
+        for path in self._paths(name, key):
+            try:
+                if path.suffix == ".pickle":
+                    with path.open("rb") as rfh:
+                        value = pickle.load(rfh)
+                else:
+                    value = pl.read_parquet(path)
+                    if path.suffix == ".series":
+                        value = value.to_series()
+            except FileNotFoundError:
+                continue
+            except Exception as exc:  # pylint: disable=broad-except
+                # For example, a result written by an incompatible library version
+                log.warning("Failed to load the cached %s: %s", path, exc)
+                continue
+            # Track the last use in the modification time, for the eviction
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+            return True, value
+        return False, None
+
+    def put(self, name: str, key: str, value: Any) -> pathlib.Path:
+        """
+        Store the ``value`` result of ``key`` in the ``name`` cache.
+        """
+        if isinstance(value, pl.DataFrame):
+            path = self._paths(name, key)[0]
+        elif isinstance(value, pl.Series):
+            path = self._paths(name, key)[1]
+        else:
+            path = self._paths(name, key)[2]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, so that other processes never see a partially written result
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        if isinstance(value, pl.DataFrame):
+            value.write_parquet(temp_path, compression="lz4")
+        elif isinstance(value, pl.Series):
+            value.to_frame().write_parquet(temp_path, compression="lz4")
+        else:
+            with temp_path.open("wb") as wfh:
+                pickle.dump(value, wfh, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(path)
+        self.evict()
+        return path
+
+    def entries(self) -> list[tuple[pathlib.Path, int, float]]:
+        """
+        Return the cached results, their size and last use, least recently used first.
+        """
+        entries = []
+        for path in self.path.glob("*/*"):
+            if path.suffix not in SUFFIXES:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another process
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Return the size of the cached results.
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """
+        Evict the least recently used results, until the cache fits ``max_bytes``.
+
+        Returns the number of evicted results.
+        """
+        entries = self.entries()
+        size = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            evicted += 1
+        if evicted:
+            log.debug("Evicted %d results from the %s cache", evicted, self.path)
+        return evicted
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """
+        Remove all the cached results, or just those of ``name``.
+        """
+        for path, _, _ in self.entries():
+            if name is None or path.parent.name == name:
+                path.unlink(missing_ok=True)
+
+    def memoize(self, func: F) -> F:
+        """
+        Decorate ``func``, caching its results.
+
+        .. code-block:: python
+
+            cache = DiskCache.from_environ()
+
+            @cache.memoize
+            def features(candles: pl.DataFrame, window: int = 20) -> pl.DataFrame:
+                ...
+        """
+        name = f"{func.__module__}.{func.__qualname__}".replace("<", "").replace(">", "")
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = self.key(func, *args, **kwargs)
+            found, value = self.get(name, key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = func(*args, **kwargs)
+            self.put(name, key, value)
+            return value
+
+        return wrapper  # type: ignore[return-value]
@@ -0,0 +1,211 @@
+"""
+Injectable clock.
+
+Every cache, log throttle and scheduling loop reads the time from the current clock, returned by
+:func:`get_clock`, instead of reading it straight from the system. Replacing it, with
+:func:`set_clock`, by a :class:`VirtualClock` runs all of them on simulated time, either
+accelerated or advanced manually, which is also how time based behavior is tested without
+actually waiting.
+
+Durations which measure the real world, like request latencies, profiling or the event loop lag,
+keep using the system clocks.
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import datetime
+import heapq
+import itertools
+import threading
+import time
+from typing import Optional
+
+
+class Clock(metaclass=abc.ABCMeta):
+    """
+    Base clock.
+    """
+
+    @abc.abstractmethod
+    def time(self) -> float:
+        """
+        Return the current time, in seconds since the epoch.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def monotonic(self) -> float:
+        """
+        Return the value, in seconds, of a clock which never goes backwards.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        """
+        Sleep for ``seconds``.
+        """
+        raise NotImplementedError
+
+    def now(self) -> datetime.datetime:
+        """
+        Return the current, timezone aware, UTC datetime.
+        """
+        return datetime.datetime.fromtimestamp(self.time(), tz=datetime.timezone.utc)
+
+
+class SystemClock(Clock):
+    """
+    The system clock.
+    """
+
+    def time(self) -> float:
+        """
+        Return the system time, in seconds since the epoch.
+        """
+        return time.time()
+
+    def monotonic(self) -> float:
+        """
+        Return the system monotonic clock, in seconds.
+        """
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Sleep for seconds, on the running event loop.
+        """
+        await asyncio.sleep(seconds)
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class VirtualClock(Clock):
+    """
+    A simulated clock.
+
+    :param start: The initial time, in seconds since the epoch
+    :param speed: How many simulated seconds pass per real second. When ``None``, time only moves
+                  when calling :meth:`VirtualClock.advance`.
+
+    Sleepers wake up once the simulated time reaches their deadline, whether it got there by
+    itself or by being advanced.
+    """
+
+    def __init__(self, start: float = 0.0, speed: Optional[float] = None) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("The clock speed must be positive")
+        self.start = start
+        self.speed = speed
+        self._advanced = 0.0
+        self._real_start = time.monotonic()
+        self._sleepers: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Return the clock representation, including its time and speed.
+        """
+        return f"{self.__class__.__name__}(time={self.time()}, speed={self.speed})"
+
+    def time(self) -> float:
+        """
+        Return the simulated time, in seconds since the epoch.
+        """
+        elapsed = 0.0
+        if self.speed is not None:
+            elapsed = (time.monotonic() - self._real_start) * self.speed
+        return self.start + self._advanced + elapsed
+
+    def monotonic(self) -> float:
+        """
+        Return the simulated time, which never goes backwards.
+        """
+        return self.time()
+
+    @property
+    def sleepers(self) -> int:
+        """
+        The number of tasks sleeping.
+        """
+        with self._lock:
+            return sum(1 for _, _, future in self._sleepers if not future.done())
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move the time forward by ``seconds``, waking up the sleepers whose deadline has passed.
+
+        Safe to call from any thread.
+        """
+        if seconds < 0:
+            raise ValueError("The time can't go backwards")
+        due: list[asyncio.Future[None]] = []
+        with self._lock:
+            self._advanced += seconds
+            now = self.time()
+            while self._sleepers and self._sleepers[0][0] <= now:
+                due.append(heapq.heappop(self._sleepers)[2])
+        for future in due:
+            if not future.done():
+                future.get_loop().call_soon_threadsafe(_wake, future)
+
+    def advance_to(self, timestamp: float) -> None:
+        """
+        Move the time forward to ``timestamp``, in seconds since the epoch, if it's in the future.
+        """
+        self.advance(max(0.0, timestamp - self.time()))
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Sleep until the simulated time is seconds later.
+        """
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        handle: Optional[asyncio.TimerHandle] = None
+        with self._lock:
+            heapq.heappush(self._sleepers, (self.time() + seconds, next(self._counter), future))
+        if self.speed is not None:
+            handle = loop.call_later(seconds / self.speed, _wake, future)
+        try:
+            await future
+        finally:
+            if handle is not None:
+                handle.cancel()
+
+
+_CLOCK: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """
+    Return the current clock.
+    """
+    return _CLOCK
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Replace the current clock, returning the previous one.
+
+    Caches keep the expiration times computed with the previous clock, so the clock should be
+    replaced before any of them is used.
+    """
+    global _CLOCK  # pylint: disable=global-statement
+    previous = _CLOCK
+    _CLOCK = clock
+    return previous
+
+
+def monotonic() -> float:
+    """
+    Return the current clock monotonic time, usable as a ``cachetools`` timer.
+    """
+    return _CLOCK.monotonic()
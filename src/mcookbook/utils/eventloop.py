@@ -0,0 +1,107 @@
+"""
+Event loop related utilities.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+from collections.abc import Coroutine
+from typing import Any
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from mcookbook.config.event_loop import EventLoopConfig
+
+try:
+    import uvloop
+
+    HAS_UVLOOP = True
+except ImportError:  # pragma: no cover
+    HAS_UVLOOP = False
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Resolve the event loop ``backend`` name to the one which will actually be used.
+
+    ``auto`` resolves to ``uvloop`` when it's installed, ``asyncio`` otherwise.
+    """
+    if backend == "auto":
+        return "uvloop" if HAS_UVLOOP else "asyncio"
+    if backend == "uvloop" and not HAS_UVLOOP:
+        log.warning(
+            "The uvloop event loop backend was requested but uvloop is not installed. "
+            "Falling back to asyncio. Run 'python -m pip install -e .[uvloop]' to install it."
+        )
+        return "asyncio"
+    return backend
+
+
+def new_event_loop(config: EventLoopConfig) -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop, tuned according to the passed ``config``.
+    """
+    backend = resolve_backend(config.backend)
+    loop: asyncio.AbstractEventLoop
+    if backend == "uvloop":
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+    log.debug("Using the %s event loop backend", backend)
+    loop.set_debug(config.debug)
+    # Only used by the event loop when running in debug mode
+    loop.slow_callback_duration = config.slow_callback_duration
+    if config.default_executor_workers is not None:
+        loop.set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=config.default_executor_workers,
+                thread_name_prefix="mcookbook-executor",
+            )
+        )
+    return loop
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    tasks = asyncio.all_tasks(loop)
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    for task in tasks:
+        if task.cancelled():
+            continue
+        if task.exception() is not None:
+            loop.call_exception_handler(
+                {
+                    "message": "unhandled exception during event loop shutdown",
+                    "exception": task.exception(),
+                    "task": task,
+                }
+            )
+
+
+def run(main: Coroutine[Any, Any, T], config: EventLoopConfig) -> T:
+    """
+    Run the ``main`` coroutine on a new event loop created from ``config``.
+
+    This is the equivalent of :func:`asyncio.run`, but allowing the event loop to be chosen and tuned.
+    """
+    loop = new_event_loop(config)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            _cancel_all_tasks(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
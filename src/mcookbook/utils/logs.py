@@ -3,13 +3,14 @@ Logging related utilities.
 """
 from __future__ import annotations
 
+import io
 import logging
+import os
 import pathlib
 import sys
+import traceback
 from collections import deque
 from collections.abc import Mapping
-from datetime import datetime
-from datetime import timedelta
 from logging import handlers
 from types import TracebackType
 from typing import Any
@@ -20,6 +21,9 @@ from typing import Union
 
 from cachetools import TLRUCache  # type: ignore[attr-defined]
 
+from mcookbook.utils import clock
+from mcookbook.utils.metrics import REGISTRY
+
 
 LOG_LEVELS = {
     "all": logging.NOTSET,
@@ -37,6 +41,18 @@ logging.root.setLevel(logging.DEBUG)
 # Store an instance of the current logging logger class
 LOGGING_LOGGER_CLASS: type[logging.Logger] = logging.getLoggerClass()
 
+# The source files whose frames should be skipped when finding the caller of a logging call
+LOGGING_SOURCE_FILES = (
+    os.path.normcase(logging.addLevelName.__code__.co_filename),
+    os.path.normcase(__file__),
+)
+
+LOG_RECORDS = REGISTRY.counter(
+    "mcookbook_log_records_total",
+    "Log records, either emitted or throttled by 'once_every_secs'.",
+    labelnames=("level", "result"),
+)
+
 _ArgsType = Union[tuple[object, ...], Mapping[str, object]]
 _SysExcInfoType = Union[tuple[type, BaseException, TracebackType], tuple[None, None, None]]
 
@@ -58,16 +74,16 @@ class TTLFilter(logging.Filter):
     def __init__(self, name: str = "") -> None:
         super().__init__(name=name)
         self._cache = TLRUCache(
-            maxsize=10000, ttu=self._calculate_cache_time_to_use, timer=datetime.now
+            maxsize=10000, ttu=self._calculate_cache_time_to_use, timer=clock.monotonic
         )
 
     def _calculate_cache_time_to_use(  # pylint: disable=unused-argument
         self,
         key: int,
         record: logging.LogRecord,
-        now: datetime,
-    ) -> datetime:
-        return now + timedelta(seconds=cast(LogRecord, record).once_every_secs)
+        now: float,
+    ) -> float:
+        return now + cast(LogRecord, record).once_every_secs
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
@@ -83,11 +99,13 @@ class TTLFilter(logging.Filter):
 
             # Don't cache debug or lower log messages
             if record.levelno <= logging.DEBUG:
+                LOG_RECORDS.labels(record.levelname.lower(), "emitted").inc()
                 return True
 
             # Should we consider caching the log record
             if not cast(LogRecord, record).once_every_secs:
                 # No, just log it
+                LOG_RECORDS.labels(record.levelname.lower(), "emitted").inc()
                 return True
 
             # Construct a cache key, based on specific log record attributes
@@ -102,15 +120,21 @@ class TTLFilter(logging.Filter):
                 "lineno",
                 "funcName",
             )
-            record_hash_tuple = ((key, getattr(record, key)) for key in interesting_keys)
-            record_hash = hash(record_hash_tuple)
+            record_hash_tuple = tuple((key, getattr(record, key)) for key in interesting_keys)
+            try:
+                record_hash = hash(record_hash_tuple)
+            except TypeError:
+                # Some of the log record arguments are not hashable
+                record_hash = hash(repr(record_hash_tuple))
             if record_hash in self._cache:
                 # Log record already in cache, don't log it again
+                LOG_RECORDS.labels(record.levelname.lower(), "throttled").inc()
                 return False
 
             # First time seeing this log record, add it to cache
             self._cache[record_hash] = record
             # Log it
+            LOG_RECORDS.labels(record.levelname.lower(), "emitted").inc()
             return True
         finally:
             # Cleanup expired cached entries
@@ -248,6 +272,27 @@ class MCookBookLoggingClass(LOGGING_LOGGER_CLASS):  # type: ignore[valid-type,mi
             stacklevel=stacklevel,
         )
 
+    def findCaller(
+        self, stack_info: bool = False, stacklevel: int = 1
+    ) -> tuple[str, int, str, str | None]:
+        """
+        Find the stack frame of the caller, skipping the logging frames, including our own.
+        """
+        frame = sys._getframe(1)  # pylint: disable=protected-access
+        while frame.f_back is not None:
+            if os.path.normcase(frame.f_code.co_filename) not in LOGGING_SOURCE_FILES:
+                if stacklevel <= 1:
+                    break
+                stacklevel -= 1
+            frame = frame.f_back
+        sinfo = None
+        if stack_info:
+            with io.StringIO() as sio:
+                sio.write("Stack (most recent call last):\n")
+                traceback.print_stack(frame, file=sio)
+                sinfo = sio.getvalue().rstrip("\n")
+        return frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name, sinfo
+
     def makeRecord(
         self,
         name: str,
@@ -0,0 +1,414 @@
+"""
+Lightweight metrics, exposed in the Prometheus text format.
+
+Updating a metric is a dictionary lookup and a couple of arithmetic operations, cheap enough to
+leave the instrumentation always on. The values are only formatted when scraped.
+Metrics are meant to be updated from the event loop thread. Updates from other threads are
+not synchronized and might, very rarely, be lost.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+from collections.abc import Callable
+from collections.abc import Iterator
+from typing import Generic
+from typing import Optional
+from typing import TypeVar
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+ChildType = TypeVar("ChildType", "CounterChild", "GaugeChild", "HistogramChild")
+MetricType = TypeVar("MetricType", "Counter", "Gauge", "Histogram")
+
+
+def _get_logger() -> logging.Logger:
+    # Not instantiated at import time because this module is imported by ``mcookbook.utils.logs``
+    # before the custom logging class is set.
+    return logging.getLogger(__name__)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(labelnames: tuple[str, ...], labelvalues: tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+    labels = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""))
+        for name, value in zip(labelnames, labelvalues)
+    )
+    return f"{{{labels}}}"
+
+
+class CounterChild:
+    """
+    A counter value.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the counter by ``amount``.
+        """
+        self.value += amount
+
+
+class GaugeChild:
+    """
+    A gauge value, either set explicitly or computed when scraped.
+    """
+
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float) -> None:
+        """
+        Set the gauge to ``value``.
+        """
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the gauge by ``amount``.
+        """
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """
+        Decrement the gauge by ``amount``.
+        """
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """
+        Compute the gauge value, when scraped, by calling ``function``.
+
+        If ``function`` returns ``None``, the sample is not exposed.
+        """
+        self.function = function
+
+    def get(self) -> Optional[float]:
+        """
+        Return the gauge value.
+        """
+        if self.function is not None:
+            try:
+                return self.function()
+            except Exception:  # pylint: disable=broad-except
+                _get_logger().debug("Failed to compute gauge value", exc_info=True)
+                return None
+        return self.value
+
+
+class HistogramChild:
+    """
+    A histogram of observed values.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # The last slot counts the observations above the highest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Observe ``value``.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric(Generic[ChildType]):
+
+    type: str
+    _default: ChildType
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], ChildType] = {}
+        if not labelnames:
+            self._default = self.labels()
+
+    def _new_child(self) -> ChildType:
+        raise NotImplementedError
+
+    def labels(self, *labelvalues: str, **labelkwargs: str) -> ChildType:
+        """
+        Return the child metric for the passed label values.
+        """
+        if labelkwargs:
+            labelvalues = tuple(labelkwargs[name] for name in self.labelnames)
+        try:
+            return self._children[labelvalues]
+        except KeyError:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(
+                    f"The {self.name} metric expects the labels {self.labelnames}"
+                ) from None
+            child = self._children[labelvalues] = self._new_child()
+            return child
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        """
+        Render the metric in the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._samples()
+
+
+class Counter(_Metric[CounterChild]):
+    """
+    A monotonically increasing counter.
+    """
+
+    type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the counter, which must not have labels, by ``amount``.
+        """
+        self._default.inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for labelvalues, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Gauge(_Metric[GaugeChild]):
+    """
+    A value which can go up and down.
+    """
+
+    type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """
+        Set the gauge, which must not have labels, to ``value``.
+        """
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """
+        Compute the gauge, which must not have labels, value by calling ``function``.
+        """
+        self._default.set_function(function)
+
+    def _samples(self) -> Iterator[str]:
+        for labelvalues, child in list(self._children.items()):
+            value = child.get()
+            if value is None:
+                continue
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram(_Metric[HistogramChild]):
+    """
+    A histogram of observed values.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """
+        Observe ``value`` on the histogram, which must not have labels.
+        """
+        self._default.observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        labelnames = self.labelnames + ("le",)
+        for labelvalues, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                labels = _format_labels(labelnames, labelvalues + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}  # type: ignore[type-arg]
+
+    def _register(self, metric: MetricType) -> MetricType:
+        existing: MetricType
+        try:
+            existing = self._metrics[metric.name]  # type: ignore[assignment]
+        except KeyError:
+            self._metrics[metric.name] = metric
+            return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"A different {metric.name} metric is already registered")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """
+        Register, or return the already registered, counter.
+        """
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """
+        Register, or return the already registered, gauge.
+        """
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Register, or return the already registered, histogram.
+        """
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format.
+        """
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+# Shared by the caches of the different subsystems, labeled by cache
+CACHE_REQUESTS = REGISTRY.counter(
+    "mcookbook_cache_requests_total", "Cache lookups.", labelnames=("cache", "result")
+)
+
+
+class MetricsServer:
+    """
+    Minimal HTTP server exposing the registry metrics under ``/metrics``.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9108
+    ) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+        Start serving metrics.
+        """
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        # Update the port, in case port 0 was passed, to bind to a random port
+        self.port = self._server.sockets[0].getsockname()[1]
+        _get_logger().info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self) -> None:
+        """
+        Stop serving metrics.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            method, path, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            path = path.split("?", 1)[0]
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b""
+            elif path != "/metrics":
+                status, content_type, body = "404 Not Found", "text/plain", b""
+            else:
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = self.registry.render().encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n"
+                "\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            pass
+        except ConnectionError:
+            pass
+        except ValueError:
+            # Malformed request line
+            pass
+        finally:
+            writer.close()
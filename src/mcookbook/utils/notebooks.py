@@ -0,0 +1,210 @@
+"""
+Headless notebook execution.
+
+Notebooks are executed with `papermill`_, which injects each run parameters after the notebook
+cell tagged ``parameters``, and records the duration of every cell in the executed notebook
+metadata.
+
+.. _papermill: https://papermill.readthedocs.io
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import time
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+try:
+    import papermill
+    from jupyter_client.manager import AsyncKernelManager
+
+    HAS_PAPERMILL = True
+except ImportError:  # pragma: no cover
+    HAS_PAPERMILL = False
+
+log = logging.getLogger(__name__)
+
+
+class NotebookRun(NamedTuple):
+    """
+    The result of a single headless notebook execution.
+    """
+
+    number: int
+    parameters: dict[str, Any]
+    output: pathlib.Path
+    status: str
+    error: Optional[str]
+    duration: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the run as a JSON serializable dictionary.
+        """
+        return {**self._asdict(), "output": self.output.name}
+
+
+def _kernel_manager_class(environ: dict[str, str]) -> type[AsyncKernelManager]:
+    class KernelManager(AsyncKernelManager):
+        """
+        Start the kernel with the extra environment variables.
+        """
+
+        # The jupyter_client types don't tell the async kernel manager methods apart
+        async def start_kernel(self, **kwargs: Any) -> None:  # type: ignore[override,unused-ignore]
+            """
+            Start the kernel, adding the extra environment variables to its environment.
+            """
+            kwargs["env"] = {**kwargs.get("env", os.environ), **environ}
+            await super().start_kernel(**kwargs)
+
+    return KernelManager
+
+
+def execute_notebook(
+    number: int,
+    notebook: pathlib.Path,
+    output: pathlib.Path,
+    parameters: dict[str, Any],
+    environ: dict[str, str],
+    timeout: Optional[int] = None,
+) -> NotebookRun:
+    """
+    Execute ``notebook`` with ``parameters``.
+
+    The executed notebook, and its outputs, are saved to ``output``.
+
+    :param environ: Extra environment variables, for the notebook kernel
+    :param timeout: The maximum duration of each cell, in seconds
+    """
+    start = time.perf_counter()
+    status = "ok"
+    error: Optional[str] = None
+    try:
+        papermill.execute_notebook(
+            str(notebook),
+            str(output),
+            parameters=parameters,
+            cwd=str(output.parent),
+            execution_timeout=timeout,
+            progress_bar=False,
+            # Only the kernel gets the extra environment variables, not this process
+            kernel_manager_class=_kernel_manager_class(environ),
+        )
+    except papermill.PapermillExecutionError as exc:
+        status = "error"
+        error = f"{exc.ename}: {exc.evalue}"
+    except Exception as exc:  # pylint: disable=broad-except
+        status = "error"
+        error = f"{exc.__class__.__name__}: {exc}"
+    return NotebookRun(number, parameters, output, status, error, time.perf_counter() - start)
+
+
+class NotebookBatch:
+    """
+    Execute a notebook once per parameter set, in parallel worker processes.
+
+    The executed notebooks, along with a ``runs.json`` summary of the runs, their parameters,
+    status and duration, are saved under ``<path>/<notebook>/<YYYYmmdd-HHMMSS>``, suffixed with
+    ``-2``, ``-3``, and so on, for the batches started within the same second.
+
+    :param notebook: The notebook to execute
+    :param path: The directory to save the runs under, usually ``<basedir>/notebooks``
+    :param environ: Extra environment variables, for the notebook kernels
+    :param workers: The number of worker processes. Default: number of CPUs
+    :param timeout: The maximum duration of each cell, in seconds
+    """
+
+    def __init__(
+        self,
+        notebook: pathlib.Path,
+        path: pathlib.Path,
+        environ: Optional[dict[str, str]] = None,
+        workers: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> None:
+        self.notebook = notebook
+        self.path = path
+        self.environ = environ or {}
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+
+    def run(self, parameter_sets: list[dict[str, Any]]) -> tuple[pathlib.Path, list[NotebookRun]]:
+        """
+        Execute the notebook once per parameter set.
+
+        Returns the directory the runs were saved to, and the runs, sorted like the parameter sets.
+        """
+        directory = self._make_directory()
+        width = len(str(len(parameter_sets)))
+        arguments = [
+            (
+                number,
+                self.notebook,
+                directory / f"{number:0{width}d}.ipynb",
+                parameters,
+                self.environ,
+                self.timeout,
+            )
+            for number, parameters in enumerate(parameter_sets, start=1)
+        ]
+        runs: list[NotebookRun] = []
+        if self.workers == 1 or len(arguments) == 1:
+            for args in arguments:
+                runs.append(self._report(execute_notebook(*args), len(arguments)))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(self.workers, len(arguments)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [executor.submit(execute_notebook, *args) for args in arguments]
+                for future in concurrent.futures.as_completed(futures):
+                    runs.append(self._report(future.result(), len(arguments)))
+        runs.sort(key=lambda run: run.number)
+        directory.joinpath("runs.json").write_text(
+            json.dumps([run.to_dict() for run in runs], indent=2, default=str)
+        )
+        return directory, runs
+
+    def _make_directory(self) -> pathlib.Path:
+        parent = self.path / self.notebook.stem
+        parent.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.datetime.now():%Y%m%d-%H%M%S}"
+        directory = parent / name
+        for suffix in itertools.count(2):
+            try:
+                # Fails when another batch already uses the directory
+                directory.mkdir()
+            except FileExistsError:
+                directory = parent / f"{name}-{suffix}"
+            else:
+                break
+        return directory
+
+    def _report(self, run: NotebookRun, total: int) -> NotebookRun:
+        if run.status == "ok":
+            log.info(
+                "Run %d/%d %s finished in %.2f seconds",
+                run.number,
+                total,
+                run.parameters,
+                run.duration,
+            )
+        else:
+            log.error(
+                "Run %d/%d %s failed after %.2f seconds: %s",
+                run.number,
+                total,
+                run.parameters,
+                run.duration,
+                run.error,
+            )
+        return run
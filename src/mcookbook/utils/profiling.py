@@ -0,0 +1,211 @@
+"""
+Profiling related utilities.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import cProfile
+import logging
+import os
+import pathlib
+import signal
+import sys
+import threading
+from collections.abc import Iterator
+from types import FrameType
+from typing import Any
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# The signal which triggers writing the profiling data collected so far, where available
+DUMP_SIGNAL: Optional[signal.Signals] = getattr(signal, "SIGUSR1", None)
+
+
+class Profiler:
+    """
+    Base profiler.
+    """
+
+    extension: str
+
+    def start(self) -> None:
+        """
+        Start profiling the calling thread.
+        """
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        """
+        Stop profiling.
+        """
+        raise NotImplementedError
+
+    def dump(self, path: pathlib.Path) -> None:
+        """
+        Write the profiling data collected so far to ``path``.
+        """
+        raise NotImplementedError
+
+
+class SamplingProfiler(Profiler):
+    """
+    Sampling profiler, aware of asyncio tasks.
+
+    A helper thread periodically samples the profiled thread's stack. When the profiled thread is
+    running an asyncio event loop, the stack is prefixed with the name of the task being run.
+    The output is in the collapsed stacks format, understood by ``flamegraph.pl``, ``inferno``
+    and ``speedscope``.
+    """
+
+    extension = "folded"
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self._stacks: collections.Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._labels: dict[Any, str] = {}
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        try:
+            return self._labels[code]
+        except KeyError:
+            label = self._labels[code] = "{} ({}:{})".format(
+                code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+            ).replace(";", ":")
+            return label
+
+    def _current_task_name(self) -> Optional[str]:
+        # Reading the loop's current task from this thread is racy, but good enough for sampling
+        current_tasks = list(getattr(asyncio.tasks, "_current_tasks", {}).items())
+        for loop, task in current_tasks:
+            # Not all event loop implementations expose the thread they're running on
+            thread_id = getattr(loop, "_thread_id", None)
+            if thread_id == self._thread_id or (thread_id is None and len(current_tasks) == 1):
+                name: str = task.get_name()
+                return name
+        return None
+
+    def _sample(self, thread_id: int) -> None:
+        frame = sys._current_frames().get(thread_id)  # pylint: disable=protected-access
+        if frame is None:
+            return
+        stack: list[str] = []
+        while frame is not None:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        task_name = self._current_task_name()
+        if task_name is not None:
+            stack.append(f"task:{task_name}")
+        stack.reverse()
+        with self._lock:
+            self._stacks[";".join(stack)] += 1
+
+    def _run(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample(thread_id)
+
+    def start(self) -> None:
+        """
+        Start profiling the calling thread.
+        """
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._thread_id,), name="mcookbook-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop profiling.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def dump(self, path: pathlib.Path) -> None:
+        """
+        Write the collapsed stacks collected so far to ``path``.
+        """
+        with self._lock:
+            stacks = list(self._stacks.items())
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks))
+
+
+class DeterministicProfiler(Profiler):
+    """
+    Deterministic profiler, based on :mod:`cProfile`.
+
+    The output can be loaded with :mod:`pstats` or turned into a flame graph with
+    tools like ``flameprof`` or ``snakeviz``.
+    """
+
+    extension = "pstats"
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+        self._running = False
+
+    def start(self) -> None:
+        """
+        Start profiling the calling thread.
+        """
+        self._running = True
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """
+        Stop profiling.
+        """
+        self._profile.disable()
+        self._running = False
+
+    def dump(self, path: pathlib.Path) -> None:
+        """
+        Write the profiling statistics collected so far to ``path``.
+        """
+        # Dumping the statistics disables the profiler
+        self._profile.dump_stats(str(path))
+        if self._running:
+            self._profile.enable()
+
+
+PROFILERS: dict[str, type[Profiler]] = {
+    "sampling": SamplingProfiler,
+    "deterministic": DeterministicProfiler,
+}
+
+
+@contextlib.contextmanager
+def profile(profiler: Profiler, output: pathlib.Path) -> Iterator[Profiler]:
+    """
+    Profile the code run within the context, writing the results to ``output`` on exit.
+
+    Where supported, sending ``SIGUSR1`` to the process writes the results collected so far.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    def _on_dump_signal(_signum: int, _sigframe: Any) -> None:
+        log.info("Writing profiling data to %s", output)
+        profiler.dump(output)
+
+    previous_handler = None
+    if DUMP_SIGNAL is not None:
+        previous_handler = signal.signal(DUMP_SIGNAL, _on_dump_signal)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if DUMP_SIGNAL is not None:
+            signal.signal(DUMP_SIGNAL, previous_handler)
+        profiler.dump(output)
+        log.info("Profiling data written to %s", output)
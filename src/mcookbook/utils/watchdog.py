@@ -0,0 +1,239 @@
+"""
+Event loop watchdog.
+
+Continuously measures the event loop scheduling lag and, when the loop is blocked for longer than
+a threshold, captures the stack of the code blocking it from a helper thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Optional
+
+from mcookbook.utils.metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "mcookbook_event_loop_lag_seconds",
+    "Delay between when a callback was scheduled to run and when it actually ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_BLOCKED = REGISTRY.counter(
+    "mcookbook_event_loop_blocked_total",
+    "Times the event loop was detected blocked for longer than the watchdog threshold.",
+)
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_WATCHDOG_FILE = os.path.abspath(__file__)
+# Frames from the event loop machinery are not interesting when pinpointing blocking code
+_EVENT_LOOP_DIR = os.path.dirname(asyncio.__file__)
+_SKIP_FILES = ("selectors.py", "threading.py")
+
+
+def _format_frame(frame: FrameType) -> str:
+    return f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def _blocking_call_site(frame: FrameType) -> tuple[str, str]:
+    """
+    Return the call site of the code blocking the event loop, and its innermost frame.
+
+    The call site is the innermost frame under the ``mcookbook`` package, falling back to the
+    innermost frame which is not part of the event loop machinery.
+    """
+    fallback: Optional[FrameType] = None
+    candidate: Optional[FrameType] = frame
+    while candidate is not None:
+        filename = candidate.f_code.co_filename
+        if filename != _WATCHDOG_FILE:
+            if filename.startswith(_PACKAGE_DIR):
+                return _format_frame(candidate), _format_frame(frame)
+            event_loop_machinery = filename.startswith(_EVENT_LOOP_DIR) or filename.endswith(
+                _SKIP_FILES
+            )
+            if fallback is None and not event_loop_machinery:
+                fallback = candidate
+        candidate = candidate.f_back
+    return _format_frame(fallback or frame), _format_frame(frame)
+
+
+class LagStats:
+    """
+    Aggregated event loop lag statistics.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.blocked = 0
+        self.blocking_sites: collections.Counter[str] = collections.Counter()
+
+    def observe(self, lag: float) -> None:
+        """
+        Record a lag sample.
+        """
+        with self._lock:
+            self.samples += 1
+            self.total += lag
+            if lag > self.max:
+                self.max = lag
+
+    def observe_blocked(self, call_site: str) -> None:
+        """
+        Record the event loop was blocked at ``call_site``.
+        """
+        with self._lock:
+            self.blocked += 1
+            self.blocking_sites[call_site] += 1
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean lag.
+        """
+        return self.total / self.samples if self.samples else 0.0
+
+    def summary(self, top: int = 3) -> str:
+        """
+        Return a human readable summary.
+        """
+        with self._lock:
+            text = (
+                f"samples={self.samples} mean={self.mean * 1000:.1f}ms "
+                f"max={self.max * 1000:.1f}ms blocked={self.blocked}"
+            )
+            if self.blocking_sites:
+                sites = ", ".join(
+                    f"{site} ({count}x)" for site, count in self.blocking_sites.most_common(top)
+                )
+                text += f". Top blocking call sites: {sites}"
+        return text
+
+    def reset(self) -> None:
+        """
+        Reset the statistics.
+        """
+        with self._lock:
+            self.samples = 0
+            self.total = 0.0
+            self.max = 0.0
+            self.blocked = 0
+            self.blocking_sites.clear()
+
+
+class EventLoopWatchdog:
+    """
+    Event loop watchdog.
+
+    A task on the watched event loop wakes up every ``interval`` seconds, measuring how late it
+    was woken up. When ``detect_blocking`` is ``True``, a helper thread checks those wake ups and,
+    if none happened for ``threshold`` seconds, captures and logs the stack of the code currently
+    running on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        report_interval: float = 60,
+        detect_blocking: bool = True,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.detect_blocking = detect_blocking
+        self.stats = LagStats()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def start(self) -> None:
+        """
+        Start watching the running event loop.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._beat(), name="mcookbook-watchdog")
+        if self.detect_blocking:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._watch, name="mcookbook-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    async def stop(self) -> None:
+        """
+        Stop watching the event loop.
+        """
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def _beat(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_report = loop.time()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self._heartbeat = time.monotonic()
+            lag = max(0.0, now - start - self.interval)
+            EVENT_LOOP_LAG.observe(lag)
+            self.stats.observe(lag)
+            if now - last_report >= self.report_interval:
+                last_report = now
+                log.info("Event loop lag statistics: %s", self.stats.summary())
+                self.stats.reset()
+
+    def _watch(self) -> None:
+        captured_heartbeat = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            if heartbeat == captured_heartbeat:
+                # Already reported while blocked since this heartbeat
+                continue
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.threshold:
+                continue
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self._loop_thread_id  # type: ignore[arg-type]
+            )
+            if frame is None:
+                continue
+            captured_heartbeat = heartbeat
+            call_site, innermost = _blocking_call_site(frame)
+            self.stats.observe_blocked(call_site)
+            EVENT_LOOP_BLOCKED.inc()
+            # Throttled per call site, the stack differs on every capture
+            log.warning(
+                "The event loop has been blocked for over %s seconds at %s",
+                self.threshold,
+                call_site,
+                once_every_secs=self.report_interval,  # type: ignore[call-arg]
+            )
+            log.debug(
+                "The event loop blocked at %s, innermost frame %s:\n%s",
+                call_site,
+                innermost,
+                "".join(traceback.format_stack(frame)).rstrip(),
+            )
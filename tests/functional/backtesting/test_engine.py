@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+
+import polars as pl
+import pytest
+
+from mcookbook.backtesting import Backtester
+from mcookbook.backtesting import simulate
+from mcookbook.backtesting import summarize
+from mcookbook.backtesting.engine import TRADES_SCHEMA
+from mcookbook.cli.__main__ import main
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.strategies import EMACross
+
+
+def _frame(entry: list[bool], exit: list[bool]) -> pl.DataFrame:
+    prices = [float(idx + 1) for idx in range(len(entry))]
+    return pl.DataFrame(
+        {
+            "timestamp": list(range(len(entry))),
+            "open": prices,
+            "high": prices,
+            "low": prices,
+            "close": [price + 0.5 for price in prices],
+            "volume": [1.0] * len(entry),
+            "entry": entry,
+            "exit": exit,
+        }
+    )
+
+
+def test_simulate():
+    frame = _frame(
+        entry=[True, False, False, False, True, True, False, False, True, False],
+        exit=[False, False, True, False, False, False, True, False, False, False],
+    )
+    trades = simulate(frame, pair="AAA/USDT")
+    assert trades.select("entry_timestamp", "exit_timestamp", "candles", "is_open").rows() == [
+        (1, 3, 2, False),
+        (5, 7, 2, False),
+        (9, 9, 1, True),
+    ]
+    # Entered and exited on the next candle open, open trades closed on the last close
+    assert trades["entry_price"].to_list() == [2.0, 6.0, 10.0]
+    assert trades["exit_price"].to_list() == [4.0, 8.0, 10.5]
+    assert trades["profit_ratio"].to_list() == pytest.approx([1.0, 1 / 3, 0.05])
+
+
+def test_simulate_fees_and_slippage():
+    frame = _frame(entry=[True, False, False], exit=[False, True, False])
+    (trade,) = simulate(frame, fee=0.01, slippage=0.02).rows(named=True)
+    assert trade["entry_price"] == pytest.approx(2 * 1.02)
+    assert trade["exit_price"] == pytest.approx(3 * 0.98)
+    assert trade["profit_ratio"] == pytest.approx(3 * 0.98 * 0.99 / (2 * 1.02 * 1.01) - 1)
+
+
+def test_exit_wins_over_entry():
+    frame = _frame(entry=[True, True, True], exit=[False, True, False])
+    assert simulate(frame)["entry_timestamp"].to_list() == [1]
+    assert simulate(_frame(entry=[False] * 3, exit=[False] * 3)).is_empty()
+
+
+def test_summarize():
+    trades = pl.DataFrame({"exit_timestamp": [1, 2, 3, 4], "profit_ratio": [0.1, -0.2, -0.1, 0.3]})
+    summary = summarize(trades)
+    assert summary["trades"] == 4
+    assert summary["win_rate"] == 0.5
+    assert summary["profit_total"] == pytest.approx(0.1)
+    assert summary["max_drawdown"] == pytest.approx(0.3)
+    assert summary["profit_factor"] == pytest.approx(0.4 / 0.3)
+    assert summarize(trades.clear())["trades"] == 0
+
+
+def test_backtester_workers_match(tmp_path):
+    store = CandleStore(tmp_path, "synthetic")
+    generator = MarketGenerator(seed=5)
+    pairs = generator.symbols(4)
+    for pair in pairs:
+        store.save(pair, "5m", generator.ohlcv(pair, timeframe="5m", candles=2000))
+    strategy = EMACross(name="EMACross", fast=5, slow=20)
+    sequential = Backtester(store, strategy, "5m", fee=0.001, workers=1).run(pairs)
+    parallel = Backtester(store, strategy, "5m", fee=0.001, workers=2).run(pairs)
+    assert sequential.trades.height > 0
+    assert sequential.trades.equals(parallel.trades)
+    assert sequential.summary["candles"] == 8000
+    assert sequential.pairs["pair"].to_list() == pairs
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_backtester_without_pairs(tmp_path, workers):
+    strategy = EMACross(name="EMACross", fast=5, slow=20)
+    result = Backtester(CandleStore(tmp_path, "synthetic"), strategy, "5m", workers=workers).run([])
+    assert result.trades.is_empty()
+    assert result.trades.schema == TRADES_SCHEMA
+    assert result.summary["trades"] == 0
+    assert result.summary["candles"] == 0
+
+
+def test_backtest_command(tmp_path):
+    config = {
+        "exchange": {"name": "binance", "pair_allow_list": ["AA[A-C]/USDT"]},
+        "pairlists": [{"name": "StaticPairList"}],
+        "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    export = tmp_path / "trades.csv"
+    main(
+        [
+            "--basedir",
+            str(tmp_path),
+            "backtest",
+            "--synthetic-markets",
+            "30",
+            "--start",
+            "2022-01-01",
+            "--end",
+            "2022-01-08",
+            "--workers",
+            "1",
+            "--export",
+            str(export),
+        ]
+    )
+    trades = pl.read_csv(export)
+    assert set(trades["pair"]) == {"AAA/USDT", "AAB/USDT", "AAC/USDT"}
+    store = CandleStore(tmp_path / "data", "synthetic")
+    assert store.pairs("5m") == ["AAA/USDT", "AAB/USDT", "AAC/USDT"]
+    assert store.load("AAA/USDT", "5m").height == 7 * 288
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pytest
+
+from mcookbook.benchmarks import runner
+from mcookbook.cli.__main__ import main
+
+
+def _results(**timings: float) -> dict[str, object]:
+    return {
+        "benchmarks": {
+            name: {"min": timing, "median": timing, "rounds": 1, "iterations": 1}
+            for name, timing in timings.items()
+        }
+    }
+
+
+def test_collect():
+    names = [benchmark.name for benchmark in runner.collect()]
+    assert names == sorted(names)
+    assert "pairlist.refresh_pairlist" in names
+    assert [benchmark.name for benchmark in runner.collect("config.*")] == ["config.parse_files"]
+
+
+def test_run(tmp_path):
+    results = runner.run("utils.merge_dictionaries", rounds=2, min_duration=0.001)
+    result = results["benchmarks"]["utils.merge_dictionaries"]
+    assert result["rounds"] == 2
+    assert 0 < result["min"] <= result["median"]
+    assert result["relative"] == pytest.approx(result["min"] / results["calibration"])
+    assert "calibration" not in [benchmark.name for benchmark in runner.collect()]
+    path = tmp_path / "results.json"
+    runner.save(results, path)
+    assert runner.load(path) == results
+
+
+def test_compare():
+    baseline = _results(fast=1.0, slow=1.0, removed=1.0)
+    current = _results(fast=0.5, slow=1.2, new=1.0)
+    (regression,) = runner.compare(baseline, current, threshold=10)
+    assert regression.name == "slow"
+    assert regression.change == pytest.approx(20)
+    assert not runner.compare(baseline, current, threshold=25)
+    table = runner.format_comparison(baseline, current)
+    assert "+20.0%" in table
+    assert "new" in table
+
+
+def test_compare_relative_timings():
+    # The current machine is twice as slow, but the benchmark didn't regress relative to it
+    baseline = _results(parse=1.0)
+    baseline["benchmarks"]["parse"]["relative"] = 10.0  # type: ignore[index]
+    current = _results(parse=2.0)
+    current["benchmarks"]["parse"]["relative"] = 10.5  # type: ignore[index]
+    assert not runner.compare(baseline, current, threshold=10)
+    current["benchmarks"]["parse"]["relative"] = 12.0  # type: ignore[index]
+    (regression,) = runner.compare(baseline, current, threshold=10)
+    assert regression.change == pytest.approx(20)
+
+
+def test_save_keeps_the_results_not_run(tmp_path):
+    path = tmp_path / "baseline.json"
+    runner.save(_results(kept=1.0, updated=1.0), path)
+    runner.save(_results(updated=2.0, new=3.0), path)
+    benchmarks = runner.load(path)["benchmarks"]
+    assert {name: result["min"] for name, result in benchmarks.items()} == {
+        "kept": 1.0,
+        "updated": 2.0,
+        "new": 3.0,
+    }
+
+
+def test_run_missing_command(tmp_path):
+    path = tmp_path / "baseline.json"
+    runner.save(_results(**{"utils.merge_dictionaries": 1.0}), path)
+    argv = ["bench", "run", "-k", "utils.*_dictionar*", "--save", str(path), "--missing"]
+    argv.extend(["--rounds", "1", "--min-duration", "0.001"])
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 0
+    # Only the missing benchmark ran
+    benchmarks = runner.load(path)["benchmarks"]
+    assert benchmarks["utils.merge_dictionaries"]["min"] == 1.0
+    assert "relative" in benchmarks["utils.sanitize_dictionary"]
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 0
+
+
+def test_compare_command_exit_code(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    runner.save(_results(parse=1.0), baseline)
+    runner.save(_results(parse=1.5), current)
+    with pytest.raises(SystemExit) as exc:
+        main(["bench", "compare", str(baseline), str(current)])
+    assert exc.value.code == 1
+    with pytest.raises(SystemExit) as exc:
+        main(["bench", "compare", str(baseline), str(current), "--threshold", "60"])
+    assert exc.value.code == 0
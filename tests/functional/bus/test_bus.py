@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcookbook.bus import BLOCK
+from mcookbook.bus import CONFLATE
+from mcookbook.bus import EventBus
+from mcookbook.bus import OrderEvent
+from mcookbook.bus import ORDERS
+from mcookbook.bus import TICKERS
+from mcookbook.exceptions import SubscriptionClosed
+from mcookbook.replay import TickersEvent
+
+
+def _tickers(timestamp: int, *pairs: str) -> TickersEvent:
+    return TickersEvent(timestamp, {pair: {"last": timestamp} for pair in pairs})
+
+
+def test_overflow_policies():
+    async def _run():
+        bus = EventBus()
+        logger = bus.subscribe(TICKERS, "logger", maxsize=2)
+        latest = bus.subscribe(TICKERS, "latest", policy=CONFLATE)
+        by_pair = bus.subscribe(
+            TICKERS,
+            "by-pair",
+            maxsize=2,
+            policy=CONFLATE,
+            key=lambda event: next(iter(event.tickers)),
+        )
+        for timestamp, pair in enumerate(("BTC/USDT", "ETH/USDT", "BTC/USDT", "SOL/USDT")):
+            await bus.publish(TICKERS, _tickers(timestamp, pair))
+
+        assert [(await logger.get()).timestamp for _ in range(2)] == [2, 3]
+        assert logger.dropped == 2
+        assert (await latest.get()).timestamp == 3
+        assert latest.get_nowait() is None
+        # The second BTC/USDT update replaced the queued one, then SOL/USDT pushed it out, being
+        # the longest queued pair
+        assert [(await by_pair.get()).timestamp for _ in range(2)] == [1, 3]
+        assert by_pair.dropped == 2
+
+        bus.close()
+        with pytest.raises(SubscriptionClosed):
+            await logger.get()
+        await bus.publish(TICKERS, _tickers(4, "BTC/USDT"))
+        assert len(latest) == 0
+
+    asyncio.run(_run())
+
+
+def test_block_backpressure():
+    async def _run():
+        bus = EventBus()
+        orders = bus.subscribe(ORDERS, "orders", maxsize=2, policy=BLOCK)
+        slow_logger = bus.subscribe(ORDERS, "logger", maxsize=1)
+        received = []
+
+        async def _consume():
+            async for event in orders:
+                received.append(event.timestamp)
+                await asyncio.sleep(0)
+
+        consumer = asyncio.create_task(_consume())
+        for timestamp in range(100):
+            await bus.publish(ORDERS, OrderEvent(timestamp, {"id": str(timestamp)}))
+            assert len(orders) <= 2
+        orders.close()
+        await consumer
+        # Every order was handled, in order, while the never consumed logger just dropped events
+        assert received == list(range(100))
+        assert slow_logger.dropped == 99
+        assert (await slow_logger.get()).timestamp == 99
+
+        with pytest.raises(ValueError, match="overflow policy"):
+            bus.subscribe(ORDERS, "orders", policy="latest")
+        with pytest.raises(ValueError, match="key"):
+            bus.subscribe(ORDERS, "orders", key=lambda event: event.order["id"])
+
+    asyncio.run(_run())
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from mcookbook.backtesting import Backtester
+from mcookbook.cli.__main__ import main
+from mcookbook.config.archive import ArchiveConfig
+from mcookbook.data import apply_retention
+from mcookbook.data import archive_candles
+from mcookbook.data import CandleArchive
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.data import resample
+from mcookbook.data import scan_gaps
+from mcookbook.data.archive import decimals
+from mcookbook.strategies import EMACross
+
+DAY = 86_400_000
+
+
+def _candles(pair: str, candles: int, seed: int = 1) -> pl.DataFrame:
+    # Exchange like prices and amounts, with a fixed number of decimals
+    return (
+        MarketGenerator(seed=seed)
+        .ohlcv(pair, candles=candles)
+        .with_columns(pl.col("open", "high", "low", "close").round(6), pl.col("volume").round(3))
+    )
+
+
+def test_archive_round_trip(tmp_path):
+    frame = _candles("AAA/USDT", 50_000)
+    assert decimals(frame, ["open", "high", "low", "close"]) == 6
+    assert decimals(frame, ["volume"]) == 3
+    store = CandleStore(tmp_path / "data", "synthetic")
+    archive = CandleArchive(tmp_path / "archive", "synthetic")
+    archive.save("AAA/USDT", "1m", frame.slice(0, 30_000))
+    # Merged with the already archived candles
+    archive.save("AAA/USDT", "1m", frame.slice(20_000))
+    assert_frame_equal(archive.load("AAA/USDT", "1m"), frame)
+    assert_frame_equal(
+        archive.load("AAA/USDT", "1m", start=100 * 60_000, end=200 * 60_000),
+        frame.slice(100, 100),
+    )
+    assert archive.pairs("1m") == ["AAA/USDT"]
+    stored = store.save("AAA/USDT", "1m", frame).stat().st_size
+    assert archive.nbytes * 3 < stored
+
+    # Without a fixed number of decimals, values are kept to the float precision
+    frame = MarketGenerator(seed=2).ohlcv("AAA/BTC", candles=1000)
+    archive.save("AAA/BTC", "1m", frame)
+    assert_frame_equal(archive.load("AAA/BTC", "1m"), frame, rel_tol=1e-12)
+
+
+def test_archive_retention(tmp_path):
+    frame = _candles("AAA/USDT", 10 * 1440)
+    store = CandleStore(tmp_path / "data", "synthetic")
+    store.save("AAA/USDT", "1m", frame)
+    archive = CandleArchive(tmp_path / "archive", "synthetic")
+    now = 10 * DAY
+
+    assert archive_candles(store, archive, now - 2 * DAY) == 8 * 1440
+    assert_frame_equal(pl.read_parquet(store.candles_path("AAA/USDT", "1m")), frame.slice(8 * 1440))
+    assert_frame_equal(archive.load("AAA/USDT", "1m"), frame.slice(0, 8 * 1440))
+    # Loading falls back to the archive for the older candles
+    assert_frame_equal(store.load("AAA/USDT", "1m"), frame)
+
+    config = ArchiveConfig.parse_obj(
+        {"retention": [{"age_days": 6, "timeframe": "1d"}, {"age_days": 3, "timeframe": "1h"}]}
+    )
+    rules = [(rule.age_days * DAY, rule.timeframe) for rule in config.retention]
+    assert apply_retention(archive, rules, now) == 7 * 1440 + 4 * 24
+    assert archive.timeframes() == ["1d", "1h", "1m"]
+    assert_frame_equal(archive.load("AAA/USDT", "1m"), frame.slice(7 * 1440, 1440))
+    assert_frame_equal(
+        archive.load("AAA/USDT", "1h"),
+        resample(frame.slice(4 * 1440, 3 * 1440), "1m", "1h"),
+    )
+    assert_frame_equal(
+        archive.load("AAA/USDT", "1d"), resample(frame.slice(0, 4 * 1440), "1m", "1d")
+    )
+
+    with pytest.raises(ValueError, match="can't be built"):
+        ArchiveConfig.parse_obj(
+            {"retention": [{"age_days": 6, "timeframe": "1h"}, {"age_days": 3, "timeframe": "1d"}]}
+        )
+
+
+def test_store_loads_archived_candles(tmp_path):
+    frame = _candles("AAA/USDT", 10 * 1440)
+    store = CandleStore(tmp_path / "data", "synthetic")
+    store.save("AAA/USDT", "1m", frame)
+    store.save("AAB/USDT", "1m", _candles("AAB/USDT", 1440, seed=2))
+    archive = CandleArchive(tmp_path / "archive", "synthetic")
+    now = 10 * DAY
+    archive_candles(store, archive, now - 2 * DAY)
+    apply_retention(archive, [(6 * DAY, "1h")], now)
+    assert archive.timeframes() == ["1h", "1m"]
+
+    # The 1m candles downsampled by the retention rules can only be loaded as 1h, or higher, ones
+    assert_frame_equal(store.load("AAA/USDT", "1m"), frame.slice(4 * 1440))
+    assert_frame_equal(store.load("AAA/USDT", "1h"), resample(frame, "1m", "1h"))
+    assert_frame_equal(
+        store.load("AAA/USDT", "4h", start=DAY + 1, end=3 * DAY),
+        resample(frame, "1m", "4h").slice(7, 12 - 1),
+    )
+    assert store.has_candles("AAA/USDT", "1h")
+    assert store.pairs("1h") == ["AAA/USDT", "AAB/USDT"]
+
+    # Only archived
+    assert not store.candles_path("AAB/USDT", "1m").exists()
+    assert store.has_candles("AAB/USDT", "1h")
+    assert not store.has_candles("AAC/USDT", "1h")
+    # The archive is found from the store path
+    assert store.archive.path == archive.path
+
+
+def test_scan_archived_gaps(tmp_path):
+    frame = _candles("AAA/USDT", 10 * 1440)
+    store = CandleStore(tmp_path / "data", "synthetic")
+    store.save(
+        "AAA/USDT", "1m", frame.filter(~pl.col("timestamp").is_between(DAY, DAY + 9 * 60_000))
+    )
+    archive = CandleArchive(tmp_path / "archive", "synthetic")
+    now = 10 * DAY
+    archive_candles(store, archive, now - 2 * DAY)
+    apply_retention(archive, [(6 * DAY, "1h")], now)
+
+    # The archived range is not missing, the one downsampled to 1h neither
+    assert scan_gaps(store, "1m", start=0, end=now).is_empty()
+    store.truncate("AAA/USDT", "1m", now)
+    archive.truncate("AAA/USDT", "1m", 5 * DAY)
+    gaps = scan_gaps(store, "1m", start=0, end=now)
+    assert gaps.select("start", "end").rows() == [(4 * DAY, 5 * DAY), (8 * DAY, now)]
+
+
+def test_backtest_archived_candles(tmp_path):
+    store = CandleStore(tmp_path / "data", "synthetic")
+    pairs = ["AAA/USDT", "AAB/USDT"]
+    for seed, pair in enumerate(pairs):
+        store.save(pair, "5m", resample(_candles(pair, 10 * 1440, seed=seed), "1m", "5m"))
+    strategy = EMACross(name="EMACross", fast=5, slow=20)
+    expected = Backtester(store, strategy, "5m", end=6 * DAY, workers=1).run(pairs)
+    assert expected.trades.height > 0
+
+    archive = CandleArchive(tmp_path / "archive", "synthetic")
+    assert archive_candles(store, archive, 8 * DAY) == 2 * 8 * 288
+    # Backtests the archived range, and the one spanning the archive and the store
+    for workers in (1, 2):
+        result = Backtester(store, strategy, "5m", end=6 * DAY, workers=workers).run(pairs)
+        assert_frame_equal(result.trades, expected.trades)
+        assert result.summary["candles"] == 2 * 6 * 288
+    result = Backtester(store, strategy, "5m", workers=1).run(pairs)
+    assert result.summary["candles"] == 2 * 10 * 288
+
+
+def test_archive_command(tmp_path):
+    # The data commands do not need a strategy configured
+    config = {
+        "exchange": {"name": "binance"},
+        "pairlists": [{"name": "StaticPairList"}],
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    store = CandleStore(tmp_path / "data", "binance")
+    store.save("AAA/USDT", "1m", _candles("AAA/USDT", 1440))
+    main(["--basedir", str(tmp_path), "archive", "--hot-days", "1"])
+    archive = CandleArchive(tmp_path / "archive", "binance")
+    assert archive.load("AAA/USDT", "1m").height == 1440
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from mcookbook.data import OHLCV_COLUMNS
+from mcookbook.data import TradeAggregator
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators.abc import Candle
+
+
+def _trades(count: int) -> list[tuple[int, float, float]]:
+    rng = random.Random(3)
+    timestamp = 1_000_000
+    price = 100.0
+    trades = []
+    for _ in range(count):
+        timestamp += rng.randint(0, 40)
+        price = round(price * (1 + rng.gauss(0, 0.001)), 4)
+        trades.append((timestamp, price, round(rng.uniform(0.01, 2), 4)))
+    return trades
+
+
+def _collect(aggregator: TradeAggregator) -> list[tuple[str, Candle]]:
+    bars: list[tuple[str, Candle]] = []
+    aggregator.subscribe(lambda pair, bar: bars.append((pair, bar)))
+    return bars
+
+
+def test_time_bars():
+    trades = _trades(5000)
+    aggregator = TradeAggregator("time", 0.5)
+    bars = _collect(aggregator)
+    for trade in trades:
+        aggregator.update("AAA/USDT", *trade)
+    aggregator.flush(trades[-1][0])
+    # The last bar is still open
+    assert aggregator.partial("AAA/USDT") is not None
+    aggregator.flush(trades[-1][0] - trades[-1][0] % 500 + 500)
+    assert aggregator.partial("AAA/USDT") is None
+
+    expected = (
+        pl.DataFrame(trades, schema=["timestamp", "price", "amount"], orient="row")
+        .group_by(pl.col("timestamp") // 500 * 500, maintain_order=True)
+        .agg(
+            open=pl.col("price").first(),
+            high=pl.col("price").max(),
+            low=pl.col("price").min(),
+            close=pl.col("price").last(),
+            volume=pl.col("amount").sum(),
+        )
+    )
+    assert {pair for pair, _ in bars} == {"AAA/USDT"}
+    assert_frame_equal(
+        pl.DataFrame([bar for _, bar in bars], schema=OHLCV_COLUMNS, orient="row"), expected
+    )
+
+
+@pytest.mark.parametrize(
+    "kind,size,measure",
+    [
+        ("tick", 50, lambda price, amount: 1),
+        ("volume", 40.0, lambda price, amount: amount),
+        ("dollar", 4000.0, lambda price, amount: price * amount),
+    ],
+)
+def test_threshold_bars(kind, size, measure):
+    trades = _trades(3000)
+    aggregator = TradeAggregator(kind, size)
+    bars = _collect(aggregator)
+    for trade in trades:
+        aggregator.update("AAA/USDT", *trade)
+    assert len(bars) > 20
+    # Replay the bars over the trades
+    index = 0
+    for _, bar in bars:
+        total = 0.0
+        start = index
+        while total < size:
+            total += measure(*trades[index][1:])
+            index += 1
+        chunk = trades[start:index]
+        assert bar.timestamp == chunk[0][0]
+        assert bar.open == chunk[0][1]
+        assert bar.close == chunk[-1][1]
+        assert bar.high == max(trade[1] for trade in chunk)
+        assert bar.low == min(trade[1] for trade in chunk)
+        assert bar.volume == pytest.approx(sum(trade[2] for trade in chunk))
+    if index < len(trades):
+        partial = aggregator.partial("AAA/USDT")
+        assert partial is not None
+        assert partial[:5] == (
+            trades[index][0],
+            trades[index][1],
+            max(trade[1] for trade in trades[index:]),
+            min(trade[1] for trade in trades[index:]),
+            trades[-1][1],
+        )
+        assert partial.volume == pytest.approx(sum(trade[2] for trade in trades[index:]))
+    else:
+        assert aggregator.partial("AAA/USDT") is None
+
+    with pytest.raises(OperationalException):
+        TradeAggregator("renko", 1)
+
+
+def test_fetch_trades():
+    class API:
+        def __init__(self) -> None:
+            self.trades = [
+                {"id": str(idx), "timestamp": 1000 * (idx // 2), "price": 1.0 + idx, "amount": 1.0}
+                for idx in range(10)
+            ]
+            self.calls: list[object] = []
+
+        async def fetch_trades(self, symbol, since=None, limit=None):
+            self.calls.append(since)
+            trades = [
+                trade for trade in self.trades if since is None or trade["timestamp"] >= since
+            ]
+            return trades[:limit]
+
+    api = API()
+    aggregator = TradeAggregator("tick", 3)
+    bars = _collect(aggregator)
+    assert asyncio.run(aggregator.fetch(api, "AAA/USDT", limit=5)) == 5
+    assert asyncio.run(aggregator.fetch(api, "AAA/USDT", limit=5)) == 4
+    assert asyncio.run(aggregator.fetch(api, "AAA/USDT", limit=5)) == 1
+    assert asyncio.run(aggregator.fetch(api, "AAA/USDT", limit=5)) == 0
+    assert api.calls == [None, 2000, 4000, 4000]
+    assert [bar.open for _, bar in bars] == [1.0, 4.0, 7.0]
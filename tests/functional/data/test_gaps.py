@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from typing import Optional
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from mcookbook.cli.__main__ import main
+from mcookbook.data import CandleStore
+from mcookbook.data import GAPS_SCHEMA
+from mcookbook.data import MarketGenerator
+from mcookbook.data import repair_gaps
+from mcookbook.data import scan_gaps
+from mcookbook.data.gaps import plan_requests
+
+MINUTE = 60_000
+
+
+class FakeAPI:
+    """
+    Serve the candles of ``frames``, like a ccxt exchange client.
+    """
+
+    def __init__(self, frames: dict[str, pl.DataFrame]) -> None:
+        self.frames = frames
+        self.calls: list[tuple[str, int]] = []
+
+    async def fetch_ohlcv(
+        self, symbol: str, timeframe: str, since: int, limit: Optional[int] = None
+    ) -> list[list[Any]]:
+        """
+        Return up to ``limit`` candles of ``symbol``, from ``since``.
+        """
+        self.calls.append((symbol, since))
+        frame = self.frames[symbol].filter(pl.col("timestamp") >= since)
+        if limit is not None:
+            frame = frame.head(limit)
+        return [list(row) for row in frame.rows()]
+
+
+def _gaps(rows: list[tuple[str, str, int, int, int]]) -> pl.DataFrame:
+    return pl.DataFrame(rows, schema=GAPS_SCHEMA, orient="row").sort("pair", "start")
+
+
+def test_scan_gaps(tmp_path):
+    generator = MarketGenerator(seed=4)
+    pairs = generator.symbols(3)
+    frame = generator.ohlcv(pairs[0], candles=100)
+    store = CandleStore(tmp_path, "synthetic")
+    store.save(pairs[0], "1m", frame)
+    store.save(
+        pairs[1], "1m", frame.filter(~pl.col("timestamp").is_between(10 * MINUTE, 14 * MINUTE))
+    )
+    # Saving drops the duplicated candles, so write them directly
+    pl.concat([frame, frame.slice(50, 1), frame.slice(50, 1)]).sort("timestamp").write_parquet(
+        store.candles_path(pairs[2], "1m")
+    )
+
+    assert_frame_equal(
+        scan_gaps(store, "1m", pairs),
+        _gaps(
+            [
+                (pairs[1], "missing", 10 * MINUTE, 15 * MINUTE, 5),
+                (pairs[2], "duplicate", 50 * MINUTE, 51 * MINUTE, 2),
+            ]
+        ),
+    )
+    # The candles missing at the edges of the range, and the pairs without candles
+    assert_frame_equal(
+        scan_gaps(store, "1m", [pairs[0], "XYZ/USDT"], start=-MINUTE // 2, end=110 * MINUTE),
+        _gaps(
+            [
+                (pairs[0], "missing", 100 * MINUTE, 110 * MINUTE, 10),
+                ("XYZ/USDT", "missing", 0, 110 * MINUTE, 110),
+            ]
+        ),
+    )
+    assert scan_gaps(store, "1m", ["XYZ/USDT"]).is_empty()
+
+
+def test_plan_requests():
+    gaps = _gaps(
+        [
+            ("A/USDT", "missing", 0, 2 * MINUTE, 2),
+            # Covered by the previous request
+            ("A/USDT", "missing", 5 * MINUTE, 6 * MINUTE, 1),
+            # Partly covered by the previous request
+            ("A/USDT", "missing", 9 * MINUTE, 25 * MINUTE, 16),
+            ("A/USDT", "duplicate", 30 * MINUTE, 31 * MINUTE, 1),
+            ("B/USDT", "missing", 5 * MINUTE, 6 * MINUTE, 1),
+        ]
+    )
+    assert plan_requests(gaps, "1m", 10) == [
+        ("A/USDT", 0, 10 * MINUTE),
+        ("A/USDT", 10 * MINUTE, 20 * MINUTE),
+        ("A/USDT", 20 * MINUTE, 30 * MINUTE),
+        ("B/USDT", 5 * MINUTE, 15 * MINUTE),
+    ]
+
+
+def test_repair_gaps(tmp_path):
+    generator = MarketGenerator(seed=5)
+    pairs = generator.symbols(4)
+    frames = dict(generator.iter_ohlcv(pairs, candles=3000))
+    store = CandleStore(tmp_path, "synthetic")
+    for pair, frame in frames.items():
+        store.save(pair, "1m", frame.sample(fraction=0.9, seed=1))
+    gaps = scan_gaps(store, "1m", pairs)
+    assert gaps["candles"].sum() == 1200
+
+    api = FakeAPI(frames)
+    filled = asyncio.run(repair_gaps(store, api, "1m", gaps, limit=1000, concurrency=2))
+    assert filled == {pair: 300 for pair in pairs}
+    assert len(api.calls) == len(plan_requests(gaps, "1m", 1000)) <= 4 * 3
+    assert scan_gaps(store, "1m", pairs).is_empty()
+    for pair, frame in frames.items():
+        assert_frame_equal(store.load(pair, "1m"), frame)
+
+
+def test_gaps_command(tmp_path, capsys):
+    # The data commands do not need a strategy configured
+    config = {
+        "exchange": {"name": "binance"},
+        "pairlists": [{"name": "StaticPairList"}],
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    generator = MarketGenerator(seed=4)
+    pair = generator.symbols(1)[0]
+    frame = generator.ohlcv(pair, candles=100)
+    store = CandleStore(tmp_path / "data", "binance")
+    store.save(pair, "1m", frame.filter(~pl.col("timestamp").is_between(10 * MINUTE, 14 * MINUTE)))
+    main(["--basedir", str(tmp_path), "gaps", "--timeframe", "1m"])
+    assert "Gaps in the stored 1m candles" in capsys.readouterr().err
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.data import resample
+from mcookbook.data import Resampler
+from mcookbook.exceptions import OperationalException
+from mcookbook.exchanges import Exchange
+from mcookbook.indicators.abc import Candle
+from mcookbook.replay import candle_events
+from mcookbook.replay import ReplayEngine
+
+# 2022-01-03, a Monday
+MONDAY = 1_641_168_000_000
+
+
+def test_resample_matches_incremental_updates():
+    frame = MarketGenerator(seed=2, gap_ratio=0.1).ohlcv(
+        "AAA/USDT", timeframe="1m", candles=2000, since=MONDAY + 7 * 60_000
+    )
+    resampler = Resampler("1m", ["5m", "1h"])
+    completed: dict[str, list[Candle]] = {"5m": [], "1h": []}
+    for row in frame.iter_rows():
+        for timeframe, candle in resampler.update("AAA/USDT", Candle(*row)):
+            completed[timeframe].append(candle)
+    for timeframe, first in (("5m", MONDAY + 5 * 60_000), ("1h", MONDAY)):
+        expected = resample(frame, "1m", timeframe)
+        # The first candle opens before the first base candle
+        assert expected["timestamp"][0] == first
+        assert_frame_equal(
+            pl.DataFrame(completed[timeframe], schema=frame.columns, orient="row"),
+            expected,
+        )
+        partial = resample(frame, "1m", timeframe, partial=True)
+        last = resampler.partial("AAA/USDT", timeframe)
+        if last is None:
+            assert partial.height == expected.height
+        else:
+            assert partial.height == expected.height + 1
+            assert partial.row(-1) == pytest.approx(tuple(last))
+
+    weekly = resample(frame, "1h", "1w", partial=True)
+    assert weekly["timestamp"].to_list() == [MONDAY]
+    with pytest.raises(OperationalException):
+        resample(frame, "1m", "1M")
+    with pytest.raises(OperationalException):
+        Resampler("5m", ["12m"])
+
+
+def test_store_resamples_missing_timeframes(tmp_path):
+    generator = MarketGenerator(seed=2)
+    store = CandleStore(tmp_path, "synthetic")
+    frame = generator.ohlcv("AAA/USDT", timeframe="1m", candles=1000, since=MONDAY)
+    store.save("AAA/USDT", "1m", frame)
+    store.save("AAA/USDT", "5m", resample(frame, "1m", "5m"))
+    store.save("AAB/USDT", "1m", generator.ohlcv("AAB/USDT", timeframe="1m", candles=10))
+
+    assert store.base_timeframe("AAA/USDT", "5m") is None
+    assert store.base_timeframe("AAA/USDT", "15m") == "5m"
+    assert store.base_timeframe("AAB/USDT", "15m") == "1m"
+    assert store.base_timeframe("AAA/USDT", "1M") is None
+    assert store.has_candles("AAA/USDT", "1h")
+    assert not store.has_candles("AAA/USDT", "1M")
+    assert store.pairs("15m") == ["AAA/USDT", "AAB/USDT"]
+    assert store.pairs("5m") == ["AAA/USDT", "AAB/USDT"]
+
+    start = MONDAY + 10 * 60_000
+    end = MONDAY + 500 * 60_000
+    loaded = store.load("AAA/USDT", "15m", start=start, end=end)
+    expected = resample(frame, "1m", "15m").filter(
+        pl.col("timestamp").is_between(start, end, closed="left")
+    )
+    assert loaded["timestamp"][0] == MONDAY + 15 * 60_000
+    assert_frame_equal(loaded, expected)
+
+
+def test_replay_resamples_lower_timeframe_candles(tmp_path):
+    generator = MarketGenerator(seed=5)
+    pairs = generator.symbols(2)
+    store = CandleStore(tmp_path, "synthetic")
+    for pair in pairs:
+        store.save(pair, "1m", generator.ohlcv(pair, timeframe="1m", candles=3000))
+    config = BacktestConfig.parse_obj(
+        {
+            "exchange": {"name": "binance", "pair_allow_list": pairs},
+            "pairlists": [{"name": "StaticPairList"}],
+            "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+        }
+    )
+
+    results = []
+    for timeframe in ("1m", "5m"):
+        exchange = Exchange.resolved(config)
+        exchange.set_markets(generator.markets(2))
+        engine = ReplayEngine(exchange, config.strategy, "5m")
+        results.append(asyncio.run(engine.run(candle_events(store, pairs, timeframe))))
+    incremental, vectorized = results
+    assert incremental.events == 6000
+    assert incremental.candles == vectorized.candles == 1200
+    assert vectorized.signals.height > 0
+    assert incremental.signals.equals(vectorized.signals)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from mcookbook.data import CandleWindow
+from mcookbook.data import CandleWindows
+from mcookbook.data import OHLCV_COLUMNS
+from mcookbook.data import RingBuffer
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators.abc import Candle
+
+
+def _candle(idx: int) -> Candle:
+    return Candle(idx * 60_000, idx + 1.0, idx + 2.0, float(idx), idx + 1.5, 10.0 * idx)
+
+
+def test_ring_buffer_wraps_around():
+    buffer = RingBuffer(3)
+    assert not len(buffer)
+    assert buffer.view().tolist() == []
+    with pytest.raises(IndexError):
+        buffer.last()
+    nbytes = buffer.nbytes
+    for value in range(1, 8):
+        buffer.append(value)
+        assert buffer.view().tolist() == list(range(max(1, value - 2), value + 1))
+        assert buffer.last() == value
+    assert len(buffer) == 3
+    assert buffer.nbytes == nbytes
+    buffer.replace_last(10)
+    assert buffer.view().tolist() == [5, 6, 10]
+    # The views are contiguous, zero-copy, slices of the buffer
+    assert buffer.view().contiguous
+    assert buffer.view().obj is buffer.view().obj
+    buffer.clear()
+    assert buffer.view().tolist() == []
+    with pytest.raises(OperationalException):
+        RingBuffer(0)
+
+
+def test_candle_window():
+    window = CandleWindow(5, columns=("ema",))
+    for idx in range(8):
+        window.append(_candle(idx), None if idx < 4 else idx * 2.0)
+    assert len(window) == 5
+    assert window.last() == _candle(7)
+    assert window.timestamp == 7 * 60_000
+    assert window.column("close").tolist() == [idx + 1.5 for idx in range(3, 8)]
+    window.replace_last(_candle(7)._replace(close=20.0), 1.0)
+    assert window.last().close == 20.0
+    frame = window.frame()
+    assert frame.columns == [*OHLCV_COLUMNS, "ema"]
+    assert frame["timestamp"].dtype == pl.Int64
+    assert frame["ema"].to_list() == [None, 8.0, 10.0, 12.0, 1.0]
+
+
+def test_candle_windows_frame():
+    windows = CandleWindows(3)
+    for idx in range(5):
+        windows.append("BTC/USDT", "1m", _candle(idx))
+        windows.append("ETH/USDT", "1m", _candle(idx + 100))
+    windows.append("ETH/USDT", "5m", _candle(0))
+    assert len(windows) == 3
+    rows = [("BTC/USDT", *_candle(idx)) for idx in range(2, 5)]
+    rows.extend(("ETH/USDT", *_candle(idx + 100)) for idx in range(2, 5))
+    expected = pl.DataFrame(
+        rows,
+        schema=["pair", *OHLCV_COLUMNS],
+        orient="row",
+    )
+    assert_frame_equal(windows.frame("1m"), expected)
+    assert_frame_equal(windows.frame("1m", ["ETH/USDT", "XRP/USDT"]), expected.slice(3))
+    windows.remove("ETH/USDT", "1m")
+    assert windows.get("ETH/USDT", "5m").last() == _candle(0)
+    windows.remove("ETH/USDT")
+    assert len(windows) == 1
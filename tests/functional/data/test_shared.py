@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+from polars.testing import assert_frame_equal
+
+from mcookbook.data import CandleWindows
+from mcookbook.data import LiveStateReader
+from mcookbook.data import LiveStateWriter
+from mcookbook.data import MarketGenerator
+from mcookbook.data.shared import ENVIRON_KEY
+from mcookbook.indicators.abc import Candle
+
+
+def test_publish_live_state(tmp_path):
+    generator = MarketGenerator(seed=7)
+    pairs = generator.symbols(6)
+    writer = LiveStateWriter(tmp_path / "live" / "binance")
+    reader = LiveStateReader(tmp_path / "live" / "binance")
+    assert reader.pairlist() == []
+    assert reader.tickers().is_empty()
+    assert reader.timeframes() == []
+    assert reader.updated("tickers") is None
+
+    writer.publish_pairlist(pairs)
+    tickers = generator.tickers(pairs)
+    writer.publish_tickers(tickers)
+    windows = CandleWindows(50)
+    for pair, frame in generator.iter_ohlcv(pairs, candles=80):
+        for row in frame.rows():
+            windows.append(pair, "1m", Candle(*row))
+    writer.publish_candles("1m", windows.frame("1m"))
+
+    assert reader.pairlist() == pairs
+    published = reader.tickers()
+    assert published["symbol"].to_list() == list(tickers)
+    assert published["last"].to_list() == [ticker["last"] for ticker in tickers.values()]
+    assert reader.timeframes() == ["1m"]
+    candles = reader.candles("1m")
+    assert_frame_equal(candles, windows.frame("1m"))
+    assert reader.updated("candles/1m") is not None
+
+    # Replacing the published state leaves the previously read one untouched
+    writer.publish_pairlist(pairs[:2])
+    assert reader.pairlist() == pairs[:2]
+    assert_frame_equal(candles, windows.frame("1m"))
+    with pytest.raises(FileNotFoundError):
+        reader.candles("5m")
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_reader_from_environ(tmp_path, monkeypatch):
+    monkeypatch.delenv(ENVIRON_KEY, raising=False)
+    with pytest.raises(RuntimeError, match=ENVIRON_KEY):
+        LiveStateReader.from_environ()
+    monkeypatch.setenv(ENVIRON_KEY, str(tmp_path))
+    assert LiveStateReader.from_environ().path == tmp_path
+    LiveStateWriter(tmp_path).publish_pairlist(["BTC/USDT"])
+    assert LiveStateReader.from_environ().pairlist() == ["BTC/USDT"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from mcookbook.data import MarketGenerator
+from mcookbook.data import OHLCV_COLUMNS
+from mcookbook.utils import expand_pairlist
+
+
+def test_markets():
+    generator = MarketGenerator(seed=3, inactive_ratio=0.2)
+    markets = generator.markets(3000)
+    assert len(markets) == 3000
+    assert list(markets)[:4] == ["AAA/USDT", "AAA/BUSD", "AAA/BTC", "AAB/USDT"]
+    inactive = sum(not market["active"] for market in markets.values())
+    assert 450 < inactive < 750
+    market = markets["ABC/BTC"]
+    assert market["base"] == "ABC"
+    assert market["quote"] == "BTC"
+    assert market["id"] == "ABCBTC"
+    assert expand_pairlist(["AB.*/BTC"], list(markets)) == [
+        f"AB{c}/BTC" for c in map(chr, range(65, 91))
+    ]
+
+
+def test_tickers_are_deterministic():
+    generator = MarketGenerator(seed=3)
+    tickers = generator.tickers(["AAA/USDT", "AAB/USDT"], timestamp=1_650_000_000_000)
+    ticker = tickers["AAB/USDT"]
+    assert ticker == generator.tickers(["AAB/USDT"], timestamp=1_650_000_000_000)["AAB/USDT"]
+    assert ticker["datetime"] == "2022-04-15T05:20:00.000Z"
+    assert ticker["low"] <= ticker["bid"] < ticker["ask"] <= ticker["high"]
+    assert ticker != MarketGenerator(seed=4).tickers(["AAB/USDT"], 0)["AAB/USDT"]
+
+
+def test_ohlcv():
+    generator = MarketGenerator(seed=3)
+    frame = generator.ohlcv("AAA/USDT", timeframe="5m", candles=100, since=1_000)
+    assert frame.columns == list(OHLCV_COLUMNS)
+    assert frame.height == 100
+    assert frame["timestamp"][0] == 0
+    assert frame["timestamp"].diff().drop_nulls().unique().to_list() == [300_000]
+    assert frame["open"][1:].to_list() == pytest.approx(frame["close"][:-1].to_list())
+    high_below_body = pl.col("high") < pl.max_horizontal("open", "close")
+    low_above_body = pl.col("low") > pl.min_horizontal("open", "close")
+    assert frame.filter(high_below_body | low_above_body).is_empty()
+    assert frame.equals(
+        generator.ohlcv(["ZZZ/BTC", "AAA/USDT"], timeframe="5m", candles=100)
+        .filter(pl.col("symbol") == "AAA/USDT")
+        .drop("symbol")
+    )
+
+
+def test_ohlcv_gaps():
+    generator = MarketGenerator(seed=3, gap_ratio=0.1)
+    per_symbol = dict(generator.iter_ohlcv(["AAA/USDT", "AAB/USDT"], candles=1000))
+    for frame in per_symbol.values():
+        assert 850 < frame.height < 950
+        assert (frame["timestamp"].diff() > 60_000).any()
+
+
+@pytest.mark.parametrize("kwargs", [{"gap_ratio": 1}, {"inactive_ratio": -0.1}])
+def test_invalid_ratios(kwargs):
+    with pytest.raises(ValueError):
+        MarketGenerator(**kwargs)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mcookbook.cli.__main__ import main
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.exceptions import OperationalException
+from mcookbook.hyperopt import ChoiceParameter
+from mcookbook.hyperopt import Dataset
+from mcookbook.hyperopt import Hyperopt
+from mcookbook.hyperopt import IntParameter
+from mcookbook.hyperopt import required_indicators
+from mcookbook.hyperopt import sample
+from mcookbook.hyperopt import Study
+from mcookbook.hyperopt.space import Parameter
+from mcookbook.strategies import EMACross
+
+SPACE: dict[str, Parameter] = {
+    "fast": IntParameter(low=3, high=15),
+    "slow": IntParameter(low=20, high=60, step=5),
+    "rsi_max": ChoiceParameter(choices=[60, 70, 80]),
+}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    store = CandleStore(tmp_path / "data", "synthetic")
+    generator = MarketGenerator(seed=3)
+    pairs = generator.symbols(4)
+    for pair in pairs:
+        store.save(pair, "5m", generator.ohlcv(pair, timeframe="5m", candles=3000))
+    return Dataset.load_or_build(tmp_path / "dataset", store, pairs, "5m")
+
+
+def _hyperopt(tmp_path, dataset, **kwargs):
+    study = Study.load_or_create(tmp_path / "study", {"space": "test"})
+    strategy = EMACross(name="EMACross")
+    return Hyperopt(study, dataset, strategy, SPACE, fee=0.001, **kwargs)
+
+
+def test_sample_is_deterministic_per_trial():
+    assert sample(SPACE, 1, 7) == sample(SPACE, 1, 7)
+    assert sample(SPACE, 1, 7) != sample(SPACE, 2, 7)
+    params = sample(SPACE, 0, 3)
+    assert 3 <= params["fast"] <= 15
+    assert params["slow"] % 5 == 0
+    assert params["rsi_max"] in (60, 70, 80)
+
+
+def test_dataset_precomputed_indicators(tmp_path, dataset):
+    store = CandleStore(tmp_path / "data", "synthetic")
+    strategy = EMACross(name="EMACross")
+    indicators = required_indicators(strategy, SPACE, 0, list(range(5)))
+    rebuilt = Dataset.load_or_build(
+        tmp_path / "dataset", store, dataset.pairs, "5m", indicators=indicators
+    )
+    assert "rsi_14" in rebuilt.columns
+    assert rebuilt.load(dataset.pairs[0]).columns == rebuilt.columns
+    assert rebuilt.candles == 12000
+    # Same inputs, nothing rebuilt
+    reloaded = Dataset.load_or_build(
+        tmp_path / "dataset", store, dataset.pairs, "5m", indicators=indicators
+    )
+    assert reloaded.index == rebuilt.index
+
+
+def test_workers_match_and_resume(tmp_path, dataset):
+    sequential = _hyperopt(tmp_path / "sequential", dataset, workers=1, pruning=False).run(6)
+    parallel = _hyperopt(tmp_path / "parallel", dataset, workers=2, pruning=False).run(6)
+    assert sequential.results().drop("rank").equals(parallel.results().drop("rank"))
+    assert len(sequential.trials) == 6
+
+    # Resuming only runs the missing trials
+    resumed = _hyperopt(tmp_path / "sequential", dataset, workers=1, pruning=False)
+    assert resumed.study.pending(8) == [6, 7]
+    assert len(resumed.run(8).trials) == 8
+
+    with pytest.raises(OperationalException):
+        Study.load_or_create(tmp_path / "sequential" / "study", {"space": "other"})
+
+
+def test_pruning(tmp_path, dataset):
+    study = _hyperopt(tmp_path, dataset, workers=1, pruning_warmup_trials=3, pruning_steps=4).run(
+        20
+    )
+    states = [trial.state for trial in study.trials.values()]
+    assert "pruned" in states
+    results = study.results()
+    assert results["state"][0] == "complete"
+    assert results["objective"][0] == study.best().objective
+
+
+def test_hyperopt_command(tmp_path):
+    config = {
+        "exchange": {"name": "binance", "pair_allow_list": ["AA[A-B]/USDT"]},
+        "pairlists": [{"name": "StaticPairList"}],
+        "strategy": {"name": "EMACross"},
+        "hyperopt": {"space": {"fast": {"low": 3, "high": 10}}},
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    argv = [
+        "--basedir",
+        str(tmp_path),
+        "hyperopt",
+        "--synthetic-markets",
+        "30",
+        "--start",
+        "2022-01-01",
+        "--end",
+        "2022-01-04",
+        "--workers",
+        "1",
+        "--trials",
+        "4",
+    ]
+    main(argv)
+    study_path = tmp_path / "hyperopt" / "EMACross-5m"
+    assert len(study_path.joinpath("trials.jsonl").read_text().splitlines()) == 4
+    main([*argv[:-1], "6"])
+    assert len(study_path.joinpath("trials.jsonl").read_text().splitlines()) == 6
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import polars as pl
+import pytest
+
+from mcookbook.data import MarketGenerator
+from mcookbook.indicators import EMA
+from mcookbook.indicators import IndicatorCache
+from mcookbook.indicators import RSI
+
+
+@pytest.fixture(scope="module")
+def ohlcv() -> pl.DataFrame:
+    return MarketGenerator(seed=7).ohlcv("AAA/USDT", timeframe="5m", candles=100)
+
+
+def test_computed_once_per_candle(ohlcv):
+    cache = IndicatorCache()
+    history = ohlcv.head(99)
+    with mock.patch.object(EMA, "compute", autospec=True, side_effect=EMA.compute) as compute:
+        first = cache.get("AAA/USDT", "5m", EMA(period=20), history)
+        second = cache.get("AAA/USDT", "5m", EMA(period=20), history)
+        assert compute.call_count == 1
+        assert second is first
+        assert first.columns == ["ema_20"]
+        assert first.height == 99
+        # Different parameters, timeframe or pair are different entries
+        cache.get("AAA/USDT", "5m", EMA(period=50), history)
+        cache.get("AAA/USDT", "1h", EMA(period=20), history)
+        cache.get("AAB/USDT", "5m", EMA(period=20), history)
+        assert compute.call_count == 4
+    assert cache.hits == 1
+    assert cache.misses == 4
+    assert len(cache) == 4
+
+
+def test_new_candle_invalidates(ohlcv):
+    cache = IndicatorCache()
+    cache.get("AAA/USDT", "5m", EMA(period=20), ohlcv.head(99))
+    cache.get("AAA/USDT", "5m", RSI(), ohlcv.head(99))
+    cache.get("AAA/USDT", "1h", RSI(), ohlcv.head(99))
+    assert len(cache) == 3
+    result = cache.get("AAA/USDT", "5m", EMA(period=20), ohlcv)
+    assert len(cache) == 2
+    assert result["ema_20"].to_list() == EMA(period=20).compute(ohlcv)["ema_20"].to_list()
+    assert cache.invalidate("AAA/USDT") == 2
+    assert len(cache) == 0
+
+
+def test_unsorted_candles(ohlcv):
+    cache = IndicatorCache()
+    expected = cache.get("AAA/USDT", "5m", EMA(period=20), ohlcv)
+    # Keyed on the newest candle, and computed over the sorted candles
+    shuffled = ohlcv.sample(fraction=1, shuffle=True, seed=1)
+    assert cache.get("AAA/USDT", "5m", EMA(period=20), shuffled) is expected
+    cache.clear()
+    assert cache.get("AAA/USDT", "5m", EMA(period=20), shuffled).equals(expected)
+
+
+def test_memory_budget(ohlcv):
+    entry_size = max(
+        EMA(period=period).compute(ohlcv).select(f"ema_{period}").estimated_size()
+        for period in range(1, 6)
+    )
+    cache = IndicatorCache(memory_budget=int(entry_size) * 3)
+    for period in range(1, 6):
+        cache.get("AAA/USDT", "5m", EMA(period=period), ohlcv)
+    assert len(cache) == 3
+    assert cache.memory_usage <= cache.memory_budget
+    # The least recently used entries were evicted
+    cache.get("AAA/USDT", "5m", EMA(period=1), ohlcv)
+    assert cache.misses == 6
+    # Too large results are still returned, just not cached
+    small = IndicatorCache(memory_budget=1)
+    assert small.get("AAA/USDT", "5m", EMA(period=1), ohlcv).height == 100
+    assert len(small) == 0
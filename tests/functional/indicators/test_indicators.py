@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import statistics
+
+import polars as pl
+import pytest
+
+from mcookbook.data import MarketGenerator
+from mcookbook.exceptions import OperationalException
+from mcookbook.indicators import ATR
+from mcookbook.indicators import BollingerBands
+from mcookbook.indicators import Candle
+from mcookbook.indicators import EMA
+from mcookbook.indicators import Indicator
+from mcookbook.indicators import IndicatorEngine
+from mcookbook.indicators import MACD
+from mcookbook.indicators import RSI
+from mcookbook.indicators import SMA
+from mcookbook.indicators import VWAP
+from mcookbook.indicators.trend import RollingWindow
+
+
+@pytest.fixture(scope="module")
+def ohlcv() -> pl.DataFrame:
+    return MarketGenerator(seed=7, volatility=0.01).ohlcv("AAA/USDT", timeframe="1h", candles=200)
+
+
+@pytest.mark.parametrize(
+    "indicator",
+    [
+        SMA(period=10),
+        SMA(period=5, source="volume"),
+        EMA(period=10),
+        RSI(period=14),
+        ATR(period=14),
+        BollingerBands(period=20, deviations=2.5),
+        MACD(fast=6, slow=13, signal=5),
+        VWAP(),
+        VWAP(anchor="1d"),
+    ],
+    ids=str,
+)
+def test_incremental_matches_vectorized(ohlcv, indicator):
+    vectorized = indicator.compute(ohlcv).select(indicator.columns).rows()
+    state = indicator.state()
+    for row, expected in zip(ohlcv.iter_rows(), vectorized):
+        state.update(Candle(*row))
+        values = state.values()
+        assert [value is None for value in values] == [value is None for value in expected]
+        assert [value for value in values if value is not None] == pytest.approx(
+            [value for value in expected if value is not None]
+        )
+    # Not warming up anymore
+    assert None not in vectorized[-1]
+
+
+def test_warmup(ohlcv):
+    frame = EMA(period=10).compute(ohlcv)
+    assert frame["ema_10"].null_count() == 9
+    frame = RSI(period=14).compute(ohlcv)
+    assert frame["rsi_14"].null_count() == 14
+    frame = MACD().compute(ohlcv)
+    assert frame.select(pl.all().null_count()).row(0)[-3:] == (25, 33, 33)
+
+
+def test_rsi_bounds(ohlcv):
+    rsi = RSI().compute(ohlcv)["rsi_14"].drop_nulls()
+    assert rsi.is_between(0, 100).all()
+    rising = pl.DataFrame({"close": [float(idx) for idx in range(20)]})
+    assert RSI().compute(rising)["rsi_14"][-1] == 100
+
+
+def test_engine(ohlcv):
+    indicators = [EMA(period=10), BollingerBands(), EMA(period=10)]
+    engine = IndicatorEngine(indicators)
+    assert engine.columns == ("ema_10", "bb_middle_20_2", "bb_upper_20_2", "bb_lower_20_2")
+    frame = engine.load("AAA/USDT", ohlcv.head(150))
+    assert frame.columns[-4:] == list(engine.columns)
+    expected = engine.compute(ohlcv)
+    for idx in range(150, 200):
+        latest = engine.update("AAA/USDT", Candle(*ohlcv.row(idx)))
+        assert list(latest.values()) == pytest.approx(
+            list(expected.select(engine.columns).row(idx))
+        )
+    # Stale candles are ignored
+    assert engine.update("AAA/USDT", Candle(*ohlcv.row(10))) == latest
+    assert engine.pairs == ["AAA/USDT"]
+    engine.remove("AAA/USDT")
+    assert engine.pairs == []
+
+
+def test_compute_sorts_by_timestamp(ohlcv):
+    shuffled = ohlcv.sample(fraction=1, shuffle=True, seed=1)
+    assert EMA(period=10).compute(shuffled).equals(EMA(period=10).compute(ohlcv))
+
+
+def test_engine_sorts_by_timestamp(ohlcv):
+    engine = IndicatorEngine([EMA(period=10), RSI(), BollingerBands()])
+    history = ohlcv.head(150)
+    frame = engine.load("AAA/USDT", history.sample(fraction=1, shuffle=True, seed=1))
+    assert frame.equals(engine.compute(history))
+    # The incremental states were warmed up in timestamp order, up to the newest candle
+    assert list(engine.latest("AAA/USDT").values()) == pytest.approx(
+        list(frame.select(engine.columns).row(-1))
+    )
+    latest = engine.update("AAA/USDT", Candle(*ohlcv.row(150)))
+    assert list(latest.values()) == pytest.approx(
+        list(engine.compute(ohlcv).select(engine.columns).row(150))
+    )
+
+
+def test_rolling_window_does_not_drift():
+    window = RollingWindow(20)
+    for idx in range(1000):
+        window.push(1e9 + idx * 1e3)
+    values = [float(idx) for idx in range(20)]
+    for value in values:
+        window.push(value)
+    assert window.mean == pytest.approx(statistics.fmean(values))
+    assert window.std == pytest.approx(statistics.pstdev(values))
+
+
+def test_resolved():
+    assert Indicator.resolved({"name": "ema", "period": 20}) == EMA(period=20)
+    assert hash(Indicator.resolved({"name": "macd"})) == hash(MACD())
+    with pytest.raises(OperationalException):
+        Indicator.resolved({"name": "unknown"})
+    with pytest.raises(ValueError):
+        Indicator.resolved({"period": 20})
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+
+from mcookbook.config.live import LiveConfig
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges.abc import Exchange
+from mcookbook.pairlist import diff_pairlists
+from mcookbook.pairlist import PairListDiff
+
+
+class SyntheticAPI:
+    """
+    Synthetic CCXT exchange API, serving in-memory markets.
+    """
+
+    def __init__(self, markets):
+        self.markets = markets
+
+    async def load_markets(self):
+        """
+        Return the synthetic markets.
+        """
+        return self.markets
+
+
+def test_diff_pairlists():
+    previous = ["BTC/USDT", "ETH/USDT", "XRP/USDT", "SOL/USDT"]
+    current = ["SOL/USDT", "ADA/USDT", "BTC/USDT", "DOT/USDT"]
+    diff = diff_pairlists(previous, current)
+    assert diff == PairListDiff(
+        added=["ADA/USDT", "DOT/USDT"],
+        removed=["ETH/USDT", "XRP/USDT"],
+        unchanged=["SOL/USDT", "BTC/USDT"],
+    )
+    assert diff.changed
+    assert not diff_pairlists(previous, list(reversed(previous))).changed
+    assert diff_pairlists([], previous).added == previous
+
+
+def test_refresh_pairlist_diff():
+    markets = MarketGenerator(seed=1).markets(50)
+    pairs = sorted(pair for pair in markets if pair.endswith("/USDT"))
+    config = LiveConfig.parse_obj(
+        {
+            "exchange": {"name": "binance", "pair_allow_list": pairs[:10]},
+            "pairlists": [{"name": "StaticPairList"}],
+        }
+    )
+    exchange = Exchange.resolved(config)
+    exchange.set_api(SyntheticAPI(markets))
+    manager = exchange.pairlist_manager
+
+    async def _refresh(allow_list):
+        exchange.config.exchange.pair_allow_list[:] = allow_list
+        return await manager.refresh_pairlist()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(exchange.get_markets())
+        diff = loop.run_until_complete(manager.refresh_pairlist())
+        assert diff == PairListDiff(added=pairs[:10], removed=[], unchanged=[])
+        # Rotate two pairs
+        diff = loop.run_until_complete(_refresh(pairs[2:12]))
+        assert diff == PairListDiff(added=pairs[10:12], removed=pairs[:2], unchanged=pairs[2:10])
+        assert manager.pairlist == pairs[2:12]
+        assert not loop.run_until_complete(_refresh(pairs[2:12])).changed
+    finally:
+        loop.close()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import ccxt
+import polars as pl
+import pytest
+
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges import Exchange
+from mcookbook.indicators.abc import Candle
+from mcookbook.paper import MatchingEngine
+from mcookbook.paper import PaperTradingAPI
+from mcookbook.replay import candle_events
+from mcookbook.replay import ReplayAPI
+from mcookbook.replay import ReplayEngine
+
+SYMBOL = "AAA/USDT"
+
+
+def _market(**overrides):
+    market = {
+        "symbol": SYMBOL,
+        "base": "AAA",
+        "quote": "USDT",
+        "maker": 0.001,
+        "taker": 0.002,
+        "precision": {"amount": 0.01, "price": 0.1},
+        "limits": {
+            "amount": {"min": 0.01, "max": 1000},
+            "price": {"min": 0.1, "max": None},
+            "cost": {"min": 5.0, "max": None},
+        },
+    }
+    market.update(overrides)
+    return market
+
+
+def _engine(balances=None) -> MatchingEngine:
+    engine = MatchingEngine({SYMBOL: _market()}, balances or {"USDT": 1000.0, "AAA": 10.0})
+    engine.on_book(SYMBOL, [[99.9, 2.0], [99.8, 5.0]], [[100.0, 1.0], [100.1, 3.0]], 1000)
+    return engine
+
+
+def test_market_order_sweeps_the_depth():
+    engine = _engine()
+    order = engine.submit(SYMBOL, "market", "buy", 2.509, timestamp=2000)
+    assert order.status == "closed"
+    # Truncated to the amount precision
+    assert order.amount == 2.5
+    assert [(fill.price, fill.amount) for fill in engine.fills] == [(100.0, 1.0), (100.1, 1.5)]
+    cost = 100.0 + 100.1 * 1.5
+    assert order.cost == pytest.approx(cost)
+    assert order.fee == pytest.approx(cost * 0.002)
+    assert engine.balance("USDT") == pytest.approx((1000 - cost * 1.002, 0.0))
+    assert engine.balance("AAA") == pytest.approx((12.5, 0.0))
+    # The taken liquidity is gone until the next order book snapshot
+    engine.submit(SYMBOL, "market", "buy", 1.0, timestamp=2000)
+    assert engine.fills[-1].price == 100.1
+
+    with pytest.raises(ccxt.InsufficientFunds):
+        engine.submit(SYMBOL, "market", "sell", 100.0)
+    with pytest.raises(ccxt.InvalidOrder):
+        # Below the minimum cost
+        engine.submit(SYMBOL, "market", "sell", 0.01)
+
+
+def test_limit_order_queue_position():
+    engine = _engine()
+    order = engine.submit(SYMBOL, "limit", "buy", 1.0, price=99.94, timestamp=2000)
+    assert order.price == 99.9
+    assert order.queue == 2.0
+    assert engine.balance("USDT") == pytest.approx((1000 - 99.9 * 1.002, 99.9 * 1.002))
+    # Some of the volume ahead was cancelled
+    engine.on_book(SYMBOL, [[99.9, 1.5]], [[100.0, 1.0]], 3000)
+    assert order.queue == 1.5
+    # Trades first consume the volume ahead
+    engine.on_trade(SYMBOL, 99.9, 1.0, 4000)
+    assert order.queue == 0.5
+    assert order.filled == 0
+    engine.on_trade(SYMBOL, 99.9, 0.75, 5000)
+    assert order.filled == 0.25
+    assert engine.fills[-1].taker is False
+    assert engine.fills[-1].fee == pytest.approx(99.9 * 0.25 * 0.001)
+    # The market trading through the order price fills the rest
+    engine.on_candle(SYMBOL, Candle(6000, 100.0, 100.2, 99.8, 100.1, 50.0))
+    assert order.status == "closed"
+    assert order.filled == 1.0
+    assert engine.balance("USDT")[1] == pytest.approx(0.0)
+    assert engine.balance("AAA") == pytest.approx((11.0, 0.0))
+    assert not engine.open_orders()
+
+
+def test_limit_orders_take_the_crossed_liquidity_and_cancel():
+    engine = _engine()
+    order = engine.submit(SYMBOL, "limit", "sell", 5.0, price=99.86, timestamp=2000)
+    # Sells to the bids at or above the limit price, as taker, then rests the remaining amount
+    assert [(fill.price, fill.amount, fill.taker) for fill in engine.fills] == [(99.9, 2.0, True)]
+    assert order.status == "open"
+    assert order.price == 99.9
+    assert engine.balance("AAA") == (5.0, 3.0)
+    engine.cancel(order.id)
+    assert order.status == "canceled"
+    assert engine.balance("AAA") == (8.0, 0.0)
+    with pytest.raises(ccxt.OrderNotFound):
+        engine.cancel(order.id)
+
+
+def test_paper_trading_api_and_replay(tmp_path):
+    generator = MarketGenerator(seed=3)
+    pairs = generator.symbols(3)
+    config = BacktestConfig.parse_obj(
+        {
+            "exchange": {"name": "binance", "pair_allow_list": pairs, "dry_run": True},
+            "pairlists": [{"name": "StaticPairList"}],
+            "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+        }
+    )
+    assert isinstance(Exchange.resolved(config).api, PaperTradingAPI)
+
+    replay_api = ReplayAPI(generator.markets(3))
+    ticker = generator.tickers([pairs[0]], timestamp=0)[pairs[0]]
+    replay_api.tickers[pairs[0]] = ticker
+    api = PaperTradingAPI(replay_api, {"USDT": 1000.0})
+    asyncio.run(api.fetch_tickers())
+    order = asyncio.run(api.create_order(pairs[0], "market", "buy", 100 / ticker["ask"]))
+    assert order["status"] == "closed"
+    assert order["average"] == ticker["ask"]
+    assert order["fee"]["currency"] == "USDT"
+    balance = asyncio.run(api.fetch_balance())
+    assert balance["USDT"]["total"] == pytest.approx(1000 - 100 * 1.001)
+    assert asyncio.run(api.fetch_my_trades())[0]["takerOrMaker"] == "taker"
+
+    store = CandleStore(tmp_path, "synthetic")
+    for pair in pairs:
+        store.save(pair, "5m", generator.ohlcv(pair, timeframe="5m", candles=1000))
+    exchange = Exchange.resolved(config)
+    exchange.set_markets(generator.markets(3))
+    engine = ReplayEngine(exchange, config.strategy, "5m", stake_amount=100.0)
+    result = asyncio.run(engine.run(candle_events(store, pairs, "5m")))
+    fills = result.fills
+    assert fills.height > 0
+    assert set(fills["side"]) == {"buy", "sell"}
+    assert fills["taker"].all()
+    # Every entry is filled at the signal candle close
+    entries = result.signals.filter("entry").select("timestamp", "pair")
+    buys = fills.filter(side="buy").select("timestamp", pair="symbol")
+    assert buys.join(entries, on=["timestamp", "pair"], how="anti").is_empty()
+    # The wallet only holds USDT, the entries of the other pairs are rejected
+    rejected = result.signals.filter(
+        "entry", ~pl.col("exit"), ~pl.col("pair").str.ends_with("/USDT")
+    )
+    assert result.rejected == rejected.height > 0
+
+
+def test_replay_counts_rejected_orders(tmp_path, caplog):
+    generator = MarketGenerator(seed=3)
+    pairs = generator.symbols(3)
+    config = BacktestConfig.parse_obj(
+        {
+            "exchange": {
+                "name": "binance",
+                "pair_allow_list": pairs,
+                "dry_run_wallet": {"USDT": 50.0},
+            },
+            "pairlists": [{"name": "StaticPairList"}],
+            "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+        }
+    )
+    store = CandleStore(tmp_path, "synthetic")
+    for pair in pairs:
+        store.save(pair, "5m", generator.ohlcv(pair, timeframe="5m", candles=1000))
+    exchange = Exchange.resolved(config)
+    exchange.set_markets(generator.markets(3))
+    # The stake is over the wallet balance, every entry is rejected
+    engine = ReplayEngine(exchange, config.strategy, "5m", stake_amount=100.0)
+    with caplog.at_level(logging.WARNING, logger="mcookbook.replay.engine"):
+        result = asyncio.run(engine.run(candle_events(store, pairs, "5m")))
+    assert result.fills.is_empty()
+    entries = result.signals.filter("entry", ~pl.col("exit")).height
+    assert entries > 0
+    assert result.rejected == entries
+    warnings = [record for record in caplog.records if record.name == "mcookbook.replay.engine"]
+    assert len(warnings) == entries
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import polars as pl
+
+from mcookbook.backtesting import populate_signals
+from mcookbook.cli.__main__ import main
+from mcookbook.config.backtest import BacktestConfig
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.exchanges import Exchange
+from mcookbook.indicators.abc import Candle
+from mcookbook.replay import BookEvent
+from mcookbook.replay import candle_events
+from mcookbook.replay import CandleEvent
+from mcookbook.replay import Event
+from mcookbook.replay import merge_events
+from mcookbook.replay import read_events
+from mcookbook.replay import ReplayEngine
+from mcookbook.replay import TickersEvent
+from mcookbook.replay import write_events
+from mcookbook.utils.clock import get_clock
+from mcookbook.utils.clock import SystemClock
+
+
+def _config(pairs: list[str]) -> BacktestConfig:
+    return BacktestConfig.parse_obj(
+        {
+            "exchange": {"name": "binance", "pair_allow_list": pairs},
+            "pairlists": [{"name": "StaticPairList"}],
+            "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+        }
+    )
+
+
+def test_replay_matches_backtest(tmp_path):
+    generator = MarketGenerator(seed=6)
+    pairs = generator.symbols(4)
+    store = CandleStore(tmp_path, "synthetic")
+    for pair in pairs:
+        store.save(pair, "5m", generator.ohlcv(pair, timeframe="5m", candles=2000))
+    # Only the first three pairs are in the pair list
+    config = _config(pairs[:3])
+    exchange = Exchange.resolved(config)
+    exchange.set_markets(generator.markets(12))
+    engine = ReplayEngine(exchange, config.strategy, "5m")
+    result = asyncio.run(engine.run(candle_events(store, pairs, "5m")))
+
+    assert isinstance(get_clock(), SystemClock)
+    assert result.events == result.candles == 8000
+    assert result.latencies.len() == 2000
+    expected = (
+        pl.concat(
+            [
+                populate_signals(config.strategy, store.load(pair, "5m")).select(
+                    "timestamp", pair=pl.lit(pair), entry="entry", exit="exit"
+                )
+                for pair in pairs[:3]
+            ]
+        )
+        .filter(pl.col("entry") | pl.col("exit"))
+        .sort("timestamp", "pair")
+    )
+    assert expected.height > 0
+    assert result.signals.sort("timestamp", "pair").equals(expected)
+
+
+def test_recorded_events(tmp_path):
+    candle = Candle(0, 1.0, 2.0, 0.5, 1.5, 10.0)
+    events: list[Event] = [
+        CandleEvent(60_000, "AAA/USDT", "1m", candle),
+        TickersEvent(30_000, {"AAA/USDT": {"symbol": "AAA/USDT", "last": 1.2}}),
+        BookEvent(90_000, "AAA/USDT", [[1.4, 2.0]], [[1.6, 1.0]]),
+    ]
+    path = tmp_path / "events.jsonl"
+    assert write_events(path, sorted(events)) == 3
+    assert list(read_events(path)) == sorted(events)
+    merged = list(merge_events([events[0], events[2]], [events[1]]))
+    assert [event.timestamp for event in merged] == [30_000, 60_000, 90_000]
+
+    config = _config(["AAA/USDT"])
+    exchange = Exchange.resolved(config)
+    exchange.set_markets(MarketGenerator().markets(3))
+    engine = ReplayEngine(exchange, config.strategy, "1m")
+    result = asyncio.run(engine.run(merged))
+    assert result.events == 3
+    assert result.candles == 1
+    book = asyncio.run(engine.api.fetch_order_book("AAA/USDT"))
+    assert book["bids"] == [[1.4, 2.0]]
+    assert asyncio.run(engine.api.fetch_tickers())["AAA/USDT"]["last"] == 1.2
+
+
+def test_replay_command(tmp_path):
+    config = {
+        "exchange": {"name": "binance", "pair_allow_list": ["AA[A-C]/USDT"]},
+        "pairlists": [{"name": "StaticPairList"}],
+        "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    export = tmp_path / "signals.csv"
+    main(
+        [
+            "--basedir",
+            str(tmp_path),
+            "replay",
+            "--synthetic-markets",
+            "30",
+            "--start",
+            "2022-01-01",
+            "--end",
+            "2022-01-03",
+            "--export",
+            str(export),
+        ]
+    )
+    signals = pl.read_csv(export)
+    assert set(signals["pair"]) == {"AAA/USDT", "AAB/USDT", "AAC/USDT"}
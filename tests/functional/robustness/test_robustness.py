@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from mcookbook.config.hyperopt import HyperoptConfig
+from mcookbook.data import CandleStore
+from mcookbook.data import MarketGenerator
+from mcookbook.robustness import distribution
+from mcookbook.robustness import monte_carlo
+from mcookbook.robustness import split_windows
+from mcookbook.robustness import WalkForward
+from mcookbook.strategies import EMACross
+
+DAY_MS = 86_400_000
+PROFITS = [0.05, -0.02, 0.03, -0.04, 0.01, 0.02, -0.01, 0.04, -0.03, 0.02]
+
+
+def test_split_windows():
+    windows = split_windows(0, 10 * DAY_MS, 4 * DAY_MS, 2 * DAY_MS)
+    assert [(w.train_start, w.test_start, w.test_end) for w in windows] == [
+        (0, 4 * DAY_MS, 6 * DAY_MS),
+        (2 * DAY_MS, 6 * DAY_MS, 8 * DAY_MS),
+        (4 * DAY_MS, 8 * DAY_MS, 10 * DAY_MS),
+    ]
+    anchored = split_windows(0, 10 * DAY_MS, 4 * DAY_MS, 2 * DAY_MS, anchored=True)
+    assert {window.train_start for window in anchored} == {0}
+    assert split_windows(0, 5 * DAY_MS, 4 * DAY_MS, 2 * DAY_MS) == []
+
+
+def test_monte_carlo_shuffle():
+    simulations = monte_carlo(PROFITS, simulations=500, method="shuffle", seed=1)
+    assert simulations.height == 500
+    assert simulations["profit_total"].to_list() == pytest.approx([sum(PROFITS)] * 500)
+    assert (simulations["max_drawdown"] >= 0).all()
+    assert simulations["max_drawdown"].n_unique() > 1
+
+
+def test_monte_carlo_bootstrap_batches():
+    simulations = monte_carlo(PROFITS, simulations=300, seed=2)
+    assert simulations["profit_total"].n_unique() > 1
+    # Batching doesn't change the results
+    batched = monte_carlo(PROFITS, simulations=300, seed=2, batch_rows=70)
+    assert batched.equals(simulations)
+    assert not monte_carlo(PROFITS, simulations=300, seed=3).equals(simulations)
+    quantiles = distribution(simulations, quantiles=(0.05, 0.5, 0.95))
+    assert quantiles["profit_total"].is_sorted()
+    assert monte_carlo([], simulations=10).is_empty()
+    with pytest.raises(ValueError):
+        monte_carlo(PROFITS, method="unknown")
+
+
+def test_walk_forward_workers_match(tmp_path):
+    store = CandleStore(tmp_path / "data", "synthetic")
+    generator = MarketGenerator(seed=4)
+    pairs = generator.symbols(2)
+    for pair in pairs:
+        store.save(pair, "1h", generator.ohlcv(pair, timeframe="1h", candles=24 * 40))
+    windows = split_windows(0, 40 * DAY_MS, 20 * DAY_MS, 10 * DAY_MS)
+    hyperopt = HyperoptConfig.parse_obj(
+        {"space": {"fast": {"low": 3, "high": 10}, "slow": {"low": 15, "high": 30}}, "trials": 4}
+    )
+    strategy = EMACross(name="EMACross")
+    sequential = WalkForward(
+        tmp_path / "sequential", store, strategy, "1h", hyperopt, workers=1
+    ).run(windows, pairs)
+    parallel = WalkForward(tmp_path / "parallel", store, strategy, "1h", hyperopt, workers=2).run(
+        windows, pairs
+    )
+    assert sequential.windows.height == 2
+    assert sequential.windows.equals(parallel.windows)
+    assert sequential.trades.equals(parallel.trades)
+    # Out-of-sample trades only
+    assert sequential.trades.height > 0
+    assert (sequential.trades["entry_timestamp"] >= 20 * DAY_MS).all()
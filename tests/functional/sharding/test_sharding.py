@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import math
+import queue
+import time
+from typing import Any
+
+import pytest
+
+from mcookbook.exceptions import OperationalException
+from mcookbook.sharding import PairEvaluator
+from mcookbook.sharding import partition_pairs
+from mcookbook.sharding import ShardPool
+from mcookbook.sharding import SharedTickerTable
+from mcookbook.sharding import TickerRow
+from mcookbook.sharding import worker
+from mcookbook.sharding.pool import partition_of
+
+
+class SpreadEvaluator(PairEvaluator):
+    """
+    Evaluate each pair's bid/ask spread.
+    """
+
+    def evaluate(self, pair: str, ticker: TickerRow) -> Any:
+        """
+        Return the pair's spread.
+        """
+        return ticker.ask - ticker.bid
+
+
+def test_partition_pairs_is_stable():
+    pairs = [f"PAIR{idx}/USDT" for idx in range(300)]
+    partitions = partition_pairs(pairs, 4)
+    assert sorted(pair for partition in partitions for pair in partition) == sorted(pairs)
+    # Removing pairs does not move the remaining ones to other partitions
+    smaller = partition_pairs(pairs[5:], 4)
+    for before, after in zip(partitions, smaller):
+        assert [pair for pair in before if pair in pairs[5:]] == after
+
+
+def test_shared_ticker_table():
+    table = SharedTickerTable.create(2)
+    try:
+        other = SharedTickerTable.attach(table.name, 2)
+        try:
+            assert all(math.isnan(value) for value in other.read(0))
+            table.write(0, {"timestamp": 1, "bid": 10.0, "ask": 10.5, "last": None})
+            row = other.read(0)
+            assert row.timestamp == 1
+            assert row.ask - row.bid == 0.5
+            assert math.isnan(row.last)
+            table.clear(0)
+            assert math.isnan(other.read(0).bid)
+        finally:
+            other.close()
+    finally:
+        table.close()
+
+
+@pytest.mark.parametrize("assign_first", [False, True])
+def test_shard_pool(assign_first):
+    pool = ShardPool(workers=2, capacity=8, evaluator=f"{__name__}:SpreadEvaluator")
+    pairs = ["BTC/USDT", "ETH/USDT", "XRP/USDT"]
+    if assign_first:
+        # The workers get the pairs assigned before they were started
+        pool.assign(pairs)
+    pool.start()
+    try:
+        if not assign_first:
+            pool.assign(pairs)
+        pool.update({pair: {"bid": idx, "ask": idx * 2} for idx, pair in enumerate(pairs, 1)})
+        results: dict[str, Any] = {}
+        timeout = time.time() + 30
+        while len(results) < len(pairs) and time.time() < timeout:
+            for _, pair, result in pool.results():
+                results[pair] = result
+            time.sleep(0.05)
+        assert results == {"BTC/USDT": 1, "ETH/USDT": 2, "XRP/USDT": 3}
+        assert pool.alive()
+    finally:
+        pool.close()
+
+
+def test_shard_pool_capacity():
+    pool = ShardPool(workers=1, capacity=1)
+    try:
+        with pytest.raises(OperationalException, match="capacity"):
+            pool.assign(["BTC/USDT", "ETH/USDT"])
+    finally:
+        pool.close()
+
+
+def test_shard_pool_assign_changes():
+    pool = ShardPool(workers=4, capacity=16)
+    try:
+        pool._controls = [queue.Queue() for _ in range(pool.workers)]
+        pairs = [f"PAIR{idx}/USDT" for idx in range(12)]
+        pool.assign(pairs)
+        assert all(control.qsize() == 1 for control in pool._controls)
+        for control in pool._controls:
+            control.get_nowait()
+        slots = dict(pool._slots)
+
+        # Only the partitions of the rotated pairs are notified, and the kept pairs keep their slot
+        rotated = pairs[1:] + ["PAIR12/USDT"]
+        pool.assign(rotated)
+        changed = {partition_of(pair, pool.workers) for pair in ("PAIR0/USDT", "PAIR12/USDT")}
+        notified = {
+            worker_id for worker_id, control in enumerate(pool._controls) if not control.empty()
+        }
+        assert notified == changed
+        for worker_id in notified:
+            kind, payload = pool._controls[worker_id].get_nowait()
+            assert kind == worker.ASSIGN
+            assert list(payload) == partition_pairs(rotated, pool.workers)[worker_id]
+        assert all(pool._slots[pair] == slots[pair] for pair in pairs[1:])
+
+        pool.assign(list(reversed(rotated)))
+        assert all(control.empty() for control in pool._controls)
+    finally:
+        pool.close()
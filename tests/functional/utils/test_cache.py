@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+from typing import Callable
+from typing import cast
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars.testing import assert_series_equal
+
+from mcookbook.data import MarketGenerator
+from mcookbook.utils.cache import DiskCache
+from mcookbook.utils.cache import frame_digest
+
+
+def _memoized_returns(cache: DiskCache, calls: list[Any]) -> Callable[..., pl.DataFrame]:
+    # The same function, hence the same stored results, for every cache instance
+    @cache.memoize
+    def returns(candles: pl.DataFrame, periods: int = 1) -> pl.DataFrame:
+        calls.append(periods)
+        return candles.select(pl.col("close").pct_change(periods).alias("returns"))
+
+    return returns
+
+
+def test_memoize(tmp_path):
+    cache = DiskCache(tmp_path)
+    calls: list[Any] = []
+    returns = _memoized_returns(cache, calls)
+
+    @cache.memoize
+    def last_close(candles: pl.Series, pairs: list[str]) -> dict[str, float]:
+        calls.append(pairs)
+        return {pair: candles[-1] for pair in pairs}
+
+    candles = MarketGenerator(seed=1).ohlcv("AAA/USDT", candles=1000)
+    expected = cast(Any, returns).__wrapped__(candles)
+    assert_frame_equal(returns(candles), expected)
+    assert_frame_equal(returns(candles, 1), expected)
+    assert_frame_equal(returns(candles.clone(), periods=1), expected)
+    assert calls == [1, 1]
+    assert (cache.hits, cache.misses) == (2, 1)
+    # Another argument, or another content, is another result
+    returns(candles, periods=2)
+    returns(candles.with_columns(pl.col("close") * 2))
+    assert calls == [1, 1, 2, 1]
+    assert last_close(candles["close"], ["AAA/USDT"]) == {"AAA/USDT": candles["close"][-1]}
+    assert last_close(candles["close"], ["AAA/USDT"]) == {"AAA/USDT": candles["close"][-1]}
+    assert len(calls) == 5
+
+    # A new cache instance, like after a kernel restart, finds the stored results
+    cache = DiskCache(tmp_path)
+    returns = _memoized_returns(cache, calls)
+
+    assert_frame_equal(returns(candles), expected)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    @cache.memoize
+    def series(candles: pl.DataFrame) -> pl.Series:
+        return candles["close"]
+
+    assert_series_equal(series(candles), candles["close"])
+    assert_series_equal(series(candles), candles["close"])
+    assert cache.hits == 2
+
+    with pytest.raises(TypeError, match="cache key"):
+        returns(candles.lazy())
+
+
+def test_frame_digest():
+    frame = MarketGenerator(seed=1).ohlcv("AAA/USDT", candles=100)
+    assert frame_digest(frame) == frame_digest(frame.clone())
+    assert frame_digest(frame) != frame_digest(frame.reverse())
+    assert frame_digest(frame) != frame_digest(frame.cast({"volume": pl.Float32}))
+    assert frame_digest(frame.head(0)) != frame_digest(frame.head(0).drop("volume"))
+    assert frame_digest(frame["close"]) == frame_digest(frame.select("close"))
+
+
+def test_lru_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=2**40)
+    frame = MarketGenerator(seed=1).ohlcv("AAA/USDT", candles=1000)
+    paths = [cache.put("frames", str(idx), frame) for idx in range(4)]
+    for idx, path in enumerate(paths):
+        os.utime(path, (idx, idx))
+    # Reading a result makes it the most recently used
+    found, value = cache.get("frames", "0")
+    assert found
+    assert_frame_equal(value, frame)
+    cache.max_bytes = cache.nbytes - 1
+    assert cache.evict() == 1
+    assert sorted(path.stem for path, _, _ in cache.entries()) == ["0", "2", "3"]
+    assert cache.get("frames", "1") == (False, None)
+    cache.clear("frames")
+    assert not cache.entries()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from mcookbook.utils.clock import get_clock
+from mcookbook.utils.clock import set_clock
+from mcookbook.utils.clock import SystemClock
+from mcookbook.utils.clock import VirtualClock
+from mcookbook.utils.logs import LogRecord
+from mcookbook.utils.logs import TTLFilter
+
+
+@pytest.fixture
+def virtual_clock():
+    clock = VirtualClock(start=1_000_000)
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def test_default_clock():
+    assert isinstance(get_clock(), SystemClock)
+
+
+def test_advance_wakes_sleepers():
+    clock = VirtualClock(start=100)
+    woken: list[str] = []
+
+    async def _sleeper(name: str, seconds: float) -> None:
+        await clock.sleep(seconds)
+        woken.append(name)
+
+    async def _main() -> None:
+        tasks = [
+            asyncio.create_task(_sleeper("short", 10)),
+            asyncio.create_task(_sleeper("long", 60)),
+        ]
+        await asyncio.sleep(0)
+        assert clock.sleepers == 2
+        clock.advance(30)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert woken == ["short"]
+        clock.advance(30)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_main())
+    assert woken == ["short", "long"]
+    assert clock.time() == 160
+    assert clock.now().year == 1970
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+
+def test_accelerated_clock():
+    clock = VirtualClock(speed=1000)
+
+    async def _main() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await clock.sleep(60)
+        return loop.time() - start
+
+    # A simulated minute takes 60 milliseconds
+    assert asyncio.run(_main()) < 1
+    assert clock.time() >= 60
+
+
+def test_log_throttling_follows_the_clock(virtual_clock):
+    log_filter = TTLFilter()
+
+    def _record() -> LogRecord:
+        record = LogRecord("mcookbook", logging.INFO, __file__, 1, "Message", (), None)
+        record.once_every_secs = 60
+        return record
+
+    assert log_filter.filter(_record())
+    assert not log_filter.filter(_record())
+    virtual_clock.advance(59)
+    assert not log_filter.filter(_record())
+    virtual_clock.advance(2)
+    assert log_filter.filter(_record())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mcookbook.config.event_loop import EventLoopConfig
+from mcookbook.utils import eventloop
+
+
+def test_resolve_auto_backend():
+    expected = "uvloop" if eventloop.HAS_UVLOOP else "asyncio"
+    assert eventloop.resolve_backend("auto") == expected
+
+
+def test_resolve_uvloop_backend_fallback(monkeypatch):
+    monkeypatch.setattr(eventloop, "HAS_UVLOOP", False)
+    assert eventloop.resolve_backend("uvloop") == "asyncio"
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        EventLoopConfig(backend="trio")
+
+
+@pytest.mark.parametrize("backend", ["asyncio", "uvloop"])
+def test_run(backend):
+    if backend == "uvloop" and not eventloop.HAS_UVLOOP:
+        pytest.skip("uvloop is not installed")
+
+    async def _main() -> tuple[bool, float]:
+        loop = asyncio.get_running_loop()
+        return loop.get_debug(), loop.slow_callback_duration
+
+    config = EventLoopConfig(backend=backend, debug=True, slow_callback_duration=0.05)
+    assert eventloop.run(_main(), config) == (True, 0.05)
+
+
+def test_default_executor_workers():
+    async def _main() -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: 42)
+
+    config = EventLoopConfig(backend="asyncio", default_executor_workers=2)
+    assert eventloop.run(_main(), config) == 42
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import pytest
+
+from mcookbook.config.live import LiveConfig
+from mcookbook.exchanges import Exchange
+from mcookbook.utils.metrics import MetricsRegistry
+from mcookbook.utils.metrics import MetricsServer
+from mcookbook.utils.metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+
+async def _scrape(server: MetricsServer, path: str = "/metrics") -> tuple[str, str]:
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = (await reader.read()).decode()
+    writer.close()
+    headers, _, body = response.partition("\r\n\r\n")
+    return headers.split("\r\n", 1)[0], body
+
+
+def _serve_and_scrape(registry: MetricsRegistry, path: str = "/metrics") -> tuple[str, str]:
+    async def _main() -> tuple[str, str]:
+        server = MetricsServer(registry, port=0)
+        await server.start()
+        try:
+            return await _scrape(server, path)
+        finally:
+            await server.close()
+
+    return asyncio.run(_main())
+
+
+def test_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", labelnames=("endpoint",))
+    counter.labels("ticker").inc()
+    counter.labels(endpoint="ticker").inc(2)
+    gauge = registry.gauge("size", "Size.")
+    gauge.set(3)
+    registry.gauge("unknown", "Unknown.").set_function(lambda: None)
+    histogram = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{endpoint="ticker"} 3.0',
+        "# HELP size Size.",
+        "# TYPE size gauge",
+        "size 3.0",
+        "# HELP unknown Unknown.",
+        "# TYPE unknown gauge",
+        "# HELP duration_seconds Duration.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{le="0.1"} 1',
+        'duration_seconds_bucket{le="1.0"} 2',
+        'duration_seconds_bucket{le="+Inf"} 3',
+        "duration_seconds_sum 5.55",
+        "duration_seconds_count 3",
+    ]
+
+
+def test_register_conflicting_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("total", "Total.") is registry.counter("total", "Total.")
+    with pytest.raises(ValueError):
+        registry.gauge("total", "Total.")
+
+
+def test_scrape():
+    registry = MetricsRegistry()
+    registry.counter("scraped_total", "Scrapes.").inc()
+    status, body = _serve_and_scrape(registry)
+    assert status == "HTTP/1.1 200 OK"
+    assert "scraped_total 1.0" in body
+
+
+def test_scrape_not_found():
+    status, body = _serve_and_scrape(MetricsRegistry(), path="/")
+    assert status == "HTTP/1.1 404 Not Found"
+    assert body == ""
+
+
+def test_log_records_volume():
+    log.warning("Counted warning")
+    _, body = _serve_and_scrape(REGISTRY)
+    assert 'mcookbook_log_records_total{level="warning",result="emitted"}' in body
+
+
+def test_exchange_requests():
+    config = LiveConfig.parse_obj(
+        {"exchange": {"name": "binance"}, "pairlists": [{"name": "StaticPairList"}]}
+    )
+    exchange = Exchange.resolved(config)
+
+    class FakeAPI:
+        last_response_headers = {"X-MBX-USED-WEIGHT-1M": "600"}
+
+        async def request(self, path: str, *args: Any, **kwargs: Any) -> Any:
+            if path == "fail":
+                raise RuntimeError(path)
+            return {"path": path}
+
+    api: Any = FakeAPI()
+    exchange._api = api
+    exchange._instrument_api(api)
+
+    async def _main() -> None:
+        assert await api.request("ticker/24hr") == {"path": "ticker/24hr"}
+        with pytest.raises(RuntimeError):
+            await api.request("fail")
+
+    asyncio.run(_main())
+    _, body = _serve_and_scrape(REGISTRY)
+    assert (
+        'mcookbook_exchange_requests_total{exchange="binance",endpoint="ticker/24hr",status="ok"} 1.0'
+        in body
+    )
+    assert (
+        'mcookbook_exchange_requests_total{exchange="binance",endpoint="fail",status="error"} 1.0'
+        in body
+    )
+    assert (
+        'mcookbook_exchange_request_duration_seconds_count{exchange="binance",endpoint="ticker/24hr"} 1'
+        in body
+    )
+    assert 'mcookbook_exchange_ratelimit_headroom_ratio{exchange="binance"} 0.75' in body
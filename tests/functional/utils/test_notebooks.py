@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+
+import pytest
+
+from mcookbook.utils import notebooks
+from mcookbook.utils.notebooks import HAS_PAPERMILL
+from mcookbook.utils.notebooks import NotebookBatch
+from mcookbook.utils.notebooks import NotebookRun
+
+
+def test_notebook_batch(tmp_path, monkeypatch):
+    executed = []
+
+    def execute_notebook(number, notebook, output, parameters, environ, timeout=None):
+        executed.append((notebook, output, parameters, environ, timeout))
+        if parameters.get("pair") == "BAD/USDT":
+            return NotebookRun(number, parameters, output, "error", "ValueError: bad", 0.5)
+        output.write_text("{}")
+        return NotebookRun(number, parameters, output, "ok", None, 0.25)
+
+    monkeypatch.setattr(notebooks, "execute_notebook", execute_notebook)
+    notebook = pathlib.Path("research.ipynb")
+    batch = NotebookBatch(notebook, tmp_path, environ={"KEY": "value"}, workers=1, timeout=30)
+    parameter_sets = [{"pair": pair} for pair in ("BTC/USDT", "BAD/USDT")]
+    directory, runs = batch.run(parameter_sets)
+
+    assert directory.parent == tmp_path / "research"
+    assert [run.number for run in runs] == [1, 2]
+    assert [run.status for run in runs] == ["ok", "error"]
+    assert [item[2] for item in executed] == parameter_sets
+    assert {item[3]["KEY"] for item in executed} == {"value"}
+    assert {item[4] for item in executed} == {30}
+    assert runs[0].output == directory / "1.ipynb"
+    assert json.loads(directory.joinpath("runs.json").read_text()) == [
+        run.to_dict() for run in runs
+    ]
+    assert json.loads(directory.joinpath("runs.json").read_text())[1] == {
+        "number": 2,
+        "parameters": {"pair": "BAD/USDT"},
+        "output": "2.ipynb",
+        "status": "error",
+        "error": "ValueError: bad",
+        "duration": 0.5,
+    }
+
+
+def _notebook(path: pathlib.Path) -> pathlib.Path:
+    # The notebooks run on the python3 kernel
+    pytest.importorskip("ipykernel")
+    nbformat = pytest.importorskip("nbformat")
+    notebook = nbformat.v4.new_notebook()
+    notebook.metadata["kernelspec"] = {
+        "name": "python3",
+        "display_name": "Python 3",
+        "language": "python",
+    }
+    notebook.cells = [
+        nbformat.v4.new_code_cell('pair = "BTC/USDT"', metadata={"tags": ["parameters"]}),
+        nbformat.v4.new_code_cell(
+            "import os\n"
+            'assert pair != "BAD/USDT", pair\n'
+            'print(pair, os.environ["MCB_TEST_KEY"])'
+        ),
+    ]
+    nbformat.write(notebook, path)
+    return path
+
+
+@pytest.mark.skipif(not HAS_PAPERMILL, reason="papermill is not installed")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_execute_notebooks(tmp_path, workers):
+    notebook = _notebook(tmp_path / "research.ipynb")
+    batch = NotebookBatch(
+        notebook, tmp_path / "runs", environ={"MCB_TEST_KEY": "value"}, workers=workers
+    )
+    parameter_sets = [{"pair": pair} for pair in ("ETH/USDT", "BAD/USDT")]
+    directory, runs = batch.run(parameter_sets)
+
+    assert [run.status for run in runs] == ["ok", "error"]
+    assert runs[1].error == "AssertionError: BAD/USDT"
+    outputs = json.loads(runs[0].output.read_text())["cells"][-1]["outputs"]
+    assert "".join(outputs[0]["text"]) == "ETH/USDT value\n"
+    # Only the kernels get the extra environment variables
+    assert "MCB_TEST_KEY" not in os.environ
+
+    # Batches started within the same second get their own directory
+    other_directory, _ = batch.run(parameter_sets[:1])
+    assert other_directory != directory
+    assert other_directory.parent == directory.parent
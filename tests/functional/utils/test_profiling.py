@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pstats
+import signal
+import time
+
+import pytest
+
+from mcookbook.cli.__main__ import main
+from mcookbook.utils.profiling import DeterministicProfiler
+from mcookbook.utils.profiling import DUMP_SIGNAL
+from mcookbook.utils.profiling import profile
+from mcookbook.utils.profiling import SamplingProfiler
+
+
+def _busy(duration: float) -> None:
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+async def _main() -> None:
+    await asyncio.create_task(asyncio.to_thread(lambda: None))
+    task = asyncio.create_task(_spin(), name="spinner")
+    await task
+
+
+async def _spin() -> None:
+    _busy(0.2)
+
+
+def test_sampling_profiler(tmp_path):
+    output = tmp_path / "profile.folded"
+    with profile(SamplingProfiler(interval=0.001), output):
+        asyncio.run(_main())
+    stacks = {}
+    for line in output.read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    assert stacks
+    spinner_stacks = [stack for stack in stacks if stack.startswith("task:spinner;")]
+    assert spinner_stacks
+    assert all("_busy (test_profiling.py:" in stack for stack in spinner_stacks)
+
+
+def test_deterministic_profiler(tmp_path):
+    output = tmp_path / "profile.pstats"
+    with profile(DeterministicProfiler(), output):
+        asyncio.run(_main())
+    stats = pstats.Stats(str(output))
+    assert any(func[2] == "_busy" for func in stats.stats)  # type: ignore[attr-defined]
+
+
+@pytest.mark.skipif(DUMP_SIGNAL is None, reason="Platform does not support SIGUSR1")
+def test_dump_on_signal(tmp_path):
+    output = tmp_path / "profile.pstats"
+    with profile(DeterministicProfiler(), output):
+        _busy(0.05)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert output.exists()
+        output.unlink()
+    assert output.exists()
+
+
+@pytest.mark.parametrize("mode", [None, "deterministic"])
+def test_profile_command(tmp_path, mode):
+    config = {
+        "exchange": {"name": "binance", "pair_allow_list": ["AA[A-C]/USDT"]},
+        "pairlists": [{"name": "StaticPairList"}],
+        "strategy": {"name": "EMACross", "fast": 5, "slow": 20},
+    }
+    tmp_path.joinpath("default.json").write_text(json.dumps(config))
+    # The bare flag must not consume the subcommand
+    argv = ["--basedir", str(tmp_path), "--profile"]
+    if mode is not None:
+        argv.extend(["--profile-mode", mode])
+    argv.extend(
+        ["replay", "--synthetic-markets", "30", "--start", "2022-01-01", "--end", "2022-01-03"]
+    )
+    main(argv)
+    extension = "pstats" if mode == "deterministic" else "folded"
+    assert list(tmp_path.joinpath("profiles").glob(f"replay-*.{extension}"))
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+
+from mcookbook.utils.cache import DiskCache
+from mcookbook.utils.watchdog import _blocking_call_site
+from mcookbook.utils.watchdog import EventLoopWatchdog
+
+
+def _blocking_call() -> None:
+    time.sleep(0.4)
+
+
+def _repeatedly_blocking_call() -> None:
+    time.sleep(0.3)
+
+
+def test_blocking_code_is_reported(caplog):
+    async def _main() -> EventLoopWatchdog:
+        watchdog = EventLoopWatchdog(interval=0.02, threshold=0.1, report_interval=60)
+        await watchdog.start()
+        try:
+            await asyncio.sleep(0.1)
+            _blocking_call()
+            await asyncio.sleep(0.1)
+        finally:
+            await watchdog.stop()
+        return watchdog
+
+    with caplog.at_level(logging.WARNING, logger="mcookbook.utils.watchdog"):
+        watchdog = asyncio.run(_main())
+
+    assert watchdog.stats.blocked == 1
+    assert watchdog.stats.max >= 0.3
+    (call_site,) = watchdog.stats.blocking_sites
+    assert call_site.endswith("in _blocking_call")
+    assert len(caplog.records) == 1
+    assert "_blocking_call" in caplog.records[0].getMessage()
+    assert "Top blocking call sites" in watchdog.stats.summary()
+
+
+def test_blocking_warnings_are_throttled_per_call_site(caplog):
+    async def _main() -> EventLoopWatchdog:
+        watchdog = EventLoopWatchdog(interval=0.02, threshold=0.1, report_interval=60)
+        await watchdog.start()
+        try:
+            for _ in range(2):
+                await asyncio.sleep(0.1)
+                _repeatedly_blocking_call()
+            await asyncio.sleep(0.1)
+        finally:
+            await watchdog.stop()
+        return watchdog
+
+    with caplog.at_level(logging.WARNING, logger="mcookbook.utils.watchdog"):
+        watchdog = asyncio.run(_main())
+
+    assert watchdog.stats.blocked == 2
+    (call_site,) = watchdog.stats.blocking_sites
+    assert call_site.endswith("in _repeatedly_blocking_call")
+    assert len(caplog.records) == 1
+
+
+def test_call_site_is_the_innermost_mcookbook_frame(tmp_path):
+    cache = DiskCache(tmp_path)
+
+    @cache.memoize
+    def _call_sites() -> tuple[str, str]:
+        return _blocking_call_site(sys._getframe())
+
+    call_site, innermost = _call_sites()
+    assert "utils/cache.py" in call_site
+    assert call_site.endswith("in wrapper")
+    assert innermost.endswith("in _call_sites")
+
+
+def test_lag_only(caplog):
+    async def _main() -> EventLoopWatchdog:
+        watchdog = EventLoopWatchdog(interval=0.02, threshold=0.1, detect_blocking=False)
+        await watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            _blocking_call()
+            await asyncio.sleep(0.05)
+        finally:
+            await watchdog.stop()
+        return watchdog
+
+    with caplog.at_level(logging.WARNING, logger="mcookbook.utils.watchdog"):
+        watchdog = asyncio.run(_main())
+
+    assert watchdog.stats.samples > 1
+    assert watchdog.stats.max >= 0.3
+    assert watchdog.stats.blocked == 0
+    assert not caplog.records
+
+
+def test_periodic_report(caplog):
+    async def _main() -> None:
+        watchdog = EventLoopWatchdog(interval=0.01, report_interval=0.05, detect_blocking=False)
+        await watchdog.start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await watchdog.stop()
+
+    with caplog.at_level(logging.INFO, logger="mcookbook.utils.watchdog"):
+        asyncio.run(_main())
+
+    assert any("Event loop lag statistics" in record.getMessage() for record in caplog.records)